@@ -0,0 +1,35 @@
+// backend/backfillRollups.js
+// Rebuild the sales rollup tables (see utils/salesRollup.js) from the full
+// order history with the sales-rollups batched migration: one short
+// transaction per chunk of orders, so checkouts keep going, and a checkpoint
+// after each. An interrupted rebuild resumes where it stopped; otherwise the
+// rollups are rebuilt from scratch.
+//
+// Usage: npm run rollups:backfill
+const dotenv = require('dotenv');
+
+dotenv.config();
+
+const { sequelize, connectDB } = require('./config/database');
+const { runBatched, checkpoints } = require('./utils/batchedMigration');
+const salesRollups = require('./migrations/batched/sales-rollups');
+
+const NAME = 'sales-rollups';
+
+const backfillRollups = async () => {
+  try {
+    await connectDB();
+
+    const previous = (await checkpoints(sequelize)).find(row => row.name === NAME);
+    const resume = previous && !previous.completedAt;
+    const { rowsDone } = await runBatched(sequelize, NAME, salesRollups, { restart: !resume });
+
+    console.log(`✅ Sales rollups rebuilt from ${rowsDone} orders${resume ? ' (resumed)' : ''}`);
+    process.exit(0);
+  } catch (error) {
+    console.error('❌ Rollup backfill failed:', error);
+    process.exit(1);
+  }
+};
+
+backfillRollups();
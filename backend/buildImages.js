@@ -0,0 +1,107 @@
+// backend/buildImages.js
+// Build-time image pipeline: writes resized, content-hashed JPEG and WebP
+// variants of every image in public/images to public/images/build and a
+// manifest (data/image-manifest.json) that the API uses for Product.image.
+// IMAGE_BUILD_DIR and IMAGE_MANIFEST_PATH override both locations.
+//
+// Usage: npm run images:build        (requires the `sharp` dev dependency)
+//        npm run images:build -- --force   rebuild every image
+const fs = require('fs');
+const path = require('path');
+const crypto = require('crypto');
+
+let sharp;
+try {
+  sharp = require('sharp');
+} catch (error) {
+  console.error('The image pipeline needs sharp: npm install --save-dev sharp');
+  process.exit(1);
+}
+
+const { MANIFEST_PATH, BUILD_DIR, VARIANT_WIDTHS } = require('./utils/imageManifest');
+
+const SOURCE_DIR = path.join(__dirname, 'public/images');
+const SOURCE_EXTENSIONS = ['.jpg', '.jpeg', '.png'];
+
+const FORMATS = {
+  jpeg: { ext: 'jpg', options: { quality: 80, mozjpeg: true, progressive: true } },
+  webp: { ext: 'webp', options: { quality: 78 } }
+};
+
+const hashOf = (buffer) => crypto.createHash('sha1').update(buffer).digest('hex');
+
+const readManifest = () => {
+  try {
+    return JSON.parse(fs.readFileSync(MANIFEST_PATH, 'utf8'));
+  } catch (error) {
+    return {};
+  }
+};
+
+const buildImage = async (file, source) => {
+  const base = path.basename(file, path.extname(file));
+  const variants = {};
+
+  for (const [variant, width] of Object.entries(VARIANT_WIDTHS)) {
+    const resized = sharp(source).rotate().resize({ width, withoutEnlargement: true });
+    variants[variant] = {};
+
+    for (const [format, { ext, options }] of Object.entries(FORMATS)) {
+      const { data, info } = await resized.clone()[format](options).toBuffer({ resolveWithObject: true });
+      // Fingerprint = hash of the output bytes, so URLs change only when content does
+      const name = `${base}-${variant}-${hashOf(data).slice(0, 10)}.${ext}`;
+      fs.writeFileSync(path.join(BUILD_DIR, name), data);
+      variants[variant][format] = `images/build/${name}`;
+      variants[variant].width = info.width;
+      variants[variant].height = info.height;
+    }
+  }
+  return variants;
+};
+
+const buildImages = async () => {
+  const force = process.argv.includes('--force');
+  fs.mkdirSync(BUILD_DIR, { recursive: true });
+  fs.mkdirSync(path.dirname(MANIFEST_PATH), { recursive: true });
+
+  const previous = readManifest();
+  const manifest = {};
+  const files = fs.readdirSync(SOURCE_DIR)
+    .filter(file => SOURCE_EXTENSIONS.includes(path.extname(file).toLowerCase()));
+
+  let built = 0;
+  for (const file of files) {
+    const key = `images/${file}`;
+    const source = fs.readFileSync(path.join(SOURCE_DIR, file));
+    const sourceHash = hashOf(source);
+
+    const outputsExist = previous[key] && Object.values(previous[key].variants).every(v =>
+      Object.keys(FORMATS).every(format => fs.existsSync(path.join(BUILD_DIR, path.basename(v[format])))));
+
+    if (!force && outputsExist && previous[key].source === sourceHash) {
+      manifest[key] = previous[key];
+      continue;
+    }
+
+    manifest[key] = { source: sourceHash, variants: await buildImage(file, source) };
+    built++;
+    console.log(`Built ${key}`);
+  }
+
+  // Remove outputs no longer referenced by the manifest
+  const referenced = new Set(Object.values(manifest).flatMap(entry =>
+    Object.values(entry.variants).flatMap(v => Object.keys(FORMATS).map(f => path.basename(v[f])))));
+  for (const file of fs.readdirSync(BUILD_DIR)) {
+    if (!referenced.has(file)) {
+      fs.unlinkSync(path.join(BUILD_DIR, file));
+    }
+  }
+
+  fs.writeFileSync(MANIFEST_PATH, JSON.stringify(manifest, null, 2));
+  console.log(`Image manifest written: ${files.length} images, ${built} rebuilt`);
+};
+
+buildImages().catch((error) => {
+  console.error('Image build failed:', error);
+  process.exit(1);
+});
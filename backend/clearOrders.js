@@ -1,9 +1,34 @@
-const { sequelize } = require('./config/database');
+// backend/clearOrders.js
+// Delete every order and its line items in batches (see
+// utils/batchedMigration.js), so a large Orders table is never locked for
+// the whole run, then empty the sales rollups like /api/admin/clear-data.
+// Safe to interrupt and re-run.
+const dotenv = require('dotenv');
+
+dotenv.config();
+
+const { Transaction } = require('sequelize');
+const { sequelize, connectDB } = require('./config/database');
+const { runBatched } = require('./utils/batchedMigration');
+const { clearRollups } = require('./utils/salesRollup');
+
+const deleteOrders = {
+  table: 'Orders',
+  apply: async ({ transaction, fromKey, toKey }) => {
+    const range = { replacements: { fromKey, toKey }, transaction };
+    await sequelize.query('DELETE FROM OrderItems WHERE orderId > :fromKey AND orderId <= :toKey', range);
+    await sequelize.query('DELETE FROM Orders WHERE id > :fromKey AND id <= :toKey', range);
+  }
+};
 
 async function clearOrders() {
   try {
-    await sequelize.query('DELETE FROM Orders');
-    console.log('✅ All orders cleared successfully');
+    await connectDB();
+    // Deleted orders are gone, so starting over costs nothing after an interruption
+    const { rowsDone } = await runBatched(sequelize, 'clear-orders', deleteOrders, { restart: true });
+    // The dashboard totals start over from zero, as after clear-data
+    await sequelize.transaction({ type: Transaction.TYPES.IMMEDIATE }, clearRollups);
+    console.log(`✅ All orders cleared successfully (${rowsDone} deleted)`);
     process.exit(0);
   } catch (error) {
     console.error('❌ Error clearing orders:', error);
@@ -11,4 +36,4 @@ async function clearOrders() {
   }
 }
 
-clearOrders();
\ No newline at end of file
+clearOrders();
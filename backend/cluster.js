@@ -0,0 +1,100 @@
+// backend/cluster.js
+// Runs server.js in CLUSTER_WORKERS processes (default: one per CPU) that
+// share one port:
+// - The first worker starts alone, so only one process runs the schema
+//   migrations; the others fork once it is listening.
+// - A worker that dies is replaced. Workers that keep crashing right after
+//   starting are restarted with a growing delay.
+// - SIGTERM/SIGINT ask every worker to drain (see shutdown in server.js);
+//   the primary exits once they have, killing stragglers after
+//   SHUTDOWN_TIMEOUT_MS.
+// - Cache invalidations are relayed between workers (see utils/clusterBus.js).
+// Sessions live in SQLite (utils/sessionStore.js), so any worker can serve
+// any request.
+const cluster = require('cluster');
+const os = require('os');
+const path = require('path');
+const dotenv = require('dotenv');
+
+dotenv.config();
+
+const { MESSAGE_TYPE } = require('./utils/clusterBus');
+const logger = require('./utils/logger');
+
+const WORKERS = Number(process.env.CLUSTER_WORKERS) || os.availableParallelism?.() || os.cpus().length;
+const SHUTDOWN_TIMEOUT_MS = Number(process.env.SHUTDOWN_TIMEOUT_MS) || 10000;
+// A worker that exits sooner than this after starting counts as crash-looping
+const MIN_UPTIME_MS = 5000;
+const MAX_RESTART_DELAY_MS = 30000;
+
+let stopping = false;
+let restartDelay = 0;
+const startedAt = new Map();
+
+const liveWorkers = () => Object.values(cluster.workers).filter((worker) => !worker.isDead());
+
+const relay = (sender) => (message) => {
+  if (message?.type !== MESSAGE_TYPE) return;
+  for (const worker of liveWorkers()) {
+    if (worker !== sender && worker.isConnected()) worker.send(message);
+  }
+};
+
+const fork = () => {
+  const worker = cluster.fork();
+  startedAt.set(worker.id, Date.now());
+  worker.on('message', relay(worker));
+  return worker;
+};
+
+cluster.setupPrimary({ exec: path.join(__dirname, 'server.js') });
+
+cluster.on('exit', (worker, code, signal) => {
+  const uptime = Date.now() - startedAt.get(worker.id);
+  startedAt.delete(worker.id);
+
+  if (stopping) {
+    if (liveWorkers().length === 0) {
+      logger.info('All workers drained, exiting');
+      process.exit(0);
+    }
+    return;
+  }
+
+  restartDelay = uptime < MIN_UPTIME_MS
+    ? Math.min(MAX_RESTART_DELAY_MS, Math.max(1000, restartDelay * 2))
+    : 0;
+  logger.error('Worker exited, restarting', {
+    workerPid: worker.process.pid, exit: signal || code, uptimeMs: uptime, restartDelayMs: restartDelay
+  });
+  setTimeout(() => {
+    if (!stopping) fork();
+  }, restartDelay);
+});
+
+const shutdown = (signal) => {
+  if (stopping) return;
+  stopping = true;
+  const workers = liveWorkers();
+  logger.info('Draining workers', { signal, workers: workers.length });
+  if (workers.length === 0) process.exit(0);
+
+  for (const worker of workers) {
+    if (worker.isConnected()) worker.send({ type: 'shutdown' });
+  }
+  // Workers give up on their own after SHUTDOWN_TIMEOUT_MS; this is the backstop
+  setTimeout(() => {
+    logger.error('Workers still running, killing them', { timeoutMs: SHUTDOWN_TIMEOUT_MS });
+    liveWorkers().forEach((worker) => worker.process.kill('SIGKILL'));
+    process.exit(1);
+  }, SHUTDOWN_TIMEOUT_MS + 1000).unref();
+};
+
+process.on('SIGTERM', () => shutdown('SIGTERM'));
+process.on('SIGINT', () => shutdown('SIGINT'));
+
+logger.info('Starting workers', { workers: WORKERS });
+cluster.once('listening', () => {
+  for (let i = 1; i < WORKERS; i++) fork();
+});
+fork();
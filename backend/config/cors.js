@@ -0,0 +1,38 @@
+// backend/config/cors.js
+// Browser origins allowed to call the API with credentials. Shared by the
+// global CORS middleware and by routes that refuse cross-site requests.
+const allowedOrigins = process.env.NODE_ENV === 'production'
+  ? [process.env.FRONTEND_URL].filter(Boolean)
+  : ['http://localhost:5173'];
+
+const corsOptions = {
+  origin: allowedOrigins,
+  credentials: true,
+  exposedHeaders: ['Content-Length', 'Content-Type', 'X-Next-Cursor', 'X-Request-Id']
+};
+
+// Origin of a request: the Origin header, else the origin of the Referer.
+// Undefined for non-browser clients that send neither.
+const requestOrigin = (req) => {
+  const origin = req.get('Origin');
+  if (origin) return origin;
+  const referer = req.get('Referer');
+  if (!referer) return undefined;
+  try {
+    return new URL(referer).origin;
+  } catch (error) {
+    return 'null';
+  }
+};
+
+// Refuse requests a browser sent from any page outside allowedOrigins.
+// Exact origin comparison, so http://localhost:5173.evil.com does not pass.
+const requireAllowedOrigin = (req, res, next) => {
+  const origin = requestOrigin(req);
+  if (origin && !allowedOrigins.includes(origin)) {
+    return res.status(403).json({ message: 'Forbidden - Invalid origin' });
+  }
+  next();
+};
+
+module.exports = { allowedOrigins, corsOptions, requireAllowedOrigin };
@@ -1,18 +1,42 @@
 const { Sequelize } = require('sequelize');
+const { applySqliteProfile, PROFILE_NAME } = require('./sqliteProfile');
+const { recordQuery } = require('../utils/metrics');
+const { migrate } = require('../utils/migrator');
+const logger = require('../utils/logger');
 
 const sequelize = new Sequelize({
   dialect: 'sqlite',
-  storage: './database.sqlite',
-  logging: false
+  storage: process.env.DB_STORAGE || './database.sqlite',
+  // Query timing for /metrics and the slow query log
+  benchmark: true,
+  logging: recordQuery
 });
 
+applySqliteProfile(sequelize);
+
+// Bring the schema up to date with the versioned migrations in migrations/.
+// DB_SYNC_ON_BOOT=true instead syncs every model on each start, as before
+// migrations existed; slower to boot, kept for comparison.
 const connectDB = async () => {
   try {
     await sequelize.authenticate();
-    console.log('SQLite connected successfully');
-    await sequelize.sync();
+    logger.info('SQLite connected', { profile: PROFILE_NAME });
+    if (process.env.DB_SYNC_ON_BOOT === 'true') {
+      // sync() cannot build the unique cart index over duplicate lines;
+      // migration 001 merges them on the migration path
+      const [carts] = await sequelize.query("SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'Carts'");
+      if (carts.length > 0) {
+        const { mergeDuplicateCarts } = require('../migrations/001-baseline-schema');
+        await sequelize.transaction((transaction) => mergeDuplicateCarts(sequelize, transaction));
+      }
+      await sequelize.sync();
+      await require('../utils/productSearch').ensureSearchIndex(sequelize);
+      return;
+    }
+    const { version, applied } = await migrate(sequelize);
+    logger.info('Schema up to date', { schemaVersion: version, applied: applied.length });
   } catch (error) {
-    console.error('Database connection failed:', error);
+    logger.error('Database connection failed', { err: error });
     process.exit(1);
   }
 };
@@ -0,0 +1,102 @@
+// backend/config/sqliteProfile.js
+// SQLite tuning applied to the Sequelize connection manager.
+//
+// SQLITE_PROFILE=performance (the default) switches the database to WAL,
+// sets the per-connection pragmas below on every connection Sequelize opens
+// and sends plain SELECTs (outside a transaction) to a small pool of
+// read-only connections. Writes keep using Sequelize's own connections: the
+// shared default one and one per transaction; busy_timeout makes them queue
+// for the write lock instead of failing with SQLITE_BUSY. WAL lets the
+// readers run alongside that writer.
+//
+// SQLITE_PROFILE=default leaves Sequelize's settings alone (rollback journal,
+// no busy timeout, one shared connection); useful for before/after runs.
+const { QueryTypes } = require('sequelize');
+
+const PROFILES = {
+  default: null,
+  performance: {
+    readers: Number(process.env.SQLITE_READERS ?? 4),
+    pragmas: {
+      synchronous: process.env.SQLITE_SYNCHRONOUS || 'NORMAL',
+      busy_timeout: Number(process.env.SQLITE_BUSY_TIMEOUT_MS) || 5000,
+      // Negative cache_size is in KiB
+      cache_size: -(Number(process.env.SQLITE_CACHE_SIZE_KB) || 20000),
+      mmap_size: (Number(process.env.SQLITE_MMAP_SIZE_MB ?? 256)) * 1024 * 1024,
+      temp_store: 'MEMORY'
+    }
+  }
+};
+
+const PROFILE_NAME = process.env.SQLITE_PROFILE || 'performance';
+
+const exec = (connection, sql) => new Promise((resolve, reject) => {
+  connection.exec(sql, (error) => (error ? reject(error) : resolve()));
+});
+
+const pragmaSql = (pragmas) => Object.entries(pragmas)
+  .map(([name, value]) => `PRAGMA ${name} = ${value};`)
+  .join('\n');
+
+const applySqliteProfile = (sequelize) => {
+  if (!(PROFILE_NAME in PROFILES)) {
+    throw new Error(`Unknown SQLITE_PROFILE "${PROFILE_NAME}" (expected ${Object.keys(PROFILES).join(' or ')})`);
+  }
+  const profile = PROFILES[PROFILE_NAME];
+  const storage = sequelize.options.storage;
+  if (!profile || !storage || storage === ':memory:') return;
+
+  const manager = sequelize.connectionManager;
+  const getConnection = manager.getConnection.bind(manager);
+  const connectionSql = pragmaSql(profile.pragmas);
+  const readerSql = `${connectionSql}\nPRAGMA query_only = 1;`;
+  const configured = new WeakSet();
+  const readers = [];
+  let walEnabled = null;
+  let nextReader = 0;
+
+  const configure = async (connection, sql) => {
+    if (!configured.has(connection)) {
+      configured.add(connection);
+      await exec(connection, sql);
+    }
+    return connection;
+  };
+
+  // journal_mode is stored in the database file, so it is set once
+  const writer = async (options) => {
+    const connection = await configure(await getConnection(options), connectionSql);
+    walEnabled = walEnabled || exec(connection, 'PRAGMA journal_mode = WAL;');
+    await walEnabled;
+    return connection;
+  };
+
+  // Readers open lazily, after the writer has switched the file to WAL
+  const reader = async () => {
+    const index = nextReader;
+    nextReader = (nextReader + 1) % profile.readers;
+    if (!readers[index]) {
+      readers[index] = writer({}).then(() => new Promise((resolve, reject) => {
+        const connection = new manager.lib.Database(storage, manager.lib.OPEN_READONLY, (error) => {
+          if (error) reject(error);
+          else resolve(connection);
+        });
+      })).then((connection) => {
+        // Registered with the manager so sequelize.close() closes it too
+        manager.connections[`reader-${index}`] = connection;
+        return configure(connection, readerSql);
+      });
+      readers[index].catch(() => { readers[index] = null; });
+    }
+    return readers[index];
+  };
+
+  // Transactions ask for a connection with a uuid and must get their own
+  manager.getConnection = (options = {}) => (
+    options.type === QueryTypes.SELECT && !options.uuid && profile.readers > 0
+      ? reader()
+      : writer(options)
+  );
+};
+
+module.exports = { applySqliteProfile, PROFILE_NAME };
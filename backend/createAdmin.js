@@ -1,6 +1,10 @@
-const bcrypt = require('bcryptjs');
+const dotenv = require('dotenv');
+
+dotenv.config();
+
 const { connectDB } = require('./config/database');
 const User = require('./models/User');
+const passwordHasher = require('./utils/passwordHasher');
 
 const createAdmin = async () => {
   try {
@@ -19,7 +23,7 @@ const createAdmin = async () => {
     }
     
     // Hash password
-    const hashedPassword = await bcrypt.hash(adminPassword, 12);
+    const hashedPassword = await passwordHasher.hash(adminPassword);
     
     // Create admin user
     const admin = await User.create({
@@ -1,4 +1,5 @@
 const jwt = require('jsonwebtoken');
+const { verifyToken, tokenFrom } = require('../utils/tokenVerifier');
 
 const verifyJWT_username = (req, res, next) => {
   const token = req.cookies.accessToken;
@@ -38,4 +39,27 @@ const verifyJWT_email = (req, res, next) => {
   }
 };
 
-module.exports = { verifyJWT_username, verifyJWT_email };
\ No newline at end of file
+// Identify the shopper from the JWT issued at login (Authorization: Bearer,
+// or the accessToken cookie after Google sign-in). Verified locally through
+// the shared token cache, with no database lookup.
+const requireUser = (req, res, next) => {
+  const token = tokenFrom(req);
+
+  if (!token) {
+    return res.status(401).json({ message: 'Please log in to access cart.' });
+  }
+
+  try {
+    const decoded = verifyToken(token);
+    if (!decoded.userId) {
+      return res.status(401).json({ message: 'Invalid token format.' });
+    }
+    req.user = decoded;
+    req.userId = String(decoded.userId);
+    next();
+  } catch (error) {
+    res.status(401).json({ message: 'Invalid token.' });
+  }
+};
+
+module.exports = { verifyJWT_username, verifyJWT_email, requireUser };
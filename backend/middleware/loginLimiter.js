@@ -0,0 +1,31 @@
+// backend/middleware/loginLimiter.js
+// Caps the password checks one client IP can have in flight. Every login
+// and registration costs a bcrypt job on the shared worker pool, so a single
+// client firing logins in parallel would otherwise queue out everyone else.
+const MAX_CONCURRENT = Number(process.env.LOGIN_MAX_CONCURRENT_PER_IP) || 4;
+
+const inFlight = new Map();
+
+const limitConcurrentLogins = (req, res, next) => {
+  const ip = req.ip;
+  const count = inFlight.get(ip) || 0;
+  if (count >= MAX_CONCURRENT) {
+    res.set('Retry-After', '1');
+    return res.status(429).json({ message: 'Too many login attempts in progress. Please try again shortly.' });
+  }
+  inFlight.set(ip, count + 1);
+
+  let released = false;
+  const release = () => {
+    if (released) return;
+    released = true;
+    const remaining = inFlight.get(ip) - 1;
+    if (remaining > 0) inFlight.set(ip, remaining);
+    else inFlight.delete(ip);
+  };
+  res.on('finish', release);
+  res.on('close', release);
+  next();
+};
+
+module.exports = { limitConcurrentLogins };
@@ -0,0 +1,40 @@
+// backend/middleware/requestLogger.js
+// One structured access log line per request, carrying its request id,
+// status, latency and query count. Ordinary requests are sampled at
+// ACCESS_LOG_SAMPLE_RATE (default: all of them); server errors and requests
+// slower than SLOW_REQUEST_MS are always logged, as warnings.
+const logger = require('../utils/logger');
+const { current } = require('../utils/requestContext');
+
+const SAMPLE_RATE = process.env.ACCESS_LOG_SAMPLE_RATE !== undefined
+  ? Number(process.env.ACCESS_LOG_SAMPLE_RATE)
+  : 1;
+const SLOW_REQUEST_MS = Number(process.env.SLOW_REQUEST_MS) || 1000;
+
+const accessLog = logger.sampled(SAMPLE_RATE);
+
+// Must run inside requestContext
+const requestLogger = (req, res, next) => {
+  const start = process.hrtime.bigint();
+  const context = current();
+
+  res.on('finish', () => {
+    const durationMs = Number(process.hrtime.bigint() - start) / 1e6;
+    const fields = {
+      requestId: context?.requestId,
+      method: req.method,
+      url: req.originalUrl,
+      status: res.statusCode,
+      durationMs: Math.round(durationMs * 1000) / 1000,
+      queries: context?.queryTimes.length
+    };
+    if (res.statusCode >= 500 || durationMs >= SLOW_REQUEST_MS) {
+      logger.warn('Request completed', fields);
+    } else {
+      accessLog.info('Request completed', fields);
+    }
+  });
+  next();
+};
+
+module.exports = { requestLogger };
@@ -1,20 +1,34 @@
+// backend/migrate.js
+// Apply pending schema migrations (see utils/migrator.js), or list them.
+// The server does the same at startup; this runs them ahead of a deploy.
+//
+// Usage: npm run migrate            apply pending migrations
+//        node migrate status        show which migrations are applied
+const dotenv = require('dotenv');
+
+dotenv.config();
+
 const { sequelize } = require('./config/database');
-const User = require('./models/User');
-const UnRegisteredUser = require('./models/UnRegisteredUser');
+const migrator = require('./utils/migrator');
 
-async function migrate() {
+const run = async () => {
   try {
-    console.log('Running database migration...');
-    
-    // Sync all models (this will create new tables and add missing columns)
-    await sequelize.sync({ alter: true });
-    
-    console.log('Migration completed successfully!');
+    await sequelize.authenticate();
+    if (process.argv[2] === 'status') {
+      for (const { version, name, applied } of await migrator.status(sequelize)) {
+        console.log(`${applied ? '✅' : '⏳'} ${String(version).padStart(3, '0')} ${name}`);
+      }
+    } else {
+      const { version, applied } = await migrator.migrate(sequelize);
+      console.log(applied.length > 0
+        ? `✅ Applied ${applied.length} migration(s), schema at version ${version}`
+        : `✅ Schema already at version ${version}`);
+    }
     process.exit(0);
   } catch (error) {
-    console.error('Migration failed:', error);
+    console.error('❌ Migration failed:', error);
     process.exit(1);
   }
-}
+};
 
-migrate();
\ No newline at end of file
+run();
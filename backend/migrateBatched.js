@@ -0,0 +1,55 @@
+// backend/migrateBatched.js
+// Run a batched data migration from migrations/batched/ while the server
+// keeps serving (see utils/batchedMigration.js). Stop it with Ctrl+C or
+// SIGTERM at any time: the chunk in flight commits, and the next run resumes
+// from there.
+//
+// Usage: node migrateBatched <name> [--restart]   e.g. order-items
+//        node migrateBatched status
+const fs = require('fs');
+const path = require('path');
+const dotenv = require('dotenv');
+
+dotenv.config();
+
+const { sequelize, connectDB } = require('./config/database');
+const { runBatched, checkpoints } = require('./utils/batchedMigration');
+const logger = require('./utils/logger');
+
+const BATCHED_DIR = path.join(__dirname, 'migrations', 'batched');
+
+const run = async () => {
+  const [name, flag] = process.argv.slice(2);
+  const available = fs.readdirSync(BATCHED_DIR).map(file => file.replace(/\.js$/, ''));
+  try {
+    await connectDB();
+    if (name === 'status') {
+      for (const row of await checkpoints(sequelize)) {
+        console.log(`${row.completedAt ? '✅' : '⏸️ '} ${row.name}: ${row.rowsDone} rows, ` +
+          `${row.rowsWritten} written, last key ${row.lastKey}`);
+      }
+    } else if (!available.includes(name)) {
+      console.error(`Usage: node migrateBatched <${available.join('|')}|status> [--restart]`);
+      process.exitCode = 1;
+    } else {
+      const controller = new AbortController();
+      process.on('SIGINT', () => controller.abort());
+      process.on('SIGTERM', () => controller.abort());
+
+      const result = await runBatched(sequelize, name, require(path.join(BATCHED_DIR, name)), {
+        restart: flag === '--restart',
+        signal: controller.signal
+      });
+      console.log(`${result.completedAt ? '✅ Completed' : '⏸️  Stopped'} ${name}: ` +
+        `${result.rows} rows in ${result.seconds.toFixed(1)}s (${Math.round(result.rowsPerSecond)} rows/s), ` +
+        `${result.rowsDone} rows and ${result.rowsWritten} written in total, last key ${result.lastKey}`);
+    }
+  } catch (error) {
+    console.error('❌ Batched migration failed:', error);
+    process.exitCode = 1;
+  }
+  await sequelize.close();
+  await logger.close();
+};
+
+run();
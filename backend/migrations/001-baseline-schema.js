@@ -0,0 +1,201 @@
+// Schema as of the switch to versioned migrations, written out as DDL so it
+// never changes with the models: later schema changes get their own
+// numbered migration. Table and index definitions match what
+// sequelize.sync() created, index names included, so on databases it built
+// the IF NOT EXISTS statements are no-ops.
+//
+// Older databases also get the columns that migrateAdmin.js,
+// migrate-user-table.js and update-schema.js used to add, and their
+// duplicate cart lines merged so the unique cart index can be built.
+const { QueryTypes } = require('sequelize');
+
+const TABLES = [
+  `CREATE TABLE IF NOT EXISTS Users (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    username VARCHAR(255) NOT NULL,
+    email VARCHAR(255) NOT NULL UNIQUE,
+    password VARCHAR(255),
+    address TEXT,
+    googleId VARCHAR(255),
+    isEmailVerified TINYINT(1) DEFAULT 0,
+    emailVerificationToken VARCHAR(255),
+    isAdmin TINYINT(1) DEFAULT 0,
+    createdAt DATETIME NOT NULL,
+    updatedAt DATETIME NOT NULL
+  )`,
+  `CREATE TABLE IF NOT EXISTS UnRegisteredUsers (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    email VARCHAR(255) NOT NULL UNIQUE,
+    googleId VARCHAR(255),
+    name VARCHAR(255),
+    createdAt DATETIME NOT NULL,
+    updatedAt DATETIME NOT NULL
+  )`,
+  `CREATE TABLE IF NOT EXISTS Products (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name VARCHAR(255) NOT NULL,
+    image VARCHAR(255) NOT NULL,
+    description TEXT NOT NULL,
+    category VARCHAR(255) NOT NULL,
+    price DECIMAL(10,2) NOT NULL,
+    countInStock INTEGER NOT NULL DEFAULT 0,
+    rating DECIMAL(2,1) NOT NULL DEFAULT 0,
+    numReviews INTEGER NOT NULL DEFAULT 0,
+    createdAt DATETIME NOT NULL,
+    updatedAt DATETIME NOT NULL
+  )`,
+  `CREATE TABLE IF NOT EXISTS Carts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    userId INTEGER NOT NULL,
+    productId INTEGER NOT NULL,
+    quantity INTEGER NOT NULL DEFAULT 1,
+    name VARCHAR(255) NOT NULL,
+    image VARCHAR(255) NOT NULL,
+    price INTEGER NOT NULL
+  )`,
+  `CREATE TABLE IF NOT EXISTS Orders (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    userId VARCHAR(255) NOT NULL,
+    orderId VARCHAR(255) NOT NULL UNIQUE,
+    items TEXT DEFAULT '[]',
+    productId INTEGER,
+    productName VARCHAR(255),
+    quantity INTEGER,
+    price DECIMAL(10,2),
+    totalAmount DECIMAL(10,2) NOT NULL,
+    status VARCHAR(255) DEFAULT 'completed',
+    deliveryDate VARCHAR(255),
+    createdAt DATETIME,
+    updatedAt DATETIME NOT NULL
+  )`,
+  `CREATE TABLE IF NOT EXISTS OrderItems (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    orderId INTEGER NOT NULL REFERENCES Orders (id) ON DELETE CASCADE ON UPDATE CASCADE,
+    productId INTEGER NOT NULL,
+    name VARCHAR(255) NOT NULL,
+    image VARCHAR(255),
+    price DECIMAL(10,2) NOT NULL,
+    quantity INTEGER NOT NULL,
+    createdAt DATETIME NOT NULL
+  )`,
+  `CREATE TABLE IF NOT EXISTS DailySales (
+    day VARCHAR(10) PRIMARY KEY,
+    revenue DECIMAL(12,2) NOT NULL DEFAULT 0,
+    orders INTEGER NOT NULL DEFAULT 0
+  )`,
+  `CREATE TABLE IF NOT EXISTS ProductDailySales (
+    day VARCHAR(10),
+    productId INTEGER,
+    productName VARCHAR(255),
+    quantity INTEGER NOT NULL DEFAULT 0,
+    revenue DECIMAL(12,2) NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, productId)
+  )`,
+  `CREATE TABLE IF NOT EXISTS CustomerSales (
+    userId VARCHAR(255) PRIMARY KEY,
+    totalSpent DECIMAL(12,2) NOT NULL DEFAULT 0,
+    orderCount INTEGER NOT NULL DEFAULT 0
+  )`,
+  `CREATE TABLE IF NOT EXISTS Sessions (
+    sid VARCHAR(255) PRIMARY KEY,
+    data TEXT NOT NULL,
+    expires DATETIME NOT NULL
+  )`,
+  `CREATE TABLE IF NOT EXISTS OutboxEmails (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    recipient VARCHAR(255) NOT NULL,
+    subject VARCHAR(255) NOT NULL,
+    html TEXT NOT NULL,
+    status VARCHAR(255) NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    nextAttemptAt DATETIME NOT NULL,
+    lockedUntil DATETIME,
+    lastError TEXT,
+    sentAt DATETIME,
+    createdAt DATETIME NOT NULL,
+    updatedAt DATETIME NOT NULL
+  )`
+];
+
+// Columns older databases can lack. ADD COLUMN needs a constant default for
+// NOT NULL columns; timestamps are added nullable and filled in instead.
+const LEGACY_COLUMNS = {
+  Users: {
+    isAdmin: 'TINYINT(1) DEFAULT 0',
+    googleId: 'VARCHAR(255)',
+    isEmailVerified: 'TINYINT(1) DEFAULT 0',
+    emailVerificationToken: 'VARCHAR(255)'
+  },
+  Orders: {
+    productId: 'INTEGER',
+    productName: 'VARCHAR(255)',
+    quantity: 'INTEGER',
+    price: 'DECIMAL(10,2)',
+    deliveryDate: 'VARCHAR(255)'
+  },
+  Products: {
+    image: "VARCHAR(255) NOT NULL DEFAULT ''",
+    description: "TEXT NOT NULL DEFAULT ''",
+    category: "VARCHAR(255) NOT NULL DEFAULT ''",
+    countInStock: 'INTEGER NOT NULL DEFAULT 0',
+    rating: 'DECIMAL(2,1) NOT NULL DEFAULT 0',
+    numReviews: 'INTEGER NOT NULL DEFAULT 0',
+    createdAt: 'DATETIME',
+    updatedAt: 'DATETIME'
+  }
+};
+
+// Index names are the ones Sequelize generated for the model indexes
+const INDEXES = [
+  'CREATE INDEX IF NOT EXISTS users_is_admin_created_at ON Users (isAdmin, createdAt)',
+  'CREATE INDEX IF NOT EXISTS products_category_price ON Products (category, price)',
+  'CREATE INDEX IF NOT EXISTS products_category_rating ON Products (category, rating)',
+  'CREATE INDEX IF NOT EXISTS products_price ON Products (price)',
+  'CREATE INDEX IF NOT EXISTS products_rating ON Products (rating)',
+  'CREATE INDEX IF NOT EXISTS products_created_at ON Products (createdAt)',
+  'CREATE UNIQUE INDEX IF NOT EXISTS carts_user_id_product_id ON Carts (userId, productId)',
+  'CREATE INDEX IF NOT EXISTS orders_created_at ON Orders (createdAt)',
+  'CREATE INDEX IF NOT EXISTS orders_status_created_at ON Orders (status, createdAt)',
+  'CREATE INDEX IF NOT EXISTS orders_user_id_created_at ON Orders (userId, createdAt)',
+  'CREATE INDEX IF NOT EXISTS order_items_product_id_created_at ON OrderItems (productId, createdAt)',
+  'CREATE INDEX IF NOT EXISTS order_items_order_id ON OrderItems (orderId)',
+  'CREATE INDEX IF NOT EXISTS customer_sales_total_spent ON CustomerSales (totalSpent)',
+  'CREATE INDEX IF NOT EXISTS sessions_expires ON Sessions (expires)',
+  'CREATE INDEX IF NOT EXISTS outbox_emails_status_next_attempt_at ON OutboxEmails (status, nextAttemptAt)'
+];
+
+// Carts from before the unique index can hold several lines for one
+// product: merge them into the oldest line. Also run ahead of sync() on the
+// DB_SYNC_ON_BOOT path (see config/database.js).
+const mergeDuplicateCarts = async (sequelize, transaction) => {
+  const run = (sql) => sequelize.query(sql, { transaction });
+  await run(`
+    UPDATE Carts SET quantity = (
+      SELECT SUM(quantity) FROM Carts dup
+      WHERE dup.userId = Carts.userId AND dup.productId = Carts.productId
+    )
+    WHERE id IN (SELECT MIN(id) FROM Carts GROUP BY userId, productId HAVING COUNT(*) > 1)`);
+  await run('DELETE FROM Carts WHERE id NOT IN (SELECT MIN(id) FROM Carts GROUP BY userId, productId)');
+};
+
+exports.mergeDuplicateCarts = mergeDuplicateCarts;
+
+exports.up = async ({ sequelize, transaction }) => {
+  const run = (sql, replacements) => sequelize.query(sql, { replacements, transaction });
+
+  for (const sql of TABLES) await run(sql);
+
+  for (const [table, columns] of Object.entries(LEGACY_COLUMNS)) {
+    const existing = await sequelize.query(`PRAGMA table_info(${table})`, { type: QueryTypes.SELECT, transaction });
+    const names = new Set(existing.map(column => column.name));
+    for (const [name, type] of Object.entries(columns)) {
+      if (names.has(name)) continue;
+      await run(`ALTER TABLE ${table} ADD COLUMN ${name} ${type}`);
+      if (type === 'DATETIME') await run(`UPDATE ${table} SET ${name} = :now`, { now: new Date() });
+    }
+  }
+
+  await mergeDuplicateCarts(sequelize, transaction);
+
+  for (const sql of INDEXES) await run(sql);
+};
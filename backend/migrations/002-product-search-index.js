@@ -0,0 +1,34 @@
+// FTS5 index behind /api/products/search (see utils/productSearch.js),
+// written out here so it never changes with that module. ProductSearch is
+// an external-content table over Products kept in sync by triggers; the
+// weighted BM25 is stored as its rank. Failures propagate, so a SQLite
+// without FTS5 leaves the migration pending instead of recording it.
+const STATEMENTS = [
+  `CREATE VIRTUAL TABLE IF NOT EXISTS ProductSearch USING fts5(
+    name, description, category,
+    content='Products', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2',
+    prefix='2 3'
+  )`,
+  "INSERT INTO ProductSearch(ProductSearch, rank) VALUES ('rank', 'bm25(10.0, 1.0, 5.0)')",
+  `CREATE TRIGGER IF NOT EXISTS ProductSearch_ai AFTER INSERT ON Products BEGIN
+    INSERT INTO ProductSearch(rowid, name, description, category)
+    VALUES (new.id, new.name, new.description, new.category);
+  END`,
+  `CREATE TRIGGER IF NOT EXISTS ProductSearch_ad AFTER DELETE ON Products BEGIN
+    INSERT INTO ProductSearch(ProductSearch, rowid, name, description, category)
+    VALUES ('delete', old.id, old.name, old.description, old.category);
+  END`,
+  `CREATE TRIGGER IF NOT EXISTS ProductSearch_au AFTER UPDATE OF name, description, category ON Products BEGIN
+    INSERT INTO ProductSearch(ProductSearch, rowid, name, description, category)
+    VALUES ('delete', old.id, old.name, old.description, old.category);
+    INSERT INTO ProductSearch(rowid, name, description, category)
+    VALUES (new.id, new.name, new.description, new.category);
+  END`,
+  // Index the products that existed before the triggers
+  "INSERT INTO ProductSearch(ProductSearch) VALUES ('rebuild')"
+];
+
+exports.up = async ({ sequelize, transaction }) => {
+  for (const sql of STATEMENTS) await sequelize.query(sql, { transaction });
+};
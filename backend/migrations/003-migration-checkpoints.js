@@ -0,0 +1,13 @@
+// Progress of the batched data migrations (see utils/batchedMigration.js):
+// the last primary key each one has committed, so an interrupted run resumes.
+const { DataTypes } = require('sequelize');
+
+exports.up = ({ queryInterface, transaction }) => queryInterface.createTable('MigrationCheckpoints', {
+  name: { type: DataTypes.STRING, primaryKey: true },
+  lastKey: { type: DataTypes.INTEGER, allowNull: false, defaultValue: 0 },
+  rowsDone: { type: DataTypes.INTEGER, allowNull: false, defaultValue: 0 },
+  rowsWritten: { type: DataTypes.INTEGER, allowNull: false, defaultValue: 0 },
+  startedAt: { type: DataTypes.DATE, allowNull: false },
+  updatedAt: { type: DataTypes.DATE, allowNull: false },
+  completedAt: { type: DataTypes.DATE, allowNull: true }
+}, { transaction });
@@ -0,0 +1,8 @@
+// Last key a batched migration walks to, for migrations that must not visit
+// rows added after they started (see utils/batchedMigration.js)
+const { DataTypes } = require('sequelize');
+
+exports.up = ({ queryInterface, transaction }) => queryInterface.addColumn('MigrationCheckpoints', 'stopKey', {
+  type: DataTypes.INTEGER,
+  allowNull: true
+}, { transaction });
@@ -0,0 +1,13 @@
+// Fill the sales rollups (see utils/salesRollup.js) from the orders placed
+// before checkouts started maintaining them, so the dashboard is right on
+// the first boot after an upgrade. Runs the sales-rollups batched migration
+// without throttling, since nothing is being served yet.
+// Not transactional: every chunk commits with its checkpoint, so a crash
+// resumes the walk on the next boot, and a walk `npm run rollups:backfill`
+// already finished is not repeated.
+const { runBatched } = require('../utils/batchedMigration');
+const salesRollups = require('./batched/sales-rollups');
+
+exports.transaction = false;
+
+exports.up = ({ sequelize }) => runBatched(sequelize, 'sales-rollups', salesRollups, { throttle: false });
@@ -0,0 +1,29 @@
+// Copy the line items of old orders from the Order.items JSON blob into
+// OrderItems. Orders that already have OrderItems (everything placed since
+// checkout started writing them) are skipped.
+//
+// Usage: npm run migrate:order-items
+const { QueryTypes } = require('sequelize');
+
+exports.table = 'Orders';
+
+exports.apply = async ({ sequelize, transaction, fromKey, toKey }) => {
+  // Same fallbacks as the old JS copy: productId or id, name or productName
+  await sequelize.query(`
+    INSERT INTO OrderItems (orderId, productId, name, image, price, quantity, createdAt)
+    SELECT o.id,
+           COALESCE(json_extract(item.value, '$.productId'), json_extract(item.value, '$.id')),
+           COALESCE(NULLIF(json_extract(item.value, '$.name'), ''),
+                    NULLIF(json_extract(item.value, '$.productName'), ''), 'Unknown product'),
+           json_extract(item.value, '$.image'),
+           COALESCE(json_extract(item.value, '$.price'), 0),
+           COALESCE(NULLIF(json_extract(item.value, '$.quantity'), 0), 1),
+           o.createdAt
+    FROM Orders o, json_each(COALESCE(NULLIF(o.items, ''), '[]')) item
+    WHERE o.id > :fromKey AND o.id <= :toKey
+      AND NOT EXISTS (SELECT 1 FROM OrderItems i WHERE i.orderId = o.id)
+    ORDER BY o.id, item.key`,
+    { replacements: { fromKey, toKey }, transaction });
+  const [{ written }] = await sequelize.query('SELECT changes() AS written', { type: QueryTypes.SELECT, transaction });
+  return written;
+};
@@ -0,0 +1,45 @@
+// Rebuild the sales rollups (see utils/salesRollup.js) from the order
+// history, one chunk of orders at a time. start() empties the rollups and
+// notes the newest order in the same transaction: every later order is added
+// to the rollups by its own checkout, so the walk stops at that order.
+//
+// Line items come from OrderItems, or from the Order.items JSON blob for
+// orders `npm run migrate:order-items` has not reached yet.
+//
+// Usage: npm run rollups:backfill
+const { QueryTypes } = require('sequelize');
+const { addOrdersToRollups, clearRollups } = require('../../utils/salesRollup');
+const { parseLegacyItems } = require('../../utils/legacyOrderItems');
+
+exports.table = 'Orders';
+exports.columns = 'id, userId, totalAmount, createdAt';
+
+exports.start = async ({ sequelize, transaction }) => {
+  await clearRollups(transaction);
+  const [{ lastOrder }] = await sequelize.query('SELECT MAX(id) AS lastOrder FROM Orders',
+    { type: QueryTypes.SELECT, transaction });
+  return lastOrder ?? 0;
+};
+
+exports.apply = async ({ sequelize, transaction, rows, fromKey, toKey }) => {
+  const range = { replacements: { fromKey, toKey }, type: QueryTypes.SELECT, transaction };
+  const items = new Map();
+  for (const item of await sequelize.query(`
+    SELECT orderId, productId, name, price, quantity FROM OrderItems
+    WHERE orderId > :fromKey AND orderId <= :toKey`, range)) {
+    if (!items.has(item.orderId)) items.set(item.orderId, []);
+    items.get(item.orderId).push(item);
+  }
+
+  if (rows.some(order => !items.has(order.id))) {
+    for (const order of await sequelize.query(`
+      SELECT id, items FROM Orders o
+      WHERE o.id > :fromKey AND o.id <= :toKey
+        AND NOT EXISTS (SELECT 1 FROM OrderItems i WHERE i.orderId = o.id)`, range)) {
+      items.set(order.id, parseLegacyItems(order.items));
+    }
+  }
+
+  await addOrdersToRollups(rows.map(order => ({ ...order, items: items.get(order.id) || [] })), transaction);
+  return rows.length;
+};
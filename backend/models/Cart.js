@@ -33,7 +33,11 @@ const Cart = sequelize.define('Cart', {
     allowNull: false
   }
 }, {
-  timestamps: false
+  timestamps: false,
+  indexes: [
+    // One line per product per user; /api/cart/add upserts against it
+    { unique: true, fields: ['userId', 'productId'] }
+  ]
 });
 
 module.exports = Cart;
\ No newline at end of file
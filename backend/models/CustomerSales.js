@@ -0,0 +1,30 @@
+const { DataTypes } = require('sequelize');
+const { sequelize } = require('../config/database');
+
+// Lifetime spend and order count per customer.
+// Maintained by utils/salesRollup.js in the checkout transaction.
+const CustomerSales = sequelize.define('CustomerSales', {
+  userId: {
+    type: DataTypes.STRING,
+    primaryKey: true
+  },
+  totalSpent: {
+    type: DataTypes.DECIMAL(12, 2),
+    allowNull: false,
+    defaultValue: 0
+  },
+  orderCount: {
+    type: DataTypes.INTEGER,
+    allowNull: false,
+    defaultValue: 0
+  }
+}, {
+  tableName: 'CustomerSales',
+  timestamps: false,
+  indexes: [
+    // Top customers
+    { fields: ['totalSpent'] }
+  ]
+});
+
+module.exports = CustomerSales;
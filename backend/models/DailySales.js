@@ -0,0 +1,26 @@
+const { DataTypes } = require('sequelize');
+const { sequelize } = require('../config/database');
+
+// Revenue and order count per calendar day (server local time).
+// Maintained by utils/salesRollup.js in the checkout transaction.
+const DailySales = sequelize.define('DailySales', {
+  day: {
+    type: DataTypes.STRING(10),
+    primaryKey: true
+  },
+  revenue: {
+    type: DataTypes.DECIMAL(12, 2),
+    allowNull: false,
+    defaultValue: 0
+  },
+  orders: {
+    type: DataTypes.INTEGER,
+    allowNull: false,
+    defaultValue: 0
+  }
+}, {
+  tableName: 'DailySales',
+  timestamps: false
+});
+
+module.exports = DailySales;
@@ -16,9 +16,12 @@ const Order = sequelize.define('Order', {
     allowNull: false,
     unique: true
   },
+  // Legacy JSON copy of the cart. Line items now live in OrderItem; new
+  // orders store '[]' here so databases with the old NOT NULL column still work.
   items: {
     type: DataTypes.TEXT,
-    allowNull: false
+    allowNull: true,
+    defaultValue: '[]'
   },
   productId: {
     type: DataTypes.INTEGER,
@@ -52,6 +55,13 @@ const Order = sequelize.define('Order', {
     type: DataTypes.DATE,
     defaultValue: DataTypes.NOW
   }
+}, {
+  indexes: [
+    // Admin listing and export filters (see routes/admin.js), newest first
+    { fields: ['createdAt'] },
+    { fields: ['status', 'createdAt'] },
+    { fields: ['userId', 'createdAt'] }
+  ]
 });
 
 module.exports = Order;
\ No newline at end of file
@@ -0,0 +1,58 @@
+const { DataTypes } = require('sequelize');
+const { sequelize } = require('../config/database');
+const Order = require('./Order');
+
+// One row per product in an order, written at checkout. Replaces the JSON
+// copy of the cart in Order.items (migrations/batched/order-items.js copies
+// it for old orders).
+const OrderItem = sequelize.define('OrderItem', {
+  id: {
+    type: DataTypes.INTEGER,
+    primaryKey: true,
+    autoIncrement: true
+  },
+  // Orders.id, not the public Order.orderId string
+  orderId: {
+    type: DataTypes.INTEGER,
+    allowNull: false,
+    references: { model: Order, key: 'id' },
+    onDelete: 'CASCADE'
+  },
+  // Not a foreign key: order history outlives products removed from the catalog
+  productId: {
+    type: DataTypes.INTEGER,
+    allowNull: false
+  },
+  name: {
+    type: DataTypes.STRING,
+    allowNull: false
+  },
+  image: {
+    type: DataTypes.STRING,
+    allowNull: true
+  },
+  price: {
+    type: DataTypes.DECIMAL(10, 2),
+    allowNull: false
+  },
+  quantity: {
+    type: DataTypes.INTEGER,
+    allowNull: false
+  },
+  // Copy of the order's createdAt so per-product reports need no join
+  createdAt: {
+    type: DataTypes.DATE,
+    allowNull: false
+  }
+}, {
+  timestamps: false,
+  indexes: [
+    { fields: ['productId', 'createdAt'] },
+    { fields: ['orderId'] }
+  ]
+});
+
+Order.hasMany(OrderItem, { foreignKey: 'orderId', as: 'orderItems' });
+OrderItem.belongsTo(Order, { foreignKey: 'orderId' });
+
+module.exports = OrderItem;
@@ -0,0 +1,62 @@
+const { DataTypes } = require('sequelize');
+const { sequelize } = require('../config/database');
+
+// Email waiting to be sent by utils/emailDispatcher.js. Requests only insert
+// rows (in their own transaction), so a slow mail relay never delays them.
+const OutboxEmail = sequelize.define('OutboxEmail', {
+  id: {
+    type: DataTypes.INTEGER,
+    primaryKey: true,
+    autoIncrement: true
+  },
+  recipient: {
+    type: DataTypes.STRING,
+    allowNull: false
+  },
+  subject: {
+    type: DataTypes.STRING,
+    allowNull: false
+  },
+  html: {
+    type: DataTypes.TEXT,
+    allowNull: false
+  },
+  // pending -> sent, or failed once retries run out or the relay rejects it for good
+  status: {
+    type: DataTypes.STRING,
+    allowNull: false,
+    defaultValue: 'pending'
+  },
+  attempts: {
+    type: DataTypes.INTEGER,
+    allowNull: false,
+    defaultValue: 0
+  },
+  nextAttemptAt: {
+    type: DataTypes.DATE,
+    allowNull: false,
+    defaultValue: DataTypes.NOW
+  },
+  // Set while a dispatcher is sending the row; an expired lease means that
+  // process died mid-send and the row can be claimed again
+  lockedUntil: {
+    type: DataTypes.DATE,
+    allowNull: true
+  },
+  lastError: {
+    type: DataTypes.TEXT,
+    allowNull: true
+  },
+  sentAt: {
+    type: DataTypes.DATE,
+    allowNull: true
+  }
+}, {
+  timestamps: true,
+  indexes: [
+    // Dispatcher claim: due pending rows, oldest first
+    { fields: ['status', 'nextAttemptAt'] }
+  ]
+});
+
+module.exports = OutboxEmail;
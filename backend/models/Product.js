@@ -1,5 +1,6 @@
 const { DataTypes } = require('sequelize');
 const { sequelize } = require('../config/database');
+const catalogCache = require('../utils/catalogCache');
 
 const Product = sequelize.define('Product', {
   id: {
@@ -43,7 +44,19 @@ const Product = sequelize.define('Product', {
     defaultValue: 0
   }
 }, {
-  timestamps: true
+  timestamps: true,
+  indexes: [
+    // Catalog filters and keyset pagination (see routes/productRoutes.js)
+    { fields: ['category', 'price'] },
+    { fields: ['category', 'rating'] },
+    { fields: ['price'] },
+    { fields: ['rating'] },
+    { fields: ['createdAt'] }
+  ]
 });
 
+// Any write through Sequelize makes cached catalog responses stale
+['afterSave', 'afterDestroy', 'afterBulkCreate', 'afterBulkUpdate', 'afterBulkDestroy']
+  .forEach(hook => Product.addHook(hook, () => catalogCache.invalidate()));
+
 module.exports = Product;
\ No newline at end of file
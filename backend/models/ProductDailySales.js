@@ -0,0 +1,34 @@
+const { DataTypes } = require('sequelize');
+const { sequelize } = require('../config/database');
+
+// Units sold and revenue per product per day (server local time).
+// Maintained by utils/salesRollup.js in the checkout transaction.
+const ProductDailySales = sequelize.define('ProductDailySales', {
+  day: {
+    type: DataTypes.STRING(10),
+    primaryKey: true
+  },
+  productId: {
+    type: DataTypes.INTEGER,
+    primaryKey: true
+  },
+  productName: {
+    type: DataTypes.STRING,
+    allowNull: true
+  },
+  quantity: {
+    type: DataTypes.INTEGER,
+    allowNull: false,
+    defaultValue: 0
+  },
+  revenue: {
+    type: DataTypes.DECIMAL(12, 2),
+    allowNull: false,
+    defaultValue: 0
+  }
+}, {
+  tableName: 'ProductDailySales',
+  timestamps: false
+});
+
+module.exports = ProductDailySales;
@@ -0,0 +1,26 @@
+const { DataTypes } = require('sequelize');
+const { sequelize } = require('../config/database');
+
+// express-session data, shared by every server process (see utils/sessionStore.js)
+const Session = sequelize.define('Session', {
+  sid: {
+    type: DataTypes.STRING,
+    primaryKey: true
+  },
+  data: {
+    type: DataTypes.TEXT,
+    allowNull: false
+  },
+  expires: {
+    type: DataTypes.DATE,
+    allowNull: false
+  }
+}, {
+  timestamps: false,
+  indexes: [
+    // Expired-session sweep
+    { fields: ['expires'] }
+  ]
+});
+
+module.exports = Session;
@@ -1,5 +1,6 @@
 const { DataTypes } = require('sequelize');
 const { sequelize } = require('../config/database');
+const principalCache = require('../utils/principalCache');
 
 const User = sequelize.define('User', {
   id: {
@@ -44,7 +45,18 @@ const User = sequelize.define('User', {
     defaultValue: false
   }
 }, {
-  timestamps: true
+  timestamps: true,
+  indexes: [
+    // Admin user listing, newest first
+    { fields: ['isAdmin', 'createdAt'] }
+  ]
 });
 
+// Profile changes, revoked admin rights and deleted accounts must not be
+// served from the admin principal cache
+['afterSave', 'afterDestroy']
+  .forEach(hook => User.addHook(hook, (user) => principalCache.invalidate(user.id)));
+['afterBulkUpdate', 'afterBulkDestroy']
+  .forEach(hook => User.addHook(hook, () => principalCache.invalidate()));
+
 module.exports = User;
\ No newline at end of file
@@ -1,11 +1,23 @@
 const express = require('express');
 const router = express.Router();
 const jwt = require('jsonwebtoken');
-const bcrypt = require('bcryptjs');
-const { Op } = require('sequelize');
+const { Op, QueryTypes } = require('sequelize');
+const { sequelize } = require('../config/database');
 const User = require('../models/User');
 const Product = require('../models/Product');
 const Order = require('../models/Order');
+const OrderItem = require('../models/OrderItem');
+const DailySales = require('../models/DailySales');
+const CustomerSales = require('../models/CustomerSales');
+const { localDay, clearRollups } = require('../utils/salesRollup');
+const { parseLegacyItems, lineItems } = require('../utils/legacyOrderItems');
+const principalCache = require('../utils/principalCache');
+const tokenVerifier = require('../utils/tokenVerifier');
+const passwordHasher = require('../utils/passwordHasher');
+const { limitConcurrentLogins } = require('../middleware/loginLimiter');
+const logger = require('../utils/logger');
+const catalogCache = require('../utils/catalogCache');
+const { badRequest, parseLimit, parseDate, encodeCursor, afterCursor } = require('../utils/pagination');
 
 // Admin authentication middleware
 const adminAuth = async (req, res, next) => {
@@ -15,8 +27,19 @@ const adminAuth = async (req, res, next) => {
       return res.status(401).json({ message: 'Access denied. No token provided.' });
     }
 
-    const decoded = jwt.verify(token, process.env.JWT_SECRET);
-    const user = await User.findByPk(decoded.userId);
+    const decoded = tokenVerifier.verifyToken(token);
+
+    let user = principalCache.get(decoded.userId, token);
+    if (!user) {
+      const found = await User.findByPk(decoded.userId, {
+        attributes: ['id', 'username', 'email', 'isAdmin']
+      });
+      // Only admins are cached: a non-admin is refused anyway and may be promoted later
+      if (found && found.isAdmin) {
+        user = found.get({ plain: true });
+        principalCache.set(decoded.userId, token, user, decoded.exp);
+      }
+    }
     
     if (!user || !user.isAdmin) {
       return res.status(403).json({ message: 'Access denied. Admin privileges required.' });
@@ -30,7 +53,7 @@ const adminAuth = async (req, res, next) => {
 };
 
 // Admin login
-router.post('/login', async (req, res) => {
+router.post('/login', limitConcurrentLogins, async (req, res) => {
   try {
     const { email, password } = req.body;
     
@@ -39,10 +62,11 @@ router.post('/login', async (req, res) => {
       return res.status(400).json({ message: 'Invalid admin credentials' });
     }
     
-    const isValidPassword = await bcrypt.compare(password, user.password);
+    const isValidPassword = await passwordHasher.compare(password, user.password);
     if (!isValidPassword) {
       return res.status(400).json({ message: 'Invalid admin credentials' });
     }
+    passwordHasher.rehashIfNeeded(user, password);
     
     const token = jwt.sign(
       { userId: user.id, email: user.email, isAdmin: true },
@@ -60,69 +84,43 @@ router.post('/login', async (req, res) => {
       }
     });
   } catch (error) {
+    if (error.status) {
+      return res.status(error.status).json({ message: error.message });
+    }
     res.status(500).json({ message: 'Server error during admin login' });
   }
 });
 
-// Get sales analytics
+// Rolling report windows in days; any other period covers all history
+const SALES_PERIOD_DAYS = { week: 7, month: 30, year: 365 };
+
+// Get sales analytics (from the ProductDailySales/DailySales rollups)
 router.get('/sales', adminAuth, async (req, res) => {
   try {
     const { period = 'week' } = req.query;
     
-    let dateFilter = {};
-    const now = new Date();
-    
-    switch (period) {
-      case 'week':
-        const weekAgo = new Date(now.getTime() - 7 * 24 * 60 * 60 * 1000);
-        dateFilter = { createdAt: { [Op.gte]: weekAgo } };
-        break;
-      case 'month':
-        const monthAgo = new Date(now.getTime() - 30 * 24 * 60 * 60 * 1000);
-        dateFilter = { createdAt: { [Op.gte]: monthAgo } };
-        break;
-      case 'year':
-        const yearAgo = new Date(now.getTime() - 365 * 24 * 60 * 60 * 1000);
-        dateFilter = { createdAt: { [Op.gte]: yearAgo } };
-        break;
-    }
+    const days = SALES_PERIOD_DAYS[period];
+    const since = days ? localDay(new Date(Date.now() - days * 24 * 60 * 60 * 1000)) : '';
 
-    const orders = await Order.findAll({ where: dateFilter });
-    
-    // Calculate sales by product
-    const productSales = {};
-    let totalRevenue = 0;
-    
-    orders.forEach(order => {
-      const items = JSON.parse(order.items);
-      items.forEach(item => {
-        const productId = item.id || item.productId;
-        const productName = item.name || item.productName;
-        const quantity = item.quantity || 1;
-        const price = parseFloat(item.price || order.totalAmount);
-        
-        if (!productSales[productId]) {
-          productSales[productId] = {
-            productId,
-            productName,
-            totalQuantity: 0,
-            totalRevenue: 0
-          };
-        }
-        
-        productSales[productId].totalQuantity += quantity;
-        productSales[productId].totalRevenue += price * quantity;
-        totalRevenue += price * quantity;
-      });
-    });
-    
-    const salesData = Object.values(productSales).sort((a, b) => b.totalRevenue - a.totalRevenue);
+    const [productSales, [orderTotals]] = await Promise.all([
+      sequelize.query(`
+        SELECT productId, MAX(productName) AS productName,
+               SUM(quantity) AS totalQuantity, SUM(revenue) AS totalRevenue
+        FROM ProductDailySales
+        WHERE day >= :since
+        GROUP BY productId
+        ORDER BY totalRevenue DESC`,
+        { replacements: { since }, type: QueryTypes.SELECT }),
+      sequelize.query(
+        'SELECT COALESCE(SUM(orders), 0) AS totalOrders FROM DailySales WHERE day >= :since',
+        { replacements: { since }, type: QueryTypes.SELECT })
+    ]);
     
     res.json({
       period,
-      totalOrders: orders.length,
-      totalRevenue,
-      productSales: salesData
+      totalOrders: orderTotals.totalOrders,
+      totalRevenue: productSales.reduce((sum, product) => sum + product.totalRevenue, 0),
+      productSales
     });
   } catch (error) {
     res.status(500).json({ error: error.message });
@@ -152,18 +150,78 @@ router.put('/products/:id', adminAuth, async (req, res) => {
   }
 });
 
+// Listings are newest first and keyset paginated on (createdAt, id); the
+// cursor for the next page is returned in the X-Next-Cursor header.
+const DEFAULT_PAGE_SIZE = 50;
+const MAX_PAGE_SIZE = 200;
+const NEWEST_FIRST = [['createdAt', 'DESC'], ['id', 'DESC']];
+
+const ORDER_STATUSES = ['pending', 'completed', 'shipped', 'cancelled'];
+
+// Created-at range shared by the order and user listings
+const dateRangeFilters = (query) => {
+  const conditions = [];
+  const from = parseDate(query.from, 'from');
+  const to = parseDate(query.to, 'to');
+  if (from) conditions.push({ createdAt: { [Op.gte]: from } });
+  if (to) conditions.push({ createdAt: { [Op.lte]: to } });
+  return conditions;
+};
+
+// status (comma separated), userId, from and to; used by the listing and the export
+const orderFilters = (query) => {
+  const conditions = dateRangeFilters(query);
+  if (query.status) {
+    const statuses = String(query.status).split(',').map(s => s.trim()).filter(Boolean);
+    const unknown = statuses.filter(s => !ORDER_STATUSES.includes(s));
+    if (unknown.length > 0) {
+      throw badRequest(`status must be one of: ${ORDER_STATUSES.join(', ')}`);
+    }
+    conditions.push({ status: { [Op.in]: statuses } });
+  }
+  if (query.userId) {
+    conditions.push({ userId: String(query.userId) });
+  }
+  return conditions;
+};
+
+const findPage = async (model, conditions, query, options = {}) => {
+  const limit = parseLimit(query.limit, MAX_PAGE_SIZE) ?? DEFAULT_PAGE_SIZE;
+  if (query.cursor) {
+    conditions = [...conditions, afterCursor(query.cursor, 'createdAt', 'DESC')];
+  }
+  const rows = await model.findAll({
+    ...options,
+    where: conditions.length > 0 ? { [Op.and]: conditions } : undefined,
+    order: NEWEST_FIRST,
+    // One extra row tells whether another page exists
+    limit: limit + 1
+  });
+
+  let nextCursor;
+  if (rows.length > limit) {
+    rows.length = limit;
+    const last = rows[limit - 1];
+    nextCursor = encodeCursor(last.createdAt, last.id);
+  }
+  return { rows, nextCursor };
+};
+
 // Order Management
+// @route   GET /api/admin/orders
+// @desc    Query parameters: status (comma separated), userId, from, to
+//          (created-at range), limit (default 50, max 200) and cursor
 router.get('/orders', adminAuth, async (req, res) => {
   try {
-    const orders = await Order.findAll({
-      order: [['createdAt', 'DESC']]
+    const { rows: orders, nextCursor } = await findPage(Order, orderFilters(req.query), req.query, {
+      include: [{ model: OrderItem, as: 'orderItems', separate: true, order: [['id', 'ASC']] }]
     });
     
     const formattedOrders = orders.map(order => ({
       id: order.id,
       orderId: order.orderId,
       userId: order.userId,
-      items: JSON.parse(order.items),
+      items: lineItems(order),
       productName: order.productName,
       quantity: order.quantity,
       price: order.price,
@@ -173,12 +231,127 @@ router.get('/orders', adminAuth, async (req, res) => {
       createdAt: order.createdAt
     }));
     
+    if (nextCursor) res.set('X-Next-Cursor', nextCursor);
     res.json(formattedOrders);
   } catch (error) {
+    if (error.status) {
+      return res.status(error.status).json({ message: error.message });
+    }
     res.status(500).json({ error: error.message });
   }
 });
 
+const EXPORT_FORMATS = {
+  ndjson: 'application/x-ndjson; charset=utf-8',
+  csv: 'text/csv; charset=utf-8'
+};
+const EXPORT_COLUMNS = ['id', 'orderId', 'userId', 'status', 'quantity', 'totalAmount', 'deliveryDate', 'createdAt'];
+const EXPORT_BATCH_SIZE = 1000;
+
+const csvField = (value) => {
+  if (value === null || value === undefined) return '';
+  const text = String(value);
+  return /[",\r\n]/.test(text) ? `"${text.replace(/"/g, '""')}"` : text;
+};
+
+// Resolves when the socket buffer has drained, or the client went away
+const writable = (res) => new Promise(resolve => {
+  const done = () => {
+    res.off('drain', done);
+    res.off('close', done);
+    resolve();
+  };
+  res.on('drain', done);
+  res.on('close', done);
+});
+
+// @route   GET /api/admin/orders/export
+// @desc    Stream every matching order as NDJSON (with its items) or CSV.
+//          Same filters as GET /api/admin/orders plus format=ndjson|csv.
+//          Orders are read in id order, EXPORT_BATCH_SIZE rows at a time, and
+//          the next batch is only read once the previous one has been flushed,
+//          so memory stays bounded however many orders match.
+router.get('/orders/export', adminAuth, async (req, res) => {
+  const format = req.query.format || 'ndjson';
+  let conditions;
+  try {
+    if (!EXPORT_FORMATS[format]) {
+      throw badRequest(`format must be one of: ${Object.keys(EXPORT_FORMATS).join(', ')}`);
+    }
+    conditions = orderFilters(req.query);
+  } catch (error) {
+    return res.status(error.status).json({ message: error.message });
+  }
+
+  res.set({
+    'Content-Type': EXPORT_FORMATS[format],
+    'Content-Disposition': `attachment; filename="orders.${format}"`,
+    'Cache-Control': 'no-store'
+  });
+  if (format === 'csv') {
+    res.write(EXPORT_COLUMNS.join(',') + '\n');
+  }
+
+  try {
+    let lastId = 0;
+    while (!res.destroyed) {
+      const orders = await Order.findAll({
+        where: { [Op.and]: [...conditions, { id: { [Op.gt]: lastId } }] },
+        attributes: EXPORT_COLUMNS,
+        order: [['id', 'ASC']],
+        limit: EXPORT_BATCH_SIZE,
+        raw: true
+      });
+      if (orders.length === 0) break;
+      lastId = orders[orders.length - 1].id;
+
+      let chunk;
+      if (format === 'csv') {
+        chunk = orders.map(order => EXPORT_COLUMNS.map(column =>
+          csvField(column === 'createdAt' ? new Date(order.createdAt).toISOString() : order[column])).join(',')
+        ).join('\n') + '\n';
+      } else {
+        const items = await OrderItem.findAll({
+          where: { orderId: { [Op.in]: orders.map(order => order.id) } },
+          attributes: ['orderId', 'productId', 'name', 'price', 'quantity'],
+          order: [['id', 'ASC']],
+          raw: true
+        });
+        const itemsByOrder = new Map();
+        for (const { orderId, ...item } of items) {
+          if (!itemsByOrder.has(orderId)) itemsByOrder.set(orderId, []);
+          itemsByOrder.get(orderId).push(item);
+        }
+        // Orders the order-items migration has not reached yet: read the blob
+        const legacy = orders.filter(order => !itemsByOrder.has(order.id)).map(order => order.id);
+        if (legacy.length > 0) {
+          const blobs = await Order.findAll({
+            where: { id: { [Op.in]: legacy } }, attributes: ['id', 'items'], raw: true
+          });
+          for (const { id, items: blob } of blobs) {
+            itemsByOrder.set(id, parseLegacyItems(blob)
+              .map(({ productId, name, price, quantity }) => ({ productId, name, price, quantity })));
+          }
+        }
+        chunk = orders.map(order => JSON.stringify({
+          ...order,
+          createdAt: new Date(order.createdAt).toISOString(),
+          items: itemsByOrder.get(order.id) || []
+        })).join('\n') + '\n';
+      }
+
+      if (!res.write(chunk)) {
+        await writable(res);
+      }
+    }
+    res.end();
+  } catch (error) {
+    // Headers are gone; abort so the client sees a truncated download, not a complete one
+    logger.error('Order export failed', { err: error });
+    res.destroy(error);
+  }
+});
+
 router.put('/orders/:id/status', adminAuth, async (req, res) => {
   try {
     const { status } = req.body;
@@ -192,101 +365,127 @@ router.put('/orders/:id/status', adminAuth, async (req, res) => {
   }
 });
 
-// Advanced Analytics
+// Advanced Analytics (from the DailySales/CustomerSales rollups)
 router.get('/analytics', adminAuth, async (req, res) => {
   try {
-    const orders = await Order.findAll();
-    const users = await User.findAll({ where: { isAdmin: false } });
-    
     // Daily revenue for last 7 days
     const last7Days = [];
     for (let i = 6; i >= 0; i--) {
       const date = new Date();
       date.setDate(date.getDate() - i);
-      const dayStart = new Date(date.setHours(0, 0, 0, 0));
-      const dayEnd = new Date(date.setHours(23, 59, 59, 999));
-      
-      const dayOrders = orders.filter(order => {
-        const orderDate = new Date(order.createdAt);
-        return orderDate >= dayStart && orderDate <= dayEnd;
-      });
-      
-      const dayRevenue = dayOrders.reduce((sum, order) => sum + parseFloat(order.totalAmount), 0);
-      
-      last7Days.push({
-        date: dayStart.toLocaleDateString('en-IN', { day: '2-digit', month: 'short' }),
-        revenue: dayRevenue,
-        orders: dayOrders.length
-      });
+      date.setHours(0, 0, 0, 0);
+      last7Days.push(date);
     }
-    
-    // Top customers
-    const customerSpending = {};
-    orders.forEach(order => {
-      if (!customerSpending[order.userId]) {
-        customerSpending[order.userId] = {
-          userId: order.userId,
-          totalSpent: 0,
-          orderCount: 0
-        };
-      }
-      customerSpending[order.userId].totalSpent += parseFloat(order.totalAmount);
-      customerSpending[order.userId].orderCount += 1;
+
+    const [dailySales, topCustomerSales, [totals]] = await Promise.all([
+      DailySales.findAll({ where: { day: { [Op.in]: last7Days.map(localDay) } }, raw: true }),
+      CustomerSales.findAll({ order: [['totalSpent', 'DESC']], limit: 5, raw: true }),
+      sequelize.query(
+        'SELECT COALESCE(SUM(revenue), 0) AS revenue, COALESCE(SUM(orders), 0) AS orders FROM DailySales',
+        { type: QueryTypes.SELECT })
+    ]);
+
+    const salesByDay = new Map(dailySales.map(day => [day.day, day]));
+    const dailyRevenue = last7Days.map(date => {
+      const day = salesByDay.get(localDay(date));
+      return {
+        date: date.toLocaleDateString('en-IN', { day: '2-digit', month: 'short' }),
+        revenue: day ? parseFloat(day.revenue) : 0,
+        orders: day ? day.orders : 0
+      };
     });
-    
-    const topCustomers = Object.values(customerSpending)
-      .sort((a, b) => b.totalSpent - a.totalSpent)
-      .slice(0, 5);
-    
+
     // Add user details to top customers
-    for (let customer of topCustomers) {
-      const user = users.find(u => u.id.toString() === customer.userId);
-      customer.username = user ? user.username : 'Unknown User';
-      customer.email = user ? user.email : 'N/A';
-    }
+    const users = await User.findAll({
+      where: { id: { [Op.in]: topCustomerSales.map(c => c.userId) }, isAdmin: false },
+      attributes: ['id', 'username', 'email']
+    });
+    const usersById = new Map(users.map(user => [user.id.toString(), user]));
+    const topCustomers = topCustomerSales.map(customer => {
+      const user = usersById.get(customer.userId);
+      return {
+        userId: customer.userId,
+        totalSpent: parseFloat(customer.totalSpent),
+        orderCount: customer.orderCount,
+        username: user ? user.username : 'Unknown User',
+        email: user ? user.email : 'N/A'
+      };
+    });
     
     res.json({
-      dailyRevenue: last7Days,
+      dailyRevenue,
       topCustomers,
-      totalRevenue: orders.reduce((sum, order) => sum + parseFloat(order.totalAmount), 0),
-      totalOrders: orders.length,
-      averageOrderValue: orders.length > 0 ? orders.reduce((sum, order) => sum + parseFloat(order.totalAmount), 0) / orders.length : 0
+      totalRevenue: totals.revenue,
+      totalOrders: totals.orders,
+      averageOrderValue: totals.orders > 0 ? totals.revenue / totals.orders : 0
     });
   } catch (error) {
     res.status(500).json({ error: error.message });
   }
 });
 
+// Hit/miss counters of the in-memory caches
+router.get('/cache-stats', adminAuth, (req, res) => {
+  res.json({
+    principals: principalCache.getStats(),
+    tokens: tokenVerifier.getStats(),
+    passwords: passwordHasher.getStats(),
+    catalog: catalogCache.getStats()
+  });
+});
+
 // Clear all data
 router.delete('/clear-data', adminAuth, async (req, res) => {
   try {
-    await Order.destroy({ where: {} });
+    await sequelize.transaction(async (transaction) => {
+      await Order.destroy({ where: {}, transaction });
+      await clearRollups(transaction);
+    });
     res.json({ message: 'All sales data cleared successfully' });
   } catch (error) {
     res.status(500).json({ error: error.message });
   }
 });
 
-// Get dashboard data
-router.get('/dashboard', adminAuth, async (req, res) => {
+// @route   GET /api/admin/users
+// @desc    Customers, newest first. Query parameters: from, to (created-at
+//          range), includeAdmins=true, limit (default 50, max 200) and cursor
+router.get('/users', adminAuth, async (req, res) => {
   try {
-    const users = await User.findAll({
+    const conditions = dateRangeFilters(req.query);
+    if (req.query.includeAdmins !== 'true') {
+      conditions.push({ isAdmin: false });
+    }
+    const { rows: users, nextCursor } = await findPage(User, conditions, req.query, {
       attributes: ['id', 'username', 'email', 'address', 'createdAt', 'isAdmin']
     });
-    
-    const products = await Product.findAll();
-    const orders = await Order.findAll();
-    
-    const totalRevenue = orders.reduce((sum, order) => sum + parseFloat(order.totalAmount), 0);
+
+    if (nextCursor) res.set('X-Next-Cursor', nextCursor);
+    res.json(users);
+  } catch (error) {
+    if (error.status) {
+      return res.status(error.status).json({ message: error.message });
+    }
+    res.status(500).json({ error: error.message });
+  }
+});
+
+// Get dashboard data: totals only; use the paginated listings for the rows
+router.get('/dashboard', adminAuth, async (req, res) => {
+  try {
+    const [totalUsers, totalProducts, [orderTotals]] = await Promise.all([
+      User.count({ where: { isAdmin: false } }),
+      Product.count(),
+      sequelize.query(
+        'SELECT COALESCE(SUM(orders), 0) AS totalOrders, COALESCE(SUM(revenue), 0) AS totalRevenue FROM DailySales',
+        { type: QueryTypes.SELECT })
+    ]);
     
     res.json({
-      users: users.filter(u => !u.isAdmin),
-      products,
-      orders,
-      totalUsers: users.filter(u => !u.isAdmin).length,
-      totalProducts: products.length,
-      totalOrders: orders.length,
-      totalRevenue
+      totalUsers,
+      totalProducts,
+      totalOrders: orderTotals.totalOrders,
+      totalRevenue: orderTotals.totalRevenue
     });
   } catch (error) {
     res.status(500).json({ error: error.message });
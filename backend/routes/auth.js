@@ -1,15 +1,17 @@
 const express = require('express');
 const router = express.Router();
-const bcrypt = require('bcryptjs');
 const jwt = require('jsonwebtoken');
-const crypto = require('crypto');
-const nodemailer = require('nodemailer');
-const passport = require('passport');
+const { Transaction } = require('sequelize');
+const { sequelize } = require('../config/database');
 const User = require('../models/User');
 const { validateEmail } = require('../utils/emailValidator');
+const { generateVerificationToken, sendVerificationEmail } = require('../utils/emailService');
+const passwordHasher = require('../utils/passwordHasher');
+const { limitConcurrentLogins } = require('../middleware/loginLimiter');
+const logger = require('../utils/logger');
 
 // Register route
-router.post('/register', async (req, res) => {
+router.post('/register', limitConcurrentLogins, async (req, res) => {
   try {
     const { username, email, password, address } = req.body;
     
@@ -18,6 +20,10 @@ router.post('/register', async (req, res) => {
     if (!emailValidation.valid) {
       return res.status(400).json({ message: emailValidation.message });
     }
+
+    if (typeof password !== 'string' || password === '') {
+      return res.status(400).json({ message: 'Password is required' });
+    }
     
     // Check if user exists
     const existingUser = await User.findOne({ where: { email } });
@@ -26,36 +32,40 @@ router.post('/register', async (req, res) => {
     }
     
     // Hash password
-    const hashedPassword = await bcrypt.hash(password, 12);
+    const hashedPassword = await passwordHasher.hash(password);
     
     // Generate verification token
-    const verificationToken = crypto.randomBytes(32).toString('hex');
-    
-    // Create user (unverified)
-    const user = await User.create({
-      username,
-      email,
-      password: hashedPassword,
-      address,
-      isEmailVerified: false,
-      emailVerificationToken: verificationToken
+    const verificationToken = generateVerificationToken();
+    
+    // Create user (unverified) and queue the verification email together;
+    // the outbox dispatcher sends it after the response
+    await sequelize.transaction({ type: Transaction.TYPES.IMMEDIATE }, async (transaction) => {
+      await User.create({
+        username,
+        email,
+        password: hashedPassword,
+        address,
+        isEmailVerified: false,
+        emailVerificationToken: verificationToken
+      }, { transaction });
+      await sendVerificationEmail(email, verificationToken, username, { transaction });
     });
     
-    // Send verification email
-    await sendVerificationEmail(email, verificationToken, username);
-    
     res.status(201).json({
       message: 'Registration successful! Please check your email to verify your account.',
       requiresVerification: true
     });
   } catch (error) {
-    console.error('Registration error:', error);
+    if (error.status) {
+      return res.status(error.status).json({ message: error.message });
+    }
+    logger.error('Registration failed', { err: error });
     res.status(500).json({ message: 'Server error during registration' });
   }
 });
 
 // Login route
-router.post('/login', async (req, res) => {
+router.post('/login', limitConcurrentLogins, async (req, res) => {
   try {
     const { email, password } = req.body;
     
@@ -80,10 +90,11 @@ router.post('/login', async (req, res) => {
     }
     
     // Check password
-    const isValidPassword = await bcrypt.compare(password, user.password);
+    const isValidPassword = await passwordHasher.compare(password, user.password);
     if (!isValidPassword) {
       return res.status(400).json({ message: 'Invalid email or password' });
     }
+    passwordHasher.rehashIfNeeded(user, password);
     
     // Generate JWT token
     const token = jwt.sign(
@@ -102,7 +113,10 @@ router.post('/login', async (req, res) => {
       }
     });
   } catch (error) {
-    console.error('Login error:', error);
+    if (error.status) {
+      return res.status(error.status).json({ message: error.message });
+    }
+    logger.error('Login failed', { err: error });
     res.status(500).json({ message: 'Server error during login' });
   }
 });
@@ -129,109 +143,103 @@ router.get('/verify/:token', async (req, res) => {
   }
 });
 
-// Send verification email function
-const sendVerificationEmail = async (email, token, username) => {
-  const transporter = nodemailer.createTransporter({
-    service: 'gmail',
-    auth: {
-      user: process.env.EMAIL_USER,
-      pass: process.env.EMAIL_PASS
-    }
-  });
-  
-  const verificationUrl = `http://localhost:5000/api/auth/verify/${token}`;
-  
-  await transporter.sendMail({
-    from: process.env.EMAIL_USER,
-    to: email,
-    subject: 'Verify Your LOCAL E COMMERCE Account',
-    html: `
-      <h2>Welcome to LOCAL E COMMERCE, ${username}!</h2>
-      <p>Please click the link below to verify your email address:</p>
-      <a href="${verificationUrl}" style="background: #FFD814; color: #000; padding: 10px 20px; text-decoration: none; border-radius: 5px;">Verify Email</a>
-      <p>Or copy this link: ${verificationUrl}</p>
-      <p>This link will expire in 24 hours.</p>
-    `
-  });
-};
-
 // Test route
 router.get('/test', (req, res) => {
   res.json({ message: 'OAuth routes working' });
 });
 
-// Google OAuth routes
-router.get('/google', (req, res, next) => {
-  console.log('Google OAuth route hit');
-  passport.authenticate('google', {
-    scope: ['profile', 'email']
-  })(req, res, next);
-});
-
-router.get('/google/callback', 
-  passport.authenticate('google', { failureRedirect: 'http://localhost:5173/login?error=oauth_failed' }),
-  async (req, res) => {
-    try {
-      console.log('OAuth callback hit, user:', req.user);
-      const profile = req.user;
-      
-      if (!profile || !profile.emails || !profile.emails[0]) {
-        console.error('Invalid profile data:', profile);
-        return res.redirect('http://localhost:5173/login?error=invalid_profile');
-      }
-      
-      const email = profile.emails[0].value;
-      const googleId = profile.id;
-      const name = profile.displayName;
-      
-      // Check if user exists by email or googleId
-      let user = await User.findOne({ 
-        where: {
-          [require('sequelize').Op.or]: [
-            { email: email },
-            { googleId: googleId }
-          ]
-        }
-      });
-      
-      if (!user) {
-        // Create new user
-        user = await User.create({
-          username: name,
-          email: email,
-          googleId: googleId,
-          address: '',
-          isEmailVerified: true
-        });
-        console.log('Created new user:', user.id);
-      } else if (!user.googleId) {
-        // Update existing user with googleId
-        await user.update({ googleId: googleId });
-        console.log('Updated existing user with googleId:', user.id);
+// Google sign-in: log in the user the profile belongs to, creating or
+// linking the account as needed
+const googleCallback = async (req, res) => {
+  try {
+    const profile = req.user;
+    
+    if (!profile || !profile.emails || !profile.emails[0]) {
+      logger.warn('OAuth profile without email', { googleId: profile?.id });
+      return res.redirect('http://localhost:5173/login?error=invalid_profile');
+    }
+    
+    const email = profile.emails[0].value;
+    const googleId = profile.id;
+    const name = profile.displayName;
+    
+    // Check if user exists by email or googleId
+    let user = await User.findOne({ 
+      where: {
+        [require('sequelize').Op.or]: [
+          { email: email },
+          { googleId: googleId }
+        ]
       }
-      
-      // Generate JWT
-      const token = jwt.sign(
-        { userId: user.id, email: user.email },
-        process.env.JWT_SECRET,
-        { expiresIn: '7d' }
-      );
-      
-      res.cookie('accessToken', token, {
-        httpOnly: true,
-        secure: process.env.NODE_ENV === 'production',
-        maxAge: 7 * 24 * 60 * 60 * 1000, // 7 days
-        sameSite: 'lax'
+    });
+    
+    if (!user) {
+      // Create new user
+      user = await User.create({
+        username: name,
+        email: email,
+        googleId: googleId,
+        address: '',
+        isEmailVerified: true
       });
-      
-      console.log('OAuth success, redirecting to home');
-      res.redirect('http://localhost:5173/');
-    } catch (error) {
-      console.error('OAuth callback error:', error);
-      res.redirect('http://localhost:5173/login?error=oauth_error');
+      logger.info('Created user from Google sign-in', { userId: user.id });
+    } else if (!user.googleId) {
+      // Update existing user with googleId
+      await user.update({ googleId: googleId });
+      logger.info('Linked Google account', { userId: user.id });
     }
+    
+    // Generate JWT
+    const token = jwt.sign(
+      { userId: user.id, email: user.email },
+      process.env.JWT_SECRET,
+      { expiresIn: '7d' }
+    );
+    
+    res.cookie('accessToken', token, {
+      httpOnly: true,
+      secure: process.env.NODE_ENV === 'production',
+      maxAge: 7 * 24 * 60 * 60 * 1000, // 7 days
+      sameSite: 'lax'
+    });
+    
+    res.redirect('http://localhost:5173/');
+  } catch (error) {
+    logger.error('OAuth callback failed', { err: error });
+    res.redirect('http://localhost:5173/login?error=oauth_error');
   }
-);
+};
+
+// Google OAuth routes. Passport, the Google strategy and the session store
+// they need are loaded on the first request to /google, so the server does
+// not pay for them at startup; JWT routes never use a session.
+let oauthRouter = null;
+
+const loadOAuth = () => {
+  if (!oauthRouter) {
+    const session = require('express-session');
+    const passport = require('../config/passport');
+    const SqliteSessionStore = require('../utils/sessionStore');
+
+    oauthRouter = express.Router();
+    oauthRouter.use(session({
+      store: new SqliteSessionStore(),
+      secret: process.env.SESSION_SECRET,
+      resave: false,
+      saveUninitialized: false
+    }));
+    oauthRouter.use(passport.initialize());
+    oauthRouter.use(passport.session());
+    oauthRouter.get('/', passport.authenticate('google', { scope: ['profile', 'email'] }));
+    oauthRouter.get('/callback',
+      passport.authenticate('google', { failureRedirect: 'http://localhost:5173/login?error=oauth_failed' }),
+      googleCallback
+    );
+  }
+  return oauthRouter;
+};
+
+router.use('/google', (req, res, next) => loadOAuth()(req, res, next));
 
 // Complete registration route
 router.post('/complete-registration', async (req, res) => {
@@ -275,7 +283,7 @@ router.post('/complete-registration', async (req, res) => {
       }
     });
   } catch (error) {
-    console.error('Complete registration error:', error);
+    logger.error('Complete registration failed', { err: error });
     res.status(500).json({ message: 'Registration completion failed' });
   }
 });
@@ -323,7 +331,7 @@ router.put('/update-profile', async (req, res) => {
     
     res.json({ message: 'Profile updated successfully' });
   } catch (error) {
-    console.error('Update profile error:', error);
+    logger.error('Profile update failed', { err: error });
     res.status(500).json({ message: 'Failed to update profile' });
   }
 });
@@ -349,7 +357,7 @@ router.delete('/delete', async (req, res) => {
     res.clearCookie('accessTokenRegistration');
     res.json({ message: 'Account deleted successfully' });
   } catch (error) {
-    console.error('Delete account error:', error);
+    logger.error('Account deletion failed', { err: error });
     res.status(500).json({ message: 'Failed to delete account' });
   }
 });
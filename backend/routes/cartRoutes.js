@@ -1,87 +1,135 @@
 const express = require('express');
 const router = express.Router();
-const jwt = require('jsonwebtoken');
+const { Op, QueryTypes, Transaction } = require('sequelize');
+const { sequelize } = require('../config/database');
+const catalogCache = require('../utils/catalogCache');
+const { addOrdersToRollups } = require('../utils/salesRollup');
+const { lineItems } = require('../utils/legacyOrderItems');
 const Cart = require('../models/Cart');
 const Product = require('../models/Product');
 const Order = require('../models/Order');
+const OrderItem = require('../models/OrderItem');
+const { requireUser } = require('../middleware/auth');
+const { requireAllowedOrigin } = require('../config/cors');
+const { recordCheckout } = require('../utils/metrics');
+const logger = require('../utils/logger');
 
-const identifyUser = (req, res, next) => {
-  const userId = req.headers['x-user-id'];
-  if (!userId) {
-    return res.status(401).json({ message: 'Please log in to access cart.' });
-  }
-  req.userId = userId;
-  next();
-};
+// Cart and order routes only answer pages served from the frontend
+router.use(requireAllowedOrigin);
 
-router.get('/', identifyUser, async (req, res) => {
-  const origin = req.get('Origin') || req.get('Referer');
-  if (origin && !origin.includes('localhost:5173')) {
-    return res.status(403).json({ message: 'Forbidden - Invalid origin' });
-  }
-  
+router.get('/', requireUser, async (req, res) => {
   try {
     const cartItems = await Cart.findAll({ where: { userId: req.userId } });
     res.json({ userId: req.userId, items: cartItems });
   } catch (error) {
-    console.error(error);
+    logger.error('Cart fetch failed', { err: error });
     res.status(500).json({ message: 'Server error fetching cart' });
   }
 });
 
-router.post('/add', identifyUser, async (req, res) => {
-  const { productId, quantity = 1 } = req.body;
+// Cart writes answer with the whole cart by default. With ?response=delta
+// they return only the changed line(s) and the cart totals instead.
+const wantsDelta = (req) => req.query.response === 'delta';
+
+// Add to a line, creating it from the product row if the user has none yet.
+// Out-of-stock or unknown products insert nothing.
+const UPSERT_LINE_SQL = `
+  INSERT INTO Carts (userId, productId, name, image, price, quantity)
+  SELECT :userId, id, name, image, price, :quantity FROM Products
+  WHERE id = :productId AND countInStock > 0
+  ON CONFLICT (userId, productId) DO UPDATE SET quantity = quantity + excluded.quantity`;
 
+const CART_TOTALS_SQL = `
+  SELECT COUNT(*) AS lines, COALESCE(SUM(quantity), 0) AS quantity,
+         COALESCE(SUM(price * quantity), 0) AS subtotal
+  FROM Carts WHERE userId = :userId`;
+
+const cartError = (status, message) => Object.assign(new Error(message), { status });
+
+const parseProductId = (productId) => {
   if (!productId || (typeof productId !== 'string' && typeof productId !== 'number') || 
       (typeof productId === 'string' && productId.trim() === '')) {
-    return res.status(400).json({ message: 'Valid product ID is required' });
+    throw cartError(400, 'Valid product ID is required');
   }
-  
   // Convert to string for consistency
-  const productIdStr = String(productId).trim();
-  
-  if (!Number.isInteger(quantity) || quantity <= 0) {
-    return res.status(400).json({ message: 'Quantity must be a positive integer' });
+  return String(productId).trim();
+};
+
+const addLine = async (userId, productId, quantity, transaction) => {
+  const changed = await sequelize.query(UPSERT_LINE_SQL, {
+    replacements: { userId, productId, quantity },
+    type: QueryTypes.BULKUPDATE,
+    transaction
+  });
+  if (changed === 0) {
+    // Only the failure path needs to know why nothing was inserted
+    const product = await Product.findByPk(productId, { attributes: ['id'], transaction });
+    throw product
+      ? cartError(400, 'Product is out of stock')
+      : cartError(404, 'Product not found');
   }
+};
 
-  try {
-    const product = await Product.findByPk(productIdStr);
+// Set a line's quantity; 0 removes it
+const setLine = async (userId, productId, quantity, transaction) => {
+  const where = { userId, productId };
+  const changed = quantity <= 0
+    ? await Cart.destroy({ where, transaction })
+    : (await Cart.update({ quantity }, { where, transaction }))[0];
+  if (changed === 0) {
+    throw cartError(404, 'Item not found in cart');
+  }
+};
 
-    if (!product) {
-      return res.status(404).json({ message: 'Product not found' });
-    }
+const cartResponse = async (userId, productIds, transaction) => {
+  const [lines, [totals]] = await Promise.all([
+    Cart.findAll({ where: { userId, productId: { [Op.in]: productIds } }, transaction }),
+    sequelize.query(CART_TOTALS_SQL, { replacements: { userId }, type: QueryTypes.SELECT, transaction })
+  ]);
+  const byProduct = new Map(lines.map(line => [String(line.productId), line]));
+  return {
+    userId,
+    // Removed lines are reported as null so clients can drop them
+    items: productIds.map(productId => ({ productId, item: byProduct.get(String(productId)) || null })),
+    totals
+  };
+};
 
-    if (product.countInStock <= 0) {
-      return res.status(400).json({ message: 'Product is out of stock' });
-    }
+const sendCart = async (req, res, productIds, status = 200) => {
+  if (wantsDelta(req)) {
+    return res.status(status).json(await cartResponse(req.userId, productIds));
+  }
+  const cartItems = await Cart.findAll({ where: { userId: req.userId } });
+  res.status(status).json({ userId: req.userId, items: cartItems });
+};
 
-    const existingItem = await Cart.findOne({ 
-      where: { userId: req.userId, productId: productIdStr } 
-    });
+router.post('/add', requireUser, async (req, res) => {
+  const { productId, quantity = 1 } = req.body;
 
-    if (existingItem) {
-      existingItem.quantity += quantity;
-      await existingItem.save();
-    } else {
-      await Cart.create({
-        userId: req.userId,
-        productId: productIdStr,
-        name: product.name,
-        image: product.image,
-        price: product.price,
-        quantity: quantity
-      });
-    }
+  let productIdStr;
+  try {
+    productIdStr = parseProductId(productId);
+  } catch (error) {
+    return res.status(error.status).json({ message: error.message });
+  }
+  
+  if (!Number.isInteger(quantity) || quantity <= 0) {
+    return res.status(400).json({ message: 'Quantity must be a positive integer' });
+  }
 
-    const cartItems = await Cart.findAll({ where: { userId: req.userId } });
-    res.status(201).json({ userId: req.userId, items: cartItems });
+  try {
+    await addLine(req.userId, productIdStr, quantity);
+    await sendCart(req, res, [productIdStr], 201);
   } catch (error) {
-    console.error(error);
+    if (error.status) {
+      return res.status(error.status).json({ message: error.message });
+    }
+    logger.error('Cart add failed', { err: error });
     res.status(500).json({ message: 'Server error adding to cart' });
   }
 });
 
-router.put('/update', identifyUser, async (req, res) => {
+router.put('/update', requireUser, async (req, res) => {
     const { productId, quantity } = req.body;
 
     if (!productId || !Number.isInteger(quantity) || quantity < 0) {
@@ -91,31 +139,18 @@ router.put('/update', identifyUser, async (req, res) => {
     const productIdStr = String(productId).trim();
 
     try {
-        const cartItem = await Cart.findOne({ 
-          where: { userId: req.userId, productId: productIdStr } 
-        });
-
-        if (!cartItem) {
-            return res.status(404).json({ message: 'Item not found in cart' });
-        }
-
-        if (quantity <= 0) {
-            await cartItem.destroy();
-        } else {
-            cartItem.quantity = quantity;
-            await cartItem.save();
-        }
-        
-        const cartItems = await Cart.findAll({ where: { userId: req.userId } });
-        return res.json({ userId: req.userId, items: cartItems });
-
+        await setLine(req.userId, productIdStr, quantity);
+        await sendCart(req, res, [productIdStr]);
     } catch (error) {
-        console.error(error);
+        if (error.status) {
+            return res.status(error.status).json({ message: error.message });
+        }
+        logger.error('Cart update failed', { err: error });
         res.status(500).json({ message: 'Server error' });
     }
 });
 
-router.delete('/remove/:productId', identifyUser, async (req, res) => {
+router.delete('/remove/:productId', requireUser, async (req, res) => {
   if (!req.params.productId) {
     return res.status(400).json({ message: 'Valid product ID is required' });
   }
@@ -126,42 +161,71 @@ router.delete('/remove/:productId', identifyUser, async (req, res) => {
     await Cart.destroy({ 
       where: { userId: req.userId, productId: productIdStr } 
     });
-      
-    const cartItems = await Cart.findAll({ where: { userId: req.userId } });
-    return res.json({ userId: req.userId, items: cartItems });
+    await sendCart(req, res, [productIdStr]);
   } catch (error) {
-    console.error(error);
+    logger.error('Cart remove failed', { err: error });
     res.status(500).json({ message: 'Server error removing item' });
   }
 });
 
-router.post('/purchase', identifyUser, async (req, res) => {
+const MAX_BULK_CHANGES = 100;
+
+// @route   POST /api/cart/bulk
+// @desc    Apply several line changes atomically. Body:
+//          { changes: [{ productId, add: n } | { productId, quantity: n }] }
+//          `add` increments (creating the line), `quantity` sets it (0 removes).
+//          If any change fails, none is applied.
+router.post('/bulk', requireUser, async (req, res) => {
+  const { changes } = req.body;
+  if (!Array.isArray(changes) || changes.length === 0 || changes.length > MAX_BULK_CHANGES) {
+    return res.status(400).json({ message: `changes must be an array of 1-${MAX_BULK_CHANGES} line changes` });
+  }
+
+  let parsed;
   try {
-    // Get user's cart items
-    const cartItems = await Cart.findAll({ where: { userId: req.userId } });
-    
-    if (!cartItems || cartItems.length === 0) {
-      return res.status(400).json({ message: 'Cart is empty' });
-    }
+    parsed = changes.map((change, index) => {
+      const productId = parseProductId(change?.productId);
+      const isAdd = change.add !== undefined;
+      const amount = isAdd ? change.add : change.quantity;
+      if (!Number.isInteger(amount) || amount < (isAdd ? 1 : 0)) {
+        throw cartError(400, `changes[${index}]: add must be a positive integer or quantity a non-negative integer`);
+      }
+      return { productId, isAdd, amount };
+    });
+  } catch (error) {
+    return res.status(error.status).json({ message: error.message });
+  }
 
-    // Calculate total amount
-    const totalAmount = cartItems.reduce((sum, item) => sum + (item.price * item.quantity), 0);
-
-    // Update product stock for each item in cart
-    for (const item of cartItems) {
-      const product = await Product.findByPk(item.productId);
-      if (product) {
-        if (product.countInStock >= item.quantity) {
-          product.countInStock -= item.quantity;
-          await product.save();
-        } else {
-          return res.status(400).json({ 
-            message: `Insufficient stock for ${item.name}. Available: ${product.countInStock}, Requested: ${item.quantity}` 
-          });
+  try {
+    await sequelize.transaction({ type: Transaction.TYPES.IMMEDIATE }, async (transaction) => {
+      for (const [index, { productId, isAdd, amount }] of parsed.entries()) {
+        try {
+          await (isAdd ? addLine : setLine)(req.userId, productId, amount, transaction);
+        } catch (error) {
+          if (error.status) error.message = `changes[${index}]: ${error.message}`;
+          throw error;
         }
       }
+    });
+    await sendCart(req, res, [...new Set(parsed.map(change => change.productId))]);
+  } catch (error) {
+    if (error.status) {
+      return res.status(error.status).json({ message: error.message });
     }
+    logger.error('Cart bulk update failed', { err: error });
+    res.status(500).json({ message: 'Server error updating cart' });
+  }
+});
 
+// Stock decrement that only applies while enough stock is left, so two
+// concurrent checkouts can never take the same unit
+const DECREMENT_STOCK_SQL = `
+  UPDATE Products
+  SET countInStock = countInStock - :quantity, updatedAt = :now
+  WHERE id = :id AND countInStock >= :quantity`;
+
+router.post('/purchase', requireUser, async (req, res) => {
+  try {
     // Create order record with random ID and delivery date
     const randomNum = Math.floor(Math.random() * 900000) + 100000;
     const randomLetter = String.fromCharCode(65 + Math.floor(Math.random() * 26));
@@ -177,22 +241,74 @@ router.post('/purchase', identifyUser, async (req, res) => {
       month: 'long', 
       day: 'numeric' 
     });
-    
-    // Create single order record with all items
-    await Order.create({
-      userId: req.userId,
-      orderId: baseOrderId,
-      items: JSON.stringify(cartItems),
-      productId: cartItems[0]?.productId || 0,
-      productName: `${cartItems.length} item${cartItems.length > 1 ? 's' : ''}`,
-      quantity: cartItems.reduce((sum, item) => sum + item.quantity, 0),
-      price: totalAmount,
-      totalAmount: totalAmount,
-      deliveryDate: formattedDeliveryDate
+
+    // All-or-nothing: any failure below rolls back every stock decrement.
+    // IMMEDIATE takes SQLite's write lock up front instead of failing on upgrade.
+    const cartItems = await sequelize.transaction({ type: Transaction.TYPES.IMMEDIATE }, async (transaction) => {
+      const items = await Cart.findAll({ where: { userId: req.userId }, transaction });
+
+      if (items.length === 0) {
+        throw cartError(400, 'Cart is empty');
+      }
+
+      // One query for every product in the cart
+      const products = await Product.findAll({
+        where: { id: { [Op.in]: items.map(item => item.productId) } },
+        attributes: ['id', 'countInStock'],
+        transaction
+      });
+      const stock = new Map(products.map(product => [product.id, product.countInStock]));
+
+      for (const item of items) {
+        // Products deleted since they were added to the cart are skipped, as before
+        if (!stock.has(item.productId)) continue;
+
+        const changed = await sequelize.query(DECREMENT_STOCK_SQL, {
+          replacements: { id: item.productId, quantity: item.quantity, now: today },
+          type: QueryTypes.BULKUPDATE,
+          transaction
+        });
+        if (changed !== 1) {
+          throw cartError(400,
+            `Insufficient stock for ${item.name}. Available: ${stock.get(item.productId)}, Requested: ${item.quantity}`);
+        }
+      }
+
+      const totalAmount = items.reduce((sum, item) => sum + (item.price * item.quantity), 0);
+
+      // Create single order record with all items
+      const order = await Order.create({
+        userId: req.userId,
+        orderId: baseOrderId,
+        productId: items[0]?.productId || 0,
+        productName: `${items.length} item${items.length > 1 ? 's' : ''}`,
+        quantity: items.reduce((sum, item) => sum + item.quantity, 0),
+        price: totalAmount,
+        totalAmount: totalAmount,
+        deliveryDate: formattedDeliveryDate
+      }, { transaction });
+
+      await OrderItem.bulkCreate(items.map(item => ({
+        orderId: order.id,
+        productId: item.productId,
+        name: item.name,
+        image: item.image,
+        price: item.price,
+        quantity: item.quantity,
+        createdAt: order.createdAt
+      })), { transaction });
+
+      // Sales reports read these rollups; they commit or roll back with the order
+      await addOrdersToRollups([{ ...order.get({ plain: true }), items }], transaction);
+
+      // Clear the user's cart after successful purchase
+      await Cart.destroy({ where: { userId: req.userId }, transaction });
+      return items;
     });
 
-    // Clear the user's cart after successful purchase
-    await Cart.destroy({ where: { userId: req.userId } });
+    // The raw stock UPDATE bypasses the Product model hooks
+    catalogCache.invalidate();
+    recordCheckout('success');
 
     res.json({ 
       message: 'Purchase completed successfully',
@@ -201,12 +317,15 @@ router.post('/purchase', identifyUser, async (req, res) => {
       items: cartItems.length
     });
   } catch (error) {
-    console.error('Purchase error details:', {
-      message: error.message,
-      stack: error.stack,
-      name: error.name,
-      sql: error.sql || 'No SQL',
-      original: error.original || 'No original error'
+    if (error.status) {
+      recordCheckout('rejected');
+      return res.status(error.status).json({ message: error.message });
+    }
+    recordCheckout('error');
+    logger.error('Purchase failed', {
+      err: error,
+      userId: req.userId,
+      original: error.original?.message
     });
     res.status(500).json({ 
       message: `Server error processing purchase: ${error.message}`,
@@ -216,19 +335,21 @@ router.post('/purchase', identifyUser, async (req, res) => {
   }
 });
 
-router.get('/orders', identifyUser, async (req, res) => {
+router.get('/orders', requireUser, async (req, res) => {
   try {
     const orders = await Order.findAll({ 
       where: { userId: req.userId },
       order: [['createdAt', 'DESC']],
-      limit: 10
+      limit: 10,
+      // One extra query for the line items of all 10 orders
+      include: [{ model: OrderItem, as: 'orderItems', separate: true, order: [['id', 'ASC']] }]
     });
     
     const formattedOrders = orders.map(order => {
       const orderDate = new Date(order.createdAt);
       return {
         orderId: order.orderId,
-        items: JSON.parse(order.items),
+        items: lineItems(order),
         totalAmount: order.totalAmount,
         status: order.status,
         createdAt: order.createdAt,
@@ -243,7 +364,7 @@ router.get('/orders', identifyUser, async (req, res) => {
     
     res.json(formattedOrders);
   } catch (error) {
-    console.error('Orders fetch error:', error);
+    logger.error('Orders fetch failed', { err: error });
     res.status(500).json({ message: 'Server error fetching orders' });
   }
 });
@@ -6,6 +6,16 @@ try {
   console.error('Failed to load express:', error.message);
   throw error;
 }
+const { Op } = require('sequelize');
+const { sequelize } = require('../config/database');
+const { searchProducts } = require('../utils/productSearch');
+const catalogCache = require('../utils/catalogCache');
+const { badRequest, parseNumber, parseLimit, encodeCursor, afterCursor } = require('../utils/pagination');
+const { withImageVariants } = require('../utils/imageManifest');
+const logger = require('../utils/logger');
+
+// Catalog fetches are the hottest path; log a sample of them
+const sampledLog = logger.sampled();
 const router = express.Router();
 
 // Lazy loading with error handling for Product model
@@ -14,21 +24,162 @@ try {
   Product = require('../models/Product');
 } catch (error) {
   console.error('Failed to load Product model:', error.message);
-} 
+}
+
+// Columns a client may request with ?fields=
+const PRODUCT_FIELDS = [
+  'id', 'name', 'image', 'description', 'category', 'price',
+  'countInStock', 'rating', 'numReviews', 'createdAt', 'updatedAt'
+];
+
+// Sort orders; every column here is backed by an index on Product
+const SORTS = {
+  'price-low': { column: 'price', direction: 'ASC' },
+  'price-high': { column: 'price', direction: 'DESC' },
+  'rating': { column: 'rating', direction: 'DESC' },
+  'newest': { column: 'createdAt', direction: 'DESC' }
+};
+
+const MAX_LIMIT = 100;
+
+// Clients may reuse a cached catalog but must revalidate it (ETag) before every use
+const CATALOG_CACHE_CONTROL = 'public, no-cache';
+const DEFAULT_SEARCH_LIMIT = 20;
+
+// Translate query parameters into findAll options
+const buildProductQuery = (query) => {
+  const conditions = [];
+
+  if (query.category) {
+    const categories = String(query.category).split(',').map(c => c.trim()).filter(Boolean);
+    conditions.push({ category: categories.length === 1 ? categories[0] : { [Op.in]: categories } });
+  }
+
+  const minPrice = parseNumber(query.minPrice, 'minPrice');
+  const maxPrice = parseNumber(query.maxPrice, 'maxPrice');
+  const minRating = parseNumber(query.minRating, 'minRating');
+  if (minPrice !== undefined) conditions.push({ price: { [Op.gte]: minPrice } });
+  if (maxPrice !== undefined) conditions.push({ price: { [Op.lte]: maxPrice } });
+  if (minRating !== undefined) conditions.push({ rating: { [Op.gte]: minRating } });
+
+  if (query.sort && !SORTS[query.sort]) {
+    throw badRequest(`sort must be one of: ${Object.keys(SORTS).join(', ')}`);
+  }
+  const sort = SORTS[query.sort];
+  const direction = sort ? sort.direction : 'ASC';
+
+  // Keyset pagination: continue strictly after the (sortValue, id) of the last row
+  if (query.cursor) {
+    conditions.push(afterCursor(query.cursor, sort && sort.column, direction));
+  }
+
+  const limit = parseLimit(query.limit, MAX_LIMIT);
+
+  let attributes;
+  if (query.fields) {
+    const requested = String(query.fields).split(',').map(f => f.trim()).filter(Boolean);
+    const unknown = requested.filter(f => !PRODUCT_FIELDS.includes(f));
+    if (unknown.length > 0) {
+      throw badRequest(`Unknown fields: ${unknown.join(', ')}`);
+    }
+    // id and the sort column are always needed to build the next cursor
+    attributes = [...new Set(['id', ...(sort ? [sort.column] : []), ...requested])];
+  }
+
+  return {
+    sort,
+    limit,
+    options: {
+      where: conditions.length > 0 ? { [Op.and]: conditions } : undefined,
+      attributes,
+      order: sort ? [[sort.column, direction], ['id', direction]] : [['id', 'ASC']],
+      // Fetch one extra row to know whether another page exists
+      limit: limit ? limit + 1 : undefined
+    }
+  };
+};
 
 // @route   GET /api/products
-// @desc    Fetch all products
+// @desc    Fetch products. Optional query parameters:
+//          category (comma separated), minPrice, maxPrice, minRating,
+//          sort (price-low | price-high | rating | newest), fields (comma separated),
+//          limit (max 100) and cursor. With a limit, the cursor for the next
+//          page is returned in the X-Next-Cursor header.
 // @access  Public (for now)
 router.get('/', async (req, res) => {
+  let query;
+  try {
+    query = buildProductQuery(req.query);
+  } catch (error) {
+    return res.status(error.status || 400).json({ message: error.message });
+  }
+
+  const sendCatalog = (entry) => {
+    res.set({ ...entry.headers, ETag: entry.etag, 'Cache-Control': CATALOG_CACHE_CONTROL });
+    if (req.fresh) {
+      return res.status(304).end();
+    }
+    res.type('application/json').send(entry.body);
+  };
+
+  const key = catalogCache.keyFor(req.query);
+  const cached = catalogCache.get(key);
+  if (cached) {
+    return sendCatalog(cached);
+  }
+
   try {
-    // Fetches all products from the database
-    const products = await Product.findAll();
-    console.log(`Successfully fetched ${products.length} products`);
-    res.json(products);
+    const computedAt = catalogCache.currentVersion();
+    const products = await Product.findAll(query.options);
+
+    const headers = {};
+    if (query.limit && products.length > query.limit) {
+      products.length = query.limit;
+      const last = products[products.length - 1];
+      headers['X-Next-Cursor'] = encodeCursor(query.sort ? last[query.sort.column] : null, last.id);
+    }
+
+    sampledLog.info('Fetched products', { count: products.length });
+    const body = JSON.stringify(products.map(product => withImageVariants(product.toJSON())));
+    sendCatalog(catalogCache.set(key, body, headers, computedAt));
   } catch (error) {
-    console.error('Error fetching products:', error.message, error.stack);
+    logger.error('Product fetch failed', { err: error });
     res.status(500).json({ message: 'Server Error: Could not fetch products' });
   }
 });
 
-module.exports = router;
\ No newline at end of file
+// @route   GET /api/products/search
+// @desc    Full-text search over name, description and category, ranked by
+//          BM25. Query parameters: q (required), limit (default 20, max 100),
+//          category, and prefix=false to disable type-ahead prefix matching.
+// @access  Public
+router.get('/search', async (req, res) => {
+  const text = String(req.query.q || '').trim();
+  if (!text) {
+    return res.status(400).json({ message: 'Search query q is required' });
+  }
+
+  let limit;
+  try {
+    limit = parseNumber(req.query.limit, 'limit') ?? DEFAULT_SEARCH_LIMIT;
+    if (!Number.isInteger(limit) || limit <= 0) {
+      throw badRequest('limit must be a positive integer');
+    }
+  } catch (error) {
+    return res.status(400).json({ message: error.message });
+  }
+
+  try {
+    const products = await searchProducts(sequelize, text, {
+      limit: Math.min(limit, MAX_LIMIT),
+      prefix: req.query.prefix !== 'false',
+      category: req.query.category
+    });
+    res.json(products.map(withImageVariants));
+  } catch (error) {
+    logger.error('Product search failed', { err: error });
+    res.status(500).json({ message: 'Server Error: Could not search products' });
+  }
+});
+
+module.exports = router;
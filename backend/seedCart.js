@@ -1,3 +1,7 @@
+const dotenv = require('dotenv');
+
+dotenv.config();
+
 const { sequelize } = require('./config/database');
 const User = require('./models/User');
 const Product = require('./models/Product');
@@ -1,3 +1,7 @@
+const dotenv = require('dotenv');
+
+dotenv.config();
+
 const { connectDB } = require('./config/database');
 const Product = require('./models/Product');
 const products = require('./data/products');
@@ -4,12 +4,21 @@ const dotenv = require('dotenv');
 const cors = require('cors');
 const path = require('path');
 const cookieParser = require('cookie-parser');
-const passport = require('passport');
-const session = require('express-session');
-const { connectDB } = require('./config/database');
+
+// Load .env before any module reads process.env at require time
+dotenv.config();
+
+const { connectDB, sequelize } = require('./config/database');
+const { corsOptions } = require('./config/cors');
 
 // Import models to ensure table creation
 require('./models/Order');
+const { requestContext } = require('./utils/requestContext');
+const { metricsMiddleware, metricsHandler } = require('./utils/metrics');
+const logger = require('./utils/logger');
+const { BUILD_DIR } = require('./utils/imageManifest');
+const { requestLogger } = require('./middleware/requestLogger');
+const emailDispatcher = require('./utils/emailDispatcher');
 
 // Import routes
 const authRoutes = require('./routes/auth');
@@ -17,33 +26,40 @@ const productRoutes = require('./routes/productRoutes');
 const cartRoutes = require('./routes/cartRoutes'); // 👈 NEW CART ROUTE IMPORT
 const adminRoutes = require('./routes/admin');
 
-dotenv.config();
-require('./config/passport');
-
-// Connect to database
-connectDB();
+// Connect to database, then start sending queued emails
+connectDB().then(emailDispatcher.start);
 
 const app = express();
 
+const SHUTDOWN_TIMEOUT_MS = Number(process.env.SHUTDOWN_TIMEOUT_MS) || 10000;
+let shuttingDown = false;
+
+// Request timing and per-request query counts, exposed on /metrics
+app.use(requestContext);
+app.use(metricsMiddleware);
+app.use(requestLogger);
+app.get('/metrics', metricsHandler);
+
+// While draining, ask keep-alive clients to reconnect (to another worker)
+app.use((req, res, next) => {
+  if (shuttingDown) res.set('Connection', 'close');
+  next();
+});
+
 // Middleware
-app.use(cors({
-  origin: process.env.NODE_ENV === 'production' ? process.env.FRONTEND_URL : 'http://localhost:5173',
-  credentials: true,
-  exposedHeaders: ['Content-Length', 'Content-Type']
-}));
+app.use(cors(corsOptions));
 
 // CRITICAL: STATIC FILE CONFIGURATION
-app.use('/images', express.static(path.join(__dirname, 'public/images')));
+// Fingerprinted variants from `npm run images:build` never change under the same URL
+app.use('/images/build', express.static(BUILD_DIR, {
+  immutable: true,
+  maxAge: '1y',
+  fallthrough: false
+}));
+app.use('/images', express.static(path.join(__dirname, 'public/images'), { maxAge: '1h' }));
 app.use(express.static(path.join(__dirname, 'public')));
 app.use(express.json());
 app.use(cookieParser());
-app.use(session({
-  secret: process.env.SESSION_SECRET,
-  resave: false,
-  saveUninitialized: false
-}));
-app.use(passport.initialize());
-app.use(passport.session()); 
 
 
 // Routes
@@ -55,7 +71,7 @@ app.use('/api/admin', adminRoutes);
 
 // Enhanced error handling middleware
 app.use((err, req, res, next) => {
-    console.error('Error:', err.stack);
+    logger.error('Unhandled error', { err, method: req.method, url: req.originalUrl });
     const isDevelopment = process.env.NODE_ENV === 'development';
     if (res.headersSent) {
         return next(err);
@@ -73,10 +89,35 @@ app.use('/api/*', (req, res) => {
 
 const PORT = process.env.PORT || 5000;
 
-app.listen(PORT, (err) => {
+const server = app.listen(PORT, (err) => {
     if (err) {
-        console.error('Failed to start server:', err);
+        logger.error('Failed to start server', { err });
         process.exit(1);
     }
-    console.log(`Server running on port ${PORT}`);
+    logger.info('Server running', { port: Number(PORT) });
+});
+
+// Stop accepting connections, let in-flight requests finish, close the database.
+// Triggered by SIGTERM/SIGINT, or by the cluster primary (see cluster.js).
+const shutdown = (reason) => {
+    if (shuttingDown) return;
+    shuttingDown = true;
+    logger.info('Draining connections', { reason });
+    setTimeout(() => {
+        logger.error('Drain timed out, exiting', { timeoutMs: SHUTDOWN_TIMEOUT_MS });
+        process.exit(1);
+    }, SHUTDOWN_TIMEOUT_MS).unref();
+    server.close(async () => {
+        await emailDispatcher.stop();
+        await sequelize.close().catch(() => {});
+        await logger.close();
+        process.exit(0);
+    });
+    server.closeIdleConnections?.();
+};
+
+process.on('SIGTERM', () => shutdown('SIGTERM'));
+process.on('SIGINT', () => shutdown('SIGINT'));
+process.on('message', (message) => {
+    if (message?.type === 'shutdown') shutdown('Shutdown requested by cluster primary');
 });
\ No newline at end of file
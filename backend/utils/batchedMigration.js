@@ -0,0 +1,261 @@
+// backend/utils/batchedMigration.js
+// Online data migrations: rewrite a large table in small chunks while the
+// server keeps serving.
+//
+// A migration walks `table` in primary key order. Each chunk is the next
+// `batchSize` keys after the checkpoint, and `apply` rewrites it inside its
+// own IMMEDIATE transaction, which also advances the checkpoint in
+// MigrationCheckpoints. A crash loses at most the chunk in flight, and the
+// next run resumes after the last committed key. Rows inserted during the run
+// are picked up too, since the walk ends only when no key is left, and a
+// later run continues from the last key instead of starting over.
+//
+// The runner keeps chunks short so foreground writers are never blocked for
+// long. The batch size halves when a chunk holds the write lock longer than
+// MIGRATION_MAX_CHUNK_MS, and grows back slowly while chunks are quick.
+// Every MIGRATION_CHECK_MS it also scrapes the server's /metrics
+// (MIGRATION_METRICS_URL) and computes the p95 of the requests served since
+// the last scrape. Above MIGRATION_MAX_LATENCY_MS it backs off, doubling the
+// pause between chunks up to MIGRATION_MAX_PAUSE_MS; once latency recovers
+// the pause shrinks back. Progress, with rows per second, is logged every
+// MIGRATION_PROGRESS_MS.
+//
+// A migration module exports:
+//   table      table to walk
+//   key        integer primary key column (default 'id')
+//   columns    columns to load for each chunk (default: the key only)
+//   apply({ sequelize, transaction, rows, fromKey, toKey })
+//              rewrite rows with fromKey < key <= toKey; returns rows written
+//   start({ sequelize, transaction })
+//              optional; runs when a run begins from scratch, in the
+//              transaction that creates its checkpoint. It may return a
+//              stop key: the walk then ends there, and rows added later are
+//              never visited, not even by a later run.
+const { QueryTypes, Transaction } = require('sequelize');
+const logger = require('./logger');
+
+const env = (name, fallback) => Number(process.env[name]) || fallback;
+
+const settings = () => ({
+  batchSize: env('MIGRATION_BATCH_SIZE', 1000),
+  minBatchSize: env('MIGRATION_MIN_BATCH_SIZE', 50),
+  maxBatchSize: env('MIGRATION_MAX_BATCH_SIZE', 20000),
+  maxChunkMs: env('MIGRATION_MAX_CHUNK_MS', 50),
+  pauseMs: env('MIGRATION_PAUSE_MS', 10),
+  maxPauseMs: env('MIGRATION_MAX_PAUSE_MS', 5000),
+  maxLatencyMs: env('MIGRATION_MAX_LATENCY_MS', 100),
+  checkMs: env('MIGRATION_CHECK_MS', 1000),
+  progressMs: env('MIGRATION_PROGRESS_MS', 5000),
+  metricsUrl: process.env.MIGRATION_METRICS_URL ?? `http://127.0.0.1:${process.env.PORT || 5000}/metrics`
+});
+
+const sleep = (ms) => new Promise(resolve => setTimeout(resolve, ms));
+
+// Requests served since the previous scrape need at least this many samples
+// before their p95 is trusted
+const MIN_LATENCY_SAMPLES = 20;
+
+// Foreground latency from the server's http_request_duration_seconds
+// histogram, summed over every route but /metrics itself
+class LatencyProbe {
+  constructor(url) {
+    this.url = url;
+    this.previous = null;
+    this.warned = false;
+  }
+
+  async scrape() {
+    const response = await fetch(this.url, {
+      headers: process.env.METRICS_TOKEN ? { Authorization: `Bearer ${process.env.METRICS_TOKEN}` } : {},
+      signal: AbortSignal.timeout(2000)
+    });
+    if (!response.ok) throw new Error(`${this.url} answered ${response.status}`);
+    const buckets = new Map();
+    for (const line of (await response.text()).split('\n')) {
+      const match = /^http_request_duration_seconds_bucket\{(.*)\} (\d+)$/.exec(line);
+      if (!match || match[1].includes('route="/metrics"')) continue;
+      const le = /le="([^"]+)"/.exec(match[1])[1];
+      buckets.set(le, (buckets.get(le) || 0) + Number(match[2]));
+    }
+    return buckets;
+  }
+
+  // p95 in ms of the requests finished since the last call, or null when
+  // there were too few of them (or the server could not be scraped)
+  async p95() {
+    let current;
+    try {
+      current = await this.scrape();
+    } catch (error) {
+      if (!this.warned) {
+        logger.warn('Cannot read foreground latency, throttling on chunk time only', { url: this.url, err: error });
+        this.warned = true;
+      }
+      return null;
+    }
+    const previous = this.previous;
+    this.previous = current;
+    if (!previous) return null;
+
+    const window = [...current]
+      .map(([le, count]) => [le === '+Inf' ? Infinity : Number(le), count - (previous.get(le) || 0)])
+      .sort((a, b) => a[0] - b[0]);
+    const total = window.at(-1)?.[1] ?? 0;
+    if (total < MIN_LATENCY_SAMPLES) return null;
+    const [bound] = window.find(([, count]) => count >= total * 0.95);
+    return bound * 1000;
+  }
+}
+
+const readCheckpoint = async (sequelize, name, transaction) => {
+  const [row] = await sequelize.query('SELECT * FROM MigrationCheckpoints WHERE name = :name', {
+    replacements: { name }, type: QueryTypes.SELECT, transaction
+  });
+  return row || null;
+};
+
+// One chunk: the next keys after the checkpoint, rewritten and checkpointed
+// in one transaction; returns { rows, written, lastKey } or null when done
+const runChunk = (sequelize, name, migration, batchSize) =>
+  sequelize.transaction({ type: Transaction.TYPES.IMMEDIATE }, async (transaction) => {
+    const key = migration.key || 'id';
+    // Re-read under the write lock in case another runner moved it
+    const { lastKey, stopKey } = await readCheckpoint(sequelize, name, transaction);
+    const rows = await sequelize.query(
+      `SELECT ${migration.columns || key} FROM ${migration.table}
+       WHERE ${key} > :lastKey${stopKey == null ? '' : ` AND ${key} <= :stopKey`}
+       ORDER BY ${key} LIMIT :limit`,
+      { replacements: { lastKey, stopKey, limit: batchSize }, type: QueryTypes.SELECT, transaction }
+    );
+    if (rows.length === 0) return null;
+
+    const toKey = rows.at(-1)[key];
+    const written = await migration.apply({ sequelize, transaction, rows, fromKey: lastKey, toKey }) ?? rows.length;
+    await sequelize.query(`
+      UPDATE MigrationCheckpoints
+      SET lastKey = :toKey, rowsDone = rowsDone + :rows, rowsWritten = rowsWritten + :written, updatedAt = :now
+      WHERE name = :name`,
+      { replacements: { name, toKey, rows: rows.length, written, now: new Date() }, transaction });
+    return { rows: rows.length, written, lastKey: toKey };
+  });
+
+// Run (or resume) `migration` under `name` until every row is done, or
+// until `signal` is aborted; returns the final checkpoint plus this run's stats.
+// `restart` discards a previous run's checkpoint, finished or not.
+// `throttle: false` skips the latency checks and the pauses between chunks,
+// for runs with no server to make way for (migrations at boot).
+const runBatched = async (sequelize, name, migration, { restart = false, signal, throttle = true } = {}) => {
+  const options = settings();
+  const key = migration.key || 'id';
+  const now = new Date();
+
+  await sequelize.transaction({ type: Transaction.TYPES.IMMEDIATE }, async (transaction) => {
+    if (restart) {
+      await sequelize.query('DELETE FROM MigrationCheckpoints WHERE name = :name', { replacements: { name }, transaction });
+    }
+    if (await readCheckpoint(sequelize, name, transaction)) {
+      // A finished migration run again only visits rows added since
+      await sequelize.query('UPDATE MigrationCheckpoints SET completedAt = NULL WHERE name = :name',
+        { replacements: { name }, transaction });
+      return;
+    }
+    const stopKey = (await migration.start?.({ sequelize, transaction })) ?? null;
+    await sequelize.query(`
+      INSERT INTO MigrationCheckpoints (name, lastKey, rowsDone, rowsWritten, stopKey, startedAt, updatedAt)
+      VALUES (:name, 0, 0, 0, :stopKey, :now, :now)`, { replacements: { name, stopKey, now }, transaction });
+  });
+  const checkpoint = await readCheckpoint(sequelize, name);
+
+  const maxKey = checkpoint.stopKey ?? (await sequelize.query(
+    `SELECT MAX(${key}) AS maxKey FROM ${migration.table}`, { type: QueryTypes.SELECT }))[0].maxKey;
+  logger.info('Batched migration started', {
+    migration: name, table: migration.table, resumeAfter: checkpoint.lastKey, maxKey
+  });
+
+  const probe = throttle && options.metricsUrl ? new LatencyProbe(options.metricsUrl) : null;
+  const start = Date.now();
+  let batchSize = options.batchSize;
+  let pauseMs = throttle ? options.pauseMs : 0;
+  let rows = 0;
+  let lastKey = checkpoint.lastKey;
+  let lastCheck = 0;
+  let lastProgress = start;
+  let progressRows = 0;
+  let throttled = 0;
+
+  const progress = (message, extra) => {
+    const seconds = (Date.now() - start) / 1000;
+    logger.info(message, {
+      migration: name,
+      rows,
+      lastKey,
+      percent: maxKey ? Math.min(100, Math.round(lastKey / maxKey * 1000) / 10) : 100,
+      rowsPerSecond: Math.round(rows / Math.max(seconds, 0.001)),
+      batchSize,
+      pauseMs,
+      throttled,
+      ...extra
+    });
+  };
+
+  for (;;) {
+    if (signal?.aborted) {
+      progress('Batched migration stopped', { reason: 'aborted' });
+      break;
+    }
+
+    if (probe && Date.now() - lastCheck >= options.checkMs) {
+      lastCheck = Date.now();
+      const p95 = await probe.p95();
+      if (p95 !== null && p95 > options.maxLatencyMs) {
+        throttled++;
+        pauseMs = Math.min(options.maxPauseMs, pauseMs * 2);
+        batchSize = Math.max(options.minBatchSize, Math.floor(batchSize / 2));
+      } else if (p95 !== null) {
+        pauseMs = Math.max(options.pauseMs, Math.floor(pauseMs / 2));
+      }
+    }
+
+    const chunkStart = Date.now();
+    const chunk = await runChunk(sequelize, name, migration, batchSize);
+    const chunkMs = Date.now() - chunkStart;
+    if (!chunk) {
+      await sequelize.query(
+        'UPDATE MigrationCheckpoints SET completedAt = :now, updatedAt = :now WHERE name = :name',
+        { replacements: { name, now: new Date() } });
+      progress('Batched migration completed');
+      break;
+    }
+    rows += chunk.rows;
+    progressRows += chunk.rows;
+    lastKey = chunk.lastKey;
+
+    // Hold the write lock for at most maxChunkMs; grow back by 10% while well under it
+    if (chunkMs > options.maxChunkMs) {
+      batchSize = Math.max(options.minBatchSize, Math.floor(batchSize / 2));
+    } else if (chunkMs < options.maxChunkMs / 2) {
+      batchSize = Math.min(options.maxBatchSize, Math.ceil(batchSize * 1.1));
+    }
+
+    if (Date.now() - lastProgress >= options.progressMs) {
+      const seconds = (Date.now() - lastProgress) / 1000;
+      progress('Batched migration progress', { recentRowsPerSecond: Math.round(progressRows / seconds) });
+      lastProgress = Date.now();
+      progressRows = 0;
+    }
+    if (pauseMs) await sleep(pauseMs);
+  }
+
+  const seconds = (Date.now() - start) / 1000;
+  return {
+    ...await readCheckpoint(sequelize, name),
+    rows,
+    seconds,
+    rowsPerSecond: rows / Math.max(seconds, 0.001)
+  };
+};
+
+const checkpoints = (sequelize) => sequelize.query('SELECT * FROM MigrationCheckpoints ORDER BY name',
+  { type: QueryTypes.SELECT });
+
+module.exports = { runBatched, checkpoints };
@@ -0,0 +1,68 @@
+// backend/utils/catalogCache.js
+// Versioned in-memory cache of serialized GET /api/products responses.
+//
+// Each entry holds the JSON body exactly as it is sent, its strong ETag and
+// any extra headers (e.g. X-Next-Cursor). Every product write bumps the
+// version and drops all entries; see the hooks in models/Product.js. In
+// cluster mode the other workers are told to drop theirs as well.
+const crypto = require('crypto');
+const clusterBus = require('./clusterBus');
+
+const MAX_ENTRIES = 500;
+
+let version = 0;
+const entries = new Map();
+const stats = { hits: 0, misses: 0, invalidations: 0 };
+
+// Canonical cache key for a query object: same parameters in any order hit the same entry
+const keyFor = (query) =>
+  Object.keys(query).sort().map(k => `${k}=${query[k]}`).join('&');
+
+const get = (key) => {
+  const entry = entries.get(key);
+  if (entry) {
+    stats.hits++;
+    // Re-insert to keep Map order as least-recently-used first
+    entries.delete(key);
+    entries.set(key, entry);
+  } else {
+    stats.misses++;
+  }
+  return entry;
+};
+
+// Store a body computed while the cache was at `computedAt`. A write that
+// happened in the meantime bumped the version, so the stale body is not kept.
+const set = (key, body, headers, computedAt) => {
+  const entry = {
+    body,
+    headers,
+    etag: `"${crypto.createHash('sha1').update(body).digest('base64url')}"`
+  };
+  if (computedAt !== version) return entry;
+
+  entries.set(key, entry);
+  if (entries.size > MAX_ENTRIES) {
+    entries.delete(entries.keys().next().value);
+  }
+  return entry;
+};
+
+const clear = () => {
+  version++;
+  stats.invalidations++;
+  entries.clear();
+};
+
+const invalidate = () => {
+  clear();
+  clusterBus.publish('catalog:invalidate');
+};
+
+clusterBus.subscribe('catalog:invalidate', clear);
+
+const currentVersion = () => version;
+
+const getStats = () => ({ ...stats, version, entries: entries.size });
+
+module.exports = { keyFor, get, set, invalidate, currentVersion, getStats };
@@ -0,0 +1,32 @@
+// backend/utils/clusterBus.js
+// Invalidation signals between cluster workers (see cluster.js).
+//
+// A worker publishes by sending { type: MESSAGE_TYPE, channel, payload } to
+// the primary, which relays it to every other worker. The publisher is
+// expected to have applied the change locally already. Outside cluster mode
+// publish() is a no-op, so callers need not care how the server was started.
+const cluster = require('cluster');
+
+const MESSAGE_TYPE = 'cluster-bus';
+
+const handlers = new Map();
+
+const publish = (channel, payload) => {
+  if (cluster.isWorker && process.connected) {
+    process.send({ type: MESSAGE_TYPE, channel, payload });
+  }
+};
+
+const subscribe = (channel, handler) => {
+  if (!handlers.has(channel)) handlers.set(channel, []);
+  handlers.get(channel).push(handler);
+};
+
+if (cluster.isWorker) {
+  process.on('message', (message) => {
+    if (message?.type !== MESSAGE_TYPE) return;
+    (handlers.get(message.channel) || []).forEach((handler) => handler(message.payload));
+  });
+}
+
+module.exports = { MESSAGE_TYPE, publish, subscribe };
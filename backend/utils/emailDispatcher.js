@@ -0,0 +1,198 @@
+// backend/utils/emailDispatcher.js
+// Background sender for the email outbox (models/OutboxEmail.js).
+//
+// Every process polls the outbox and claims up to EMAIL_BATCH_SIZE due rows
+// at a time, leasing them for EMAIL_LEASE_MS so cluster workers never send
+// the same row twice. It sends them over one pooled SMTP transport shared by
+// the process: SMTP_MAX_CONNECTIONS connections are kept open and reused
+// across messages, and they also cap how many sends run at once. A failed
+// send is retried after EMAIL_RETRY_BASE_MS, doubling per attempt up to
+// EMAIL_RETRY_MAX_MS. The row is marked failed after EMAIL_MAX_ATTEMPTS, or
+// at once when the relay rejects the message permanently (5xx).
+//
+// The relay is SMTP_HOST / SMTP_PORT / SMTP_SECURE, or Gmail when SMTP_HOST
+// is unset, authenticated as EMAIL_USER / EMAIL_PASS when those are set.
+// EMAIL_DISPATCHER=off leaves a process enqueue-only.
+const { Op, Transaction } = require('sequelize');
+const { sequelize } = require('../config/database');
+const OutboxEmail = require('../models/OutboxEmail');
+const { recordEmail } = require('./metrics');
+const logger = require('./logger');
+
+const ENABLED = process.env.EMAIL_DISPATCHER !== 'off';
+const BATCH_SIZE = Number(process.env.EMAIL_BATCH_SIZE) || 50;
+const POLL_INTERVAL_MS = Number(process.env.EMAIL_POLL_INTERVAL_MS) || 1000;
+const LEASE_MS = Number(process.env.EMAIL_LEASE_MS) || 60000;
+const MAX_ATTEMPTS = Number(process.env.EMAIL_MAX_ATTEMPTS) || 8;
+const RETRY_BASE_MS = Number(process.env.EMAIL_RETRY_BASE_MS) || 5000;
+const RETRY_MAX_MS = Number(process.env.EMAIL_RETRY_MAX_MS) || 15 * 60 * 1000;
+const MAX_CONNECTIONS = Number(process.env.SMTP_MAX_CONNECTIONS) || 3;
+const FROM = process.env.EMAIL_FROM || process.env.EMAIL_USER || 'no-reply@localhost.localdomain';
+
+const stats = { batches: 0, sent: 0, retried: 0, failed: 0 };
+
+let transport = null;
+let timer = null;
+let running = null;
+let started = false;
+let woken = false;
+
+// nodemailer is loaded with the first batch to send, not at startup
+const getTransport = () => {
+  if (!transport) {
+    const nodemailer = require('nodemailer');
+    transport = nodemailer.createTransport({
+      pool: true,
+      maxConnections: MAX_CONNECTIONS,
+      ...(process.env.SMTP_HOST
+        ? {
+          host: process.env.SMTP_HOST,
+          port: Number(process.env.SMTP_PORT) || 587,
+          secure: process.env.SMTP_SECURE === 'true'
+        }
+        : { service: 'gmail' }),
+      ...(process.env.EMAIL_USER && {
+        auth: { user: process.env.EMAIL_USER, pass: process.env.EMAIL_PASS }
+      })
+    });
+  }
+  return transport;
+};
+
+// Due rows whose lease is free or expired, leased to this process in one
+// write transaction so concurrent dispatchers claim disjoint batches
+const claim = () => sequelize.transaction({ type: Transaction.TYPES.IMMEDIATE }, async (transaction) => {
+  const now = new Date();
+  const rows = await OutboxEmail.findAll({
+    where: {
+      status: 'pending',
+      nextAttemptAt: { [Op.lte]: now },
+      [Op.or]: [{ lockedUntil: null }, { lockedUntil: { [Op.lte]: now } }]
+    },
+    order: [['nextAttemptAt', 'ASC'], ['id', 'ASC']],
+    limit: BATCH_SIZE,
+    transaction
+  });
+  if (rows.length > 0) {
+    await OutboxEmail.update(
+      { lockedUntil: new Date(now.getTime() + LEASE_MS), attempts: sequelize.literal('attempts + 1') },
+      { where: { id: rows.map(row => row.id) }, transaction }
+    );
+  }
+  return rows;
+});
+
+const retryDelay = (attempts) => {
+  const delay = Math.min(RETRY_MAX_MS, RETRY_BASE_MS * 2 ** (attempts - 1));
+  // Jitter, so a relay outage does not end with every row retrying at once
+  return delay * (0.8 + Math.random() * 0.4);
+};
+
+const fail = async (row, error) => {
+  const attempts = row.attempts + 1;
+  const permanent = error.responseCode >= 500 && error.responseCode < 600;
+  const giveUp = permanent || attempts >= MAX_ATTEMPTS;
+  await OutboxEmail.update({
+    status: giveUp ? 'failed' : 'pending',
+    nextAttemptAt: new Date(Date.now() + (giveUp ? 0 : retryDelay(attempts))),
+    lockedUntil: null,
+    lastError: error.message
+  }, { where: { id: row.id } });
+
+  if (giveUp) {
+    stats.failed++;
+    recordEmail('failed');
+    logger.error('Email failed', { emailId: row.id, attempts, permanent, err: error });
+  } else {
+    stats.retried++;
+    recordEmail('retry');
+    logger.warn('Email send failed, will retry', { emailId: row.id, attempts, err: error });
+  }
+};
+
+// Claim and send one batch; returns how many rows were claimed
+const dispatchBatch = async () => {
+  const rows = await claim();
+  if (rows.length === 0) return 0;
+  stats.batches++;
+
+  const smtp = getTransport();
+  const results = await Promise.allSettled(rows.map(row => smtp.sendMail({
+    from: FROM,
+    to: row.recipient,
+    subject: row.subject,
+    html: row.html
+  })));
+
+  const sent = rows.filter((row, i) => results[i].status === 'fulfilled');
+  if (sent.length > 0) {
+    await OutboxEmail.update(
+      { status: 'sent', sentAt: new Date(), lockedUntil: null, lastError: null },
+      { where: { id: sent.map(row => row.id) } }
+    );
+    stats.sent += sent.length;
+    recordEmail('sent', sent.length);
+  }
+  await Promise.all(rows
+    .map((row, i) => [row, results[i]])
+    .filter(([, result]) => result.status === 'rejected')
+    .map(([row, result]) => fail(row, result.reason)));
+  return rows.length;
+};
+
+const schedule = (delay) => {
+  if (!started || timer || running) return;
+  timer = setTimeout(tick, delay);
+  timer.unref();
+};
+
+const tick = async () => {
+  timer = null;
+  let claimed = 0;
+  running = dispatchBatch();
+  try {
+    claimed = await running;
+  } catch (error) {
+    logger.error('Email dispatch failed', { err: error });
+  } finally {
+    running = null;
+  }
+  // A full batch means more are probably due; keep draining
+  const again = claimed === BATCH_SIZE || woken;
+  woken = false;
+  schedule(again ? 0 : POLL_INTERVAL_MS);
+};
+
+const start = () => {
+  if (!ENABLED || started) return;
+  started = true;
+  schedule(0);
+};
+
+// Send right away instead of at the next poll, e.g. once an outbox row commits
+const wake = () => {
+  if (!started) return;
+  if (running) {
+    woken = true;
+    return;
+  }
+  clearTimeout(timer);
+  timer = null;
+  schedule(0);
+};
+
+// Let the batch in flight finish, then close the SMTP connections
+const stop = async () => {
+  started = false;
+  clearTimeout(timer);
+  timer = null;
+  await running?.catch(() => {});
+  if (transport) {
+    transport.close();
+    transport = null;
+  }
+};
+
+const getStats = () => ({ ...stats, enabled: ENABLED, batchSize: BATCH_SIZE, maxConnections: MAX_CONNECTIONS });
+
+module.exports = { start, stop, wake, dispatchBatch, getStats };
@@ -1,30 +1,29 @@
-const nodemailer = require('nodemailer');
+// backend/utils/emailService.js
+// Transactional emails. Sending only writes an OutboxEmail row; the
+// dispatcher (utils/emailDispatcher.js) delivers it in the background, so
+// callers never wait on the mail relay. Pass the caller's transaction to
+// make the email part of it: nothing is sent if it rolls back.
 const crypto = require('crypto');
-
-// Create transporter (using Gmail for simplicity)
-const createTransporter = () => {
-  return nodemailer.createTransporter({
-    service: 'gmail',
-    auth: {
-      user: process.env.EMAIL_USER,
-      pass: process.env.EMAIL_PASS
-    }
-  });
-};
+const OutboxEmail = require('../models/OutboxEmail');
+const emailDispatcher = require('./emailDispatcher');
 
 // Generate verification token
 const generateVerificationToken = () => {
   return crypto.randomBytes(32).toString('hex');
 };
 
-// Send verification email
-const sendVerificationEmail = async (email, token, username) => {
-  const transporter = createTransporter();
-  
-  const verificationUrl = `${process.env.FRONTEND_URL || 'http://localhost:5173'}/verify-email?token=${token}`;
-  
-  const mailOptions = {
-    from: process.env.EMAIL_USER,
+const enqueueEmail = async ({ to, subject, html }, { transaction } = {}) => {
+  const row = await OutboxEmail.create({ recipient: to, subject, html }, { transaction });
+  if (transaction) transaction.afterCommit(emailDispatcher.wake);
+  else emailDispatcher.wake();
+  return row;
+};
+
+// Queue the verification email
+const sendVerificationEmail = (email, token, username, options) => {
+  const verificationUrl = `http://localhost:5000/api/auth/verify/${token}`;
+
+  return enqueueEmail({
     to: email,
     subject: 'Verify Your LOCAL E COMMERCE Account',
     html: `
@@ -33,7 +32,7 @@ const sendVerificationEmail = async (email, token, username) => {
         <p>Hello ${username},</p>
         <p>Thank you for signing up with LOCAL E COMMERCE! Please verify your email address to complete your registration.</p>
         <div style="text-align: center; margin: 30px 0;">
-          <a href="${verificationUrl}" 
+          <a href="${verificationUrl}"
              style="background-color: #FFD814; color: #000; padding: 15px 30px; text-decoration: none; border-radius: 5px; font-weight: bold;">
             Verify Email Address
           </a>
@@ -44,12 +43,11 @@ const sendVerificationEmail = async (email, token, username) => {
         <p>If you didn't create an account with LOCAL E COMMERCE, please ignore this email.</p>
       </div>
     `
-  };
-
-  await transporter.sendMail(mailOptions);
+  }, options);
 };
 
 module.exports = {
   generateVerificationToken,
+  enqueueEmail,
   sendVerificationEmail
-};
\ No newline at end of file
+};
@@ -0,0 +1,44 @@
+// backend/utils/imageManifest.js
+// Maps original product images (e.g. images/books_1.jpg) to the resized,
+// fingerprinted variants produced by buildImages.js. Without a manifest the
+// API keeps returning the original image paths.
+const fs = require('fs');
+const path = require('path');
+
+// IMAGE_MANIFEST_PATH and IMAGE_BUILD_DIR move both outputs elsewhere (the
+// tests build into a temporary directory); the variants keep their
+// images/build/ URLs
+const MANIFEST_PATH = path.resolve(process.env.IMAGE_MANIFEST_PATH || path.join(__dirname, '../data/image-manifest.json'));
+const BUILD_DIR = path.resolve(process.env.IMAGE_BUILD_DIR || path.join(__dirname, '../public/images/build'));
+
+// Target widths in pixels; images are never enlarged
+const VARIANT_WIDTHS = { thumbnail: 160, card: 400, detail: 1200 };
+
+// Variant used for Product.image in API responses (what product cards render)
+const DEFAULT_VARIANT = 'card';
+
+let manifest;
+
+const loadManifest = () => {
+  if (manifest === undefined) {
+    try {
+      manifest = JSON.parse(fs.readFileSync(MANIFEST_PATH, 'utf8'));
+    } catch (error) {
+      manifest = null;
+    }
+  }
+  return manifest;
+};
+
+// Point `image` at the card-sized JPEG and add every variant under `images`
+const withImageVariants = (product) => {
+  const entry = product.image && loadManifest()?.[product.image];
+  if (!entry) return product;
+  return {
+    ...product,
+    image: entry.variants[DEFAULT_VARIANT].jpeg,
+    images: entry.variants
+  };
+};
+
+module.exports = { MANIFEST_PATH, BUILD_DIR, VARIANT_WIDTHS, withImageVariants };
@@ -0,0 +1,27 @@
+// backend/utils/legacyOrderItems.js
+// Line items of orders placed before OrderItems existed live only in the
+// Order.items JSON blob until `npm run migrate:order-items` copies them.
+// Readers fall back to the blob for orders that have no OrderItem rows yet.
+
+// Same fallbacks as the order-items migration: productId or id, name or
+// productName, a missing quantity counts as one
+const parseLegacyItems = (items) => {
+  let parsed;
+  try {
+    parsed = JSON.parse(items || '[]');
+  } catch (error) {
+    return [];
+  }
+  return (Array.isArray(parsed) ? parsed : []).map(item => ({
+    productId: item.productId ?? item.id,
+    name: item.name || item.productName || 'Unknown product',
+    image: item.image ?? null,
+    price: item.price ?? 0,
+    quantity: item.quantity || 1
+  }));
+};
+
+// An order's line items: its OrderItems (loaded as `orderItems`), else the blob
+const lineItems = (order) => (order.orderItems?.length ? order.orderItems : parseLegacyItems(order.items));
+
+module.exports = { parseLegacyItems, lineItems };
@@ -0,0 +1,55 @@
+// backend/utils/logWriter.js
+// Worker thread body for utils/logger.js: writes the lines it is sent to
+// `fd`, oldest first, so a slow disk or a full pipe never stalls the event
+// loop. Writes are whole lines in batches of at most PIPE_BUF bytes (a
+// longer line goes out on its own). While a non-blocking pipe is full the
+// worker sleeps and retries. Every byte written, or given up on, is added
+// to `written` so the logger can tell what is still in flight.
+const fs = require('fs');
+const { parentPort, workerData } = require('worker_threads');
+
+// Largest write POSIX guarantees a pipe takes in one piece (Linux PIPE_BUF)
+const PIPE_BUF = 4096;
+const RETRY_MS = 5;
+
+const { fd, written } = workerData;
+const pause = new Int32Array(new SharedArrayBuffer(4));
+
+const settle = (bytes) => {
+  Atomics.add(written, 0, BigInt(bytes));
+  Atomics.notify(written, 0);
+};
+
+const writeLines = (lines) => {
+  let done = 0;
+  while (done < lines.length) {
+    let end = done;
+    let size = 0;
+    while (end < lines.length && (end === done || size + lines[end].length <= PIPE_BUF)) {
+      size += lines[end++].length;
+    }
+    const batch = end - done === 1 ? lines[done] : Buffer.concat(lines.slice(done, end), size);
+    let bytes;
+    try {
+      bytes = fs.writeSync(fd, batch);
+    } catch (error) {
+      if (error.code === 'EAGAIN') {
+        Atomics.wait(pause, 0, 0, RETRY_MS);
+        continue;
+      }
+      // Nothing left to report it to; drop the batch rather than retry forever
+      bytes = size;
+    }
+    settle(bytes);
+    if (bytes < size) {
+      // Cut short (a line longer than PIPE_BUF, a full disk): the rest of
+      // the batch becomes one entry and goes next
+      lines[end - 1] = batch.subarray(bytes);
+      done = end - 1;
+    } else {
+      done = end;
+    }
+  }
+};
+
+parentPort.on('message', (lines) => writeLines(lines.map(line => Buffer.from(line))));
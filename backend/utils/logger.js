@@ -0,0 +1,167 @@
+// backend/utils/logger.js
+// Structured JSON logger with buffered writes that never block the event
+// loop.
+//
+// Each record is one JSON line: time, level, msg, pid, the id of the request
+// being handled (from utils/requestContext.js) and any extra fields. Lines
+// are buffered and handed to a writer thread (utils/logWriter.js) every
+// FLUSH_INTERVAL_MS or once FLUSH_BYTES have piled up, so neither a slow
+// LOG_FILE disk nor a blocking stdout stalls requests.
+//
+// The writer sends whole lines in batches of at most PIPE_BUF bytes. Writes
+// that size to a pipe are atomic, so the workers of a cluster sharing the
+// primary's stdout never interleave their lines (a single line longer than
+// PIPE_BUF still can). LOG_FILE is opened with O_APPEND for the same reason.
+// If the reader cannot keep up, lines past MAX_BUFFER_BYTES not yet written
+// are dropped and counted rather than held in memory.
+//
+// LOG_LEVEL   debug | info | warn | error (default info)
+// LOG_FILE    append to this file instead of stdout
+// LOG_SAMPLE_RATE  share of sampled info logs that are kept (default 0.01)
+const fs = require('fs');
+const path = require('path');
+const { Worker } = require('worker_threads');
+const { current } = require('./requestContext');
+
+const LEVELS = { debug: 10, info: 20, warn: 30, error: 40 };
+const LEVEL = LEVELS[process.env.LOG_LEVEL] || LEVELS.info;
+const SAMPLE_RATE = process.env.LOG_SAMPLE_RATE !== undefined ? Number(process.env.LOG_SAMPLE_RATE) : 0.01;
+const FLUSH_INTERVAL_MS = 100;
+const FLUSH_BYTES = 64 * 1024;
+const MAX_BUFFER_BYTES = 8 * 1024 * 1024;
+// The exit handler gives up on a writer that gets nothing out for this long
+const EXIT_FLUSH_MS = 1000;
+const WRITER_PATH = path.join(__dirname, 'logWriter.js');
+
+const fd = process.env.LOG_FILE ? fs.openSync(process.env.LOG_FILE, 'a') : process.stdout.fd;
+
+// Bytes the writer has written (or given up on), shared with it
+const written = new BigInt64Array(new SharedArrayBuffer(8));
+const writer = new Worker(WRITER_PATH, { workerData: { fd, written } });
+// The writer must not keep scripts alive; the exit handler waits for it
+writer.unref();
+
+let lines = [];
+let bufferedBytes = 0;
+let postedBytes = 0;
+let dropped = 0;
+let timer = null;
+
+// Bytes logged but not yet written, here or with the writer
+const backlog = () => bufferedBytes + postedBytes - Number(Atomics.load(written, 0));
+
+const schedule = () => {
+  if (timer) return;
+  timer = setTimeout(flush, FLUSH_INTERVAL_MS);
+  timer.unref();
+};
+
+const flush = () => {
+  if (timer) {
+    clearTimeout(timer);
+    timer = null;
+  }
+  if (lines.length === 0) return;
+  writer.postMessage(lines);
+  postedBytes += bufferedBytes;
+  lines = [];
+  bufferedBytes = 0;
+};
+
+// The writer thread keeps running while the process exits: hand it the last
+// lines and wait until it has written everything, so nothing is reordered
+// or lost.
+const flushSync = () => {
+  reportDropped();
+  flush();
+  let seen = Atomics.load(written, 0);
+  let lastProgress = Date.now();
+  while (Number(seen) < postedBytes) {
+    const waited = Date.now() - lastProgress;
+    if (waited > EXIT_FLUSH_MS) return;
+    Atomics.wait(written, 0, seen, EXIT_FLUSH_MS - waited + 1);
+    const now = Atomics.load(written, 0);
+    if (now !== seen) {
+      seen = now;
+      lastProgress = Date.now();
+    }
+  }
+};
+process.on('exit', flushSync);
+
+const push = (line, bytes = Buffer.byteLength(line)) => {
+  lines.push(line);
+  bufferedBytes += bytes;
+};
+
+const reportDropped = () => {
+  if (!dropped) return;
+  push(`${JSON.stringify({ time: new Date().toISOString(), level: 'warn', msg: 'Log lines dropped', dropped, pid: process.pid })}\n`);
+  dropped = 0;
+};
+
+const enqueue = (line) => {
+  const bytes = Buffer.byteLength(line);
+  if (backlog() + bytes > MAX_BUFFER_BYTES) {
+    dropped++;
+    return;
+  }
+  reportDropped();
+  push(line, bytes);
+  if (bufferedBytes >= FLUSH_BYTES) flush();
+  else schedule();
+};
+
+// Errors become plain objects; JSON.stringify would drop message and stack
+const serialize = (fields) => {
+  if (!fields) return {};
+  const result = {};
+  for (const [key, value] of Object.entries(fields)) {
+    result[key] = value instanceof Error
+      ? { name: value.name, message: value.message, stack: value.stack, ...(value.sql && { sql: value.sql }) }
+      : value;
+  }
+  return result;
+};
+
+const write = (level, msg, fields, extra) => {
+  if (LEVELS[level] < LEVEL) return;
+  const context = current();
+  const record = {
+    time: new Date().toISOString(),
+    level,
+    msg,
+    pid: process.pid,
+    ...(context?.requestId && { requestId: context.requestId }),
+    ...extra,
+    ...serialize(fields)
+  };
+  enqueue(`${JSON.stringify(record)}\n`);
+};
+
+const makeLogger = (keep, extra) => Object.fromEntries(Object.keys(LEVELS).map((level) => [
+  level,
+  (msg, fields) => {
+    if (keep()) write(level, msg, fields, extra);
+  }
+]));
+
+const logger = makeLogger(() => true);
+
+// Logger for high-volume messages: keeps about `rate` of them and records
+// the rate on each line so readers can scale counts back up
+logger.sampled = (rate = SAMPLE_RATE) => makeLogger(() => Math.random() < rate, { sampleRate: rate });
+
+logger.flush = flush;
+
+// Flush and wait for every buffered line to be written; for clean shutdowns
+logger.close = () => new Promise((resolve) => {
+  flush();
+  const drain = () => {
+    if (backlog() > 0) setTimeout(drain, 10);
+    else resolve();
+  };
+  drain();
+});
+
+module.exports = logger;
@@ -0,0 +1,177 @@
+// backend/utils/metrics.js
+// In-process metrics in the Prometheus text exposition format, served on
+// GET /metrics (see server.js).
+//
+// HTTP metrics are labelled with the matched Express route pattern
+// (/api/cart/remove/:productId, not the raw URL) so label values stay
+// bounded; requests that match no route are counted under "other".
+// Database metrics come from Sequelize's query logging (config/database.js)
+// and are attributed to the route of the request that ran them, or "none"
+// for queries outside a request. Queries slower than SLOW_QUERY_MS are
+// logged with their SQL.
+//
+// In cluster mode every worker keeps its own metrics; a scrape reports the
+// worker that answered it.
+const { current } = require('./requestContext');
+const logger = require('./logger');
+
+const HTTP_BUCKETS = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10];
+const QUERY_BUCKETS = [0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5, 1];
+const QUERIES_PER_REQUEST_BUCKETS = [0, 1, 2, 5, 10, 20, 50, 100];
+const SLOW_QUERY_MS = Number(process.env.SLOW_QUERY_MS) || 100;
+
+const metrics = [];
+
+const escapeLabel = (value) => String(value).replace(/\\/g, '\\\\').replace(/\n/g, '\\n').replace(/"/g, '\\"');
+
+const labelString = (labels) => {
+  const pairs = Object.entries(labels).map(([name, value]) => `${name}="${escapeLabel(value)}"`);
+  return pairs.length ? `{${pairs.join(',')}}` : '';
+};
+
+const define = (metric) => {
+  metrics.push(metric);
+  return metric;
+};
+
+const counter = (name, help) => {
+  const values = new Map();
+  return define({
+    name, help, type: 'counter',
+    inc(labels = {}, amount = 1) {
+      const key = labelString(labels);
+      values.set(key, (values.get(key) || 0) + amount);
+    },
+    lines: () => [...values].map(([key, value]) => `${name}${key} ${value}`)
+  });
+};
+
+const gauge = (name, help) => {
+  const values = new Map();
+  return define({
+    name, help, type: 'gauge',
+    inc(labels = {}, amount = 1) {
+      const key = labelString(labels);
+      values.set(key, (values.get(key) || 0) + amount);
+    },
+    dec(labels = {}, amount = 1) {
+      this.inc(labels, -amount);
+    },
+    lines: () => [...values].map(([key, value]) => `${name}${key} ${value}`)
+  });
+};
+
+const histogram = (name, help, buckets) => {
+  const series = new Map();
+  return define({
+    name, help, type: 'histogram',
+    observe(labels, value) {
+      const key = labelString(labels);
+      let entry = series.get(key);
+      if (!entry) {
+        entry = { labels, counts: new Array(buckets.length).fill(0), sum: 0, count: 0 };
+        series.set(key, entry);
+      }
+      for (let i = 0; i < buckets.length; i++) {
+        if (value <= buckets[i]) entry.counts[i]++;
+      }
+      entry.sum += value;
+      entry.count++;
+    },
+    lines: () => [...series.values()].flatMap(({ labels, counts, sum, count }) => [
+      ...buckets.map((bound, i) => `${name}_bucket${labelString({ ...labels, le: bound })} ${counts[i]}`),
+      `${name}_bucket${labelString({ ...labels, le: '+Inf' })} ${count}`,
+      `${name}_sum${labelString(labels)} ${sum}`,
+      `${name}_count${labelString(labels)} ${count}`
+    ])
+  });
+};
+
+const httpRequests = counter('http_requests_total', 'HTTP requests by route and status code');
+const httpDuration = histogram('http_request_duration_seconds', 'HTTP request latency by route', HTTP_BUCKETS);
+const httpInFlight = gauge('http_requests_in_flight', 'HTTP requests currently being handled');
+const dbQueries = counter('db_queries_total', 'Database queries by the route that ran them');
+const dbQueryDuration = histogram('db_query_duration_seconds', 'Database query latency by route', QUERY_BUCKETS);
+const queriesPerRequest = histogram('db_queries_per_request', 'Database queries run by one request',
+  QUERIES_PER_REQUEST_BUCKETS);
+const slowQueries = counter('db_slow_queries_total', `Database queries slower than ${SLOW_QUERY_MS}ms`);
+const checkouts = counter('checkouts_total', 'Checkout attempts by result');
+const emails = counter('emails_total', 'Outbox email send attempts by result');
+
+// Route pattern of a finished request, e.g. /api/products/:id
+const routeOf = (req) => {
+  if (!req.route) return 'other';
+  const route = `${req.baseUrl}${req.route.path}`;
+  return route.length > 1 && route.endsWith('/') ? route.slice(0, -1) : route;
+};
+
+// Middleware: time every request; must run inside requestContext
+const metricsMiddleware = (req, res, next) => {
+  const start = process.hrtime.bigint();
+  const context = current();
+  httpInFlight.inc();
+
+  let done = false;
+  const finish = () => {
+    if (done) return;
+    done = true;
+    httpInFlight.dec();
+    const route = routeOf(req);
+    const seconds = Number(process.hrtime.bigint() - start) / 1e9;
+    httpRequests.inc({ method: req.method, route, status: res.statusCode });
+    httpDuration.observe({ method: req.method, route }, seconds);
+    if (context) {
+      // Queries are attributed here because the route is only known now
+      const times = context.queryTimes;
+      queriesPerRequest.observe({ route }, times.length);
+      if (times.length) dbQueries.inc({ route }, times.length);
+      times.forEach((ms) => dbQueryDuration.observe({ route }, ms / 1000));
+    }
+  };
+  res.on('finish', finish);
+  res.on('close', finish);
+  next();
+};
+
+// Sequelize `logging` callback with `benchmark: true`:
+// ("Executed (<connection>): <sql>", milliseconds)
+const recordQuery = (message, ms) => {
+  const context = current();
+  if (context) {
+    context.queryTimes.push(ms);
+  } else {
+    dbQueries.inc({ route: 'none' });
+    dbQueryDuration.observe({ route: 'none' }, ms / 1000);
+  }
+  if (ms >= SLOW_QUERY_MS) {
+    slowQueries.inc();
+    logger.warn('Slow query', {
+      durationMs: ms,
+      url: context && `${context.req.method} ${context.req.originalUrl}`,
+      sql: message.replace(/^Executed \([^)]*\): /, '')
+    });
+  }
+};
+
+const recordCheckout = (result) => checkouts.inc({ result });
+
+// result: sent, retry or failed
+const recordEmail = (result, count = 1) => emails.inc({ result }, count);
+
+const render = () => metrics.map(({ name, help, type, lines }) => [
+  `# HELP ${name} ${help}`,
+  `# TYPE ${name} ${type}`,
+  ...lines()
+].join('\n')).join('\n') + '\n';
+
+// GET /metrics; set METRICS_TOKEN to require "Authorization: Bearer <token>"
+const metricsHandler = (req, res) => {
+  const token = process.env.METRICS_TOKEN;
+  if (token && req.header('Authorization') !== `Bearer ${token}`) {
+    return res.status(401).json({ message: 'Access denied.' });
+  }
+  res.set('Content-Type', 'text/plain; version=0.0.4; charset=utf-8');
+  res.send(render());
+};
+
+module.exports = { metricsMiddleware, metricsHandler, recordQuery, recordCheckout, recordEmail, render };
@@ -0,0 +1,108 @@
+// backend/utils/migrator.js
+// Versioned schema migrations.
+//
+// Each file in migrations/ is named NNN-description.js and exports
+// `up({ sequelize, queryInterface, transaction })`. Applied versions are
+// recorded in the SchemaVersions table. At boot, connectDB reads the highest
+// one and runs only newer files, so an up-to-date database starts with one
+// query instead of sequelize.sync() introspecting every table and index.
+// Schema changes therefore need a new migration file; editing a model alone
+// no longer changes the database.
+//
+// Migrations run in an IMMEDIATE transaction unless they export
+// `transaction = false`. Those must be idempotent, because a crash can leave
+// them half applied and unrecorded.
+const fs = require('fs');
+const path = require('path');
+const { QueryTypes, Transaction } = require('sequelize');
+const logger = require('./logger');
+
+const MIGRATIONS_DIR = path.join(__dirname, '..', 'migrations');
+const TABLE = 'SchemaVersions';
+
+const listMigrations = () => fs.readdirSync(MIGRATIONS_DIR)
+  .filter(file => /^\d+-[\w-]+\.js$/.test(file))
+  .map(file => ({
+    version: parseInt(file, 10),
+    name: file.replace(/^\d+-/, '').replace(/\.js$/, ''),
+    file: path.join(MIGRATIONS_DIR, file)
+  }))
+  .sort((a, b) => a.version - b.version);
+
+const latestVersion = () => listMigrations().at(-1)?.version ?? 0;
+
+const appliedVersions = async (sequelize, options = {}) => {
+  try {
+    const rows = await sequelize.query(`SELECT version FROM ${TABLE}`, { type: QueryTypes.SELECT, ...options });
+    return new Set(rows.map(row => row.version));
+  } catch (error) {
+    if (/no such table/.test(error.message)) return new Set();
+    throw error;
+  }
+};
+
+const currentVersion = async (sequelize) => {
+  try {
+    const [row] = await sequelize.query(`SELECT MAX(version) AS version FROM ${TABLE}`, { type: QueryTypes.SELECT });
+    return row.version ?? 0;
+  } catch (error) {
+    if (/no such table/.test(error.message)) return 0;
+    throw error;
+  }
+};
+
+const record = (sequelize, migration, durationMs, transaction) => sequelize.query(
+  `INSERT OR IGNORE INTO ${TABLE} (version, name, appliedAt, durationMs) VALUES (:version, :name, :appliedAt, :durationMs)`,
+  {
+    replacements: { version: migration.version, name: migration.name, appliedAt: new Date(), durationMs },
+    transaction
+  }
+);
+
+// Apply every migration not yet recorded; returns { version, applied }
+const migrate = async (sequelize) => {
+  const migrations = listMigrations();
+  const latest = migrations.at(-1)?.version ?? 0;
+  if (await currentVersion(sequelize) >= latest) {
+    return { version: latest, applied: [] };
+  }
+
+  await sequelize.query(`
+    CREATE TABLE IF NOT EXISTS ${TABLE} (
+      version INTEGER PRIMARY KEY,
+      name VARCHAR(255) NOT NULL,
+      appliedAt DATETIME NOT NULL,
+      durationMs INTEGER NOT NULL
+    )`);
+  const done = await appliedVersions(sequelize);
+  const queryInterface = sequelize.getQueryInterface();
+  const applied = [];
+
+  for (const migration of migrations.filter(m => !done.has(m.version))) {
+    const { up, transaction: transactional = true } = require(migration.file);
+    const start = Date.now();
+    if (transactional) {
+      const ran = await sequelize.transaction({ type: Transaction.TYPES.IMMEDIATE }, async (transaction) => {
+        // Another process may have applied it while this one waited for the lock
+        if ((await appliedVersions(sequelize, { transaction })).has(migration.version)) return false;
+        await up({ sequelize, queryInterface, transaction });
+        await record(sequelize, migration, Date.now() - start, transaction);
+        return true;
+      });
+      if (!ran) continue;
+    } else {
+      await up({ sequelize, queryInterface });
+      await record(sequelize, migration, Date.now() - start);
+    }
+    applied.push(migration.version);
+    logger.info('Applied migration', { version: migration.version, name: migration.name, durationMs: Date.now() - start });
+  }
+  return { version: latest, applied };
+};
+
+const status = async (sequelize) => {
+  const done = await appliedVersions(sequelize);
+  return listMigrations().map(({ version, name }) => ({ version, name, applied: done.has(version) }));
+};
+
+module.exports = { migrate, status, currentVersion, latestVersion, listMigrations };
@@ -0,0 +1,67 @@
+// backend/utils/pagination.js
+// Query parameter parsing and keyset cursors shared by the listing endpoints
+// (GET /api/products, /api/admin/orders, /api/admin/users).
+const { Op } = require('sequelize');
+
+const badRequest = (message) => Object.assign(new Error(message), { status: 400 });
+
+const parseNumber = (value, name) => {
+  if (value === undefined || value === '') return undefined;
+  const number = Number(value);
+  if (!Number.isFinite(number)) {
+    throw badRequest(`${name} must be a number`);
+  }
+  return number;
+};
+
+// Positive integer limit capped at `max`; undefined when not given
+const parseLimit = (value, max) => {
+  const limit = parseNumber(value, 'limit');
+  if (limit === undefined) return undefined;
+  if (!Number.isInteger(limit) || limit <= 0) {
+    throw badRequest('limit must be a positive integer');
+  }
+  return Math.min(limit, max);
+};
+
+const parseDate = (value, name) => {
+  if (value === undefined || value === '') return undefined;
+  const date = new Date(value);
+  if (Number.isNaN(date.getTime())) {
+    throw badRequest(`${name} must be a date`);
+  }
+  return date;
+};
+
+// Cursors are opaque to clients: base64url encoded [sortValue, id] of the last row
+const encodeCursor = (value, id) =>
+  Buffer.from(JSON.stringify([value, id])).toString('base64url');
+
+const decodeCursor = (cursor) => {
+  try {
+    const [value, id] = JSON.parse(Buffer.from(String(cursor), 'base64url').toString());
+    if (!Number.isInteger(id)) throw new Error();
+    return { value, id };
+  } catch (error) {
+    throw badRequest('Invalid cursor');
+  }
+};
+
+// Keyset condition for rows strictly after the cursor in ORDER BY column, id
+// (both in `direction`). Without a column, rows are ordered by id alone.
+const afterCursor = (cursor, column, direction) => {
+  const { value, id } = decodeCursor(cursor);
+  const compare = direction === 'ASC' ? Op.gt : Op.lt;
+  if (!column) {
+    return { id: { [compare]: id } };
+  }
+  const sortValue = column === 'createdAt' ? new Date(value) : value;
+  return {
+    [Op.or]: [
+      { [column]: { [compare]: sortValue } },
+      { [column]: sortValue, id: { [compare]: id } }
+    ]
+  };
+};
+
+module.exports = { badRequest, parseNumber, parseLimit, parseDate, encodeCursor, decodeCursor, afterCursor };
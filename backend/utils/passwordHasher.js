@@ -0,0 +1,120 @@
+// backend/utils/passwordHasher.js
+// bcrypt hashing on a small pool of worker threads. bcryptjs is pure
+// JavaScript, so a single compare at cost 12 would otherwise block every
+// other request for a few hundred milliseconds.
+//
+// BCRYPT_COST sets the work factor (clamped to MIN_COST..MAX_COST) and
+// BCRYPT_POOL_SIZE the number of workers. At most MAX_QUEUE jobs wait for a
+// worker; past that, callers get a 503 error instead of an ever-growing
+// backlog. Hashes made with another cost are upgraded on the next
+// successful login (see rehashIfNeeded).
+const os = require('os');
+const path = require('path');
+const { Worker } = require('worker_threads');
+const bcrypt = require('bcryptjs');
+const logger = require('./logger');
+
+const MIN_COST = 8;
+const MAX_COST = 14;
+const DEFAULT_COST = 12;
+
+const COST = Math.min(MAX_COST, Math.max(MIN_COST, Number(process.env.BCRYPT_COST) || DEFAULT_COST));
+const POOL_SIZE = Number(process.env.BCRYPT_POOL_SIZE) || Math.max(1, Math.min(4, os.cpus().length - 1));
+const MAX_QUEUE = Number(process.env.BCRYPT_MAX_QUEUE) || 64;
+const WORKER_PATH = path.join(__dirname, 'passwordWorker.js');
+
+const slots = [];
+const queue = [];
+const stats = { hashes: 0, compares: 0, rehashes: 0, rejected: 0 };
+
+const spawn = () => {
+  const slot = { worker: new Worker(WORKER_PATH), job: null, error: null };
+  // Idle workers must not keep scripts like createAdmin.js alive
+  slot.worker.unref();
+
+  slot.worker.on('message', ({ result, error }) => {
+    const job = slot.job;
+    slot.job = null;
+    slot.worker.unref();
+    if (error) job.reject(new Error(error));
+    else job.resolve(result);
+    dispatch();
+  });
+  slot.worker.on('error', (error) => {
+    slot.error = error;
+  });
+  slot.worker.on('exit', () => {
+    slots.splice(slots.indexOf(slot), 1);
+    if (slot.job) slot.job.reject(slot.error || new Error('Password worker exited'));
+    dispatch();
+  });
+
+  slots.push(slot);
+  return slot;
+};
+
+const dispatch = () => {
+  while (queue.length) {
+    let slot = slots.find((candidate) => !candidate.job);
+    if (!slot && slots.length < POOL_SIZE) slot = spawn();
+    if (!slot) return;
+
+    slot.job = queue.shift();
+    slot.worker.ref();
+    slot.worker.postMessage(slot.job.message);
+  }
+};
+
+const run = (message) => new Promise((resolve, reject) => {
+  if (queue.length >= MAX_QUEUE) {
+    stats.rejected++;
+    return reject(Object.assign(new Error('Server busy, please try again shortly.'), { status: 503 }));
+  }
+  queue.push({ message, resolve, reject });
+  dispatch();
+});
+
+const hash = (password) => {
+  // bcrypt would hash String(undefined) without complaint
+  if (typeof password !== 'string' || password === '') {
+    return Promise.reject(Object.assign(new Error('Password is required'), { status: 400 }));
+  }
+  stats.hashes++;
+  return run({ op: 'hash', password, cost: COST });
+};
+
+const compare = (password, hashed) => {
+  stats.compares++;
+  return run({ op: 'compare', password: String(password ?? ''), hash: hashed });
+};
+
+// True when a stored hash was made with a different work factor
+const needsRehash = (hashed) => {
+  try {
+    return bcrypt.getRounds(hashed) !== COST;
+  } catch (error) {
+    return false;
+  }
+};
+
+// After a successful login, re-hash the password at the current cost.
+// Runs in the background and never fails the login.
+const rehashIfNeeded = async (user, password) => {
+  if (!needsRehash(user.password)) return;
+  try {
+    await user.update({ password: await hash(password) });
+    stats.rehashes++;
+  } catch (error) {
+    logger.error('Password rehash failed', { err: error, userId: user.id });
+  }
+};
+
+const getStats = () => ({
+  ...stats,
+  cost: COST,
+  poolSize: POOL_SIZE,
+  busy: slots.filter((slot) => slot.job).length,
+  queued: queue.length
+});
+
+module.exports = { hash, compare, needsRehash, rehashIfNeeded, getStats };
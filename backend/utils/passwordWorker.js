@@ -0,0 +1,16 @@
+// backend/utils/passwordWorker.js
+// Worker thread body for utils/passwordHasher.js: runs one bcrypt hash or
+// compare per message so the event loop never does the key stretching.
+const { parentPort } = require('worker_threads');
+const bcrypt = require('bcryptjs');
+
+parentPort.on('message', ({ op, password, hash, cost }) => {
+  try {
+    const result = op === 'hash'
+      ? bcrypt.hashSync(password, cost)
+      : bcrypt.compareSync(password, hash);
+    parentPort.postMessage({ result });
+  } catch (error) {
+    parentPort.postMessage({ error: error.message });
+  }
+});
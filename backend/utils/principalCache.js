@@ -0,0 +1,66 @@
+// backend/utils/principalCache.js
+// Short-lived in-memory cache of the users behind verified JWTs, so the
+// admin middleware does not look the same user up on every request.
+//
+// Entries are keyed by user id and token and expire after TTL_MS or when the
+// token does, whichever comes first. Any write to a user through the User
+// model drops that user's entries (see the hooks in models/User.js), in every
+// cluster worker; writes that bypass the model are picked up once TTL_MS has
+// passed.
+const clusterBus = require('./clusterBus');
+
+const TTL_MS = Number(process.env.PRINCIPAL_CACHE_TTL_MS) || 60 * 1000;
+const MAX_ENTRIES = 1000;
+
+const entries = new Map();
+const stats = { hits: 0, misses: 0, invalidations: 0 };
+
+// The signature segment identifies the token; no need to keep the whole JWT
+const keyFor = (userId, token) => `${userId}:${String(token).split('.').pop()}`;
+
+const get = (userId, token) => {
+  const key = keyFor(userId, token);
+  const entry = entries.get(key);
+  if (entry && entry.expiresAt > Date.now()) {
+    stats.hits++;
+    // Re-insert to keep Map order as least-recently-used first
+    entries.delete(key);
+    entries.set(key, entry);
+    return entry.principal;
+  }
+  if (entry) entries.delete(key);
+  stats.misses++;
+  return undefined;
+};
+
+// `tokenExpiresAt` is the JWT exp claim in seconds
+const set = (userId, token, principal, tokenExpiresAt) => {
+  const expiresAt = Math.min(Date.now() + TTL_MS, tokenExpiresAt ? tokenExpiresAt * 1000 : Infinity);
+  entries.set(keyFor(userId, token), { principal, userId: String(userId), expiresAt });
+  if (entries.size > MAX_ENTRIES) {
+    entries.delete(entries.keys().next().value);
+  }
+};
+
+const clear = (userId) => {
+  stats.invalidations++;
+  if (userId === undefined || userId === null) {
+    entries.clear();
+    return;
+  }
+  for (const [key, entry] of entries) {
+    if (entry.userId === String(userId)) entries.delete(key);
+  }
+};
+
+// Drop every cached token of one user, or of all users without an id
+const invalidate = (userId) => {
+  clear(userId);
+  clusterBus.publish('principals:invalidate', userId ?? null);
+};
+
+clusterBus.subscribe('principals:invalidate', clear);
+
+const getStats = () => ({ ...stats, entries: entries.size });
+
+module.exports = { get, set, invalidate, getStats };
@@ -0,0 +1,151 @@
+// backend/utils/productSearch.js
+// Full-text product search backed by an SQLite FTS5 index over Products.
+//
+// ProductSearch is an external-content FTS5 table: it stores only the index,
+// and triggers on Products keep it in sync for every INSERT, UPDATE and
+// DELETE, including bulk `Product.update(...)` calls that bypass model hooks.
+const { QueryTypes } = require('sequelize');
+const logger = require('./logger');
+
+const SEARCH_TABLE = 'ProductSearch';
+
+// Relative BM25 weights of the indexed columns (name, description, category)
+const BM25_WEIGHTS = [10.0, 1.0, 5.0];
+
+const RESULT_COLUMNS = [
+  'id', 'name', 'image', 'category', 'price', 'countInStock', 'rating', 'numReviews'
+];
+
+const TRIGGERS = {
+  [`${SEARCH_TABLE}_ai`]: `
+    CREATE TRIGGER IF NOT EXISTS ${SEARCH_TABLE}_ai AFTER INSERT ON Products BEGIN
+      INSERT INTO ${SEARCH_TABLE}(rowid, name, description, category)
+      VALUES (new.id, new.name, new.description, new.category);
+    END`,
+  [`${SEARCH_TABLE}_ad`]: `
+    CREATE TRIGGER IF NOT EXISTS ${SEARCH_TABLE}_ad AFTER DELETE ON Products BEGIN
+      INSERT INTO ${SEARCH_TABLE}(${SEARCH_TABLE}, rowid, name, description, category)
+      VALUES ('delete', old.id, old.name, old.description, old.category);
+    END`,
+  [`${SEARCH_TABLE}_au`]: `
+    CREATE TRIGGER IF NOT EXISTS ${SEARCH_TABLE}_au AFTER UPDATE OF name, description, category ON Products BEGIN
+      INSERT INTO ${SEARCH_TABLE}(${SEARCH_TABLE}, rowid, name, description, category)
+      VALUES ('delete', old.id, old.name, old.description, old.category);
+      INSERT INTO ${SEARCH_TABLE}(rowid, name, description, category)
+      VALUES (new.id, new.name, new.description, new.category);
+    END`
+};
+
+// null until this process has created or looked for the index
+let ftsAvailable = null;
+
+// Create the FTS table and triggers if needed. The index is rebuilt from
+// Products whenever the table or any trigger was missing (first boot, or
+// after `sync({ alter: true })` recreated Products and dropped its triggers).
+// Only the DB_SYNC_ON_BOOT path calls it, and without FTS5 it falls back to
+// LIKE search. Migrated databases get the index from migration 002, which
+// keeps its own copy of this DDL and fails loudly instead; other processes
+// find the index on their first search (see hasSearchIndex).
+const ensureSearchIndex = async (sequelize) => {
+  try {
+    const existing = await sequelize.query(
+      `SELECT name FROM sqlite_master
+       WHERE name IN (:table, 'Products') OR (type = 'trigger' AND tbl_name = 'Products')`,
+      { replacements: { table: SEARCH_TABLE }, type: QueryTypes.SELECT }
+    );
+    const names = new Set(existing.map(row => row.name));
+    if (!names.has('Products')) {
+      // Scripts that only sync other models (e.g. createAdmin.js)
+      return;
+    }
+    const missing = [SEARCH_TABLE, ...Object.keys(TRIGGERS)].filter(name => !names.has(name));
+
+    if (missing.length > 0) {
+      await sequelize.transaction(async (transaction) => {
+        await sequelize.query(`
+          CREATE VIRTUAL TABLE IF NOT EXISTS ${SEARCH_TABLE} USING fts5(
+            name, description, category,
+            content='Products', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2',
+            prefix='2 3'
+          )`, { transaction });
+        // Store the weighted BM25 as the table's rank so FTS5 orders and limits hits itself
+        await sequelize.query(
+          `INSERT INTO ${SEARCH_TABLE}(${SEARCH_TABLE}, rank) VALUES ('rank', 'bm25(${BM25_WEIGHTS.join(', ')})')`,
+          { transaction });
+        for (const sql of Object.values(TRIGGERS)) {
+          await sequelize.query(sql, { transaction });
+        }
+        await sequelize.query(`INSERT INTO ${SEARCH_TABLE}(${SEARCH_TABLE}) VALUES ('rebuild')`, { transaction });
+      });
+      logger.info('Product search index rebuilt');
+    }
+    ftsAvailable = true;
+  } catch (error) {
+    ftsAvailable = false;
+    logger.error('FTS5 product search unavailable, falling back to LIKE', { err: error });
+  }
+};
+
+const hasSearchIndex = async (sequelize) => {
+  if (ftsAvailable === null) {
+    const found = await sequelize.query(
+      "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :table",
+      { replacements: { table: SEARCH_TABLE }, type: QueryTypes.SELECT }
+    );
+    ftsAvailable = found.length > 0;
+  }
+  return ftsAvailable;
+};
+
+// Turn free text into an FTS5 query: every word must match, and the last
+// word also matches as a prefix so results update while the user types.
+const buildMatchQuery = (text, prefix) => {
+  const terms = String(text).toLowerCase().match(/[\p{L}\p{N}]+/gu) || [];
+  return terms
+    .map((term, i) => `"${term}"${prefix && i === terms.length - 1 ? '*' : ''}`)
+    .join(' ');
+};
+
+const searchProducts = async (sequelize, text, { limit = 20, prefix = true, category } = {}) => {
+  const columns = RESULT_COLUMNS.map(c => `p.${c}`).join(', ');
+
+  if (!await hasSearchIndex(sequelize)) {
+    const pattern = `%${String(text).trim()}%`;
+    return sequelize.query(`
+      SELECT ${columns} FROM Products p
+      WHERE (p.name LIKE :pattern OR p.category LIKE :pattern)
+        ${category ? 'AND p.category = :category' : ''}
+      ORDER BY p.id LIMIT :limit`,
+      { replacements: { pattern, category, limit }, type: QueryTypes.SELECT });
+  }
+
+  const match = buildMatchQuery(text, prefix);
+  if (!match) return [];
+
+  if (category) {
+    return sequelize.query(`
+      SELECT ${columns}, ${SEARCH_TABLE}.rank AS score
+      FROM ${SEARCH_TABLE}
+      JOIN Products p ON p.id = ${SEARCH_TABLE}.rowid
+      WHERE ${SEARCH_TABLE} MATCH :match AND p.category = :category
+      ORDER BY ${SEARCH_TABLE}.rank
+      LIMIT :limit`,
+      { replacements: { match, category, limit }, type: QueryTypes.SELECT });
+  }
+
+  // Pick the top rows inside FTS5 first, then join only those to Products
+  return sequelize.query(`
+    SELECT ${columns}, hits.rank AS score
+    FROM (
+      SELECT rowid, rank FROM ${SEARCH_TABLE}
+      WHERE ${SEARCH_TABLE} MATCH :match
+      ORDER BY rank
+      LIMIT :limit
+    ) hits
+    JOIN Products p ON p.id = hits.rowid
+    ORDER BY hits.rank`,
+    { replacements: { match, limit }, type: QueryTypes.SELECT });
+};
+
+module.exports = { ensureSearchIndex, searchProducts, buildMatchQuery };
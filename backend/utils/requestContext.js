@@ -0,0 +1,25 @@
+// backend/utils/requestContext.js
+// Per-request state that follows a request through every await, so code far
+// from the handler (Sequelize's query logging, for one) can attribute work
+// to the request that caused it.
+const crypto = require('crypto');
+const { AsyncLocalStorage } = require('async_hooks');
+
+const storage = new AsyncLocalStorage();
+
+// Incoming X-Request-Id values are reused only if they look like an id
+const REQUEST_ID = /^[\w.-]{1,64}$/;
+
+// Middleware: start a context for each request, with the caller's
+// X-Request-Id or a new one, echoed on the response
+const requestContext = (req, res, next) => {
+  const incoming = req.get('X-Request-Id');
+  const requestId = incoming && REQUEST_ID.test(incoming) ? incoming : crypto.randomUUID();
+  res.set('X-Request-Id', requestId);
+  storage.run({ req, requestId, queryTimes: [] }, next);
+};
+
+// Context of the request being handled, or undefined outside one
+const current = () => storage.getStore();
+
+module.exports = { requestContext, current };
@@ -0,0 +1,94 @@
+// backend/utils/salesRollup.js
+// Incremental sales rollups behind /api/admin/analytics and /api/admin/sales.
+//
+// Checkout adds each new order to DailySales, ProductDailySales and
+// CustomerSales inside its own transaction, so the reports read a handful of
+// pre-aggregated rows instead of scanning the order history. The
+// sales-rollups batched migration (migrations/batched/sales-rollups.js)
+// rebuilds the tables from existing orders.
+const { QueryTypes } = require('sequelize');
+const { sequelize } = require('../config/database');
+const DailySales = require('../models/DailySales');
+const ProductDailySales = require('../models/ProductDailySales');
+const CustomerSales = require('../models/CustomerSales');
+
+// Rows per INSERT, well below SQLite's bound parameter limit
+const UPSERT_CHUNK = 200;
+
+const pad = (n) => String(n).padStart(2, '0');
+
+// Calendar day in server local time, the same day boundaries the dashboard uses
+const localDay = (date) => {
+  const d = new Date(date);
+  return `${d.getFullYear()}-${pad(d.getMonth() + 1)}-${pad(d.getDate())}`;
+};
+
+const cents = (amount) => Math.round(amount * 100) / 100;
+
+// INSERT rows, adding `sumColumns` onto existing rows with the same key and
+// overwriting `setColumns`. Each row lists keys, then sums, then sets.
+const upsertRows = async (table, keyColumns, sumColumns, setColumns, rows, transaction) => {
+  const columns = [...keyColumns, ...sumColumns, ...setColumns];
+  const updates = [
+    ...sumColumns.map(c => `${c} = ${c} + excluded.${c}`),
+    ...setColumns.map(c => `${c} = excluded.${c}`)
+  ];
+  const placeholder = `(${columns.map(() => '?').join(', ')})`;
+
+  for (let i = 0; i < rows.length; i += UPSERT_CHUNK) {
+    const chunk = rows.slice(i, i + UPSERT_CHUNK);
+    await sequelize.query(
+      `INSERT INTO ${table} (${columns.join(', ')}) VALUES ${chunk.map(() => placeholder).join(', ')} ` +
+      `ON CONFLICT (${keyColumns.join(', ')}) DO UPDATE SET ${updates.join(', ')}`,
+      { replacements: chunk.flat(), type: QueryTypes.BULKUPDATE, transaction });
+  }
+};
+
+// Add orders to every rollup table. Each order needs userId, totalAmount,
+// createdAt and items ([{ productId, name, price, quantity }]).
+const addOrdersToRollups = async (orders, transaction) => {
+  const days = new Map();
+  const products = new Map();
+  const customers = new Map();
+
+  for (const order of orders) {
+    const day = localDay(order.createdAt);
+    const amount = parseFloat(order.totalAmount) || 0;
+
+    const daily = days.get(day) || { revenue: 0, orders: 0 };
+    daily.revenue += amount;
+    daily.orders += 1;
+    days.set(day, daily);
+
+    const customer = customers.get(order.userId) || { totalSpent: 0, orderCount: 0 };
+    customer.totalSpent += amount;
+    customer.orderCount += 1;
+    customers.set(order.userId, customer);
+
+    for (const item of order.items) {
+      const productId = item.productId;
+      const key = `${day}:${productId}`;
+      const quantity = item.quantity || 1;
+      const sold = products.get(key) || { day, productId, quantity: 0, revenue: 0 };
+      sold.productName = item.name;
+      sold.quantity += quantity;
+      sold.revenue += (parseFloat(item.price) || 0) * quantity;
+      products.set(key, sold);
+    }
+  }
+
+  await upsertRows(DailySales.tableName, ['day'], ['revenue', 'orders'], [],
+    [...days].map(([day, d]) => [day, cents(d.revenue), d.orders]), transaction);
+  await upsertRows(ProductDailySales.tableName, ['day', 'productId'], ['quantity', 'revenue'], ['productName'],
+    [...products.values()].map(p => [p.day, p.productId, p.quantity, cents(p.revenue), p.productName]), transaction);
+  await upsertRows(CustomerSales.tableName, ['userId'], ['totalSpent', 'orderCount'], [],
+    [...customers].map(([userId, c]) => [userId, cents(c.totalSpent), c.orderCount]), transaction);
+};
+
+const clearRollups = async (transaction) => {
+  for (const model of [DailySales, ProductDailySales, CustomerSales]) {
+    await model.destroy({ where: {}, transaction });
+  }
+};
+
+module.exports = { localDay, addOrdersToRollups, clearRollups };
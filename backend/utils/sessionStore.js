@@ -0,0 +1,61 @@
+// backend/utils/sessionStore.js
+// express-session store backed by the Sessions table, so every cluster
+// worker sees the same sessions and nothing accumulates in process memory
+// (the default MemoryStore never shrinks and is private to one process).
+//
+// Sessions expire with their cookie, or SESSION_TTL_MS after the last write
+// when the cookie has no expiry. Expired rows are swept every
+// SESSION_PRUNE_INTERVAL_MS.
+const { Op } = require('sequelize');
+const { Store } = require('express-session');
+const Session = require('../models/Session');
+const logger = require('./logger');
+
+const TTL_MS = Number(process.env.SESSION_TTL_MS) || 24 * 60 * 60 * 1000;
+const PRUNE_INTERVAL_MS = Number(process.env.SESSION_PRUNE_INTERVAL_MS) || 15 * 60 * 1000;
+
+const expiresAt = (sess) => {
+  const cookieExpires = sess?.cookie?.expires;
+  return cookieExpires ? new Date(cookieExpires) : new Date(Date.now() + TTL_MS);
+};
+
+// Adapt a promise to express-session's optional node-style callback
+const settle = (promise, callback) => {
+  promise.then((value) => callback && callback(null, value), (error) => callback && callback(error));
+};
+
+class SqliteSessionStore extends Store {
+  constructor() {
+    super();
+    this.pruneTimer = setInterval(() => {
+      this.prune().catch((error) => logger.error('Session prune failed', { err: error }));
+    }, PRUNE_INTERVAL_MS);
+    this.pruneTimer.unref();
+  }
+
+  get(sid, callback) {
+    settle(Session.findByPk(sid).then((row) => (
+      row && row.expires > new Date() ? JSON.parse(row.data) : null
+    )), callback);
+  }
+
+  set(sid, sess, callback) {
+    settle(Session.upsert({ sid, data: JSON.stringify(sess), expires: expiresAt(sess) })
+      .then(() => undefined), callback);
+  }
+
+  touch(sid, sess, callback) {
+    settle(Session.update({ expires: expiresAt(sess) }, { where: { sid } })
+      .then(() => undefined), callback);
+  }
+
+  destroy(sid, callback) {
+    settle(Session.destroy({ where: { sid } }).then(() => undefined), callback);
+  }
+
+  prune() {
+    return Session.destroy({ where: { expires: { [Op.lte]: new Date() } } });
+  }
+}
+
+module.exports = SqliteSessionStore;
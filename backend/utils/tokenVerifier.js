@@ -0,0 +1,58 @@
+// backend/utils/tokenVerifier.js
+// Shared JWT verification with a small in-memory cache of verified claims,
+// so a client sending the same token on every request pays for the HMAC
+// check and JSON parsing once per TTL_MS instead of once per request.
+//
+// Entries are keyed by the whole token (header, payload and signature) and
+// expire after TTL_MS or when the token does, whichever comes first. Tokens
+// that fail verification are never cached. TOKEN_CACHE_TTL_MS=0 turns the
+// cache off, which is how `tests/auth_benchmark.py` measures the raw cost.
+const jwt = require('jsonwebtoken');
+
+const TTL_MS = process.env.TOKEN_CACHE_TTL_MS !== undefined
+  ? Number(process.env.TOKEN_CACHE_TTL_MS)
+  : 5 * 60 * 1000;
+const MAX_ENTRIES = 10000;
+
+const entries = new Map();
+const stats = { hits: 0, misses: 0, failures: 0 };
+
+// Returns the decoded claims or throws like jwt.verify
+const verifyToken = (token) => {
+  const now = Date.now();
+  const entry = entries.get(token);
+  if (entry && entry.expiresAt > now) {
+    stats.hits++;
+    // Re-insert to keep Map order as least-recently-used first
+    entries.delete(token);
+    entries.set(token, entry);
+    return entry.claims;
+  }
+  if (entry) entries.delete(token);
+  stats.misses++;
+
+  let claims;
+  try {
+    claims = jwt.verify(token, process.env.JWT_SECRET);
+  } catch (error) {
+    stats.failures++;
+    throw error;
+  }
+
+  if (TTL_MS > 0) {
+    const expiresAt = Math.min(now + TTL_MS, claims.exp ? claims.exp * 1000 : Infinity);
+    entries.set(token, { claims, expiresAt });
+    if (entries.size > MAX_ENTRIES) {
+      entries.delete(entries.keys().next().value);
+    }
+  }
+  return claims;
+};
+
+// Bearer token from the Authorization header, else the sign-in cookie
+const tokenFrom = (req) =>
+  req.header('Authorization')?.replace('Bearer ', '') || req.cookies?.accessToken;
+
+const getStats = () => ({ ...stats, entries: entries.size, ttlMs: TTL_MS });
+
+module.exports = { verifyToken, tokenFrom, getStats };
@@ -2,9 +2,19 @@
 import React, { useState, useEffect } from 'react';
 import { Link } from 'react-router-dom';
 import Header from './Header';
+import { authHeaders } from '../utils/authHeaders';
 
 const API_BASE_URL = import.meta.env.VITE_API_URL || 'http://localhost:5000';
 
+// Merge a ?response=delta reply (changed lines only) into the current cart
+const applyCartDelta = (cart, delta) => {
+  const changed = new Map(delta.items.map(({ productId, item }) => [String(productId), item]));
+  const items = (cart?.items || [])
+    .map(item => changed.has(String(item.productId)) ? changed.get(String(item.productId)) : item)
+    .filter(Boolean);
+  return { ...cart, items };
+};
+
 const CartPage = ({ handleLogout }) => {
   const [cart, setCart] = useState(null);
   const [loading, setLoading] = useState(true);
@@ -15,12 +25,9 @@ const CartPage = ({ handleLogout }) => {
   const fetchCart = async () => {
     setLoading(true);
     try {
-      const userId = localStorage.getItem('user_id');
-      
       const response = await fetch(`${API_BASE_URL}/api/cart`, {
-        headers: {
-          'x-user-id': userId
-        }
+        headers: authHeaders(),
+        credentials: 'include'
       });
 
       if (response.ok) {
@@ -51,14 +58,13 @@ const CartPage = ({ handleLogout }) => {
     setUpdating(true);
 
     try {
-        const userId = localStorage.getItem('user_id');
-        
-        const response = await fetch(`${API_BASE_URL}/api/cart/update`, {
+        const response = await fetch(`${API_BASE_URL}/api/cart/update?response=delta`, {
             method: 'PUT',
             headers: {
                 'Content-Type': 'application/json',
-                'x-user-id': userId
+                ...authHeaders()
             },
+            credentials: 'include',
             body: JSON.stringify({ 
                 productId: productId, 
                 quantity: newQuantity 
@@ -67,8 +73,8 @@ const CartPage = ({ handleLogout }) => {
 
         if (response.ok) {
             try {
-                const updatedCart = await response.json();
-                setCart(updatedCart);
+                const delta = await response.json();
+                setCart(current => applyCartDelta(current, delta));
                 window.dispatchEvent(new Event('cartUpdated'));
             } catch (parseError) {
                 console.error('Failed to parse update response:', parseError);
@@ -97,19 +103,16 @@ const CartPage = ({ handleLogout }) => {
             return;
         }
         
-        const userId = localStorage.getItem('user_id');
-        
-        const response = await fetch(`${API_BASE_URL}/api/cart/remove/${encodeURIComponent(productId)}`, {
+        const response = await fetch(`${API_BASE_URL}/api/cart/remove/${encodeURIComponent(productId)}?response=delta`, {
             method: 'DELETE',
-            headers: {
-                'x-user-id': userId
-            }
+            headers: authHeaders(),
+            credentials: 'include'
         });
 
         if (response.ok) {
-            // Update local state with the new cart data from the server
-            const updatedCart = await response.json();
-            setCart(updatedCart);
+            // Drop the removed line from local state
+            const delta = await response.json();
+            setCart(current => applyCartDelta(current, delta));
             window.dispatchEvent(new Event('cartUpdated'));
         } else {
             console.error('Failed to remove item from cart.');
@@ -11,7 +11,6 @@ const CategoryPage = ({ handleLogout }) => {
   const { filters } = useFilters();
   const { categorySlug } = useParams(); 
   const [products, setProducts] = useState([]);
-  const [allProducts, setAllProducts] = useState([]);
   const [loading, setLoading] = useState(true);
   
   // Convert 'electronics-tv' to 'Electronics Tv' for display (memoized)
@@ -22,23 +21,35 @@ const CategoryPage = ({ handleLogout }) => {
 
   const baseUrl = 'http://localhost:5000'; 
 
+  // Only the columns ProductCard renders
+  const CARD_FIELDS = 'id,name,image,category,price,rating,numReviews,countInStock';
+
   useEffect(() => {
     const fetchCategoryProducts = async () => {
       setLoading(true);
       try {
-        // Fetch ALL products (for now)
-        const response = await fetch(`${baseUrl}/api/products`);
+        // Category, price range and sorting are applied by the API
+        const params = new URLSearchParams({ category: categoryName, fields: CARD_FIELDS });
+
+        // Price range filter (prices in database are in paisa)
+        if (filters.priceRange) {
+          if (filters.priceRange.includes('+')) {
+            params.set('minPrice', filters.priceRange.replace('+', ''));
+          } else {
+            const [minStr, maxStr] = filters.priceRange.split('-');
+            params.set('minPrice', minStr);
+            params.set('maxPrice', maxStr);
+          }
+        }
+
+        if (filters.sortBy) {
+          params.set('sort', filters.sortBy);
+        }
+
+        const response = await fetch(`${baseUrl}/api/products?${params}`);
         if (!response.ok) throw new Error("Failed to fetch products.");
         
-        const allProductsData = await response.json();
-        
-        // Filter the results to match the current category
-        const categoryProducts = allProductsData.filter(p => 
-          p.category.toLowerCase().includes(categoryName.toLowerCase())
-        );
-
-        setAllProducts(categoryProducts);
-        applyFilters(categoryProducts);
+        setProducts(await response.json());
       } catch (err) {
         console.error("Error fetching or filtering products:", err);
       } finally {
@@ -46,43 +57,7 @@ const CategoryPage = ({ handleLogout }) => {
       }
     };
     fetchCategoryProducts();
-  }, [categorySlug, categoryName]);
-
-  const applyFilters = React.useCallback((productList = allProducts) => {
-    let filtered = [...productList];
-
-    // Apply price range filter (prices in database are in paisa)
-    if (filters.priceRange) {
-      if (filters.priceRange.includes('+')) {
-        const min = Number(filters.priceRange.replace('+', ''));
-        filtered = filtered.filter(product => product.price >= min);
-      } else {
-        const [minStr, maxStr] = filters.priceRange.split('-');
-        const min = Number(minStr);
-        const max = Number(maxStr);
-        filtered = filtered.filter(product => product.price >= min && product.price <= max);
-      }
-    }
-
-
-
-    if (filters.sortBy === 'price-low') {
-      filtered.sort((a, b) => a.price - b.price);
-    } else if (filters.sortBy === 'price-high') {
-      filtered.sort((a, b) => b.price - a.price);
-    } else if (filters.sortBy === 'rating') {
-      filtered.sort((a, b) => b.rating - a.rating);
-    }
-
-    setProducts(filtered);
-  }, [filters]);
-
-  useEffect(() => {
-    if (allProducts.length > 0) {
-      applyFilters(allProducts);
-    }
-  }, [filters]);
-  
+  }, [categorySlug, categoryName, filters]);
 
   if (loading) {
     return (
@@ -4,6 +4,7 @@ import { useTheme } from '../context/ThemeContext';
 import { useWishlist } from '../context/WishlistContext';
 import { useFilters } from '../context/FilterContext';
 import { useUser } from '../context/UserContext';
+import { authHeaders } from '../utils/authHeaders';
 import '../styles/animations.css';
 
 const LogoutButton = () => {
@@ -133,12 +134,9 @@ const Header = ({ hideCategories = false, hideSearchBar = false }) => {
 
   const fetchCartCount = React.useCallback(async () => {
     try {
-      const userId = localStorage.getItem('user_id');
-      
       const response = await fetch('http://localhost:5000/api/cart', {
-        headers: {
-          'x-user-id': userId
-        }
+        headers: authHeaders(),
+        credentials: 'include'
       });
       if (response.ok) {
         const cart = await response.json();
@@ -3,16 +3,21 @@ import React, { useState, useEffect } from 'react';
 const OrderManagement = () => {
   const [orders, setOrders] = useState([]);
   const [loading, setLoading] = useState(true);
+  const [nextCursor, setNextCursor] = useState(null);
 
-  const fetchOrders = async () => {
+  // Orders come newest first, one page at a time; pass the cursor to append the next page
+  const fetchOrders = async (cursor) => {
     try {
       const token = localStorage.getItem('adminToken');
-      const response = await fetch('http://localhost:5000/api/admin/orders', {
+      const params = new URLSearchParams({ limit: '50' });
+      if (cursor) params.set('cursor', cursor);
+      const response = await fetch(`http://localhost:5000/api/admin/orders?${params}`, {
         headers: { 'Authorization': `Bearer ${token}` }
       });
       if (response.ok) {
         const data = await response.json();
-        setOrders(data);
+        setOrders(current => cursor ? [...current, ...data] : data);
+        setNextCursor(response.headers.get('X-Next-Cursor'));
       }
     } catch (error) {
       console.error('Error fetching orders:', error);
@@ -126,6 +131,24 @@ const OrderManagement = () => {
           </tbody>
         </table>
       </div>
+
+      {nextCursor && (
+        <button
+          onClick={() => fetchOrders(nextCursor)}
+          style={{
+            marginTop: '16px',
+            backgroundColor: '#FFD814',
+            color: '#000',
+            border: 'none',
+            padding: '8px 16px',
+            borderRadius: '4px',
+            cursor: 'pointer',
+            fontWeight: 'bold'
+          }}
+        >
+          Load more orders
+        </button>
+      )}
       
       {orders.length === 0 && (
         <div style={{
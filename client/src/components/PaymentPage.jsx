@@ -2,6 +2,7 @@
 import React, { useState } from 'react';
 import { useTheme } from '../context/ThemeContext';
 import Header from './Header';
+import { authHeaders } from '../utils/authHeaders';
 import '../animations.css';
 
 const PaymentPage = ({ handleLogout }) => {
@@ -36,9 +37,7 @@ const PaymentPage = ({ handleLogout }) => {
       let cartResponse;
       try {
         cartResponse = await fetch('http://localhost:5000/api/cart', {
-          headers: {
-            'x-user-id': userId
-          },
+          headers: authHeaders(),
           credentials: 'include'
         });
       } catch (networkError) {
@@ -71,7 +70,7 @@ const PaymentPage = ({ handleLogout }) => {
           method: 'POST',
           headers: {
             'Content-Type': 'application/json',
-            'x-user-id': userId
+            ...authHeaders()
           },
           credentials: 'include'
         });
@@ -3,6 +3,7 @@ import React from 'react';
 import { showToast } from './Toast';
 import { useWishlist } from '../context/WishlistContext';
 import { useTheme } from '../context/ThemeContext';
+import { authHeaders } from '../utils/authHeaders';
 
 const ProductCard = ({ product }) => {
   const { addToWishlist, removeFromWishlist, isInWishlist } = useWishlist();
@@ -16,14 +17,13 @@ const ProductCard = ({ product }) => {
 
   const handleAddToCart = React.useCallback(async () => {
     try {
-      const userId = localStorage.getItem('user_id');
-      
       const response = await fetch('http://localhost:5000/api/cart/add', {
         method: 'POST',
         headers: {
           'Content-Type': 'application/json',
-          'x-user-id': userId
+          ...authHeaders()
         },
+        credentials: 'include',
         body: JSON.stringify({ 
           productId: productId, 
           quantity: 1 
@@ -70,23 +70,32 @@ const ProductCard = ({ product }) => {
         e.currentTarget.style.boxShadow = 'none';
       }}
     >
-      <img 
-        src={`${API_BASE_URL}/${product.image}`} 
-        alt={product.name} 
-        style={{ 
-          width: '100%', 
-          height: '200px', 
-          objectFit: 'cover', 
-          borderRadius: '4px', 
-          marginBottom: '10px',
-          transition: 'all 0.3s ease'
-        }}
+      <picture>
+        {/* Resized WebP variant when the image pipeline has run (see backend/buildImages.js) */}
+        {product.images?.card?.webp && (
+          <source srcSet={`${API_BASE_URL}/${product.images.card.webp}`} type="image/webp" />
+        )}
+        <img 
+          src={`${API_BASE_URL}/${product.image}`} 
+          alt={product.name} 
+          loading="lazy"
+          width={product.images?.card?.width}
+          height={product.images?.card?.height}
+          style={{ 
+            width: '100%', 
+            height: '200px', 
+            objectFit: 'cover', 
+            borderRadius: '4px', 
+            marginBottom: '10px',
+            transition: 'all 0.3s ease'
+          }}
 
-        onError={(e) => {
-            e.target.onerror = null; 
-            e.target.src = PLACEHOLDER_IMAGE 
-        }}
-      />
+          onError={(e) => {
+              e.target.onerror = null; 
+              e.target.src = PLACEHOLDER_IMAGE 
+          }}
+        />
+      </picture>
       <div style={{ display: 'flex', justifyContent: 'space-between', alignItems: 'flex-start' }}>
         <h3 style={{ color: theme.colors.text, fontSize: '1.2em', margin: '5px 0', flex: 1 }}>{product.name}</h3>
         <button
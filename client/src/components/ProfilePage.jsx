@@ -2,6 +2,7 @@
 import React, { useState, useEffect } from 'react';
 import Header from './Header';
 import { useUser } from '../context/UserContext';
+import { authHeaders } from '../utils/authHeaders';
 
 const ProfilePage = ({ handleLogout }) => {
   const { user: contextUser, loading: userLoading } = useUser();
@@ -92,7 +93,7 @@ const ProfilePage = ({ handleLogout }) => {
       if (!userId) return;
       
       const response = await fetch('http://localhost:5000/api/cart/orders', {
-        headers: { 'x-user-id': userId },
+        headers: authHeaders(),
         credentials: 'include'
       });
       
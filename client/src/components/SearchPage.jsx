@@ -24,7 +24,8 @@ const SearchPage = ({ handleLogout }) => {
     const fetchSearchResults = async () => {
       setLoading(true);
       try {
-        const response = await fetch('http://localhost:5000/api/products');
+        // Ranked full-text search runs on the server; only the matches are downloaded
+        const response = await fetch(`http://localhost:5000/api/products/search?q=${encodeURIComponent(query)}&limit=100`);
         if (response.ok) {
           const fetchedProducts = await response.json();
           setAllProducts(fetchedProducts);
@@ -46,11 +47,7 @@ const SearchPage = ({ handleLogout }) => {
   }, [query]);
 
   const applyFilters = (productList = allProducts) => {
-    let filtered = productList.filter(product =>
-      (product.name && product.name.toLowerCase().includes(query.toLowerCase())) ||
-      (product.category && product.category.toLowerCase().includes(query.toLowerCase())) ||
-      (product.brand && product.brand.toLowerCase().includes(query.toLowerCase()))
-    );
+    let filtered = [...productList];
 
     // Apply price range filter (prices in database are in paisa)
     if (filters.priceRange) {
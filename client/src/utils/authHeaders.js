@@ -0,0 +1,8 @@
+// client/src/utils/authHeaders.js
+// Authorization header for the cart and order routes. Email/password logins
+// keep their JWT in localStorage; Google sign-ins only have the httpOnly
+// accessToken cookie, so those requests must also send credentials.
+export const authHeaders = () => {
+  const token = localStorage.getItem('userToken');
+  return token ? { Authorization: `Bearer ${token}` } : {};
+};
@@ -0,0 +1,90 @@
+import csv
+import io
+import json
+
+import pytest
+
+class TestAdminListing:
+    """
+    Admin listings: keyset pagination, filters and streaming export
+    """
+
+    def _walk(self, http, url, headers, params, max_pages=50):
+        rows, cursor = [], None
+        for _ in range(max_pages):
+            page_params = {**params, **({"cursor": cursor} if cursor else {})}
+            response = http.get(url, params=page_params, headers=headers)
+            assert response.status_code == 200
+            rows.extend(response.json())
+            cursor = response.headers.get("X-Next-Cursor")
+            if not cursor:
+                break
+        return rows
+
+    def test_orders_paginate_newest_first(self, http, api_url, auth_headers):
+        """Test walking order pages yields every order once, newest first"""
+        orders = self._walk(http, f"{api_url}/admin/orders", auth_headers, {"limit": 3})
+        ids = [order["id"] for order in orders]
+        assert len(ids) == len(set(ids)), "Order repeated across pages"
+        keys = [(order["createdAt"], order["id"]) for order in orders]
+        assert keys == sorted(keys, reverse=True)
+
+        response = http.get(f"{api_url}/admin/orders", headers=auth_headers)
+        assert len(response.json()) <= 50, "Default page size not applied"
+        print(f"✓ Walked {len(orders)} orders in pages of 3")
+
+    def test_order_filters(self, http, api_url, auth_headers):
+        """Test status and date-range filters, and 400 for bad parameters"""
+        completed = http.get(f"{api_url}/admin/orders", params={"status": "completed", "limit": 200},
+                             headers=auth_headers).json()
+        assert all(order["status"] == "completed" for order in completed)
+
+        response = http.get(f"{api_url}/admin/orders", params={"from": "2999-01-01"}, headers=auth_headers)
+        assert response.status_code == 200 and response.json() == []
+
+        for params in ({"status": "lost"}, {"from": "not-a-date"}, {"cursor": "garbage"}, {"limit": 0}):
+            response = http.get(f"{api_url}/admin/orders", params=params, headers=auth_headers)
+            assert response.status_code == 400, params
+        print("✓ Order filters validated")
+
+    def test_users_listing(self, http, api_url, auth_headers):
+        """Test the user listing hides admins and never returns passwords"""
+        users = self._walk(http, f"{api_url}/admin/users", auth_headers, {"limit": 5})
+        assert all(not user["isAdmin"] for user in users)
+        assert all("password" not in user for user in users)
+
+        everyone = self._walk(http, f"{api_url}/admin/users", auth_headers, {"includeAdmins": "true", "limit": 5})
+        assert any(user["isAdmin"] for user in everyone)
+        print(f"✓ {len(users)} customers listed")
+
+    def test_export_matches_listing(self, http, api_url, auth_headers):
+        """Test NDJSON and CSV exports contain exactly the listed orders"""
+        listed = {order["id"] for order in self._walk(http, f"{api_url}/admin/orders", auth_headers,
+                                                      {"status": "completed", "limit": 200})}
+
+        response = http.get(f"{api_url}/admin/orders/export", params={"status": "completed"},
+                            headers=auth_headers, stream=True)
+        assert response.status_code == 200
+        assert response.headers["Content-Type"].startswith("application/x-ndjson")
+        exported = [json.loads(line) for line in response.iter_lines() if line]
+        assert {order["id"] for order in exported} == listed
+        assert all(isinstance(order["items"], list) for order in exported)
+
+        response = http.get(f"{api_url}/admin/orders/export", params={"status": "completed", "format": "csv"},
+                            headers=auth_headers)
+        assert response.status_code == 200
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        assert {int(row["id"]) for row in rows} == listed
+
+        response = http.get(f"{api_url}/admin/orders/export", params={"format": "xml"}, headers=auth_headers)
+        assert response.status_code == 400
+        print(f"✓ Exported {len(exported)} orders as NDJSON and CSV")
+
+    def test_dashboard_returns_totals(self, http, api_url, auth_headers):
+        """Test the dashboard returns totals instead of every row"""
+        data = http.get(f"{api_url}/admin/dashboard", headers=auth_headers).json()
+        assert set(data) == {"totalUsers", "totalProducts", "totalOrders", "totalRevenue"}
+        print(f"✓ Dashboard totals: {data}")
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
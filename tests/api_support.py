@@ -0,0 +1,86 @@
+"""
+URLs, credentials and token helpers shared by the test suites, conftest.py
+and the benchmark tools. A plain module, so scripts run outside pytest can
+import it too (conftest.py is pytest's to load).
+
+Base URLs come from BACKEND_URL / FRONTEND_URL. Cart owners are synthetic
+user ids; their tokens are signed here with the server's JWT_SECRET (from
+the environment or backend/.env) instead of logging each one in.
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+import os
+import re
+import time
+
+BACKEND_URL = os.environ.get("BACKEND_URL", "http://localhost:5000").rstrip("/")
+FRONTEND_URL = os.environ.get("FRONTEND_URL", "http://localhost:5173").rstrip("/")
+API_URL = f"{BACKEND_URL}/api"
+
+ADMIN_CREDENTIALS = {
+    "email": os.environ.get("ADMIN_EMAIL", "admin@lec.com"),
+    "password": os.environ.get("ADMIN_PASSWORD", "admin@1234")
+}
+
+def _backend_env(name):
+    """Read `name` from backend/.env, the file the dev server loads"""
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend", ".env")
+    try:
+        with open(path) as f:
+            for line in f:
+                key, _, value = line.strip().partition("=")
+                if key.strip() == name:
+                    return value.strip().strip("'\"")
+    except OSError:
+        pass
+    return None
+
+# Falls back to the secret tests/local_backend.py starts the server with
+JWT_SECRET = os.environ.get("JWT_SECRET") or _backend_env("JWT_SECRET") or "local-backend-secret"
+
+# Database the server at BACKEND_URL uses; a relative DB_STORAGE is resolved
+# from backend/, as the server does
+DB_PATH = os.path.normpath(os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "backend",
+    os.environ.get("DB_STORAGE") or _backend_env("DB_STORAGE") or "database.sqlite"))
+
+def _b64url(data):
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+def user_token(user_id, secret=None, expires_in=3600):
+    """HS256 JWT with the claims /api/auth/login issues, for a cart owner"""
+    now = int(time.time())
+    header = _b64url(json.dumps({"alg": "HS256", "typ": "JWT"}).encode())
+    payload = _b64url(json.dumps({"userId": int(user_id), "iat": now, "exp": now + expires_in}).encode())
+    signing_input = f"{header}.{payload}".encode()
+    signature = hmac.new((secret or JWT_SECRET).encode(), signing_input, hashlib.sha256).digest()
+    return f"{header}.{payload}.{_b64url(signature)}"
+
+def user_headers(user_id, secret=None):
+    """Headers identifying `user_id` to the cart and order routes"""
+    return {"Authorization": f"Bearer {user_token(user_id, secret)}"}
+
+_METRIC_LINE = re.compile(r'^([a-zA-Z_:][a-zA-Z0-9_:]*)(?:\{(.*)\})? (\S+)$')
+_METRIC_LABEL = re.compile(r'([a-zA-Z_][a-zA-Z0-9_]*)="((?:[^"\\]|\\.)*)"')
+
+def parse_metrics(text):
+    """Prometheus text format -> {(name, frozenset(labels.items())): value}"""
+    samples = {}
+    for line in text.splitlines():
+        match = _METRIC_LINE.match(line)
+        if not match:
+            continue
+        name, labels, value = match.groups()
+        labels = {k: v.replace('\\"', '"').replace("\\n", "\n").replace("\\\\", "\\")
+                  for k, v in _METRIC_LABEL.findall(labels or "")}
+        samples[(name, frozenset(labels.items()))] = float(value)
+    return samples
+
+def metric_value(samples, name, **labels):
+    """Sum of every `name` sample whose labels include `labels`"""
+    wanted = set(labels.items())
+    return sum(value for (sample, sample_labels), value in samples.items()
+               if sample == name and wanted <= sample_labels)
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Token Verification Benchmark for Amazon Replica
+Measure what JWT verification costs the cart routes under load
+
+Usage:
+    python auth_benchmark.py                     # 50 users, 10s per run
+    python auth_benchmark.py --users 200 --duration 30 --json auth.json
+
+Starts the backend twice on a copy of backend/database.sqlite: once with the
+token cache disabled (TOKEN_CACHE_TTL_MS=0, every request runs jwt.verify)
+and once with the default cache. Each run drives closed-loop GET /api/cart
+traffic from distinct signed users and reports latency, throughput and the
+server's verifier hit/miss counters; the difference between the runs is the
+verification overhead per request.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+
+import requests
+
+from api_support import ADMIN_CREDENTIALS
+from load_harness import run_load
+from local_backend import DEFAULT_DATABASE, LocalBackend
+
+MODES = [
+    ("uncached", {"TOKEN_CACHE_TTL_MS": "0"}),
+    ("cached", {}),
+]
+
+async def read_cart(ctx):
+    """Fetch this user's cart; authentication is the only work besides one query"""
+    await ctx.request("GET /api/cart", "GET", "/cart", headers=ctx.user_headers())
+
+def token_stats(api_url):
+    """Server-side verifier counters from /api/admin/cache-stats"""
+    token = requests.post(f"{api_url}/admin/login", json=ADMIN_CREDENTIALS).json()["token"]
+    response = requests.get(f"{api_url}/admin/cache-stats", headers={"Authorization": f"Bearer {token}"})
+    response.raise_for_status()
+    return response.json()["tokens"]
+
+def run_mode(name, env, args):
+    with LocalBackend(database=args.database, env=env) as backend:
+        # Warm-up run so both modes start with a JIT-compiled server and open connections
+        asyncio.run(run_load(mode="closed", users=args.users, duration=2, mix="cart_read=1",
+                             scenarios={"cart_read": read_cart}, api_url=backend.api_url,
+                             jwt_secret=backend.jwt_secret))
+        report = asyncio.run(run_load(mode="closed", users=args.users, duration=args.duration,
+                                      mix="cart_read=1", scenarios={"cart_read": read_cart},
+                                      api_url=backend.api_url, jwt_secret=backend.jwt_secret))
+        stats = token_stats(backend.api_url)
+
+    op = report['operations']["GET /api/cart"]
+    result = {
+        'median_ms': op['p50_ms'],
+        'p99_ms': op['p99_ms'],
+        'throughput_rps': report['throughput_rps'],
+        'error_rate': report['error_rate'],
+        'verifier': stats
+    }
+    print(f"{name:<10} p50 {op['p50_ms']:>7.2f}ms  p99 {op['p99_ms']:>7.2f}ms  "
+          f"{report['throughput_rps']:>8.1f} req/s  errors {report['error_rate']*100:.2f}%  "
+          f"verifier hits {stats['hits']} misses {stats['misses']}", flush=True)
+    return result
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure JWT verification overhead on the cart routes")
+    parser.add_argument("--users", type=int, default=50, help="virtual users, one token each (default 50)")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per run (default 10)")
+    parser.add_argument("--database", default=DEFAULT_DATABASE, help="database to copy for the runs")
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args(argv)
+
+    print(f"GET /api/cart, {args.users} users, {args.duration:.0f}s per run")
+    print("="*100)
+    results = {name: run_mode(name, env, args) for name, env in MODES}
+
+    uncached, cached = results["uncached"], results["cached"]
+    saved = uncached['median_ms'] - cached['median_ms']
+    print(f"\nVerification overhead per request: {saved:.3f}ms at the median "
+          f"({uncached['throughput_rps']:.1f} -> {cached['throughput_rps']:.1f} req/s)")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.json}")
+    return all(result['error_rate'] == 0 for result in results.values())
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Benchmark Regression Suite for Amazon Replica
+Time every public and admin endpoint and compare against stored baselines
+
+Usage:
+    python benchmark.py run                       # local backend, save benchmarks/<commit>.json
+    python benchmark.py run --api-url http://localhost:5000/api
+    python benchmark.py compare <base> [<current>] --threshold 10
+
+Without --api-url, `run` starts `node server.js` on an ephemeral port
+against a copy of backend/database.sqlite, seeding a fresh one if it does not
+exist, so no network access is needed. Baselines are keyed by git commit;
+`compare` accepts a commit id or a path to a result file and exits non-zero
+when a median or p99 regressed past the threshold.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+import requests
+
+from api_support import ADMIN_CREDENTIALS, API_URL, user_headers
+from local_backend import DEFAULT_DATABASE, LocalBackend
+
+BENCHMARK_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks")
+
+# Cart owner used by the cart benchmarks; kept away from real user ids
+BENCHMARK_USER_ID = "900001"
+
+class BenchmarkClient:
+    """Keep-alive HTTP client with the state the endpoint benchmarks need"""
+
+    def __init__(self, api_url, jwt_secret=None):
+        self.api_url = api_url
+        self.http = requests.Session()
+        self.admin_token = None
+        self.product_id = None
+        self._user_headers = user_headers(BENCHMARK_USER_ID, jwt_secret)
+
+    def prepare(self):
+        response = self.http.post(f"{self.api_url}/auth/login", json=ADMIN_CREDENTIALS)
+        response.raise_for_status()
+        self.admin_token = response.json()["token"]
+        products = self.http.get(f"{self.api_url}/products").json()
+        self.product_id = products[0]["id"]
+
+    def admin_headers(self):
+        return {"Authorization": f"Bearer {self.admin_token}"}
+
+    def user_headers(self):
+        return self._user_headers
+
+    def send(self, method, path, headers=None, json_body=None):
+        response = self.http.request(method, f"{self.api_url}{path}", headers=headers, json=json_body)
+        if response.status_code >= 400:
+            raise RuntimeError(f"{method} {path} -> {response.status_code}: {response.text[:200]}")
+        return response
+
+    def ensure_in_cart(self):
+        self.send("POST", "/cart/add", self.user_headers(),
+                  {"productId": self.product_id, "quantity": 1})
+
+def benchmarks():
+    """
+    (name, setup, request) triples. `setup` runs untimed before every sample,
+    `request` is the timed call.
+    """
+    return [
+        ("GET /api/products",
+         None,
+         lambda c: c.send("GET", "/products")),
+        ("GET /api/cart",
+         BenchmarkClient.ensure_in_cart,
+         lambda c: c.send("GET", "/cart", c.user_headers())),
+        ("POST /api/cart/add",
+         None,
+         lambda c: c.send("POST", "/cart/add", c.user_headers(),
+                          {"productId": c.product_id, "quantity": 1})),
+        ("PUT /api/cart/update",
+         BenchmarkClient.ensure_in_cart,
+         lambda c: c.send("PUT", "/cart/update", c.user_headers(),
+                          {"productId": c.product_id, "quantity": 1})),
+        ("DELETE /api/cart/remove/:productId",
+         BenchmarkClient.ensure_in_cart,
+         lambda c: c.send("DELETE", f"/cart/remove/{c.product_id}", c.user_headers())),
+        ("GET /api/admin/analytics",
+         None,
+         lambda c: c.send("GET", "/admin/analytics", c.admin_headers())),
+        ("GET /api/admin/sales",
+         None,
+         lambda c: c.send("GET", "/admin/sales?period=month", c.admin_headers())),
+        ("GET /api/admin/dashboard",
+         None,
+         lambda c: c.send("GET", "/admin/dashboard", c.admin_headers())),
+        ("GET /api/admin/orders",
+         None,
+         lambda c: c.send("GET", "/admin/orders?limit=50", c.admin_headers())),
+    ]
+
+def robust_stats(samples):
+    """Median, MAD and tail statistics in milliseconds; outliers are counted, not dropped"""
+    ms = sorted(s * 1000 for s in samples)
+    median = statistics.median(ms)
+    mad = statistics.median(abs(x - median) for x in ms)
+    q1, _, q3 = statistics.quantiles(ms, n=4) if len(ms) >= 4 else (ms[0], median, ms[-1])
+    iqr = q3 - q1
+    outliers = sum(1 for x in ms if x < q1 - 1.5 * iqr or x > q3 + 1.5 * iqr)
+    p99_index = max(0, int(round(0.99 * len(ms))) - 1)
+    return {
+        'samples': len(ms),
+        'median_ms': median,
+        'mad_ms': mad,
+        'mean_ms': statistics.fmean(ms),
+        'min_ms': ms[0],
+        'p90_ms': ms[max(0, int(round(0.90 * len(ms))) - 1)],
+        'p99_ms': ms[p99_index],
+        'max_ms': ms[-1],
+        'outliers': outliers
+    }
+
+def run_benchmarks(api_url, warmup, samples, only=None, jwt_secret=None):
+    client = BenchmarkClient(api_url, jwt_secret)
+    client.prepare()
+    results = {}
+
+    for name, setup, call in benchmarks():
+        if only and not any(pattern in name for pattern in only):
+            continue
+        for _ in range(warmup):
+            if setup:
+                setup(client)
+            call(client)
+
+        timings = []
+        for _ in range(samples):
+            if setup:
+                setup(client)
+            start = time.perf_counter()
+            call(client)
+            timings.append(time.perf_counter() - start)
+
+        results[name] = robust_stats(timings)
+        stats = results[name]
+        print(f"{name:<38} median {stats['median_ms']:>8.2f}ms  MAD {stats['mad_ms']:>6.2f}ms  "
+              f"p99 {stats['p99_ms']:>8.2f}ms  ({stats['outliers']} outliers)", flush=True)
+
+    # Leave the benchmark user's cart empty
+    client.http.delete(f"{api_url}/cart/remove/{client.product_id}", headers=client.user_headers())
+    return results
+
+def git_commit():
+    """Current commit id, suffixed with -dirty when the tree has local changes"""
+    root = os.path.dirname(BENCHMARK_DIR)
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short=12", "HEAD"], cwd=root,
+                                capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=root,
+                               capture_output=True, text=True).stdout.strip()
+        return f"{commit}-dirty" if dirty else commit
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+def result_path(ref):
+    """Resolve a commit id or file path to a result file"""
+    if os.path.exists(ref):
+        return ref
+    return os.path.join(BENCHMARK_DIR, f"{ref}.json")
+
+def command_run(args):
+    commit = args.commit or git_commit()
+    print(f"Benchmarking commit {commit}: {args.warmup} warm-up runs, {args.samples} samples per endpoint")
+    print("="*100)
+
+    if args.api_url:
+        results = run_benchmarks(args.api_url.rstrip("/"), args.warmup, args.samples, args.only)
+    else:
+        with LocalBackend(database=args.database) as backend:
+            results = run_benchmarks(backend.api_url, args.warmup, args.samples, args.only,
+                                         backend.jwt_secret)
+
+    report = {
+        'commit': commit,
+        'created': time.strftime("%Y-%m-%dT%H:%M:%S"),
+        'warmup': args.warmup,
+        'samples': args.samples,
+        'results': results
+    }
+    output = args.output or result_path(commit)
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults saved to {output}")
+    return True
+
+def compare(base, current, threshold, p99_threshold):
+    """Return a list of (endpoint, metric, base, current, change%) regressions"""
+    regressions = []
+    print(f"{'Endpoint':<38} {'median':>22} {'p99':>24}")
+    for name, cur in current['results'].items():
+        old = base['results'].get(name)
+        if not old:
+            print(f"{name:<38} (no baseline)")
+            continue
+        line = f"{name:<38}"
+        for metric, limit in (('median_ms', threshold), ('p99_ms', p99_threshold)):
+            change = (cur[metric] - old[metric]) / old[metric] * 100 if old[metric] else 0.0
+            flag = " ❌" if change > limit else ""
+            line += f" {old[metric]:>7.2f}->{cur[metric]:>7.2f} {change:>+6.1f}%{flag}"
+            if change > limit:
+                regressions.append((name, metric, old[metric], cur[metric], change))
+        print(line)
+    return regressions
+
+def command_compare(args):
+    with open(result_path(args.base)) as f:
+        base = json.load(f)
+    with open(result_path(args.current or git_commit())) as f:
+        current = json.load(f)
+
+    p99_threshold = args.p99_threshold if args.p99_threshold is not None else args.threshold
+    print(f"Comparing {current['commit']} against baseline {base['commit']} "
+          f"(median +{args.threshold}%, p99 +{p99_threshold}%)")
+    print("="*100)
+    regressions = compare(base, current, args.threshold, p99_threshold)
+
+    if regressions:
+        print(f"\n⚠️  {len(regressions)} regression(s):")
+        for name, metric, old, new, change in regressions:
+            print(f"  {name} {metric}: {old:.2f}ms -> {new:.2f}ms ({change:+.1f}%)")
+        return False
+    print("\n🎉 No regressions past the threshold")
+    return True
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Endpoint benchmark regression suite")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="benchmark every endpoint and save a baseline")
+    run.add_argument("--api-url", help=f"benchmark a running server instead (e.g. {API_URL})")
+    run.add_argument("--database", default=DEFAULT_DATABASE,
+                     help="seeded SQLite file copied for the local backend")
+    run.add_argument("--warmup", type=int, default=20, help="untimed warm-up runs per endpoint")
+    run.add_argument("--samples", type=int, default=200, help="timed samples per endpoint")
+    run.add_argument("--only", nargs="*", help="only endpoints whose name contains one of these")
+    run.add_argument("--commit", help="key to store the results under (default: git commit)")
+    run.add_argument("--output", help="result file (default: benchmarks/<commit>.json)")
+
+    cmp = sub.add_parser("compare", help="fail when results regressed against a baseline")
+    cmp.add_argument("base", help="baseline commit id or result file")
+    cmp.add_argument("current", nargs="?", help="commit id or result file (default: current commit)")
+    cmp.add_argument("--threshold", type=float, default=10.0,
+                     help="allowed median regression in percent (default 10)")
+    cmp.add_argument("--p99-threshold", type=float,
+                     help="allowed p99 regression in percent (default: --threshold)")
+
+    args = parser.parse_args(argv)
+    return command_run(args) if args.command == "run" else command_compare(args)
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
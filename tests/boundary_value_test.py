@@ -1,4 +1,3 @@
-import requests
 import pytest
 
 class TestBoundaryValue:
@@ -6,9 +5,9 @@ class TestBoundaryValue:
     Boundary Value Testing - Test at boundaries of input domains
     """
     
-    def test_email_length_boundaries(self):
+    def test_email_length_boundaries(self, http, api_url):
         """Test email length boundaries"""
-        base_url = "http://localhost:5000/api/auth/login"
+        base_url = f"{api_url}/auth/login"
         
         # Boundary values for email length
         # Minimum: 1 character
@@ -24,24 +23,24 @@ class TestBoundaryValue:
         
         # Test minimum boundary
         data = {"email": min_email, "password": "admin@1234"}
-        response = requests.post(base_url, json=data)
+        response = http.post(base_url, json=data)
         assert response.status_code in [200, 400]  # Valid format, may not exist
         
         # Test maximum boundary
         data = {"email": max_email, "password": "admin@1234"}
-        response = requests.post(base_url, json=data)
+        response = http.post(base_url, json=data)
         assert response.status_code in [200, 400]
         
         # Test above maximum (should fail)
         data = {"email": above_max_email, "password": "admin@1234"}
-        response = requests.post(base_url, json=data)
+        response = http.post(base_url, json=data)
         assert response.status_code == 400
         
         print("✓ Email length boundaries tested")
     
-    def test_password_length_boundaries(self):
+    def test_password_length_boundaries(self, http, api_url):
         """Test password length boundaries"""
-        base_url = "http://localhost:5000/api/auth/login"
+        base_url = f"{api_url}/auth/login"
         
         # Boundary values for password length
         boundaries = [
@@ -56,7 +55,7 @@ class TestBoundaryValue:
         
         for password, expected_status in boundaries:
             data = {"email": "admin@lec.com", "password": password}
-            response = requests.post(base_url, json=data)
+            response = http.post(base_url, json=data)
             
             if expected_status == 200:
                 assert response.status_code == 200
@@ -64,10 +63,21 @@ class TestBoundaryValue:
                 assert response.status_code == 400
         
         print("✓ Password length boundaries tested")
+
+    def test_register_requires_password(self, http, api_url):
+        """Test registration without a usable password is refused before anything is stored"""
+        for password in [None, "", 12345678]:
+            data = {"username": "No Password", "email": "nopassword@example.com", "address": "1 Test Road"}
+            if password is not None:
+                data["password"] = password
+            response = http.post(f"{api_url}/auth/register", json=data)
+            assert response.status_code == 400, f"password {password!r}: {response.status_code}"
+
+        print("✓ Registration without a password refused")
     
-    def test_product_price_boundaries(self):
+    def test_product_price_boundaries(self, http, api_url):
         """Test product price boundaries"""
-        response = requests.get("http://localhost:5000/api/products")
+        response = http.get(f"{api_url}/products")
         products = response.json()
         
         prices = [p.get("price", 0) for p in products]
@@ -86,13 +96,13 @@ class TestBoundaryValue:
         
         print(f"✓ Price boundaries: Min={min_price}, Max={max_price}")
     
-    def test_api_response_time_boundaries(self):
+    def test_api_response_time_boundaries(self, http, api_url):
         """Test API response time boundaries"""
         import time
         
         # Boundary: Response should be under 5 seconds
         start_time = time.time()
-        response = requests.get("http://localhost:5000/api/products")
+        response = http.get(f"{api_url}/products")
         end_time = time.time()
         
         response_time = end_time - start_time
@@ -104,9 +114,9 @@ class TestBoundaryValue:
         
         print(f"✓ Response time boundary: {response_time:.3f}s < 5.0s")
     
-    def test_product_count_boundaries(self):
+    def test_product_count_boundaries(self, http, api_url):
         """Test product count boundaries"""
-        response = requests.get("http://localhost:5000/api/products")
+        response = http.get(f"{api_url}/products")
         products = response.json()
         
         product_count = len(products)
@@ -0,0 +1,67 @@
+import pytest
+
+from api_support import FRONTEND_URL, user_headers, user_token
+
+CART_USER_ID = "900600"
+
+class TestCartAuth:
+    """
+    Cart identity: signed JWTs verified through the shared token cache
+    """
+
+    def test_requires_valid_token(self, http, api_url):
+        """Test missing, forged and expired tokens are refused"""
+        assert http.get(f"{api_url}/cart").status_code == 401
+        assert http.get(f"{api_url}/cart", headers={"x-user-id": CART_USER_ID}).status_code == 401, \
+            "Bare x-user-id header accepted"
+
+        forged = user_headers(CART_USER_ID, secret="not-the-server-secret")
+        assert http.get(f"{api_url}/cart", headers=forged).status_code == 401
+
+        expired = {"Authorization": f"Bearer {user_token(CART_USER_ID, expires_in=-60)}"}
+        assert http.get(f"{api_url}/cart", headers=expired).status_code == 401
+        print("✓ Missing, forged and expired tokens refused")
+
+    def test_token_identifies_user(self, http, api_url):
+        """Test the cart belongs to the user in the token, via header or cookie"""
+        response = http.get(f"{api_url}/cart", headers=user_headers(CART_USER_ID))
+        assert response.status_code == 200
+        assert str(response.json()["userId"]) == CART_USER_ID
+
+        response = http.get(f"{api_url}/cart", cookies={"accessToken": user_token(CART_USER_ID)})
+        assert response.status_code == 200
+        assert str(response.json()["userId"]) == CART_USER_ID
+        print("✓ Bearer header and cookie both identify the user")
+
+    def test_origin_check(self, http, api_url):
+        """Test only the frontend origin may call the cart from a browser"""
+        headers = user_headers(CART_USER_ID)
+        allowed = http.get(f"{api_url}/cart", headers={**headers, "Origin": FRONTEND_URL})
+        assert allowed.status_code == 200
+
+        for origin in ("http://evil.example", f"{FRONTEND_URL}.evil.example"):
+            response = http.get(f"{api_url}/cart", headers={**headers, "Origin": origin})
+            assert response.status_code == 403, origin
+        response = http.post(f"{api_url}/cart/add", json={"productId": 1, "quantity": 1},
+                             headers={**headers, "Referer": "http://evil.example/page"})
+        assert response.status_code == 403
+        print("✓ Foreign origins refused")
+
+    def test_repeat_requests_hit_cache(self, http, api_url, auth_headers):
+        """Test repeated requests with one token skip re-verification"""
+        headers = user_headers(CART_USER_ID)
+        http.get(f"{api_url}/cart", headers=headers)
+        before = http.get(f"{api_url}/admin/cache-stats", headers=auth_headers).json()["tokens"]
+        for _ in range(5):
+            assert http.get(f"{api_url}/cart", headers=headers).status_code == 200
+        after = http.get(f"{api_url}/admin/cache-stats", headers=auth_headers).json()["tokens"]
+
+        if before["ttlMs"] == 0:
+            pytest.skip("Token cache disabled on this server")
+        # 5 cart reads + the admin token on the final stats call
+        assert after["hits"] - before["hits"] == 6
+        assert after["misses"] == before["misses"]
+        print(f"✓ Token cache: {after}")
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,127 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+
+from api_support import user_headers
+
+CART_USER_ID = "900300"
+HEADERS = user_headers(CART_USER_ID)
+
+@pytest.fixture
+def products(http, api_url):
+    products = [p for p in http.get(f"{api_url}/products").json() if p["countInStock"] > 0]
+    yield products[:3]
+    for product in products[:3]:
+        http.delete(f"{api_url}/cart/remove/{product['id']}", headers=HEADERS)
+
+class TestCartDelta:
+    """
+    Cart writes: upsert add, delta responses and bulk changes
+    """
+
+    def _cart(self, http, api_url):
+        return http.get(f"{api_url}/cart", headers=HEADERS).json()["items"]
+
+    def test_add_returns_delta(self, http, api_url, products):
+        """Test ?response=delta returns the changed line and cart totals"""
+        product = products[0]
+        response = http.post(f"{api_url}/cart/add?response=delta",
+                             json={"productId": product["id"], "quantity": 2}, headers=HEADERS)
+        assert response.status_code == 201
+        data = response.json()
+        assert [entry["productId"] for entry in data["items"]] == [str(product["id"])]
+        assert data["items"][0]["item"]["quantity"] == 2
+
+        cart = self._cart(http, api_url)
+        assert data["totals"]["lines"] == len(cart)
+        assert data["totals"]["quantity"] == sum(item["quantity"] for item in cart)
+        assert data["totals"]["subtotal"] == pytest.approx(sum(item["price"] * item["quantity"] for item in cart))
+        print(f"✓ Delta response: {data['totals']}")
+
+    def test_add_upserts_single_line(self, http, api_url, products):
+        """Test repeated and concurrent adds of one product accumulate on one line"""
+        product = products[0]
+
+        def add(_):
+            with requests.Session() as session:
+                return session.post(f"{api_url}/cart/add?response=delta",
+                                    json={"productId": product["id"], "quantity": 1}, headers=HEADERS).status_code
+
+        with ThreadPoolExecutor(max_workers=10) as pool:
+            statuses = list(pool.map(add, range(10)))
+        assert statuses == [201] * 10
+
+        lines = [item for item in self._cart(http, api_url) if item["productId"] == product["id"]]
+        assert len(lines) == 1, "Duplicate cart lines for one product"
+        assert lines[0]["quantity"] == 10
+        print("✓ 10 concurrent adds merged into one line")
+
+    def test_add_unknown_product(self, http, api_url):
+        """Test adding an unknown product still returns 404"""
+        response = http.post(f"{api_url}/cart/add", json={"productId": 999999}, headers=HEADERS)
+        assert response.status_code == 404
+        print("✓ Unknown product rejected")
+
+    def test_update_and_remove_delta(self, http, api_url, products):
+        """Test update and remove report the changed line, null once removed"""
+        product = products[0]
+        http.post(f"{api_url}/cart/add", json={"productId": product["id"]}, headers=HEADERS)
+
+        response = http.put(f"{api_url}/cart/update?response=delta",
+                            json={"productId": product["id"], "quantity": 4}, headers=HEADERS)
+        assert response.status_code == 200
+        assert response.json()["items"][0]["item"]["quantity"] == 4
+
+        response = http.delete(f"{api_url}/cart/remove/{product['id']}?response=delta", headers=HEADERS)
+        assert response.status_code == 200
+        assert response.json()["items"][0]["item"] is None
+
+        response = http.put(f"{api_url}/cart/update?response=delta",
+                            json={"productId": product["id"], "quantity": 1}, headers=HEADERS)
+        assert response.status_code == 404
+        print("✓ Update and remove deltas")
+
+    def test_default_response_is_full_cart(self, http, api_url, products):
+        """Test writes without ?response=delta still return the whole cart"""
+        for product in products[:2]:
+            response = http.post(f"{api_url}/cart/add", json={"productId": product["id"]}, headers=HEADERS)
+        assert response.status_code == 201
+        assert {item["productId"] for item in response.json()["items"]} >= {p["id"] for p in products[:2]}
+        print("✓ Full cart returned by default")
+
+    def test_bulk_changes(self, http, api_url, products):
+        """Test several changes apply in one request"""
+        first, second, third = products
+        http.post(f"{api_url}/cart/add", json={"productId": third["id"]}, headers=HEADERS)
+
+        response = http.post(f"{api_url}/cart/bulk?response=delta", headers=HEADERS, json={"changes": [
+            {"productId": first["id"], "add": 2},
+            {"productId": second["id"], "add": 1},
+            {"productId": second["id"], "quantity": 5},
+            {"productId": third["id"], "quantity": 0},
+        ]})
+        assert response.status_code == 200
+        items = {entry["productId"]: entry["item"] for entry in response.json()["items"]}
+        assert items[str(first["id"])]["quantity"] == 2
+        assert items[str(second["id"])]["quantity"] == 5
+        assert items[str(third["id"])] is None
+        print("✓ Bulk changes applied")
+
+    def test_bulk_is_atomic(self, http, api_url, products):
+        """Test a failing change leaves the whole cart untouched"""
+        before = self._cart(http, api_url)
+        response = http.post(f"{api_url}/cart/bulk", headers=HEADERS, json={"changes": [
+            {"productId": products[0]["id"], "add": 1},
+            {"productId": 999999, "add": 1},
+        ]})
+        assert response.status_code == 404
+        assert "changes[1]" in response.json()["message"]
+        assert self._cart(http, api_url) == before
+
+        for body in ({}, {"changes": []}, {"changes": [{"productId": products[0]["id"], "add": 0}]}):
+            assert http.post(f"{api_url}/cart/bulk", headers=HEADERS, json=body).status_code == 400
+        print("✓ Failed bulk request rolled back")
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
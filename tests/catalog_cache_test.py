@@ -0,0 +1,102 @@
+import statistics
+import time
+
+import pytest
+
+from api_support import user_headers
+
+CART_USER_ID = "900101"
+
+class TestCatalogCache:
+    """
+    Catalog cache: ETag/304 revalidation and invalidation on product writes
+    """
+
+    def _update(self, http, api_url, auth_headers, product, **changes):
+        body = {key: product[key] for key in ("name", "price", "countInStock", "category")}
+        body.update(changes)
+        response = http.put(f"{api_url}/admin/products/{product['id']}", json=body, headers=auth_headers)
+        assert response.status_code == 200
+
+    def test_etag_and_cache_headers(self, http, api_url):
+        """Test the catalog carries a strong ETag and revalidation headers"""
+        response = http.get(f"{api_url}/products")
+        assert response.status_code == 200
+        etag = response.headers.get("ETag")
+        assert etag and not etag.startswith("W/"), "Expected a strong ETag"
+        assert "no-cache" in response.headers.get("Cache-Control", "")
+        print(f"✓ Catalog ETag {etag}")
+
+    def test_if_none_match_returns_304(self, http, api_url):
+        """Test a matching If-None-Match gets 304 with no body"""
+        etag = http.get(f"{api_url}/products").headers["ETag"]
+        response = http.get(f"{api_url}/products", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.content == b""
+
+        response = http.get(f"{api_url}/products", headers={"If-None-Match": '"stale"'})
+        assert response.status_code == 200
+        print("✓ Conditional GET answered with 304")
+
+    def test_fresh_after_admin_update(self, http, api_url, auth_headers):
+        """Test an admin product update invalidates the cached catalog"""
+        product = http.get(f"{api_url}/products").json()[0]
+        before = http.get(f"{api_url}/products").headers["ETag"]
+
+        self._update(http, api_url, auth_headers, product, countInStock=product["countInStock"] + 7)
+        try:
+            response = http.get(f"{api_url}/products", headers={"If-None-Match": before})
+            assert response.status_code == 200, "Stale catalog served after update"
+            assert response.headers["ETag"] != before
+            updated = next(p for p in response.json() if p["id"] == product["id"])
+            assert updated["countInStock"] == product["countInStock"] + 7
+        finally:
+            self._update(http, api_url, auth_headers, product)
+        print("✓ Catalog fresh after admin update")
+
+    def test_fresh_after_purchase(self, http, api_url):
+        """Test the stock decrement at checkout invalidates the cached catalog"""
+        headers = user_headers(CART_USER_ID)
+        products = http.get(f"{api_url}/products").json()
+        product = next(p for p in products if p["countInStock"] > 1)
+        before = http.get(f"{api_url}/products").headers["ETag"]
+
+        http.post(f"{api_url}/cart/add", json={"productId": product["id"], "quantity": 1}, headers=headers)
+        response = http.post(f"{api_url}/cart/purchase", headers=headers)
+        assert response.status_code == 200
+
+        response = http.get(f"{api_url}/products", headers={"If-None-Match": before})
+        assert response.status_code == 200
+        updated = next(p for p in response.json() if p["id"] == product["id"])
+        assert updated["countInStock"] == product["countInStock"] - 1
+        print("✓ Catalog fresh after checkout")
+
+    def test_hit_path_latency(self, http, api_url, auth_headers):
+        """Measure cache miss vs hit vs 304 latency"""
+        product = http.get(f"{api_url}/products").json()[0]
+        samples = 30
+        miss, hit, not_modified = [], [], []
+
+        for _ in range(samples):
+            # A no-op update still goes through Product.update and invalidates
+            self._update(http, api_url, auth_headers, product)
+            start = time.perf_counter()
+            etag = http.get(f"{api_url}/products").headers["ETag"]
+            miss.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            http.get(f"{api_url}/products")
+            hit.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            assert http.get(f"{api_url}/products", headers={"If-None-Match": etag}).status_code == 304
+            not_modified.append(time.perf_counter() - start)
+
+        miss_ms, hit_ms, nm_ms = (statistics.median(s) * 1000 for s in (miss, hit, not_modified))
+        print(f"✓ Median latency: miss {miss_ms:.2f}ms, hit {hit_ms:.2f}ms "
+              f"({(1 - hit_ms / miss_ms) * 100:.0f}% faster), 304 {nm_ms:.2f}ms")
+        assert hit_ms <= miss_ms
+        assert nm_ms <= miss_ms
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,100 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+
+from api_support import user_headers
+
+# Dedicated cart users so parallel checkouts never share a cart with other suites
+FIRST_USER_ID = 900200
+BUYERS = 20
+STOCK = 5
+
+class TestCheckoutConcurrency:
+    """
+    Checkout under concurrency: stock never oversold, failed carts roll back
+    """
+
+    def _set_stock(self, http, api_url, auth_headers, product, count):
+        body = {key: product[key] for key in ("name", "price", "category")}
+        body["countInStock"] = count
+        response = http.put(f"{api_url}/admin/products/{product['id']}", json=body, headers=auth_headers)
+        assert response.status_code == 200
+
+    def _stock(self, http, api_url, product_id):
+        products = http.get(f"{api_url}/products", params={"fields": "id,countInStock"}).json()
+        return next(p["countInStock"] for p in products if p["id"] == product_id)
+
+    def _clear_cart(self, http, api_url, user_id, product_ids):
+        for product_id in product_ids:
+            http.delete(f"{api_url}/cart/remove/{product_id}", headers=user_headers(user_id))
+
+    def test_parallel_checkouts_never_oversell(self, http, api_url, auth_headers):
+        """Test more buyers than units: exactly STOCK checkouts succeed, stock ends at 0"""
+        products = http.get(f"{api_url}/products").json()
+        product = products[0]
+        users = [FIRST_USER_ID + i for i in range(BUYERS)]
+
+        self._set_stock(http, api_url, auth_headers, product, STOCK)
+        try:
+            for user_id in users:
+                response = http.post(f"{api_url}/cart/add", json={"productId": product["id"], "quantity": 1},
+                                     headers=user_headers(user_id))
+                assert response.status_code == 201
+
+            barrier = threading.Barrier(BUYERS)
+
+            def checkout(user_id):
+                # One session per buyer so requests really run in parallel
+                with requests.Session() as session:
+                    barrier.wait()
+                    response = session.post(f"{api_url}/cart/purchase", headers=user_headers(user_id))
+                    return response.status_code, response.json().get("message", "")
+
+            with ThreadPoolExecutor(max_workers=BUYERS) as pool:
+                results = list(pool.map(checkout, users))
+
+            succeeded = [r for r in results if r[0] == 200]
+            failed = [r for r in results if r[0] != 200]
+            remaining = self._stock(http, api_url, product["id"])
+
+            assert remaining >= 0, f"Stock went negative: {remaining}"
+            assert remaining == STOCK - len(succeeded), "Stock and successful orders disagree"
+            assert len(succeeded) == STOCK, f"Expected {STOCK} sales, got {len(succeeded)}"
+            assert all(status == 400 and "Insufficient stock" in message for status, message in failed)
+            print(f"✓ {BUYERS} parallel checkouts: {len(succeeded)} sold, {len(failed)} refused, stock {remaining}")
+        finally:
+            for user_id in users:
+                self._clear_cart(http, api_url, user_id, [product["id"]])
+            self._set_stock(http, api_url, auth_headers, product, product["countInStock"])
+
+    def test_failed_checkout_rolls_back(self, http, api_url, auth_headers):
+        """Test a cart with one unavailable item leaves stock and cart untouched"""
+        products = [p for p in http.get(f"{api_url}/products").json() if p["countInStock"] > 2]
+        available, scarce = products[0], products[1]
+        user_id = FIRST_USER_ID + BUYERS
+        headers = user_headers(user_id)
+
+        try:
+            for product in (available, scarce):
+                response = http.post(f"{api_url}/cart/add", json={"productId": product["id"], "quantity": 2},
+                                     headers=headers)
+                assert response.status_code == 201
+            self._set_stock(http, api_url, auth_headers, scarce, 1)
+
+            response = http.post(f"{api_url}/cart/purchase", headers=headers)
+            assert response.status_code == 400
+            assert "Insufficient stock" in response.json()["message"]
+
+            assert self._stock(http, api_url, available["id"]) == available["countInStock"], \
+                "Stock decremented for a checkout that failed"
+            cart = http.get(f"{api_url}/cart", headers=headers).json()
+            assert len(cart["items"]) == 2, "Cart cleared by a checkout that failed"
+            print("✓ Failed checkout rolled back")
+        finally:
+            self._clear_cart(http, api_url, user_id, [available["id"], scarce["id"]])
+            self._set_stock(http, api_url, auth_headers, scarce, scarce["countInStock"])
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
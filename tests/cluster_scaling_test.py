@@ -0,0 +1,120 @@
+"""
+Cluster mode test: throughput scales with CLUSTER_WORKERS, crashed workers
+are replaced, cache invalidations reach every worker and SIGTERM drains
+cleanly. Starts its own backends (`node cluster.js`) on copies of the dev
+database, so it needs node and Linux /proc; takes about a minute:
+
+    python -m pytest cluster_scaling_test.py -s
+"""
+
+import asyncio
+import os
+import shutil
+import signal
+import time
+
+import pytest
+import requests
+
+from api_support import ADMIN_CREDENTIALS
+from load_harness import run_load
+from local_backend import LocalBackend
+
+WORKER_COUNTS = [1, 2, 4]
+LOAD_SECONDS = float(os.environ.get("CLUSTER_LOAD_SECONDS", 5))
+LOAD_USERS = 64
+# Throughput with 4 workers must reach this multiple of the 1-worker run
+MIN_SPEEDUP = 1.8
+
+pytestmark = pytest.mark.skipif(shutil.which("node") is None or not os.path.exists("/proc/self/status"),
+                                reason="Needs node and /proc")
+
+def worker_pids(backend):
+    """Child processes of the cluster primary"""
+    pid = backend.process.pid
+    with open(f"/proc/{pid}/task/{pid}/children") as f:
+        return [int(child) for child in f.read().split()]
+
+def wait_for_workers(backend, count, timeout=20):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if len(worker_pids(backend)) == count:
+            return
+        time.sleep(0.1)
+    raise AssertionError(f"Expected {count} workers, found {len(worker_pids(backend))}")
+
+def cluster_backend(workers):
+    return LocalBackend(script="cluster.js", env={"CLUSTER_WORKERS": str(workers)})
+
+def browse_throughput(backend):
+    report = asyncio.run(run_load(mode="closed", users=LOAD_USERS, duration=LOAD_SECONDS,
+                                  mix="browse=1", api_url=backend.api_url))
+    assert report['error_rate'] == 0
+    return report['throughput_rps']
+
+def test_throughput_scales_with_workers():
+    """Test /api/products throughput grows with the number of workers"""
+    if (os.cpu_count() or 1) < max(WORKER_COUNTS):
+        pytest.skip(f"Needs at least {max(WORKER_COUNTS)} CPUs")
+    results = {}
+    for workers in WORKER_COUNTS:
+        with cluster_backend(workers) as backend:
+            wait_for_workers(backend, workers)
+            results[workers] = browse_throughput(backend)
+        print(f"{workers} worker(s): {results[workers]:,.0f} req/s")
+
+    speedup = results[max(WORKER_COUNTS)] / results[1]
+    print(f"Speedup with {max(WORKER_COUNTS)} workers: {speedup:.2f}x")
+    assert speedup >= MIN_SPEEDUP, f"Only {speedup:.2f}x with {max(WORKER_COUNTS)} workers"
+
+def test_crashed_worker_is_replaced():
+    """Test killing a worker leaves the service up and the pool back at full size"""
+    with cluster_backend(2) as backend:
+        wait_for_workers(backend, 2)
+        victim = worker_pids(backend)[0]
+        os.kill(victim, signal.SIGKILL)
+
+        for _ in range(20):
+            assert requests.get(f"{backend.api_url}/products").status_code == 200
+        wait_for_workers(backend, 2)
+        assert victim not in worker_pids(backend)
+        print(f"✓ Worker {victim} replaced")
+
+def test_invalidation_reaches_every_worker():
+    """Test a product update is visible from every worker straight away"""
+    with cluster_backend(4) as backend:
+        wait_for_workers(backend, 4)
+        http = requests.Session()
+        token = http.post(f"{backend.api_url}/admin/login", json=ADMIN_CREDENTIALS).json()["token"]
+        product = http.get(f"{backend.api_url}/products").json()[0]
+
+        # Fresh connections spread over the workers and warm every worker's cache
+        for _ in range(20):
+            requests.get(f"{backend.api_url}/products")
+
+        body = {key: product[key] for key in ("name", "price", "category")}
+        body["countInStock"] = product["countInStock"] + 3
+        response = http.put(f"{backend.api_url}/admin/products/{product['id']}", json=body,
+                            headers={"Authorization": f"Bearer {token}"})
+        assert response.status_code == 200
+        time.sleep(0.2)  # the signal is relayed through the primary
+
+        for _ in range(20):
+            products = requests.get(f"{backend.api_url}/products").json()
+            stock = next(p["countInStock"] for p in products if p["id"] == product["id"])
+            assert stock == body["countInStock"], "A worker served a stale catalog"
+        print("✓ Every worker dropped its cached catalog")
+
+def test_sigterm_drains_and_exits():
+    """Test SIGTERM drains every worker and the primary exits with status 0"""
+    backend = cluster_backend(2).start()
+    try:
+        wait_for_workers(backend, 2)
+        backend.process.send_signal(signal.SIGTERM)
+        assert backend.process.wait(timeout=15) == 0
+        print("✓ Cluster drained and exited with status 0")
+    finally:
+        backend.stop()
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
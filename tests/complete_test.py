@@ -1,47 +1,46 @@
-import requests
 import pytest
 import time
 
 class TestAmazonReplica:
     
-    def test_frontend_loads(self):
+    def test_frontend_loads(self, http, frontend_url):
         """Test that frontend application loads"""
-        response = requests.get("http://localhost:5173")
+        response = http.get(frontend_url)
         assert response.status_code == 200
         print("✓ Frontend application loads successfully")
     
-    def test_login_page_loads(self):
+    def test_login_page_loads(self, http, frontend_url):
         """Test that login page loads"""
-        response = requests.get("http://localhost:5173/login")
+        response = http.get(f"{frontend_url}/login")
         assert response.status_code == 200
         print("✓ Login page loads successfully")
     
-    def test_admin_authentication(self):
+    def test_admin_authentication(self, http, api_url):
         """Test admin login functionality"""
         login_data = {
             "email": "admin@lec.com",
             "password": "admin@1234"
         }
-        response = requests.post("http://localhost:5000/api/auth/login", json=login_data)
+        response = http.post(f"{api_url}/auth/login", json=login_data)
         assert response.status_code == 200
         data = response.json()
         assert "token" in data
         assert data["user"]["email"] == "admin@lec.com"
         print("✓ Admin authentication works")
     
-    def test_invalid_login(self):
+    def test_invalid_login(self, http, api_url):
         """Test invalid login credentials"""
         login_data = {
             "email": "wrong@email.com",
             "password": "wrongpass"
         }
-        response = requests.post("http://localhost:5000/api/auth/login", json=login_data)
+        response = http.post(f"{api_url}/auth/login", json=login_data)
         assert response.status_code == 400
         print("✓ Invalid login properly rejected")
     
-    def test_products_api(self):
+    def test_products_api(self, http, api_url):
         """Test products API endpoint"""
-        response = requests.get("http://localhost:5000/api/products")
+        response = http.get(f"{api_url}/products")
         assert response.status_code == 200
         products = response.json()
         assert len(products) > 0
@@ -49,22 +48,16 @@ class TestAmazonReplica:
         assert "price" in products[0]
         print(f"✓ Products API returns {len(products)} products")
     
-    def test_cart_functionality(self):
+    def test_cart_functionality(self, http, api_url, auth_headers):
         """Test cart operations"""
-        # Login first
-        login_data = {"email": "admin@lec.com", "password": "admin@1234"}
-        login_response = requests.post("http://localhost:5000/api/auth/login", json=login_data)
-        token = login_response.json()["token"]
-        headers = {"Authorization": f"Bearer {token}"}
-        
         # Get cart
-        cart_response = requests.get("http://localhost:5000/api/cart", headers=headers)
+        cart_response = http.get(f"{api_url}/cart", headers=auth_headers)
         assert cart_response.status_code in [200, 404]  # Cart might be empty
         print("✓ Cart API accessible")
     
-    def test_google_oauth_endpoint(self):
+    def test_google_oauth_endpoint(self, http, api_url):
         """Test Google OAuth endpoint exists"""
-        response = requests.get("http://localhost:5000/api/auth/google", allow_redirects=False)
+        response = http.get(f"{api_url}/auth/google", allow_redirects=False)
         assert response.status_code in [302, 200]  # Redirect to Google or success
         print("✓ Google OAuth endpoint configured")
 
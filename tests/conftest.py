@@ -0,0 +1,175 @@
+"""
+Shared fixtures for the Amazon Replica test suites.
+
+Base URLs, credentials and token helpers live in api_support.py. All suites
+share one keep-alive HTTP session, and the admin JWT is fetched once and
+reused from the pytest cache until it is about to expire, so the server only
+runs a bcrypt compare when a login is actually under test.
+
+Tests that must not share server state use `isolated_backend`: a backend of
+their own on a clone of a seeded template database, built once per run.
+`legacy_database` is a copy of the dev database with orders whose line
+items exist only in the old JSON blob, for the migration and backfill tests.
+"""
+
+import base64
+import hashlib
+import json
+import os
+import random
+import shutil
+import sqlite3
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import requests
+from requests.adapters import HTTPAdapter
+
+from api_support import (ADMIN_CREDENTIALS, API_URL, BACKEND_URL, DB_PATH, FRONTEND_URL, JWT_SECRET,
+                         parse_metrics)
+from local_backend import DEFAULT_DATABASE, LocalBackend, build_template, run_script
+
+HTTP_POOL_SIZE = int(os.environ.get("HTTP_POOL_SIZE", "16"))
+
+# Refresh a cached token this many seconds before it actually expires
+TOKEN_EXPIRY_MARGIN = 60
+
+# Attempts when a login is refused with 429 (too many logins in flight)
+LOGIN_RETRIES = 5
+
+# Orders legacy_database adds with their line items only in the JSON blob
+LEGACY_ORDERS = 5000
+
+def _token_expiry(token):
+    """Return the `exp` claim of a JWT, or 0 if it cannot be read"""
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        return int(json.loads(base64.urlsafe_b64decode(payload)).get("exp", 0))
+    except (IndexError, ValueError, TypeError):
+        return 0
+
+@pytest.fixture(scope="session")
+def backend_url():
+    return BACKEND_URL
+
+@pytest.fixture(scope="session")
+def frontend_url():
+    return FRONTEND_URL
+
+@pytest.fixture(scope="session")
+def api_url():
+    return API_URL
+
+@pytest.fixture(scope="session")
+def http():
+    """Keep-alive HTTP session with a sized connection pool"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    yield session
+    session.close()
+
+@pytest.fixture
+def scrape_metrics(http):
+    """Fetch and parse the backend's /metrics"""
+    def scrape():
+        response = http.get(f"{BACKEND_URL}/metrics")
+        assert response.status_code == 200, f"/metrics returned {response.status_code}"
+        return parse_metrics(response.text)
+    return scrape
+
+@pytest.fixture(scope="session")
+def admin_login(request, http):
+    """
+    Admin login response (token and user), obtained once and reused across
+    runs and worker processes until the token expires. The cache key covers
+    the signing secret and the database as well as the server, and a cached
+    token is only reused once an admin route accepts it.
+    """
+    server = hashlib.sha256(f"{JWT_SECRET}\0{DB_PATH}".encode()).hexdigest()[:16]
+    cache_key = f"amazon_replica/login/{BACKEND_URL}/{ADMIN_CREDENTIALS['email']}/{server}"
+    cached = request.config.cache.get(cache_key, None)
+    if cached and _token_expiry(cached.get("token", "")) > time.time() + TOKEN_EXPIRY_MARGIN:
+        check = http.get(f"{API_URL}/admin/cache-stats",
+                         headers={"Authorization": f"Bearer {cached['token']}"})
+        if check.status_code == 200:
+            return cached
+
+    response = http.post(f"{API_URL}/auth/login", json=ADMIN_CREDENTIALS)
+    # Parallel workers may all log in at once and hit the per-IP login limit
+    for _ in range(LOGIN_RETRIES):
+        if response.status_code != 429:
+            break
+        time.sleep(float(response.headers.get("Retry-After", 1)))
+        response = http.post(f"{API_URL}/auth/login", json=ADMIN_CREDENTIALS)
+    assert response.status_code == 200, f"Admin login failed: {response.status_code}"
+    data = response.json()
+    request.config.cache.set(cache_key, {"token": data["token"], "user": data["user"]})
+    return data
+
+@pytest.fixture(scope="session")
+def admin_token(admin_login):
+    return admin_login["token"]
+
+@pytest.fixture(scope="session")
+def auth_headers(admin_token):
+    return {"Authorization": f"Bearer {admin_token}"}
+
+@pytest.fixture(scope="session")
+def template_database(tmp_path_factory):
+    """
+    Seeded database to clone private databases from. run_all_tests.py --local
+    builds one per run and shares it with every worker via TEMPLATE_DATABASE.
+    """
+    path = os.environ.get("TEMPLATE_DATABASE")
+    if path:
+        return path
+    if shutil.which("node") is None:
+        pytest.skip("Needs node")
+    path = str(tmp_path_factory.mktemp("template") / "template.sqlite")
+    build_template(path)
+    return path
+
+@pytest.fixture
+def isolated_backend(template_database):
+    """Backend on a private clone of the template database"""
+    with LocalBackend(database=template_database, template=True) as backend:
+        yield backend
+
+def _add_legacy_orders(db_path, count, seed=7):
+    """Insert `count` orders that keep their line items only in the JSON blob"""
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    conn = sqlite3.connect(db_path)
+    rows = []
+    for i in range(count):
+        items = [{"id": rng.randint(1, 10**6), "userId": 900500 + i % 300, "productId": rng.randint(1, 50),
+                  "name": f"Product {i % 50}", "image": "images/legacy.jpg",
+                  "price": rng.randint(100, 5000), "quantity": rng.randint(1, 3)}
+                 for _ in range(rng.randint(1, 4))]
+        total = sum(item["price"] * item["quantity"] for item in items)
+        created = (now - timedelta(minutes=rng.randint(0, 60 * 24 * 400))).strftime("%Y-%m-%d %H:%M:%S.000 +00:00")
+        rows.append((str(900500 + i % 300), f"LG{seed}{i:08d}", json.dumps(items), total, created, created))
+    with conn:
+        conn.executemany("""
+            INSERT INTO Orders (userId, orderId, items, totalAmount, status, createdAt, updatedAt)
+            VALUES (?, ?, ?, ?, 'completed', ?, ?)""", rows)
+    conn.close()
+
+@pytest.fixture
+def legacy_database():
+    """Copy of the dev database with LEGACY_ORDERS JSON-only orders added"""
+    if not os.path.exists(DEFAULT_DATABASE) or shutil.which("node") is None:
+        pytest.skip("Needs node and backend/database.sqlite")
+    workdir = tempfile.mkdtemp(prefix="order-items-")
+    db_path = os.path.join(workdir, "database.sqlite")
+    shutil.copyfile(DEFAULT_DATABASE, db_path)
+    # Let the server create OrderItems and the other new tables first
+    run_script("migrateBatched.js", db_path, "order-items")
+    _add_legacy_orders(db_path, LEGACY_ORDERS)
+    yield db_path
+    shutil.rmtree(workdir, ignore_errors=True)
@@ -1,11 +1,10 @@
-import requests
 import pytest
 
 class TestDatabase:
     
-    def test_data_retrieval(self):
+    def test_data_retrieval(self, http, api_url):
         """Test database data retrieval operations"""
-        response = requests.get("http://localhost:5000/api/products")
+        response = http.get(f"{api_url}/products")
         assert response.status_code == 200
         products = response.json()
         
@@ -21,11 +20,11 @@ class TestDatabase:
         
         print(f"✓ Retrieved {len(products)} products from database")
     
-    def test_data_consistency(self):
+    def test_data_consistency(self, http, api_url):
         """Test data consistency across requests"""
         # Make multiple requests
-        response1 = requests.get("http://localhost:5000/api/products")
-        response2 = requests.get("http://localhost:5000/api/products")
+        response1 = http.get(f"{api_url}/products")
+        response2 = http.get(f"{api_url}/products")
         
         assert response1.status_code == 200
         assert response2.status_code == 200
@@ -39,14 +38,10 @@ class TestDatabase:
         
         print("✓ Database data consistency verified")
     
-    def test_user_data_operations(self):
+    def test_user_data_operations(self, admin_login):
         """Test user-related database operations"""
-        # Test login (reads user from database)
-        login_data = {"email": "admin@lec.com", "password": "admin@1234"}
-        response = requests.post("http://localhost:5000/api/auth/login", json=login_data)
-        
-        assert response.status_code == 200
-        user_data = response.json()
+        # Login reads the user from the database (once per run, then cached)
+        user_data = admin_login
         
         # Verify user data structure
         assert "user" in user_data
@@ -55,9 +50,9 @@ class TestDatabase:
         
         print("✓ User database operations work")
     
-    def test_product_categories(self):
+    def test_product_categories(self, http, api_url):
         """Test product categorization in database"""
-        response = requests.get("http://localhost:5000/api/products")
+        response = http.get(f"{api_url}/products")
         products = response.json()
         
         # Check categories exist
@@ -69,9 +64,9 @@ class TestDatabase:
         assert len(categories) > 0
         print(f"✓ Found {len(categories)} product categories")
     
-    def test_data_validation(self):
+    def test_data_validation(self, http, api_url):
         """Test database data validation"""
-        response = requests.get("http://localhost:5000/api/products")
+        response = http.get(f"{api_url}/products")
         products = response.json()
         
         for product in products:
@@ -90,12 +85,12 @@ class TestDatabase:
         
         print("✓ Database data validation passed")
     
-    def test_database_performance(self):
+    def test_database_performance(self, http, api_url):
         """Test database response performance"""
         import time
         
         start_time = time.time()
-        response = requests.get("http://localhost:5000/api/products")
+        response = http.get(f"{api_url}/products")
         end_time = time.time()
         
         response_time = end_time - start_time
@@ -0,0 +1,429 @@
+#!/usr/bin/env python3
+"""
+Synthetic Data Generator for Amazon Replica
+Fill a SQLite database with production-sized, reproducible data
+
+Usage:
+    python datagen.py --scale small                  # ~150k rows into backend/database.sqlite
+    python datagen.py --scale large --database /tmp/perf.sqlite --reset
+    python datagen.py --products 50000 --orders 1000000 --seed 7
+
+Writes products, users, cart lines, orders and order items straight into
+SQLite with batched executemany in large transactions:
+- Product popularity follows a Zipf law, so a few products dominate orders
+  and carts, and review counts follow popularity.
+- Order times are bursty: a weekly cycle, a growth trend, a holiday season,
+  random promotion days with several times the normal volume and a diurnal
+  curve within each day.
+- The same --seed and --end on the same starting database give an
+  identical database, so benchmark runs are comparable.
+
+The schema is the backend's: a database without tables is first seeded with
+seeder.js and createAdmin.js (needs node). Generated users share the admin's
+password hash, so they log in with the admin password. Secondary indexes
+and the search triggers are dropped during the load and rebuilt once at the
+end, and the sales rollups are rebuilt with backfillRollups.js when node is
+available.
+"""
+
+import argparse
+import bisect
+import itertools
+import math
+import os
+import random
+import shutil
+import sqlite3
+import subprocess
+import sys
+import time
+from array import array
+from datetime import datetime, timedelta, timezone
+
+from local_backend import BACKEND_DIR, DEFAULT_DATABASE, seed_database
+from search_benchmark import BRANDS, CATEGORIES
+
+SCALES = {
+    # products, users, orders, cart lines (order items come to ~1.9 per order)
+    "small": (10_000, 5_000, 50_000, 5_000),
+    "medium": (100_000, 50_000, 500_000, 50_000),
+    "large": (500_000, 1_000_000, 3_500_000, 200_000),
+}
+
+# Median price and spread (lognormal sigma) per category, in whole rupees
+PRICES = {
+    "Electronics": (8000, 1.1),
+    "Apparel": (1500, 0.7),
+    "Home & Kitchen": (2500, 0.9),
+    "Books": (450, 0.5),
+    "Sports & Outdoors": (2000, 0.9),
+}
+FIRST_NAMES = ["Aarav", "Priya", "Rohan", "Ananya", "Vikram", "Meera", "Arjun", "Kavya",
+               "Sam", "Alex", "Maria", "Chen", "Fatima", "Lucas", "Zoe", "Omar"]
+LAST_NAMES = ["Sharma", "Patel", "Iyer", "Khan", "Reddy", "Singh", "Garcia", "Smith",
+              "Nguyen", "Kim", "Okafor", "Müller", "Rossi", "Silva", "Cohen", "Das"]
+CITIES = ["Mumbai", "Delhi", "Bengaluru", "Chennai", "Kolkata", "Pune", "Hyderabad", "Jaipur"]
+
+PRODUCT_ZIPF = 1.1   # popularity exponent over product rank
+USER_ZIPF = 0.7      # a minority of customers places most orders
+PROMO_DAY_RATE = 0.03
+# Relative order volume per hour of the day (server time)
+HOURLY = [2, 1, 1, 1, 1, 2, 3, 5, 7, 8, 8, 9, 10, 9, 8, 8, 9, 10, 12, 14, 15, 13, 9, 5]
+# Loaded tables whose secondary indexes and triggers are dropped during the load
+LOADED_TABLES = ["Products", "Users", "Carts", "Orders", "OrderItems"]
+BATCH_ROWS = 10_000
+TRANSACTION_ROWS = 500_000
+
+def sql_time(epoch):
+    """Timestamp in the format Sequelize stores in SQLite"""
+    return datetime.fromtimestamp(epoch, timezone.utc).strftime("%Y-%m-%d %H:%M:%S.000 +00:00")
+
+def delivery_date(epoch):
+    """Delivery date formatted like checkout does (en-IN long date)"""
+    day = datetime.fromtimestamp(epoch, timezone.utc)
+    return f"{day:%A}, {day.day} {day:%B} {day.year}"
+
+class ZipfSampler:
+    """
+    Draw ids with probability proportional to 1 / rank**exponent. Ranks are
+    assigned to ids in a seeded random order, so popularity is unrelated to
+    id or creation time.
+    """
+
+    def __init__(self, ids, exponent, rng):
+        self.ids = list(ids)
+        rng.shuffle(self.ids)
+        self.cum_weights = list(itertools.accumulate(1 / rank ** exponent
+                                                     for rank in range(1, len(self.ids) + 1)))
+        self.rng = rng
+
+    def rank_of(self):
+        """Map of id -> popularity rank (1 = most popular)"""
+        return {id_: rank for rank, id_ in enumerate(self.ids, 1)}
+
+    def sample(self, k=1):
+        return self.rng.choices(self.ids, cum_weights=self.cum_weights, k=k)
+
+    def distinct(self, k):
+        """Up to k distinct ids, for one order or cart"""
+        chosen = []
+        for id_ in self.sample(k * 2):
+            if id_ not in chosen:
+                chosen.append(id_)
+                if len(chosen) == k:
+                    break
+        return chosen
+
+def order_times(count, start, days, rng):
+    """
+    `count` sorted epoch seconds over `days` days from `start`, with weekly,
+    trend, seasonal and promotion-day bursts plus a diurnal curve
+    """
+    day_weights = []
+    promo_days = []
+    for d in range(days):
+        day = start + timedelta(days=d)
+        weight = 1.3 if day.weekday() >= 5 else 1.0
+        weight *= 0.6 + 0.8 * d / max(days - 1, 1)
+        if day.month in (11, 12):
+            weight *= 1.6
+        weight *= rng.gammavariate(4, 0.25)
+        if rng.random() < PROMO_DAY_RATE:
+            weight *= rng.uniform(2, 5)
+            promo_days.append(d)
+        day_weights.append(weight)
+    day_cum = list(itertools.accumulate(day_weights))
+    hour_cum = list(itertools.accumulate(HOURLY))
+    # Promotions open with a rush: half their orders land in a 2-hour window
+    promo_hour = {d: rng.randrange(8, 22) for d in promo_days}
+
+    base = int(start.timestamp())
+    times = array("q")
+    for d in rng.choices(range(days), cum_weights=day_cum, k=count):
+        if d in promo_hour and rng.random() < 0.5:
+            hour = promo_hour[d] + rng.randrange(2)
+        else:
+            hour = bisect.bisect(hour_cum, rng.random() * hour_cum[-1])
+        times.append(base + d * 86400 + hour * 3600 + rng.randrange(3600))
+    return array("q", sorted(times))
+
+class Generator:
+    def __init__(self, conn, seed, end, days):
+        self.conn = conn
+        self.seed = seed
+        self.end = end
+        self.days = days
+        self.start = end - timedelta(days=days)
+        self.products = {}   # id -> (name, image, price)
+        self.user_ids = []
+        self.product_sampler = None
+
+    def rng(self, table):
+        """Independent stream per table, so one table's size never shifts another's data"""
+        return random.Random(f"{self.seed}:{table}")
+
+    def next_id(self, table):
+        return self.conn.execute(f"SELECT COALESCE(MAX(id), 0) + 1 FROM {table}").fetchone()[0]
+
+    def load(self, table, columns, rows):
+        """executemany in BATCH_ROWS chunks, committing every TRANSACTION_ROWS rows"""
+        sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+        start = time.perf_counter()
+        total = 0
+        rows = iter(rows)
+        self.conn.execute("BEGIN")
+        while True:
+            batch = list(itertools.islice(rows, BATCH_ROWS))
+            if not batch:
+                break
+            self.conn.executemany(sql, batch)
+            total += len(batch)
+            if total % TRANSACTION_ROWS < BATCH_ROWS:
+                self.conn.execute("COMMIT")
+                self.conn.execute("BEGIN")
+        self.conn.execute("COMMIT")
+        elapsed = time.perf_counter() - start
+        print(f"{table:<12} {total:>10,} rows in {elapsed:6.1f}s ({total / max(elapsed, 1e-9):,.0f} rows/s)",
+              flush=True)
+        return total
+
+    def generate_products(self, count):
+        rng = self.rng("Products")
+        first = self.next_id("Products")
+        images = {}
+        for category, image in self.conn.execute("SELECT category, image FROM Products"):
+            images.setdefault(category, []).append(image)
+        categories = list(CATEGORIES)
+        ids = range(first, first + count)
+        self.product_sampler = ZipfSampler(ids, PRODUCT_ZIPF, self.rng("popularity"))
+        rank_of = self.product_sampler.rank_of()
+
+        def rows():
+            for id_ in ids:
+                category = rng.choice(categories)
+                words = CATEGORIES[category]
+                name = f"{rng.choice(BRANDS)} {' '.join(rng.sample(words, 3))} {id_}"
+                description = " ".join(rng.choices(words + BRANDS, k=20))
+                image = rng.choice(images.get(category) or [f"images/{category.split()[0].lower()}_1.jpg"])
+                median, sigma = PRICES[category]
+                price = max(49, round(median * math.exp(rng.gauss(0, sigma))))
+                stock = 0 if rng.random() < 0.05 else rng.randint(1, 500)
+                reviews = int(5000 / rank_of[id_] ** 0.8 * rng.uniform(0.5, 1.5))
+                rating = round(min(5.0, max(1.0, rng.gauss(4.2, 0.5))), 1) if reviews else 0
+                created = sql_time(self.start.timestamp() + rng.uniform(-365, self.days) * 86400)
+                self.products[id_] = (name, image, price)
+                yield (id_, name, image, description, category, price, stock, rating, reviews,
+                       created, created)
+
+        return self.load("Products", ["id", "name", "image", "description", "category", "price",
+                                      "countInStock", "rating", "numReviews", "createdAt", "updatedAt"],
+                         rows())
+
+    def generate_users(self, count):
+        rng = self.rng("Users")
+        first = self.next_id("Users")
+        row = self.conn.execute("SELECT password FROM Users WHERE isAdmin = 1 AND password IS NOT NULL "
+                                "ORDER BY id LIMIT 1").fetchone()
+        password = row[0] if row else None
+        self.user_ids = list(range(first, first + count))
+
+        def rows():
+            for id_ in self.user_ids:
+                name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+                address = f"{rng.randint(1, 999)} {rng.choice(LAST_NAMES)} Road, {rng.choice(CITIES)}"
+                created = sql_time(self.start.timestamp() - rng.uniform(0, 365) * 86400)
+                yield (id_, name, f"user{id_}@example.com", password, address, 1, 0, created, created)
+
+        return self.load("Users", ["id", "username", "email", "password", "address", "isEmailVerified",
+                                   "isAdmin", "createdAt", "updatedAt"], rows())
+
+    def generate_carts(self, count):
+        rng = self.rng("Carts")
+
+        def rows():
+            written = 0
+            for user_id in rng.sample(self.user_ids, min(len(self.user_ids), count)):
+                for product_id in self.product_sampler.distinct(min(count - written, rng.randint(1, 5))):
+                    name, image, price = self.products[product_id]
+                    yield (user_id, product_id, rng.choice((1, 1, 1, 2, 3)), name, image, price)
+                    written += 1
+                if written >= count:
+                    return
+
+        return self.load("Carts", ["userId", "productId", "quantity", "name", "image", "price"], rows())
+
+    def generate_orders(self, count):
+        rng = self.rng("Orders")
+        first = self.next_id("Orders")
+        times = order_times(count, self.start, self.days, self.rng("order-times"))
+        users = ZipfSampler(self.user_ids, USER_ZIPF, self.rng("customers"))
+        recent = (self.end - timedelta(days=10)).timestamp()
+        items = []
+
+        def rows():
+            for offset, epoch in enumerate(times):
+                id_ = first + offset
+                created = sql_time(epoch)
+                lines = self.product_sampler.distinct(min(1 + int(rng.expovariate(0.9)), 10))
+                total = quantity = 0
+                for product_id in lines:
+                    name, image, price = self.products[product_id]
+                    qty = rng.choice((1, 1, 1, 1, 1, 1, 1, 1, 2, 2, 3))
+                    items.append((id_, product_id, name, image, price, qty, created))
+                    total += price * qty
+                    quantity += qty
+                if epoch >= recent:
+                    status = rng.choices(("pending", "shipped", "completed", "cancelled"), (4, 4, 1, 1))[0]
+                else:
+                    status = "cancelled" if rng.random() < 0.04 else "completed"
+                yield (id_, str(users.sample()[0]), f"GN{id_:010d}", "[]", lines[0],
+                       f"{len(lines)} item{'s' if len(lines) > 1 else ''}", quantity, total, total,
+                       status, delivery_date(epoch + rng.randint(1, 10) * 86400), created, created)
+
+        def order_items():
+            # Orders are generated in batches; their items follow each batch
+            order_rows = rows()
+            while True:
+                batch = list(itertools.islice(order_rows, BATCH_ROWS))
+                if not batch:
+                    return
+                yield batch, items[:]
+                items.clear()
+
+        start = time.perf_counter()
+        order_sql = """
+            INSERT INTO Orders (id, userId, orderId, items, productId, productName, quantity, price,
+                                totalAmount, status, deliveryDate, createdAt, updatedAt)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"""
+        item_sql = """
+            INSERT INTO OrderItems (orderId, productId, name, image, price, quantity, createdAt)
+            VALUES (?, ?, ?, ?, ?, ?, ?)"""
+        orders = lines = 0
+        self.conn.execute("BEGIN")
+        for order_batch, item_batch in order_items():
+            self.conn.executemany(order_sql, order_batch)
+            self.conn.executemany(item_sql, item_batch)
+            orders += len(order_batch)
+            lines += len(item_batch)
+            if orders % TRANSACTION_ROWS < BATCH_ROWS:
+                self.conn.execute("COMMIT")
+                self.conn.execute("BEGIN")
+        self.conn.execute("COMMIT")
+        elapsed = time.perf_counter() - start
+        print(f"{'Orders':<12} {orders:>10,} rows + {lines:,} items in {elapsed:6.1f}s "
+              f"({(orders + lines) / max(elapsed, 1e-9):,.0f} rows/s)", flush=True)
+        return orders + lines
+
+def drop_secondary_objects(conn):
+    """Drop indexes and triggers on the loaded tables; return their SQL to recreate"""
+    placeholders = ", ".join("?" * len(LOADED_TABLES))
+    objects = conn.execute(f"""
+        SELECT type, name, sql FROM sqlite_master
+        WHERE type IN ('index', 'trigger') AND sql IS NOT NULL AND tbl_name IN ({placeholders})""",
+                           LOADED_TABLES).fetchall()
+    for type_, name, _ in objects:
+        conn.execute(f'DROP {type_.upper()} "{name}"')
+    return [sql for _, _, sql in objects]
+
+def rebuild_secondary_objects(conn, statements):
+    start = time.perf_counter()
+    for sql in statements:
+        conn.execute(sql)
+    has_search = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'ProductSearch'").fetchone()
+    if has_search:
+        conn.execute("INSERT INTO ProductSearch(ProductSearch) VALUES ('rebuild')")
+    print(f"Rebuilt {len(statements)} indexes and triggers"
+          f"{' and the search index' if has_search else ''} in {time.perf_counter() - start:.1f}s", flush=True)
+
+def rebuild_rollups(db_path):
+    if shutil.which("node") is None:
+        print("⚠️  node not found: run `npm run rollups:backfill` in backend/ against this database")
+        return
+    start = time.perf_counter()
+    result = subprocess.run(["node", "backfillRollups.js"], cwd=BACKEND_DIR,
+                            env={**os.environ, "DB_STORAGE": os.path.abspath(db_path)},
+                            stdout=subprocess.DEVNULL)
+    if result.returncode != 0:
+        print("⚠️  Rollup backfill failed: run `npm run rollups:backfill` in backend/ against this database")
+        return
+    print(f"Rebuilt sales rollups in {time.perf_counter() - start:.1f}s", flush=True)
+
+def generate(db_path, products, users, orders, cart_lines, seed=42, end=None, days=365,
+             rollups=True):
+    """Append a synthetic dataset to the database at db_path; return the row count"""
+    if (orders or cart_lines) and not (products and users):
+        raise ValueError("orders and cart lines need generated products and users")
+    has_schema = False
+    if os.path.exists(db_path):
+        conn = sqlite3.connect(db_path)
+        has_schema = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'Products'").fetchone()
+        conn.close()
+    if not has_schema:
+        if shutil.which("node") is None:
+            raise RuntimeError(f"{db_path} has no schema and node is not available to create it")
+        seed_database(os.path.abspath(db_path))
+
+    end = end or datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    # The file is rebuilt from scratch if the load fails, so skip durability
+    for pragma in ("journal_mode = MEMORY", "synchronous = OFF", "cache_size = -262144",
+                   "temp_store = MEMORY"):
+        conn.execute(f"PRAGMA {pragma}")
+    start = time.perf_counter()
+    try:
+        statements = drop_secondary_objects(conn)
+        generator = Generator(conn, seed, end, days)
+        rows = generator.generate_products(products)
+        rows += generator.generate_users(users)
+        rows += generator.generate_carts(cart_lines)
+        rows += generator.generate_orders(orders)
+        rebuild_secondary_objects(conn, statements)
+        conn.execute("PRAGMA journal_mode = DELETE")
+    finally:
+        conn.close()
+    if rollups and orders:
+        rebuild_rollups(db_path)
+    print(f"Generated {rows:,} rows in {time.perf_counter() - start:.1f}s (seed {seed}, "
+          f"orders up to {end:%Y-%m-%d})")
+    return rows
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a large, reproducible dataset into SQLite")
+    parser.add_argument("--database", default=DEFAULT_DATABASE,
+                        help="SQLite file to fill (default: the backend's database.sqlite)")
+    parser.add_argument("--reset", action="store_true",
+                        help="delete the database first and start from a freshly seeded one")
+    parser.add_argument("--scale", choices=SCALES, default="small",
+                        help="preset sizes: small ~150k, medium ~1.5M, large ~11M rows (default small)")
+    parser.add_argument("--products", type=int)
+    parser.add_argument("--users", type=int)
+    parser.add_argument("--orders", type=int)
+    parser.add_argument("--cart-lines", type=int)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--end", type=lambda s: datetime.strptime(s, "%Y-%m-%d").replace(tzinfo=timezone.utc),
+                        help="last day of order history, YYYY-MM-DD (default today); "
+                             "fix it to reproduce a database on another day")
+    parser.add_argument("--days", type=int, default=365, help="days of order history (default 365)")
+    parser.add_argument("--no-rollups", action="store_true", help="skip rebuilding the sales rollups")
+    args = parser.parse_args(argv)
+
+    products, users, orders, cart_lines = SCALES[args.scale]
+    if args.reset:
+        for suffix in ("", "-wal", "-shm", "-journal"):
+            if os.path.exists(args.database + suffix):
+                os.remove(args.database + suffix)
+    try:
+        generate(args.database,
+                 products if args.products is None else args.products,
+                 users if args.users is None else args.users,
+                 orders if args.orders is None else args.orders,
+                 cart_lines if args.cart_lines is None else args.cart_lines,
+                 seed=args.seed, end=args.end, days=args.days, rollups=not args.no_rollups)
+    except (RuntimeError, ValueError) as error:
+        print(f"❌ {error}")
+        return False
+    return True
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
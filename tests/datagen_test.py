@@ -0,0 +1,105 @@
+"""
+Synthetic data generator test: datagen.py must be reproducible from a seed,
+produce the skewed and bursty distributions it promises and leave a database
+the backend serves. Creates the schema with the backend's own scripts, so it
+needs node:
+
+    python -m pytest datagen_test.py -s
+"""
+
+import hashlib
+import os
+import shutil
+import sqlite3
+import statistics
+import tempfile
+from datetime import datetime, timezone
+
+import pytest
+import requests
+
+from datagen import generate
+from local_backend import LocalBackend, seed_database
+
+COUNTS = dict(products=3000, users=1000, orders=20000, cart_lines=800)
+END = datetime(2026, 1, 31, tzinfo=timezone.utc)
+TABLES = ["Products", "Users", "Carts", "Orders", "OrderItems"]
+
+@pytest.fixture(scope="module")
+def workdir():
+    if shutil.which("node") is None:
+        pytest.skip("Needs node")
+    path = tempfile.mkdtemp(prefix="datagen-")
+    seed_database(os.path.join(path, "template.sqlite"))
+    yield path
+    shutil.rmtree(path, ignore_errors=True)
+
+def build(workdir, name, seed):
+    db_path = os.path.join(workdir, name)
+    shutil.copy(os.path.join(workdir, "template.sqlite"), db_path)
+    generate(db_path, seed=seed, end=END, rollups=False, **COUNTS)
+    return db_path
+
+def fingerprint(db_path):
+    digest = hashlib.sha256()
+    with sqlite3.connect(db_path) as conn:
+        for table in TABLES:
+            for row in conn.execute(f"SELECT * FROM {table} ORDER BY id"):
+                digest.update(repr(row).encode())
+    return digest.hexdigest()
+
+@pytest.fixture(scope="module")
+def generated(workdir):
+    return build(workdir, "generated.sqlite", seed=42)
+
+def test_same_seed_same_database(workdir, generated):
+    """Test the dataset is a function of the seed"""
+    assert fingerprint(build(workdir, "again.sqlite", seed=42)) == fingerprint(generated)
+    assert fingerprint(build(workdir, "other.sqlite", seed=43)) != fingerprint(generated)
+    print("✓ Same seed, same database")
+
+def test_distributions(generated):
+    """Test product popularity is heavily skewed and order volume is bursty"""
+    with sqlite3.connect(generated) as conn:
+        sold = [row[0] for row in conn.execute(
+            "SELECT SUM(quantity) FROM OrderItems GROUP BY productId ORDER BY 1 DESC")]
+        daily = [row[0] for row in conn.execute(
+            "SELECT COUNT(*) FROM Orders WHERE orderId LIKE 'GN%' GROUP BY substr(createdAt, 1, 10)")]
+    top_share = sum(sold[:COUNTS["products"] // 100]) / sum(sold)
+    burst = max(daily) / statistics.median(daily)
+    assert top_share > 0.3, f"top 1% of products sold only {top_share:.0%} of units"
+    assert burst > 3, f"busiest day only {burst:.1f}x the median day"
+    print(f"✓ Top 1% of products: {top_share:.0%} of units; busiest day {burst:.1f}x median")
+
+def test_rows_are_consistent(generated):
+    """Test counts, foreign keys, unique cart lines and order totals"""
+    with sqlite3.connect(generated) as conn:
+        orders = conn.execute("SELECT COUNT(*) FROM Orders WHERE orderId LIKE 'GN%'").fetchone()[0]
+        orphans = conn.execute("""
+            SELECT COUNT(*) FROM OrderItems i LEFT JOIN Orders o ON o.id = i.orderId
+            WHERE o.id IS NULL""").fetchone()[0]
+        duplicates = conn.execute("""
+            SELECT COUNT(*) FROM (SELECT 1 FROM Carts GROUP BY userId, productId HAVING COUNT(*) > 1)
+        """).fetchone()[0]
+        mismatched = conn.execute("""
+            SELECT COUNT(*) FROM Orders o
+            JOIN (SELECT orderId, SUM(price * quantity) AS total FROM OrderItems GROUP BY orderId) i
+              ON i.orderId = o.id
+            WHERE o.totalAmount != i.total
+        """).fetchone()[0]
+        indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert orders == COUNTS["orders"]
+    assert (orphans, duplicates, mismatched) == (0, 0, 0)
+    assert any(name.startswith("orders_") for name in indexes), "secondary indexes were not rebuilt"
+    print("✓ Generated rows are consistent and indexes rebuilt")
+
+def test_backend_serves_generated_data(generated):
+    """Test the backend boots on the dataset and finds generated products"""
+    with LocalBackend(database=generated) as backend:
+        response = requests.get(f"{backend.api_url}/products/search", params={"q": "wireless"})
+        response.raise_for_status()
+        assert response.json(), "search found no generated products"
+    print("✓ Backend serves the generated catalog")
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
@@ -1,4 +1,3 @@
-import requests
 import pytest
 
 class TestDecisionTable:
@@ -6,13 +5,13 @@ class TestDecisionTable:
     Decision Table Testing - Test all combinations of conditions
     """
     
-    def test_login_decision_table(self):
+    def test_login_decision_table(self, http, api_url):
         """
         Decision Table for Login:
         Conditions: Valid Email (Y/N), Valid Password (Y/N), User Exists (Y/N)
         Actions: Login Success, Login Failure, Error Message
         """
-        base_url = "http://localhost:5000/api/auth/login"
+        base_url = f"{api_url}/auth/login"
         
         # Decision Table Test Cases
         test_cases = [
@@ -62,7 +61,7 @@ class TestDecisionTable:
         
         for i, case in enumerate(test_cases, 1):
             data = {"email": case["email"], "password": case["password"]}
-            response = requests.post(base_url, json=data)
+            response = http.post(base_url, json=data)
             
             assert response.status_code == case["expected"], \
                 f"Case {i} failed: {case['description']}"
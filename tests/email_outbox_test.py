@@ -0,0 +1,139 @@
+"""
+Email outbox test: registration only queues the verification email, and the
+background dispatcher delivers it over pooled SMTP connections, with retries
+for deferred recipients. Starts its own backend against a local SMTP sink
+(smtp_sink.py, needs aiosmtpd), so it needs node:
+
+    python -m pytest email_outbox_test.py -s
+"""
+
+import re
+import shutil
+import sqlite3
+import statistics
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+
+from local_backend import LocalBackend
+
+pytest.importorskip("aiosmtpd")
+from smtp_sink import SmtpSink  # noqa: E402
+
+SLOW_RELAY_S = 2.0
+MAX_REGISTER_S = 1.0
+THROUGHPUT_EMAILS = 200
+
+@pytest.fixture(scope="module")
+def sink():
+    with SmtpSink() as sink:
+        yield sink
+
+@pytest.fixture(scope="module")
+def backend(sink):
+    if shutil.which("node") is None:
+        pytest.skip("Needs node")
+    env = {
+        "SMTP_HOST": "127.0.0.1",
+        "SMTP_PORT": str(sink.port),
+        # The sink does not authenticate; an empty value also overrides backend/.env
+        "EMAIL_USER": "",
+        "EMAIL_FROM": "shop@localhost.localdomain",
+        "EMAIL_RETRY_BASE_MS": "100",
+        "EMAIL_POLL_INTERVAL_MS": "100",
+        "BCRYPT_COST": "8",
+        "LOGIN_MAX_CONCURRENT_PER_IP": "64",
+    }
+    with LocalBackend(env=env) as backend:
+        yield backend
+
+@pytest.fixture(autouse=True)
+def reset_sink(sink):
+    sink.delay = 0.0
+    yield
+    sink.delay = 0.0
+
+def new_email():
+    return f"shopper{uuid.uuid4().hex[:12]}@example.com"
+
+def register(backend, email):
+    start = time.perf_counter()
+    response = requests.post(f"{backend.api_url}/auth/register", json={
+        "username": "Outbox Shopper", "email": email, "password": "secret123", "address": "1 Test Road"
+    })
+    assert response.status_code == 201, response.text
+    return time.perf_counter() - start
+
+def outbox_row(backend, email):
+    with sqlite3.connect(backend.db_path) as conn:
+        conn.row_factory = sqlite3.Row
+        return conn.execute("SELECT * FROM OutboxEmails WHERE recipient = ?", (email,)).fetchone()
+
+def wait_for_status(backend, email, status, timeout=10.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        row = outbox_row(backend, email)
+        if row and row["status"] == status:
+            return row
+        time.sleep(0.05)
+    raise AssertionError(f"outbox row for {email} never reached {status!r}: {dict(row) if row else None}")
+
+def test_register_does_not_wait_for_relay(backend, sink):
+    """Test a slow relay delays the email, not the registration"""
+    sink.delay = SLOW_RELAY_S
+    email = new_email()
+    elapsed = register(backend, email)
+    assert elapsed < MAX_REGISTER_S, f"register took {elapsed:.2f}s with a {SLOW_RELAY_S}s relay"
+
+    sink.wait_for(lambda messages: any(m["to"] == email for m in messages))
+    message = sink.to(email)[0]
+    assert message["from"] == "shop@localhost.localdomain"
+    link = re.search(r'href="([^"]+/api/auth/verify/[0-9a-f]+)"', message["body"])
+    assert link, "verification link missing from the email"
+    token = link.group(1).rsplit("/", 1)[1]
+    response = requests.get(f"{backend.api_url}/auth/verify/{token}", allow_redirects=False)
+    assert "verified=true" in response.headers.get("Location", "")
+    print(f"✓ Registered in {elapsed * 1000:.0f}ms; email delivered after the {SLOW_RELAY_S}s relay")
+
+def test_deferred_recipient_is_retried(backend, sink):
+    """Test 451 answers are retried with backoff until the email goes through"""
+    email = new_email()
+    sink.defer[email] = 2
+    register(backend, email)
+    row = wait_for_status(backend, email, "sent")
+    assert row["attempts"] == 3
+    assert len(sink.to(email)) == 1
+    print(f"✓ Delivered on attempt {row['attempts']}")
+
+def test_rejected_recipient_fails_without_retry(backend, sink):
+    """Test a 550 marks the email failed at once"""
+    email = new_email()
+    sink.reject.add(email)
+    register(backend, email)
+    row = wait_for_status(backend, email, "failed")
+    assert row["attempts"] == 1
+    assert "550" in row["lastError"]
+    assert sink.to(email) == []
+    print("✓ Permanent rejection recorded without retries")
+
+def test_send_throughput(backend, sink):
+    """Test a burst of registrations is delivered once each, and report the send rate"""
+    emails = [new_email() for _ in range(THROUGHPUT_EMAILS)]
+    start = time.time()
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        latencies = list(pool.map(lambda email: register(backend, email), emails))
+    wanted = set(emails)
+    messages = sink.wait_for(lambda messages: wanted <= {m["to"] for m in messages}, timeout=60)
+
+    delivered = [m for m in messages if m["to"] in wanted]
+    assert len(delivered) == len(emails), "some emails were delivered more than once"
+    elapsed = max(m["received_at"] for m in delivered) - start
+    rate = len(emails) / elapsed
+    print(f"✓ {len(emails)} emails in {elapsed:.2f}s ({rate:.0f}/s); "
+          f"register median {statistics.median(latencies) * 1000:.0f}ms")
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
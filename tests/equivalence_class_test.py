@@ -1,4 +1,3 @@
-import requests
 import pytest
 
 class TestEquivalenceClass:
@@ -6,9 +5,9 @@ class TestEquivalenceClass:
     Equivalence Class Testing - Divide inputs into valid and invalid classes
     """
     
-    def test_email_equivalence_classes(self):
+    def test_email_equivalence_classes(self, http, api_url):
         """Test email input equivalence classes"""
-        base_url = "http://localhost:5000/api/auth/login"
+        base_url = f"{api_url}/auth/login"
         
         # Valid Class: Proper email format
         valid_emails = [
@@ -38,7 +37,7 @@ class TestEquivalenceClass:
         # Test Valid Class
         for email in valid_emails:
             data = {"email": email, "password": "admin@1234"}
-            response = requests.post(base_url, json=data)
+            response = http.post(base_url, json=data)
             # Should return 200 for admin@lec.com, 400 for others (user not found)
             assert response.status_code in [200, 400]
         
@@ -46,14 +45,14 @@ class TestEquivalenceClass:
         for email_list in [invalid_no_at, invalid_no_domain]:
             for email in email_list:
                 data = {"email": email, "password": "admin@1234"}
-                response = requests.post(base_url, json=data)
+                response = http.post(base_url, json=data)
                 assert response.status_code == 400
         
         print("✓ Email equivalence classes tested")
     
-    def test_password_equivalence_classes(self):
+    def test_password_equivalence_classes(self, http, api_url):
         """Test password input equivalence classes"""
-        base_url = "http://localhost:5000/api/auth/login"
+        base_url = f"{api_url}/auth/login"
         
         # Valid Class: Correct password
         valid_password = "admin@1234"
@@ -66,20 +65,20 @@ class TestEquivalenceClass:
         
         # Test Valid Class
         data = {"email": "admin@lec.com", "password": valid_password}
-        response = requests.post(base_url, json=data)
+        response = http.post(base_url, json=data)
         assert response.status_code == 200
         
         # Test Invalid Classes
         for password in invalid_wrong + invalid_empty:
             data = {"email": "admin@lec.com", "password": password}
-            response = requests.post(base_url, json=data)
+            response = http.post(base_url, json=data)
             assert response.status_code == 400
         
         print("✓ Password equivalence classes tested")
     
-    def test_product_price_equivalence_classes(self):
+    def test_product_price_equivalence_classes(self, http, api_url):
         """Test product price ranges"""
-        response = requests.get("http://localhost:5000/api/products")
+        response = http.get(f"{api_url}/products")
         products = response.json()
         
         # Equivalence Classes for Price
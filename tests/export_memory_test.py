@@ -0,0 +1,132 @@
+"""
+Order export memory test: stream 1M synthetic orders from
+GET /api/admin/orders/export and check the server's resident memory stays
+flat. Starts its own backend on a throwaway database, so it needs node and
+takes a minute or two:
+
+    python -m pytest export_memory_test.py -s
+    EXPORT_ORDERS=200000 python -m pytest export_memory_test.py -s
+"""
+
+import os
+import random
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import requests
+
+from api_support import ADMIN_CREDENTIALS
+from local_backend import LocalBackend, seed_database
+
+ORDER_COUNT = int(os.environ.get("EXPORT_ORDERS", 1_000_000))
+# Materializing 1M orders costs well over 500MB; streaming should need a few MB
+MAX_RSS_GROWTH_MB = 100
+STATUSES = ["pending", "completed", "shipped", "cancelled"]
+
+def add_orders(db_path, count, seed=11):
+    """Insert `count` orders (without line items) straight into SQLite"""
+    rng = random.Random(seed)
+    start = datetime.now(timezone.utc) - timedelta(days=365)
+    conn = sqlite3.connect(db_path)
+
+    def rows():
+        for i in range(count):
+            created = (start + timedelta(seconds=i * 30)).strftime("%Y-%m-%d %H:%M:%S.000 +00:00")
+            total = rng.randint(100, 50000)
+            yield (str(rng.randint(1, 50000)), f"EX{i:09d}", rng.randint(1, 5), total, total,
+                   rng.choice(STATUSES), created, created)
+
+    with conn:
+        conn.executemany("""
+            INSERT INTO Orders (userId, orderId, items, quantity, price, totalAmount, status, createdAt, updatedAt)
+            VALUES (?, ?, '[]', ?, ?, ?, ?, ?, ?)""", rows())
+    conn.close()
+
+def rss_mb(pid):
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    raise RuntimeError("VmRSS not found")
+
+class RssSampler(threading.Thread):
+    """Record a process's resident set size every `interval` seconds"""
+
+    def __init__(self, pid, interval=0.05):
+        super().__init__(daemon=True)
+        self.pid, self.interval = pid, interval
+        self.samples = []
+        self.stopped = threading.Event()
+
+    def run(self):
+        while not self.stopped.is_set():
+            self.samples.append(rss_mb(self.pid))
+            time.sleep(self.interval)
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+        return self.samples
+
+@pytest.fixture(scope="module")
+def export_backend():
+    if shutil.which("node") is None or not os.path.exists("/proc/self/status"):
+        pytest.skip("Needs node and /proc")
+    workdir = tempfile.mkdtemp(prefix="export-memory-")
+    db_path = os.path.join(workdir, "database.sqlite")
+    try:
+        seed_database(db_path)
+        # First start creates the Orders table and its indexes
+        with LocalBackend(database=db_path, copy=False):
+            pass
+        start = time.perf_counter()
+        add_orders(db_path, ORDER_COUNT)
+        print(f"\nInserted {ORDER_COUNT} orders in {time.perf_counter() - start:.1f}s")
+        with LocalBackend(database=db_path, copy=False) as backend:
+            yield backend
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+@pytest.fixture(scope="module")
+def export_headers(export_backend):
+    response = requests.post(f"{export_backend.api_url}/admin/login", json=ADMIN_CREDENTIALS)
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['token']}"}
+
+@pytest.mark.parametrize("export_format", ["ndjson", "csv"])
+def test_export_memory_is_flat(export_backend, export_headers, export_format):
+    """Test exporting every order keeps server RSS growth bounded"""
+    pid = export_backend.process.pid
+    # Warm up the order queries before taking the baseline
+    requests.get(f"{export_backend.api_url}/admin/orders", params={"limit": 200}, headers=export_headers)
+    baseline = rss_mb(pid)
+
+    sampler = RssSampler(pid)
+    sampler.start()
+    start = time.perf_counter()
+    rows = 0
+    with requests.get(f"{export_backend.api_url}/admin/orders/export", params={"format": export_format},
+                      headers=export_headers, stream=True) as response:
+        assert response.status_code == 200
+        for line in response.iter_lines(chunk_size=64 * 1024):
+            if line:
+                rows += 1
+    elapsed = time.perf_counter() - start
+    samples = sampler.stop()
+
+    if export_format == "csv":
+        rows -= 1  # header
+    peak = max(samples)
+    print(f"{export_format}: {rows} rows in {elapsed:.1f}s ({rows / elapsed:,.0f} rows/s), "
+          f"RSS baseline {baseline:.0f}MB peak {peak:.0f}MB")
+    assert rows == ORDER_COUNT
+    assert peak - baseline < MAX_RSS_GROWTH_MB, \
+        f"RSS grew {peak - baseline:.0f}MB while exporting (limit {MAX_RSS_GROWTH_MB}MB)"
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
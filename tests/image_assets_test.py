@@ -0,0 +1,123 @@
+"""
+Image pipeline test: runs buildImages.js into a temporary directory (needs
+node and the backend's `sharp` dependency), then checks the manifest, the
+fingerprints and the caching headers of a backend serving that build.
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import subprocess
+
+import pytest
+
+from local_backend import BACKEND_DIR, LocalBackend
+
+PUBLIC_DIR = os.path.join(BACKEND_DIR, "public")
+
+VARIANT_WIDTHS = {"thumbnail": 160, "card": 400, "detail": 1200}
+FORMATS = {"jpeg": "jpg", "webp": "webp"}
+ONE_YEAR = 365 * 24 * 60 * 60
+
+@pytest.fixture(scope="session")
+def image_build(tmp_path_factory):
+    """
+    Variants and manifest built from backend/public/images into a temporary
+    directory; returns the build dir, the manifest and the environment that
+    points buildImages.js and the server at them
+    """
+    if shutil.which("node") is None:
+        pytest.skip("Needs node")
+    out = tmp_path_factory.mktemp("images")
+    env = {"IMAGE_BUILD_DIR": str(out / "build"), "IMAGE_MANIFEST_PATH": str(out / "image-manifest.json")}
+    result = subprocess.run(["node", "buildImages.js"], cwd=BACKEND_DIR, env={**os.environ, **env},
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        pytest.fail(f"buildImages.js failed:\n{result.stdout}{result.stderr}", pytrace=False)
+    with open(env["IMAGE_MANIFEST_PATH"]) as f:
+        manifest = json.load(f)
+    return {"build_dir": env["IMAGE_BUILD_DIR"], "manifest": manifest, "env": env}
+
+@pytest.fixture(scope="module")
+def manifest(image_build):
+    return image_build["manifest"]
+
+@pytest.fixture(scope="module")
+def image_backend(image_build, template_database):
+    """Backend on a clone of the template database, serving the fresh build"""
+    with LocalBackend(database=template_database, template=True, env=image_build["env"]) as backend:
+        yield backend
+
+class TestImageAssets:
+    """
+    Image pipeline: fingerprinted variants, manifest and immutable caching
+    """
+
+    def test_manifest_covers_source_images(self, manifest):
+        """Test every source image has thumbnail, card and detail variants"""
+        sources = [f"images/{name}" for name in os.listdir(os.path.join(PUBLIC_DIR, "images"))
+                   if name.lower().endswith((".jpg", ".jpeg", ".png"))]
+        missing = [source for source in sources if source not in manifest]
+        assert not missing, f"Images missing from manifest: {missing[:5]}"
+
+        for source, entry in manifest.items():
+            assert set(entry["variants"]) == set(VARIANT_WIDTHS), source
+            for variant, info in entry["variants"].items():
+                assert info["width"] <= VARIANT_WIDTHS[variant]
+                assert set(FORMATS) <= set(info)
+        print(f"✓ Manifest covers {len(sources)} images")
+
+    def test_variant_names_match_content(self, image_build, manifest):
+        """Test each variant file exists and its fingerprint is the hash of its bytes"""
+        for entry in manifest.values():
+            for info in entry["variants"].values():
+                for format, ext in FORMATS.items():
+                    path = info[format]
+                    match = re.search(rf"-([0-9a-f]{{10}})\.{ext}$", path)
+                    assert match, f"Unfingerprinted variant {path}"
+                    with open(os.path.join(image_build["build_dir"], os.path.basename(path)), "rb") as f:
+                        digest = hashlib.sha1(f.read()).hexdigest()
+                    assert digest.startswith(match.group(1)), f"Stale fingerprint for {path}"
+        print("✓ Variant fingerprints match file contents")
+
+    def test_variants_served_immutable(self, http, image_backend, manifest):
+        """Test fingerprinted variants are served with a one-year immutable cache"""
+        info = next(iter(manifest.values()))["variants"]["card"]
+        for format in FORMATS:
+            response = http.get(f"{image_backend.backend_url}/{info[format]}")
+            assert response.status_code == 200
+            assert response.headers["Content-Type"] == f"image/{format}"
+            cache_control = response.headers.get("Cache-Control", "")
+            assert "immutable" in cache_control
+            assert f"max-age={ONE_YEAR}" in cache_control
+
+        response = http.get(f"{image_backend.backend_url}/images/build/missing-0000000000.jpg")
+        assert response.status_code == 404
+        print(f"✓ Variants served with: {cache_control}")
+
+    def test_originals_not_immutable(self, http, image_backend, manifest):
+        """Test original images keep a short, revalidated cache lifetime"""
+        source = next(iter(manifest))
+        response = http.get(f"{image_backend.backend_url}/{source}")
+        assert response.status_code == 200
+        assert "immutable" not in response.headers.get("Cache-Control", "")
+        print(f"✓ Original served with: {response.headers.get('Cache-Control')}")
+
+    def test_api_returns_variants(self, http, image_backend, manifest):
+        """Test the catalog and search point product images at the variants"""
+        products = http.get(f"{image_backend.api_url}/products").json()
+        built = [p for p in products if p.get("images")]
+        assert built, "No product image resolved through the manifest"
+        for product in built:
+            assert product["image"] == product["images"]["card"]["jpeg"]
+            assert product["image"].startswith("images/build/")
+
+        name = built[0]["name"].split()[0]
+        results = http.get(f"{image_backend.api_url}/products/search", params={"q": name}).json()
+        assert any(r.get("images") for r in results)
+        print(f"✓ {len(built)} products served with resized variants")
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
@@ -1,44 +1,39 @@
-import requests
 import pytest
 import time
 
 class TestIntegration:
     
-    def test_full_user_flow(self):
+    def test_full_user_flow(self, http, api_url, admin_token):
         """Test complete user journey from login to cart"""
-        # Step 1: Login
-        login_data = {"email": "admin@lec.com", "password": "admin@1234"}
-        login_response = requests.post("http://localhost:5000/api/auth/login", json=login_data)
-        assert login_response.status_code == 200
-        token = login_response.json()["token"]
-        headers = {"Authorization": f"Bearer {token}"}
+        # Step 1: Login (cached for the whole run)
+        headers = {"Authorization": f"Bearer {admin_token}"}
         
         # Step 2: Get products
-        products_response = requests.get("http://localhost:5000/api/products")
+        products_response = http.get(f"{api_url}/products")
         assert products_response.status_code == 200
         products = products_response.json()
         assert len(products) > 0
         
         # Step 3: Access cart
-        cart_response = requests.get("http://localhost:5000/api/cart", headers=headers)
+        cart_response = http.get(f"{api_url}/cart", headers=headers)
         assert cart_response.status_code in [200, 404]
         
         print("✓ Complete user flow works")
     
-    def test_frontend_backend_integration(self):
+    def test_frontend_backend_integration(self, http, api_url, frontend_url):
         """Test frontend and backend communication"""
         # Test frontend can reach backend
-        frontend_response = requests.get("http://localhost:5173")
-        backend_response = requests.get("http://localhost:5000/api/products")
+        frontend_response = http.get(frontend_url)
+        backend_response = http.get(f"{api_url}/products")
         
         assert frontend_response.status_code == 200
         assert backend_response.status_code == 200
         print("✓ Frontend-Backend integration works")
     
-    def test_database_connectivity(self):
+    def test_database_connectivity(self, http, api_url):
         """Test database operations through API"""
         # Test data retrieval
-        response = requests.get("http://localhost:5000/api/products")
+        response = http.get(f"{api_url}/products")
         assert response.status_code == 200
         data = response.json()
         
@@ -51,14 +46,10 @@ class TestIntegration:
         
         print("✓ Database connectivity verified")
     
-    def test_session_management(self):
+    def test_session_management(self, admin_login):
         """Test user session handling"""
         # Login and get token
-        login_data = {"email": "admin@lec.com", "password": "admin@1234"}
-        response = requests.post("http://localhost:5000/api/auth/login", json=login_data)
-        assert response.status_code == 200
-        
-        token = response.json()["token"]
+        token = admin_login["token"]
         assert token is not None
         assert len(token) > 20  # JWT tokens are long
         
@@ -0,0 +1,435 @@
+#!/usr/bin/env python3
+"""
+Load Generation Harness for Amazon Replica
+Drive the Express API with scripted scenarios and report latency percentiles
+
+Modes:
+    closed-loop  N virtual users, each starting its next scenario as soon as
+                 the previous one finishes (plus optional think time)
+    open-loop    scenarios start at a fixed arrival rate whether or not earlier
+                 ones have finished; scenario latency is measured from the
+                 scheduled start so server stalls are not hidden
+
+Usage:
+    python load_harness.py --users 20 --duration 30
+    python load_harness.py --rate 50 --duration 60 --mix browse=70,cart=20,checkout=5,analytics=5
+    python load_harness.py --users 10 --scenario-file my_scenarios.py --json report.json
+    python load_harness.py --users 20 --mix browse=70,checkout=30 \
+        --compare SQLITE_PROFILE=default SQLITE_PROFILE=performance
+
+A scenario file is a Python module defining a SCENARIOS dict of
+name -> async function(ctx); its entries are added to the built-in ones.
+
+--compare runs the same load once per backend configuration, each on a
+locally started server (see local_backend.py) with the given environment
+variables, and prints the runs side by side.
+"""
+
+import argparse
+import asyncio
+import importlib.util
+import json
+import random
+import sys
+import time
+from collections import defaultdict
+
+import aiohttp
+
+from api_support import ADMIN_CREDENTIALS, API_URL, user_headers
+from local_backend import LocalBackend
+
+# Upper bounds (ms) of the latency histogram buckets
+HISTOGRAM_BUCKETS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, float("inf")]
+
+# Synthetic cart owners are numbered from here so they never collide with real users
+LOAD_USER_BASE = 1_000_000
+
+DEFAULT_MIX = "browse=70,cart=20,checkout=5,analytics=5"
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(pct / 100 * len(sorted_values))))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+class Recorder:
+    """Collects latency samples and status codes per operation"""
+
+    def __init__(self):
+        self.samples = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.statuses = defaultdict(lambda: defaultdict(int))
+        self.dropped = 0
+
+    def record(self, name, latency, ok, status):
+        self.samples[name].append(latency)
+        self.statuses[name][status] += 1
+        if not ok:
+            self.errors[name] += 1
+
+    def summary(self, elapsed):
+        """Return {name: stats} with percentiles in milliseconds"""
+        result = {}
+        for name, values in sorted(self.samples.items()):
+            ordered = sorted(values)
+            histogram = []
+            index = 0
+            for bound in HISTOGRAM_BUCKETS:
+                count = 0
+                while index < len(ordered) and ordered[index] * 1000 <= bound:
+                    count += 1
+                    index += 1
+                histogram.append([bound if bound != float("inf") else None, count])
+            result[name] = {
+                'count': len(ordered),
+                'errors': self.errors[name],
+                'error_rate': self.errors[name] / len(ordered) if ordered else 0.0,
+                'throughput': len(ordered) / elapsed if elapsed else 0.0,
+                'p50_ms': percentile(ordered, 50) * 1000,
+                'p95_ms': percentile(ordered, 95) * 1000,
+                'p99_ms': percentile(ordered, 99) * 1000,
+                'max_ms': ordered[-1] * 1000 if ordered else 0.0,
+                'statuses': dict(self.statuses[name]),
+                'histogram': histogram
+            }
+        return result
+
+class ScenarioContext:
+    """Per virtual-user state handed to every scenario function"""
+
+    def __init__(self, session, recorder, api_url, user_id, shared):
+        self.session = session
+        self.recorder = recorder
+        self.api_url = api_url
+        self.user_id = user_id
+        self.shared = shared
+        self.random = random.Random(user_id)
+        self._user_headers = None
+
+    @property
+    def product_ids(self):
+        return self.shared['product_ids']
+
+    def user_headers(self):
+        """Headers identifying this virtual user to the cart routes (signed once)"""
+        if self._user_headers is None:
+            self._user_headers = user_headers(self.user_id, self.shared['jwt_secret'])
+        return self._user_headers
+
+    def admin_headers(self):
+        return {"Authorization": f"Bearer {self.shared['admin_token']}"}
+
+    async def request(self, name, method, path, ok_statuses=None, **kwargs):
+        """Send one request, record its latency under `name` and return (status, body)"""
+        start = time.perf_counter()
+        status = 0
+        body = None
+        try:
+            async with self.session.request(method, f"{self.api_url}{path}", **kwargs) as response:
+                status = response.status
+                body = await response.read()
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            status = 0
+        latency = time.perf_counter() - start
+        ok = status in ok_statuses if ok_statuses else 200 <= status < 300
+        self.recorder.record(name, latency, ok, status)
+        return status, body
+
+# ---------------------------------------------------------------------------
+# Built-in scenarios
+# ---------------------------------------------------------------------------
+
+async def browse(ctx):
+    """Load the product catalog"""
+    await ctx.request("GET /api/products", "GET", "/products")
+
+async def add_to_cart(ctx):
+    """Add a random product to this user's cart"""
+    product_id = ctx.random.choice(ctx.product_ids)
+    await ctx.request("POST /api/cart/add", "POST", "/cart/add",
+                      json={"productId": product_id, "quantity": 1},
+                      headers=ctx.user_headers())
+
+async def checkout(ctx):
+    """Browse, add one item and purchase the cart"""
+    await browse(ctx)
+    await add_to_cart(ctx)
+    # 400 means the cart was empty or stock ran out, which is a valid business outcome
+    await ctx.request("POST /api/cart/purchase", "POST", "/cart/purchase",
+                      ok_statuses={200, 400}, headers=ctx.user_headers())
+
+async def login(ctx):
+    """Log in with the admin credentials (a full bcrypt compare on the server)"""
+    # 429 is the per-IP login limit doing its job, not a failure
+    await ctx.request("POST /api/auth/login", "POST", "/auth/login",
+                      ok_statuses={200, 429}, json=ADMIN_CREDENTIALS)
+
+async def admin_analytics(ctx):
+    """Poll the admin analytics dashboard"""
+    await ctx.request("GET /api/admin/analytics", "GET", "/admin/analytics",
+                      headers=ctx.admin_headers())
+
+SCENARIOS = {
+    "browse": browse,
+    "cart": add_to_cart,
+    "checkout": checkout,
+    "analytics": admin_analytics,
+    "login": login
+}
+
+def load_scenario_file(path):
+    """Import SCENARIOS from a user supplied Python file"""
+    spec = importlib.util.spec_from_file_location("custom_scenarios", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return getattr(module, "SCENARIOS", {})
+
+def parse_mix(mix, scenarios):
+    """Parse 'browse=70,cart=30' into ([functions], [weights])"""
+    names, weights = [], []
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in scenarios:
+            raise ValueError(f"Unknown scenario '{name}'. Available: {', '.join(sorted(scenarios))}")
+        names.append(name)
+        weights.append(float(weight or 1))
+    return names, weights
+
+# ---------------------------------------------------------------------------
+# Runner
+# ---------------------------------------------------------------------------
+
+async def prepare(session, api_url, needs_admin, jwt_secret=None):
+    """Fetch the product ids and, if required, an admin token"""
+    shared = {'product_ids': [], 'admin_token': None, 'jwt_secret': jwt_secret}
+    async with session.get(f"{api_url}/products") as response:
+        products = await response.json()
+        shared['product_ids'] = [p["id"] for p in products] or [1]
+    if needs_admin:
+        async with session.post(f"{api_url}/auth/login", json=ADMIN_CREDENTIALS) as response:
+            shared['admin_token'] = (await response.json()).get("token")
+    return shared
+
+async def run_scenario(name, scenario, ctx, recorder, scheduled):
+    """Run one scenario and record its end-to-end latency from `scheduled`"""
+    try:
+        await scenario(ctx)
+        ok = True
+    except Exception:
+        ok = False
+    recorder.record(f"scenario:{name}", time.perf_counter() - scheduled, ok, "ok" if ok else "exception")
+
+async def closed_loop(users, duration, think_time, pick, make_ctx, recorder):
+    deadline = time.perf_counter() + duration
+
+    async def virtual_user(index):
+        ctx = make_ctx(index)
+        while time.perf_counter() < deadline:
+            name, scenario = pick(ctx.random)
+            await run_scenario(name, scenario, ctx, recorder, time.perf_counter())
+            if think_time:
+                await asyncio.sleep(ctx.random.expovariate(1 / think_time))
+
+    await asyncio.gather(*(virtual_user(i) for i in range(users)))
+
+async def open_loop(rate, duration, max_in_flight, pick, make_ctx, recorder):
+    start = time.perf_counter()
+    in_flight = set()
+    arrivals = int(rate * duration)
+    rng = random.Random(0)
+
+    for n in range(arrivals):
+        scheduled = start + n / rate
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if len(in_flight) >= max_in_flight:
+            recorder.dropped += 1
+            continue
+        ctx = make_ctx(n)
+        name, scenario = pick(rng)
+        task = asyncio.create_task(run_scenario(name, scenario, ctx, recorder, scheduled))
+        in_flight.add(task)
+        task.add_done_callback(in_flight.discard)
+
+    if in_flight:
+        await asyncio.gather(*in_flight)
+
+async def run_load(mode="closed", users=10, rate=10.0, duration=10.0, mix=DEFAULT_MIX,
+                   scenarios=None, think_time=0.0, max_in_flight=1000, api_url=API_URL,
+                   connections=100, timeout=30.0, jwt_secret=None):
+    """
+    Run a load test and return the report dict.
+    Importable so other suites can drive load alongside their own checks.
+    Virtual users' cart tokens are signed with `jwt_secret` (default: the
+    JWT_SECRET api_support resolves).
+    """
+    scenarios = {**SCENARIOS, **(scenarios or {})}
+    names, weights = parse_mix(mix, scenarios)
+    recorder = Recorder()
+
+    def pick(rng):
+        name = rng.choices(names, weights)[0]
+        return name, scenarios[name]
+
+    connector = aiohttp.TCPConnector(limit=connections)
+    client_timeout = aiohttp.ClientTimeout(total=timeout)
+    async with aiohttp.ClientSession(connector=connector, timeout=client_timeout) as session:
+        shared = await prepare(session, api_url, needs_admin="analytics" in names,
+                               jwt_secret=jwt_secret)
+
+        def make_ctx(index):
+            return ScenarioContext(session, recorder, api_url, LOAD_USER_BASE + index, shared)
+
+        start = time.perf_counter()
+        if mode == "open":
+            await open_loop(rate, duration, max_in_flight, pick, make_ctx, recorder)
+        else:
+            await closed_loop(users, duration, think_time, pick, make_ctx, recorder)
+        elapsed = time.perf_counter() - start
+
+    operations = recorder.summary(elapsed)
+    total = sum(op['count'] for name, op in operations.items() if not name.startswith("scenario:"))
+    errors = sum(op['errors'] for name, op in operations.items() if not name.startswith("scenario:"))
+    return {
+        'mode': mode,
+        'users': users if mode == "closed" else None,
+        'rate': rate if mode == "open" else None,
+        'mix': mix,
+        'elapsed_s': elapsed,
+        'total_requests': total,
+        'throughput_rps': total / elapsed if elapsed else 0.0,
+        'error_rate': errors / total if total else 0.0,
+        'dropped': recorder.dropped,
+        'operations': operations
+    }
+
+def print_report(report, show_histogram=True):
+    """Print a human readable report"""
+    print(f"\n{'='*100}")
+    mode = f"closed-loop, {report['users']} users" if report['mode'] == "closed" \
+        else f"open-loop, {report['rate']}/s"
+    print(f"LOAD REPORT ({mode}, mix {report['mix']})")
+    print('='*100)
+    print(f"{'Operation':<36} {'count':>7} {'err%':>6} {'rps':>8} "
+          f"{'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}")
+    for name, op in report['operations'].items():
+        print(f"{name:<36} {op['count']:>7} {op['error_rate']*100:>5.1f}% {op['throughput']:>8.1f} "
+              f"{op['p50_ms']:>7.1f}ms {op['p95_ms']:>6.1f}ms {op['p99_ms']:>6.1f}ms {op['max_ms']:>6.1f}ms")
+
+    if show_histogram:
+        for name, op in report['operations'].items():
+            print(f"\n{name}")
+            peak = max(count for _, count in op['histogram']) or 1
+            for bound, count in op['histogram']:
+                if count == 0:
+                    continue
+                label = f"<= {bound:g}ms" if bound is not None else f"> {HISTOGRAM_BUCKETS[-2]:g}ms"
+                print(f"  {label:>10} {count:>7} {'#' * max(1, int(40 * count / peak))}")
+
+    print(f"\nTotal requests: {report['total_requests']}")
+    print(f"Throughput: {report['throughput_rps']:.1f} req/s")
+    print(f"Error rate: {report['error_rate']*100:.2f}%")
+    if report['dropped']:
+        print(f"Dropped arrivals (max in-flight reached): {report['dropped']}")
+    print(f"Elapsed: {report['elapsed_s']:.2f}s")
+
+def parse_env(spec):
+    """'KEY=VALUE,KEY2=VALUE2' -> dict"""
+    env = {}
+    for pair in spec.split(","):
+        key, sep, value = pair.partition("=")
+        if not sep or not key.strip():
+            raise ValueError(f"Expected KEY=VALUE in {spec!r}")
+        env[key.strip()] = value.strip()
+    return env
+
+def compare_configs(specs, **load_args):
+    """Run the same load against a local backend per environment spec"""
+    reports = {}
+    for spec in specs:
+        with LocalBackend(env=parse_env(spec)) as backend:
+            print(f"\n>>> {spec}", flush=True)
+            reports[spec] = asyncio.run(run_load(**load_args, api_url=backend.api_url,
+                                                 jwt_secret=backend.jwt_secret))
+    return reports
+
+def print_comparison(reports):
+    """One line per configuration: throughput, errors and per-scenario latency"""
+    scenarios = sorted({name for report in reports.values()
+                        for name in report['operations'] if name.startswith("scenario:")})
+    print(f"\n{'='*100}\nCOMPARISON\n{'='*100}")
+    header = f"{'Configuration':<40} {'req/s':>9} {'err%':>6}"
+    for name in scenarios:
+        header += f" {name[len('scenario:'):] + ' p50/p99':>22}"
+    print(header)
+    for spec, report in reports.items():
+        line = f"{spec:<40} {report['throughput_rps']:>9.1f} {report['error_rate']*100:>5.2f}%"
+        for name in scenarios:
+            op = report['operations'].get(name)
+            cell = f"{op['p50_ms']:.1f}/{op['p99_ms']:.1f}ms" if op else "-"
+            line += f" {cell:>22}"
+        print(line)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load generator for the Amazon Replica API")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--users", type=int, help="closed-loop mode with N virtual users (default 10)")
+    group.add_argument("--rate", type=float, help="open-loop mode with a fixed arrival rate per second")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds to run (default 10)")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"weighted scenario mix (default {DEFAULT_MIX})")
+    parser.add_argument("--scenario-file", help="Python file defining extra SCENARIOS")
+    parser.add_argument("--think-time", type=float, default=0.0,
+                        help="mean think time between closed-loop scenarios in seconds")
+    parser.add_argument("--max-in-flight", type=int, default=1000,
+                        help="open-loop cap on concurrent scenarios; later arrivals are dropped")
+    parser.add_argument("--connections", type=int, default=100, help="HTTP connection pool size")
+    parser.add_argument("--api-url", default=API_URL, help=f"API base URL (default {API_URL})")
+    parser.add_argument("--jwt-secret", help="secret to sign virtual users' tokens with "
+                                             "(default JWT_SECRET or backend/.env)")
+    parser.add_argument("--compare", nargs="+", metavar="KEY=VALUE[,KEY=VALUE]",
+                        help="run once per backend environment on a local server and compare")
+    parser.add_argument("--json", help="also write the report to this file")
+    parser.add_argument("--no-histogram", action="store_true", help="hide latency histograms")
+    args = parser.parse_args(argv)
+
+    extra = load_scenario_file(args.scenario_file) if args.scenario_file else None
+    load_args = dict(
+        mode="open" if args.rate else "closed",
+        users=args.users or 10,
+        rate=args.rate or 0.0,
+        duration=args.duration,
+        mix=args.mix,
+        scenarios=extra,
+        think_time=args.think_time,
+        max_in_flight=args.max_in_flight,
+        connections=args.connections
+    )
+
+    if args.compare:
+        reports = compare_configs(args.compare, **load_args)
+        for spec, report in reports.items():
+            print(f"\n>>> {spec}")
+            print_report(report, show_histogram=not args.no_histogram)
+        print_comparison(reports)
+        result = reports
+        success = all(report['error_rate'] == 0 for report in reports.values())
+    else:
+        result = asyncio.run(run_load(**load_args, api_url=args.api_url.rstrip("/"),
+                                      jwt_secret=args.jwt_secret))
+        print_report(result, show_histogram=not args.no_histogram)
+        success = result['error_rate'] == 0
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(result, f, indent=2)
+        print(f"Report written to {args.json}")
+
+    return success
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,33 @@
+import asyncio
+import pytest
+
+from load_harness import run_load, print_report
+
+class TestLoad:
+    """
+    Load Testing - Short runs of the load harness against the live API
+    """
+
+    def test_browse_closed_loop(self, api_url):
+        """Test catalog browsing under 10 concurrent users"""
+        report = asyncio.run(run_load(mode="closed", users=10, duration=5,
+                                      mix="browse=1", api_url=api_url))
+        print_report(report, show_histogram=False)
+
+        products = report['operations']["GET /api/products"]
+        assert report['error_rate'] == 0
+        assert products['p99_ms'] < 2000, f"p99 {products['p99_ms']:.1f}ms exceeds 2s"
+        print(f"✓ Browse p99: {products['p99_ms']:.1f}ms at {report['throughput_rps']:.1f} req/s")
+
+    def test_mixed_open_loop(self, api_url):
+        """Test a mixed browse/cart/checkout workload at a fixed arrival rate"""
+        report = asyncio.run(run_load(mode="open", rate=20, duration=5,
+                                      mix="browse=70,cart=25,checkout=5", api_url=api_url))
+        print_report(report, show_histogram=False)
+
+        assert report['dropped'] == 0, "Server could not keep up with 20 scenarios/s"
+        assert report['error_rate'] < 0.01
+        print(f"✓ Mixed workload error rate: {report['error_rate']*100:.2f}%")
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,197 @@
+"""
+Start the Express backend locally against a private SQLite file.
+
+Used by the benchmark and performance tools so they can run without the
+developer's dev server and without any network access:
+
+    with LocalBackend() as backend:
+        requests.get(f"{backend.api_url}/products")
+"""
+
+import os
+import shutil
+import socket
+import sqlite3
+import subprocess
+import tempfile
+import time
+
+import requests
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "backend"))
+DEFAULT_DATABASE = os.path.join(BACKEND_DIR, "database.sqlite")
+# ioctl asking the filesystem for a copy-on-write clone (btrfs, XFS, bcachefs)
+FICLONE = 0x40049409
+
+def free_port():
+    """Ask the OS for an unused TCP port"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def seed_database(db_path, env=None):
+    """Create the schema, the sample products and the admin user in db_path"""
+    seed_env = {**os.environ, **(env or {}), "DB_STORAGE": db_path}
+    for script in ("seeder.js", "createAdmin.js"):
+        subprocess.run(["node", script], cwd=BACKEND_DIR, env=seed_env, check=True,
+                       stdout=subprocess.DEVNULL)
+
+def run_script(script, db_path, *args):
+    """Run a backend command-line script (e.g. migrateBatched.js) against db_path"""
+    subprocess.run(["node", script, *args], cwd=BACKEND_DIR, check=True,
+                   env={**os.environ, "DB_STORAGE": db_path}, stdout=subprocess.DEVNULL)
+
+def copy_database(source, target):
+    """
+    Consistent copy of a live SQLite database, including unflushed WAL pages.
+    The copy uses a rollback journal, so the server's SQLITE_PROFILE decides.
+    """
+    src = sqlite3.connect(f"file:{source}?mode=ro", uri=True)
+    dst = sqlite3.connect(target)
+    try:
+        src.backup(dst)
+        dst.execute("PRAGMA journal_mode = DELETE")
+    finally:
+        src.close()
+        dst.close()
+
+def build_template(path, env=None):
+    """Seed a fresh database at `path` for clone_database to copy from"""
+    seed_database(path, env)
+    conn = sqlite3.connect(path)
+    try:
+        # Fold any WAL left by the seed scripts into the main file, which is
+        # all a clone copies
+        conn.execute("PRAGMA journal_mode = DELETE")
+    finally:
+        conn.close()
+
+def clone_database(template, target):
+    """
+    Copy a template database that no process has open. Uses a copy-on-write
+    reflink where the filesystem supports one and an in-kernel copy
+    otherwise; both take milliseconds for a seeded database. Returns the
+    method used.
+    """
+    if fcntl is not None:
+        with open(template, "rb") as src, open(target, "wb") as dst:
+            try:
+                fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+                return "reflink"
+            except OSError:
+                pass
+    shutil.copyfile(template, target)
+    return "copy"
+
+class LocalBackend:
+    """
+    Context manager running `node server.js` (or `script`, e.g. cluster.js)
+    on an ephemeral port.
+
+    The server works on a copy of `database` (seeded from scratch when it does
+    not exist), so benchmarks never touch the developer's database. With
+    `template=True`, `database` is a closed template (see build_template) and
+    is cloned instead of copied through the backup API.
+    """
+
+    def __init__(self, database=DEFAULT_DATABASE, port=None, env=None, copy=True,
+                 startup_timeout=30.0, log_path=None, script="server.js", template=False):
+        self.source_database = database
+        self.template = template
+        self.script = script
+        self.port = port or free_port()
+        self.env = env or {}
+        self.copy = copy
+        self.startup_timeout = startup_timeout
+        self.log_path = log_path
+        self.process = None
+        self.ready_seconds = None
+        self.workdir = None
+        self.db_path = None
+        self._log = None
+
+    @property
+    def backend_url(self):
+        return f"http://127.0.0.1:{self.port}"
+
+    @property
+    def api_url(self):
+        return f"{self.backend_url}/api"
+
+    @property
+    def jwt_secret(self):
+        """Secret the server signs and verifies tokens with"""
+        return self.env.get("JWT_SECRET") or os.environ.get("JWT_SECRET", "local-backend-secret")
+
+    def _server_env(self):
+        return {
+            **os.environ,
+            "JWT_SECRET": self.jwt_secret,
+            "SESSION_SECRET": os.environ.get("SESSION_SECRET", "local-backend-session"),
+            "NODE_ENV": os.environ.get("NODE_ENV", "test"),
+            **self.env,
+            "PORT": str(self.port),
+            "DB_STORAGE": self.db_path
+        }
+
+    def start(self):
+        self.workdir = tempfile.mkdtemp(prefix="amazon-replica-")
+        if self.copy:
+            self.db_path = os.path.join(self.workdir, "database.sqlite")
+            if self.template:
+                clone_database(self.source_database, self.db_path)
+            elif os.path.exists(self.source_database):
+                copy_database(self.source_database, self.db_path)
+            else:
+                seed_database(self.db_path, self.env)
+        else:
+            self.db_path = os.path.abspath(self.source_database)
+
+        self._log = open(self.log_path or os.path.join(self.workdir, "server.log"), "w")
+        self.process = subprocess.Popen(["node", self.script], cwd=BACKEND_DIR,
+                                        env=self._server_env(), stdout=self._log,
+                                        stderr=subprocess.STDOUT)
+        self.ready_seconds = self.wait_until_ready()
+        return self
+
+    def wait_until_ready(self):
+        """Poll /api/products until it answers 200; return the time it took"""
+        start = time.perf_counter()
+        deadline = start + self.startup_timeout
+        while time.perf_counter() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(f"Backend exited with code {self.process.returncode}")
+            try:
+                if requests.get(f"{self.api_url}/products", timeout=1).status_code == 200:
+                    return time.perf_counter() - start
+            except requests.RequestException:
+                pass
+            time.sleep(0.05)
+        self.stop()
+        raise RuntimeError(f"Backend did not become ready within {self.startup_timeout}s")
+
+    def stop(self):
+        if self.process and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+        if self._log:
+            self._log.close()
+            self._log = None
+        if self.workdir:
+            shutil.rmtree(self.workdir, ignore_errors=True)
+            self.workdir = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
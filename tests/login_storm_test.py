@@ -0,0 +1,109 @@
+"""
+Login storm test: /api/products latency must not move while the server is
+busy checking passwords. Starts its own backend on a copy of the dev
+database, so it needs node and takes about half a minute:
+
+    python -m pytest login_storm_test.py -s
+    STORM_SECONDS=30 python -m pytest login_storm_test.py -s
+"""
+
+import asyncio
+import os
+import shutil
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+
+from api_support import ADMIN_CREDENTIALS
+from load_harness import print_report, run_load
+from local_backend import LocalBackend
+
+STORM_SECONDS = float(os.environ.get("STORM_SECONDS", 8))
+BROWSE_USERS = 10
+STORM_USERS = 40
+# Differs from the default of 12 the admin was created with, to exercise rehashing
+BCRYPT_COST = 10
+# Storm p99 may not exceed baseline p99 * factor + slack
+P99_FACTOR = 2.0
+P99_SLACK_MS = 25.0
+
+@pytest.fixture(scope="module")
+def storm_backend():
+    if shutil.which("node") is None:
+        pytest.skip("Needs node")
+    with LocalBackend(env={"BCRYPT_COST": str(BCRYPT_COST)}) as backend:
+        yield backend
+
+def admin_hash_cost(db_path):
+    conn = sqlite3.connect(db_path)
+    (hashed,) = conn.execute("SELECT password FROM Users WHERE email = ?",
+                             (ADMIN_CREDENTIALS["email"],)).fetchone()
+    conn.close()
+    return int(hashed.split("$")[2])
+
+def test_login_rehashes_to_current_cost(storm_backend):
+    """Test a login upgrades a hash made with another work factor"""
+    before = admin_hash_cost(storm_backend.db_path)
+    response = requests.post(f"{storm_backend.api_url}/auth/login", json=ADMIN_CREDENTIALS)
+    assert response.status_code == 200
+
+    # The rehash runs after the response is sent
+    deadline = time.time() + 10
+    while admin_hash_cost(storm_backend.db_path) != BCRYPT_COST and time.time() < deadline:
+        time.sleep(0.1)
+    assert admin_hash_cost(storm_backend.db_path) == BCRYPT_COST
+    assert requests.post(f"{storm_backend.api_url}/auth/login", json=ADMIN_CREDENTIALS).status_code == 200
+    print(f"✓ Admin hash upgraded from cost {before} to {BCRYPT_COST}")
+
+def test_per_ip_login_limit(storm_backend):
+    """Test parallel logins from one client beyond the limit get 429 with Retry-After"""
+    barrier = threading.Barrier(12)
+
+    def attempt(_):
+        barrier.wait()
+        response = requests.post(f"{storm_backend.api_url}/auth/login", json=ADMIN_CREDENTIALS)
+        return response.status_code, response.headers.get("Retry-After")
+
+    with ThreadPoolExecutor(max_workers=12) as pool:
+        results = list(pool.map(attempt, range(12)))
+
+    statuses = [status for status, _ in results]
+    assert set(statuses) <= {200, 429}
+    assert 200 in statuses and 429 in statuses, statuses
+    assert all(retry for status, retry in results if status == 429)
+    print(f"✓ {statuses.count(429)} of 12 parallel logins limited")
+
+def test_products_p99_flat_during_login_storm(storm_backend):
+    """Test browsing p99 stays near its baseline while logins saturate the hashing pool"""
+    api_url = storm_backend.api_url
+
+    async def scenario():
+        baseline = await run_load(mode="closed", users=BROWSE_USERS, duration=STORM_SECONDS,
+                                  mix="browse=1", api_url=api_url)
+        browse, storm = await asyncio.gather(
+            run_load(mode="closed", users=BROWSE_USERS, duration=STORM_SECONDS,
+                     mix="browse=1", api_url=api_url),
+            run_load(mode="closed", users=STORM_USERS, duration=STORM_SECONDS,
+                     mix="login=1", api_url=api_url))
+        return baseline, browse, storm
+
+    baseline, browse, storm = asyncio.run(scenario())
+    print_report(storm, show_histogram=False)
+
+    logins = storm['operations']["POST /api/auth/login"]
+    before = baseline['operations']["GET /api/products"]['p99_ms']
+    during = browse['operations']["GET /api/products"]['p99_ms']
+    print(f"/api/products p99: {before:.1f}ms baseline, {during:.1f}ms during "
+          f"{logins['count']} logins ({logins['statuses']})")
+
+    assert logins['statuses'].get(200, 0) > 0, "No login succeeded during the storm"
+    assert browse['error_rate'] == 0
+    assert during <= before * P99_FACTOR + P99_SLACK_MS, \
+        f"/api/products p99 rose from {before:.1f}ms to {during:.1f}ms during the login storm"
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
@@ -0,0 +1,70 @@
+import pytest
+
+from api_support import metric_value, user_headers
+
+CART_USER_ID = "900700"
+
+class TestMetrics:
+    """
+    /metrics: Prometheus exposition, route-level timing and per-route query budgets
+    """
+
+    def _delta(self, before, after, name, **labels):
+        return metric_value(after, name, **labels) - metric_value(before, name, **labels)
+
+    def test_exposition_format(self, http, backend_url):
+        """Test /metrics serves the Prometheus text format"""
+        response = http.get(f"{backend_url}/metrics")
+        assert response.status_code == 200
+        assert response.headers["Content-Type"].startswith("text/plain")
+        for name in ("http_requests_total", "http_request_duration_seconds", "db_queries_total"):
+            assert f"# TYPE {name} " in response.text
+        print("✓ Prometheus exposition served")
+
+    def test_products_query_budget(self, http, api_url, scrape_metrics):
+        """Test GET /api/products runs at most one query"""
+        before = scrape_metrics()
+        assert http.get(f"{api_url}/products").status_code == 200
+        after = scrape_metrics()
+
+        requests_seen = self._delta(before, after, "http_requests_total", route="/api/products", status="200")
+        queries = self._delta(before, after, "db_queries_total", route="/api/products")
+        assert requests_seen >= 1
+        assert queries <= requests_seen, f"{queries} queries for {requests_seen} catalog request(s)"
+        print(f"✓ /api/products: {queries:.0f} queries")
+
+    def test_cart_query_budget(self, http, api_url, scrape_metrics):
+        """Test GET /api/cart runs a single query and no user lookup"""
+        headers = user_headers(CART_USER_ID)
+        before = scrape_metrics()
+        assert http.get(f"{api_url}/cart", headers=headers).status_code == 200
+        after = scrape_metrics()
+        assert self._delta(before, after, "db_queries_total", route="/api/cart") == 1
+        print("✓ /api/cart: 1 query")
+
+    def test_routes_are_labelled_by_pattern(self, http, api_url, scrape_metrics):
+        """Test route labels use the Express pattern, never the raw URL"""
+        headers = user_headers(CART_USER_ID)
+        http.delete(f"{api_url}/cart/remove/987654", headers=headers)
+        http.get(f"{api_url}/no-such-route-1234")
+        samples = scrape_metrics()
+
+        routes = {dict(labels).get("route") for (name, labels) in samples if name == "http_requests_total"}
+        assert "/api/cart/remove/:productId" in routes
+        assert not any("987654" in route or "no-such-route" in route for route in routes)
+        print(f"✓ {len(routes)} route labels, all patterns")
+
+    def test_latency_histogram_counts_requests(self, http, api_url, scrape_metrics):
+        """Test each request lands in the latency histogram's +Inf bucket"""
+        before = scrape_metrics()
+        for _ in range(3):
+            http.get(f"{api_url}/products")
+        after = scrape_metrics()
+        counted = self._delta(before, after, "http_request_duration_seconds_bucket",
+                              route="/api/products", le="+Inf")
+        assert counted >= 3
+        assert metric_value(after, "http_requests_in_flight") >= 0
+        print(f"✓ {counted:.0f} requests timed")
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -1,4 +1,3 @@
-import requests
 import pytest
 
 class TestMutation:
@@ -6,9 +5,9 @@ class TestMutation:
     Mutation Testing - Test with slightly modified inputs
     """
     
-    def test_email_mutations(self):
+    def test_email_mutations(self, http, api_url):
         """Test email mutations to verify validation"""
-        base_url = "http://localhost:5000/api/auth/login"
+        base_url = f"{api_url}/auth/login"
         base_email = "admin@lec.com"
         
         # Mutation 1: Case sensitivity
@@ -21,7 +20,7 @@ class TestMutation:
         
         for mutated_email in mutations:
             data = {"email": mutated_email, "password": "admin@1234"}
-            response = requests.post(base_url, json=data)
+            response = http.post(base_url, json=data)
             # Test if system handles case sensitivity properly
             print(f"✓ Mutation: {mutated_email} -> Status: {response.status_code}")
         
@@ -34,14 +33,14 @@ class TestMutation:
         
         for mutated_email in special_mutations:
             data = {"email": mutated_email, "password": "admin@1234"}
-            response = requests.post(base_url, json=data)
+            response = http.post(base_url, json=data)
             print(f"✓ Special char mutation: {mutated_email} -> Status: {response.status_code}")
         
         print("✓ Email mutation testing completed")
     
-    def test_password_mutations(self):
+    def test_password_mutations(self, http, api_url):
         """Test password mutations"""
-        base_url = "http://localhost:5000/api/auth/login"
+        base_url = f"{api_url}/auth/login"
         base_password = "admin@1234"
         
         # Mutation 1: Character substitution
@@ -55,7 +54,7 @@ class TestMutation:
         
         for mutated_password in mutations:
             data = {"email": "admin@lec.com", "password": mutated_password}
-            response = requests.post(base_url, json=data)
+            response = http.post(base_url, json=data)
             # Should fail for wrong passwords
             assert response.status_code == 400, f"Should reject: {mutated_password}"
             print(f"✓ Password mutation rejected: {mutated_password}")
@@ -70,17 +69,17 @@ class TestMutation:
         
         for mutated_password in length_mutations:
             data = {"email": "admin@lec.com", "password": mutated_password}
-            response = requests.post(base_url, json=data)
+            response = http.post(base_url, json=data)
             assert response.status_code == 400, f"Should reject: {mutated_password}"
             print(f"✓ Length mutation rejected: {mutated_password}")
         
         print("✓ Password mutation testing completed")
     
-    def test_api_endpoint_mutations(self):
+    def test_api_endpoint_mutations(self, http, api_url):
         """Test API endpoint mutations"""
         base_endpoints = [
-            "http://localhost:5000/api/products",
-            "http://localhost:5000/api/auth/login"
+            f"{api_url}/products",
+            f"{api_url}/auth/login"
         ]
         
         # Mutation 1: Case variations
@@ -94,7 +93,7 @@ class TestMutation:
             
             for mutated_endpoint in mutations:
                 try:
-                    response = requests.get(mutated_endpoint, timeout=5)
+                    response = http.get(mutated_endpoint, timeout=5)
                     print(f"✓ Endpoint mutation: {mutated_endpoint} -> {response.status_code}")
                 except:
                     print(f"✓ Endpoint mutation failed: {mutated_endpoint}")
@@ -0,0 +1,144 @@
+"""
+Online migration test: copy the line items of MIGRATION_ORDERS (default 5M)
+legacy orders into OrderItems with `node migrateBatched order-items` while
+the load harness browses, fills carts and checks out against the same
+database. The migration is killed halfway through and resumed from its
+checkpoint. Starts its own backend, so it needs node; building the database
+takes several minutes at the default size:
+
+    python -m pytest online_migration_test.py -s
+    MIGRATION_ORDERS=500000 python -m pytest online_migration_test.py -s
+"""
+
+import asyncio
+import os
+import re
+import shutil
+import sqlite3
+import subprocess
+import tempfile
+import time
+
+import pytest
+
+from datagen import generate
+from load_harness import print_report, run_load
+from local_backend import BACKEND_DIR, LocalBackend, build_template
+
+MIGRATION_ORDERS = int(os.environ.get("MIGRATION_ORDERS", 5_000_000))
+LOAD_SECONDS = float(os.environ.get("MIGRATION_LOAD_SECONDS", 20))
+LOAD_USERS = 10
+LOAD_MIX = "browse=60,cart=30,checkout=10"
+# p99 during the migration may not exceed baseline p99 * factor + slack; the
+# slack covers waiting for one chunk's write lock (MIGRATION_MAX_CHUNK_MS)
+P99_FACTOR = 2.0
+P99_SLACK_MS = 100.0
+
+CHECKSUM_SQL = "SELECT COUNT(*), SUM(quantity), SUM(productId * quantity), SUM(price * quantity) FROM OrderItems"
+
+@pytest.fixture(scope="module")
+def legacy_orders():
+    """
+    Database with MIGRATION_ORDERS orders whose line items are only in the
+    Order.items JSON blob; yields (path, last legacy order id, checksum of
+    the OrderItems the migration must recreate)
+    """
+    if shutil.which("node") is None:
+        pytest.skip("Needs node")
+    workdir = tempfile.mkdtemp(prefix="online-migration-")
+    db_path = os.path.join(workdir, "database.sqlite")
+    build_template(db_path)
+    generate(db_path, products=2_000, users=50_000, orders=MIGRATION_ORDERS, cart_lines=0, rollups=False)
+
+    start = time.perf_counter()
+    conn = sqlite3.connect(db_path)
+    with conn:
+        conn.execute("""
+            UPDATE Orders SET items = (
+                SELECT json_group_array(json_object('productId', productId, 'name', name, 'image', image,
+                                                   'price', price, 'quantity', quantity))
+                FROM OrderItems WHERE OrderItems.orderId = Orders.id)""")
+    checksum = conn.execute(CHECKSUM_SQL).fetchone()
+    last_id = conn.execute("SELECT MAX(id) FROM Orders").fetchone()[0]
+    with conn:
+        conn.execute("DELETE FROM OrderItems")
+    conn.close()
+    print(f"Moved {checksum[0]:,} order items into JSON blobs in {time.perf_counter() - start:.0f}s")
+    yield db_path, last_id, checksum
+    shutil.rmtree(workdir, ignore_errors=True)
+
+def migration_env(backend):
+    """Migrate the backend's database, throttled on the backend's latency"""
+    return {**os.environ, "DB_STORAGE": backend.db_path,
+            "MIGRATION_METRICS_URL": f"{backend.backend_url}/metrics"}
+
+def checkpoint(db_path):
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    row = conn.execute("SELECT * FROM MigrationCheckpoints WHERE name = 'order-items'").fetchone()
+    conn.close()
+    return dict(row) if row else None
+
+def legacy_checksum(db_path, last_id, below=None):
+    conn = sqlite3.connect(db_path)
+    row = conn.execute(f"{CHECKSUM_SQL} WHERE orderId <= ?", (min(last_id, below or last_id),)).fetchone()
+    conn.close()
+    return row
+
+def test_migration_runs_online(legacy_orders):
+    """Test the migration keeps foreground p99 near baseline, survives a kill and copies every item once"""
+    db_path, last_id, expected = legacy_orders
+    with LocalBackend(database=db_path, copy=False, startup_timeout=300) as backend:
+        load = dict(mode="closed", users=LOAD_USERS, duration=LOAD_SECONDS, mix=LOAD_MIX,
+                    api_url=backend.api_url, jwt_secret=backend.jwt_secret)
+        baseline = asyncio.run(run_load(**load))
+
+        log_path = os.path.join(os.path.dirname(db_path), "migration.log")
+        with open(log_path, "w") as log:
+            runner = subprocess.Popen(["node", "migrateBatched.js", "order-items"], cwd=BACKEND_DIR,
+                                      env=migration_env(backend), stdout=log, stderr=subprocess.STDOUT)
+            during = asyncio.run(run_load(**load))
+            interrupted = runner.poll() is None
+            runner.kill()
+            runner.wait()
+
+        if interrupted:
+            # Whatever the kill cut off rolled back with its chunk
+            partial = checkpoint(db_path)
+            assert partial and 0 < partial["lastKey"] < last_id and partial["completedAt"] is None
+            done = legacy_checksum(db_path, last_id, below=partial["lastKey"])
+            assert done[0] == partial["rowsWritten"], "items committed without their checkpoint"
+            assert legacy_checksum(db_path, last_id)[0] == done[0], "items past the checkpoint"
+            print(f"✓ Killed after {partial['lastKey']:,} of {last_id:,} orders; resuming")
+        else:
+            print("⚠️  Migration finished within the load window; nothing to resume")
+
+        resumed = subprocess.run(["node", "migrateBatched.js", "order-items"], cwd=BACKEND_DIR,
+                                 env=migration_env(backend), check=True,
+                                 capture_output=True, text=True)
+    # The rest of stdout is JSON log lines
+    summary = next(line for line in reversed(resumed.stdout.splitlines()) if "rows/s" in line
+                   and not line.startswith("{"))
+    print(summary)
+
+    final = checkpoint(db_path)
+    assert final["completedAt"] is not None
+    actual = legacy_checksum(db_path, last_id)
+    assert actual[:3] == expected[:3], "order items differ from the original ones"
+    assert actual[3] == pytest.approx(expected[3]), "order item prices differ from the original ones"
+    rate = re.search(r"\((\d+) rows/s\)", summary)
+    assert rate, summary
+
+    print_report(during, show_histogram=False)
+    assert during['error_rate'] == 0
+    for name in ("GET /api/products", "POST /api/cart/add"):
+        before = baseline['operations'][name]['p99_ms']
+        after = during['operations'][name]['p99_ms']
+        print(f"{name} p99: {before:.1f}ms baseline, {after:.1f}ms during the migration")
+        assert after <= before * P99_FACTOR + P99_SLACK_MS, \
+            f"{name} p99 rose from {before:.1f}ms to {after:.1f}ms during the migration"
+    print(f"✓ {final['rowsDone']:,} orders migrated online, {final['rowsWritten']:,} items "
+          f"({rate.group(1)} rows/s on resume)")
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
@@ -0,0 +1,76 @@
+import json
+import sqlite3
+
+import pytest
+
+import requests
+
+from api_support import user_headers
+from local_backend import LocalBackend, run_script
+
+CART_USER_ID = "900450"
+# Owner of some of legacy_database's JSON-only orders
+LEGACY_USER_ID = "900500"
+
+class TestOrderItems:
+    """
+    OrderItem rows: written at checkout, migrated from legacy JSON blobs, read
+    from the blob until then
+    """
+
+    def test_checkout_writes_order_items(self, http, api_url):
+        """Test a checkout's lines come back from /api/cart/orders as order items"""
+        headers = user_headers(CART_USER_ID)
+        products = [p for p in http.get(f"{api_url}/products").json() if p["countInStock"] > 2][:2]
+        for product in products:
+            http.post(f"{api_url}/cart/add", json={"productId": product["id"], "quantity": 2}, headers=headers)
+        response = http.post(f"{api_url}/cart/purchase", headers=headers)
+        assert response.status_code == 200
+
+        order = http.get(f"{api_url}/cart/orders", headers=headers).json()[0]
+        assert order["orderId"] == response.json()["orderId"]
+        assert sorted(item["productId"] for item in order["items"]) == sorted(p["id"] for p in products)
+        assert all(item["quantity"] == 2 for item in order["items"])
+        assert float(order["totalAmount"]) == pytest.approx(
+            sum(float(item["price"]) * item["quantity"] for item in order["items"]))
+        print(f"✓ Order {order['orderId']} stored {len(order['items'])} order items")
+
+    def test_migration_copies_blobs(self, legacy_database):
+        """Test the migration copies every legacy line and is safe to re-run"""
+        run_script("migrateBatched.js", legacy_database, "order-items")
+
+        conn = sqlite3.connect(legacy_database)
+        expected = sum(len(json.loads(items)) for (items,) in conn.execute("SELECT items FROM Orders"))
+        assert conn.execute("SELECT COUNT(*) FROM OrderItems").fetchone()[0] == expected
+        orphans = conn.execute("""
+            SELECT COUNT(*) FROM Orders o
+            WHERE o.items != '[]' AND NOT EXISTS (SELECT 1 FROM OrderItems i WHERE i.orderId = o.id)""").fetchone()[0]
+        assert orphans == 0
+
+        run_script("migrateBatched.js", legacy_database, "order-items")
+        assert conn.execute("SELECT COUNT(*) FROM OrderItems").fetchone()[0] == expected, "Re-run duplicated items"
+        plan = " ".join(row[-1] for row in conn.execute(
+            "EXPLAIN QUERY PLAN SELECT SUM(quantity) FROM OrderItems WHERE productId = 1 AND createdAt >= '2020'"))
+        assert "USING INDEX" in plan or "USING COVERING INDEX" in plan, plan
+        conn.close()
+        print(f"✓ Migrated {expected} legacy order items")
+
+    def test_unmigrated_orders_list_blob_items(self, legacy_database):
+        """Test orders the migration has not reached still list their items from the JSON blob"""
+        conn = sqlite3.connect(legacy_database)
+        blobs = {order_id: json.loads(items) for order_id, items in conn.execute(
+            "SELECT orderId, items FROM Orders WHERE userId = ? AND orderId LIKE 'LG%'", (LEGACY_USER_ID,))}
+        conn.close()
+
+        with LocalBackend(database=legacy_database, copy=False) as backend:
+            headers = user_headers(LEGACY_USER_ID, backend.jwt_secret)
+            orders = requests.get(f"{backend.api_url}/cart/orders", headers=headers).json()
+        assert orders and all(order["orderId"] in blobs for order in orders)
+        for order in orders:
+            expected = blobs[order["orderId"]]
+            assert [(item["productId"], item["quantity"]) for item in order["items"]] == \
+                [(item["productId"], item["quantity"]) for item in expected]
+        print(f"✓ {len(orders)} unmigrated orders listed with their blob items")
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
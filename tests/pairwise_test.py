@@ -1,4 +1,3 @@
-import requests
 import pytest
 import itertools
 
@@ -7,13 +6,13 @@ class TestPairwise:
     Pairwise Testing - Test all pairs of input parameters
     """
     
-    def test_login_parameter_pairs(self):
+    def test_login_parameter_pairs(self, http, api_url):
         """
         Pairwise testing for login parameters:
         Email types: Valid, Invalid format, Empty
         Password types: Correct, Wrong, Empty
         """
-        base_url = "http://localhost:5000/api/auth/login"
+        base_url = f"{api_url}/auth/login"
         
         # Parameter values
         emails = [
@@ -33,7 +32,7 @@ class TestPairwise:
         
         for (email_type, email), (pass_type, password) in test_pairs:
             data = {"email": email, "password": password}
-            response = requests.post(base_url, json=data)
+            response = http.post(base_url, json=data)
             
             # Expected results based on pair combination
             if email_type == "valid" and pass_type == "correct":
@@ -48,16 +47,16 @@ class TestPairwise:
         
         print("✓ Pairwise login testing completed")
     
-    def test_product_filter_pairs(self):
+    def test_product_filter_pairs(self, http, api_url):
         """
         Pairwise testing for product filtering:
         Categories: Electronics, Books, All
         Price ranges: Low, High, All
         """
-        base_url = "http://localhost:5000/api/products"
+        base_url = f"{api_url}/products"
         
         # Get all products first
-        response = requests.get(base_url)
+        response = http.get(base_url)
         all_products = response.json()
         
         # Test different category and price combinations
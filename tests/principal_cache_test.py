@@ -0,0 +1,52 @@
+import pytest
+
+class TestPrincipalCache:
+    """
+    Admin principal cache: hits on repeat requests, dropped on profile changes
+    """
+
+    def _stats(self, http, api_url, auth_headers):
+        response = http.get(f"{api_url}/admin/cache-stats", headers=auth_headers)
+        assert response.status_code == 200
+        return response.json()["principals"]
+
+    def test_repeat_requests_hit_cache(self, http, api_url, auth_headers):
+        """Test repeated admin requests with one token are served from the cache"""
+        self._stats(http, api_url, auth_headers)
+        before = self._stats(http, api_url, auth_headers)
+        for _ in range(5):
+            assert http.get(f"{api_url}/admin/analytics", headers=auth_headers).status_code == 200
+        after = self._stats(http, api_url, auth_headers)
+
+        # 5 analytics calls + the final stats call
+        assert after["hits"] - before["hits"] == 6
+        assert after["misses"] == before["misses"]
+        print(f"✓ Principal cache: {after}")
+
+    def test_profile_change_invalidates(self, http, api_url, auth_headers, admin_token):
+        """Test a profile update drops the cached principal"""
+        cookies = {"accessToken": admin_token}
+        profile = http.get(f"{api_url}/auth/me", cookies=cookies).json()
+        before = self._stats(http, api_url, auth_headers)
+
+        try:
+            response = http.put(f"{api_url}/auth/update-profile", cookies=cookies,
+                                json={"username": f"{profile['username']} (renamed)", "address": profile["address"]})
+            assert response.status_code == 200
+            after = self._stats(http, api_url, auth_headers)
+            assert after["invalidations"] > before["invalidations"]
+            assert after["misses"] == before["misses"] + 1, "Stale principal served after profile change"
+        finally:
+            http.put(f"{api_url}/auth/update-profile", cookies=cookies,
+                     json={"username": profile["username"], "address": profile["address"]})
+        print("✓ Profile change invalidated the cached principal")
+
+    def test_invalid_and_missing_tokens(self, http, api_url):
+        """Test the cache never lets a bad token through"""
+        assert http.get(f"{api_url}/admin/analytics").status_code == 401
+        response = http.get(f"{api_url}/admin/analytics", headers={"Authorization": "Bearer not.a.token"})
+        assert response.status_code == 401
+        print("✓ Invalid tokens refused")
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,79 @@
+import pytest
+
+class TestProductQuery:
+    """
+    Server-side filtering, sorting, projection and keyset pagination
+    for GET /api/products
+    """
+
+    def test_category_filter(self, http, api_url):
+        """Test products can be filtered by category"""
+        response = http.get(f"{api_url}/products", params={"category": "Books"})
+        assert response.status_code == 200
+        products = response.json()
+        assert len(products) > 0
+        assert all(p["category"] == "Books" for p in products)
+        print(f"✓ Category filter returned {len(products)} books")
+
+    def test_price_and_rating_filters(self, http, api_url):
+        """Test price range and minimum rating filters"""
+        params = {"minPrice": 500, "maxPrice": 5000, "minRating": 4}
+        response = http.get(f"{api_url}/products", params=params)
+        assert response.status_code == 200
+        for product in response.json():
+            assert 500 <= float(product["price"]) <= 5000
+            assert float(product["rating"]) >= 4
+        print("✓ Price and rating filters applied")
+
+    def test_sort_orders(self, http, api_url):
+        """Test price and rating sort orders"""
+        for sort, key, reverse in [("price-low", "price", False),
+                                   ("price-high", "price", True),
+                                   ("rating", "rating", True)]:
+            products = http.get(f"{api_url}/products", params={"sort": sort}).json()
+            values = [float(p[key]) for p in products]
+            assert values == sorted(values, reverse=reverse), f"{sort} is not sorted"
+        print("✓ Sort orders verified")
+
+    def test_field_projection(self, http, api_url):
+        """Test fields= returns only the requested columns plus id"""
+        response = http.get(f"{api_url}/products", params={"fields": "name,price"})
+        assert response.status_code == 200
+        for product in response.json():
+            assert set(product) == {"id", "name", "price"}
+        print("✓ Field projection drops description and other columns")
+
+    def test_keyset_pagination(self, http, api_url):
+        """Test walking every page with the cursor returns each product once"""
+        all_ids = [p["id"] for p in http.get(f"{api_url}/products", params={"fields": "id"}).json()]
+
+        for sort in [None, "price-low", "rating"]:
+            seen = []
+            params = {"limit": 7, "fields": "id"}
+            if sort:
+                params["sort"] = sort
+            while True:
+                response = http.get(f"{api_url}/products", params=params)
+                assert response.status_code == 200
+                page = response.json()
+                assert len(page) <= 7
+                seen.extend(p["id"] for p in page)
+                cursor = response.headers.get("X-Next-Cursor")
+                if not cursor:
+                    break
+                params["cursor"] = cursor
+
+            assert len(seen) == len(set(seen)), f"Duplicate products across pages ({sort})"
+            assert sorted(seen) == sorted(all_ids), f"Pages do not cover the catalog ({sort})"
+        print(f"✓ Keyset pagination covers all {len(all_ids)} products exactly once")
+
+    def test_invalid_parameters(self, http, api_url):
+        """Test invalid query parameters are rejected with 400"""
+        for params in [{"minPrice": "cheap"}, {"sort": "random"}, {"limit": 0},
+                       {"fields": "password"}, {"limit": 5, "cursor": "not-a-cursor"}]:
+            response = http.get(f"{api_url}/products", params=params)
+            assert response.status_code == 400, f"Should reject {params}"
+        print("✓ Invalid query parameters rejected")
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
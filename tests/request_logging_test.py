@@ -0,0 +1,143 @@
+"""
+Structured logging test: every request gets an id, echoed in X-Request-Id
+and carried by its JSON access log line, so client-side latencies can be
+matched with the server's, and processes sharing one stdout pipe (cluster
+workers) never interleave their lines. Starts its own backend writing to
+LOG_FILE, so it needs node:
+
+    python -m pytest request_logging_test.py -s
+"""
+
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import tempfile
+import time
+import uuid
+
+import pytest
+import requests
+
+from local_backend import BACKEND_DIR, LocalBackend
+
+# Logs `count` lines padded to `size` bytes as fast as it can, then exits
+# without closing the logger, leaving the exit handler to flush the rest
+SPAM_SCRIPT = """
+const logger = require('./utils/logger');
+const [count, size] = process.argv.slice(1).map(Number);
+const pad = 'x'.repeat(size);
+let i = 0;
+const burst = () => {
+  for (let end = Math.min(count, i + 200); i < end; i++) logger.info('spam', { i, pad });
+  if (i < count) setImmediate(burst);
+  else process.exit(0);
+};
+burst();
+"""
+
+@pytest.fixture(scope="module")
+def logged_backend():
+    if shutil.which("node") is None:
+        pytest.skip("Needs node")
+    workdir = tempfile.mkdtemp(prefix="request-logging-")
+    log_file = os.path.join(workdir, "server.jsonl")
+    try:
+        with LocalBackend(env={"LOG_FILE": log_file, "ACCESS_LOG_SAMPLE_RATE": "1"}) as backend:
+            yield backend, log_file
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+def read_log(log_file):
+    with open(log_file) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def access_lines(log_file, request_ids, timeout=5.0):
+    """Wait for the buffered writer to flush an access line for every id"""
+    deadline = time.time() + timeout
+    while True:
+        found = {record["requestId"]: record for record in read_log(log_file)
+                 if record.get("msg") == "Request completed" and record.get("requestId") in request_ids}
+        if len(found) == len(request_ids) or time.time() > deadline:
+            return found
+        time.sleep(0.1)
+
+def test_log_lines_are_structured(logged_backend):
+    """Test every line is a JSON object with time, level, msg and pid"""
+    backend, log_file = logged_backend
+    requests.get(f"{backend.api_url}/products")
+    time.sleep(0.3)
+    records = read_log(log_file)
+    assert records
+    for record in records:
+        assert {"time", "level", "msg", "pid"} <= set(record)
+        assert record["level"] in {"debug", "info", "warn", "error"}
+    print(f"✓ {len(records)} structured log lines")
+
+def test_request_ids_correlate_with_latency(logged_backend):
+    """Test access lines match client requests by id, status and latency"""
+    backend, log_file = logged_backend
+    http = requests.Session()
+    calls = [("GET", "/products"), ("GET", "/products/search?q=wireless"),
+             ("GET", "/cart"), ("GET", "/no-such-route")] * 10
+    sent = {}
+    for method, path in calls:
+        request_id = f"test-{uuid.uuid4().hex}"
+        start = time.perf_counter()
+        response = http.request(method, f"{backend.api_url}{path}", headers={"X-Request-Id": request_id})
+        sent[request_id] = ((time.perf_counter() - start) * 1000, response.status_code)
+        assert response.headers["X-Request-Id"] == request_id
+
+    logged = access_lines(log_file, set(sent))
+    assert set(logged) == set(sent), f"{len(sent) - len(logged)} requests missing from the log"
+    for request_id, (client_ms, status) in sent.items():
+        record = logged[request_id]
+        assert record["status"] == status
+        # The server's view of a request can only be shorter than the client's
+        assert 0 < record["durationMs"] <= client_ms + 1, (record, client_ms)
+
+    server = statistics.median(record["durationMs"] for record in logged.values())
+    client = statistics.median(client_ms for client_ms, _ in sent.values())
+    print(f"✓ {len(sent)} requests correlated: median {server:.2f}ms server, {client:.2f}ms client")
+
+def test_request_ids_are_generated(logged_backend):
+    """Test requests without a usable X-Request-Id get a fresh one"""
+    backend, log_file = logged_backend
+    generated = requests.get(f"{backend.api_url}/products").headers["X-Request-Id"]
+    replaced = requests.get(f"{backend.api_url}/products",
+                            headers={"X-Request-Id": "not a valid id " * 10}).headers["X-Request-Id"]
+    assert generated and replaced and generated != replaced
+    assert " " not in replaced
+    assert set(access_lines(log_file, {generated, replaced})) == {generated, replaced}
+    print("✓ Request ids generated when missing or invalid")
+
+def test_shared_pipe_lines_never_interleave():
+    """Test processes logging to one pipe write whole lines, in order, and lose none silently"""
+    if shutil.which("node") is None:
+        pytest.skip("Needs node")
+    count = 5000
+    read_end, write_end = os.pipe()
+    writers = [subprocess.Popen(["node", "-e", SPAM_SCRIPT, str(count), str(size)], cwd=BACKEND_DIR,
+                                stdout=write_end)
+               for size in (100, 1000, 3000, 500)]
+    os.close(write_end)
+    with os.fdopen(read_end, "rb") as pipe:
+        output = pipe.read().decode()
+    for writer in writers:
+        assert writer.wait() == 0
+
+    by_pid = {}
+    for line in output.splitlines():
+        record = json.loads(line)
+        by_pid.setdefault(record["pid"], []).append(record)
+    assert set(by_pid) == {writer.pid for writer in writers}
+    for records in by_pid.values():
+        logged = [record["i"] for record in records if record["msg"] == "spam"]
+        dropped = sum(record["dropped"] for record in records if record["msg"] == "Log lines dropped")
+        assert logged == sorted(logged)
+        assert len(logged) + dropped == count
+    print(f"✓ {len(output.splitlines()):,} lines from {len(writers)} processes, none interleaved")
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
@@ -2,95 +2,477 @@
 """
 Complete Test Suite Runner for Amazon Replica
 Run all tests and generate comprehensive report
+
+Usage:
+    python run_all_tests.py                 # sequential, one suite at a time
+    python run_all_tests.py --parallel      # sharded across a worker pool
+    python run_all_tests.py --parallel -j 8 # with 8 workers
+    python run_all_tests.py --parallel --local
+                                            # each worker on its own local backend
+    python run_all_tests.py --slow          # also the long-running SLOW_SUITES
 """
 
+import argparse
+import os
+import queue
+import shutil
 import subprocess
 import sys
+import tempfile
+import threading
 import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from local_backend import LocalBackend, build_template
+
+TEST_SUITES = [
+    ("simple_test.py", "Basic API Tests"),
+    ("complete_test.py", "Core Functionality Tests"),
+    ("integration_test.py", "Integration Tests"),
+    ("error_handling_test.py", "Error Handling Tests"),
+    ("database_test.py", "Database Tests"),
+    ("product_query_test.py", "Product Query Tests"),
+    ("search_test.py", "Product Search Tests"),
+    ("catalog_cache_test.py", "Catalog Cache Tests"),
+    ("image_assets_test.py", "Image Asset Tests"),
+    ("checkout_concurrency_test.py", "Checkout Concurrency Tests"),
+    ("cart_delta_test.py", "Cart Delta Tests"),
+    ("sales_rollup_test.py", "Sales Rollup Tests"),
+    ("order_items_test.py", "Order Item Tests"),
+    ("admin_listing_test.py", "Admin Listing Tests"),
+    ("principal_cache_test.py", "Principal Cache Tests"),
+    ("cart_auth_test.py", "Cart Authentication Tests"),
+    ("metrics_test.py", "Metrics Tests"),
+    ("load_test.py", "Load Smoke Tests"),
+    ("template_database_test.py", "Template Database Tests"),
+    ("request_logging_test.py", "Request Logging Tests"),
+    ("email_outbox_test.py", "Email Outbox Tests"),
+    ("sqlite_profile_test.py", "SQLite Profile Tests"),
+    ("datagen_test.py", "Data Generator Tests"),
+    ("equivalence_class_test.py", "Equivalence Class Testing"),
+    ("boundary_value_test.py", "Boundary Value Testing"),
+    ("decision_table_test.py", "Decision Table Testing"),
+    ("state_transition_test.py", "State Transition Testing"),
+    ("pairwise_test.py", "Pairwise Testing"),
+    ("mutation_test.py", "Mutation Testing")
+]
+
+# Suites that change shared server state (cart contents, stock, orders).
+# In parallel mode they are never sharded and run one after another once
+# every other shard has finished, so nothing reads the state they change
+# while they run. With --local they run whole, each on a fresh clone of the
+# template database.
+ISOLATED_SUITES = {
+    "state_transition_test.py",
+    "search_test.py",
+    "catalog_cache_test.py",
+    "checkout_concurrency_test.py",
+    "cart_delta_test.py",
+    "sales_rollup_test.py",
+    "order_items_test.py",
+    "admin_listing_test.py",
+    "principal_cache_test.py",
+    "cart_auth_test.py",
+    "metrics_test.py",
+    "load_test.py",
+}
+
+# Suites that start backends of their own instead of using BACKEND_URL. They
+# run whole (their backends are module fixtures) on any worker, and never
+# touch the worker's backend.
+SELF_HOSTED_SUITES = {
+    "image_assets_test.py",
+    "template_database_test.py",
+    "request_logging_test.py",
+    "email_outbox_test.py",
+    "sqlite_profile_test.py",
+    "datagen_test.py",
+    "cluster_scaling_test.py",
+    "login_storm_test.py",
+    "export_memory_test.py",
+    "online_migration_test.py",
+}
+
+# Opt-in with --slow: each takes from half a minute to several minutes
+SLOW_SUITES = [
+    ("login_storm_test.py", "Login Storm Tests"),
+    ("cluster_scaling_test.py", "Cluster Scaling Tests"),
+    ("export_memory_test.py", "Export Memory Tests"),
+    ("online_migration_test.py", "Online Migration Tests"),
+]
+
+# Tests per pytest process when a shared suite is split: each process pays
+# for the session fixtures (HTTP pool, admin login) once
+TESTS_PER_SHARD = int(os.environ.get("TESTS_PER_SHARD", 10))
+
+def suite_kind(test_file):
+    """'isolated', 'self-hosted' or 'shared' (split into batches of tests)"""
+    if test_file in ISOLATED_SUITES:
+        return "isolated"
+    if test_file in SELF_HOSTED_SUITES:
+        return "self-hosted"
+    return "shared"
 
 def run_test_suite(test_file, test_name):
     """Run a test suite and return results"""
     print(f"\n{'='*60}")
     print(f"Running {test_name}")
     print('='*60)
-    
+
     try:
-        result = subprocess.run([sys.executable, "-m", "pytest", test_file, "-v"], 
+        result = subprocess.run([sys.executable, "-m", "pytest", test_file, "-v"],
                               capture_output=True, text=True)
-        
+
         print(result.stdout)
         if result.stderr:
             print("STDERR:", result.stderr)
-        
+
         return result.returncode == 0
     except Exception as e:
         print(f"Error running {test_name}: {e}")
         return False
 
-def main():
-    """Run all test suites"""
-    print("Amazon Replica - Comprehensive Test Suite")
-    print("="*60)
-    
-    test_suites = [
-        ("simple_test.py", "Basic API Tests"),
-        ("complete_test.py", "Core Functionality Tests"),
-        ("integration_test.py", "Integration Tests"),
-        ("error_handling_test.py", "Error Handling Tests"),
-        ("database_test.py", "Database Tests"),
-        ("equivalence_class_test.py", "Equivalence Class Testing"),
-        ("boundary_value_test.py", "Boundary Value Testing"),
-        ("decision_table_test.py", "Decision Table Testing"),
-        ("state_transition_test.py", "State Transition Testing"),
-        ("pairwise_test.py", "Pairwise Testing"),
-        ("mutation_test.py", "Mutation Testing")
-    ]
-    
+def collect_tests(test_file):
+    """Return the pytest node ids of every test in a suite"""
+    result = subprocess.run(
+        [sys.executable, "-m", "pytest", test_file, "--collect-only", "-q"],
+        capture_output=True, text=True
+    )
+    return [line.strip() for line in result.stdout.splitlines()
+            if "::" in line and not line.startswith(" ")]
+
+def batches(node_ids, size=TESTS_PER_SHARD):
+    """Split a suite's node ids into shards of at most `size` tests"""
+    return [node_ids[i:i + size] for i in range(0, len(node_ids), size)]
+
+def run_shard(node_ids, env=None):
+    """
+    Run a shard of tests in its own pytest process.
+    Returns (success, output, {node_id: duration}).
+    """
+    fd, xml_path = tempfile.mkstemp(suffix=".xml", prefix="shard-")
+    os.close(fd)
+    try:
+        result = subprocess.run(
+            [sys.executable, "-m", "pytest", *node_ids, "-v", f"--junitxml={xml_path}"],
+            capture_output=True, text=True, env=env
+        )
+        output = result.stdout
+        if result.stderr:
+            output += "\nSTDERR: " + result.stderr
+        return result.returncode == 0, output, parse_durations(xml_path)
+    except Exception as e:
+        return False, f"Error running {' '.join(node_ids)}: {e}", {}
+    finally:
+        os.remove(xml_path)
+
+def parse_durations(xml_path):
+    """Read per-test durations from a junit xml report"""
+    durations = {}
+    try:
+        root = ET.parse(xml_path).getroot()
+    except (ET.ParseError, OSError):
+        return durations
+    for case in root.iter("testcase"):
+        classname = case.get("classname", "")
+        if not classname:
+            # Collection errors are reported without a class or module
+            durations[case.get("name", "")] = float(case.get("time", 0))
+            continue
+        module, *parts = classname.split(".")
+        node_id = "::".join([f"{module}.py", *parts, case.get("name", "")])
+        durations[node_id] = float(case.get("time", 0))
+    return durations
+
+def run_timed_shard(node_ids, env=None):
+    """run_shard, also returning the time the shard started running"""
+    start = time.time()
+    return (start, *run_shard(node_ids, env))
+
+def run_parallel(workers, suites=TEST_SUITES):
+    """
+    Shard every suite across a pool of pytest processes and stream each
+    suite's output as soon as all of its shards have finished. Shared suites
+    are split into batches of TESTS_PER_SHARD tests. Isolated suites run
+    whole, one after another, once the pool has drained.
+    """
     results = {}
     total_start = time.time()
-    
-    for test_file, test_name in test_suites:
+
+    shared = [(f, n) for f, n in suites if f not in ISOLATED_SUITES]
+    isolated = [(f, n) for f, n in suites if f in ISOLATED_SUITES]
+    sharded = [f for f, _ in shared if suite_kind(f) == "shared"]
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        node_ids = dict(zip(sharded, pool.map(collect_tests, sharded)))
+
+        futures = {}
+        pending = {}
+        for test_file, test_name in shared:
+            # A suite that fails to collect still runs once so its error is reported
+            shards = batches(node_ids.get(test_file, [])) or [[test_file]]
+            pending[test_name] = {
+                'remaining': len(shards),
+                'success': True,
+                'output': [],
+                'durations': {},
+                # Earliest shard start; a suite's time starts when it runs, not when queued
+                'start': float('inf')
+            }
+            for shard in shards:
+                futures[pool.submit(run_timed_shard, shard)] = test_name
+
+        for future in as_completed(futures):
+            test_name = futures[future]
+            start, success, output, durations = future.result()
+            suite = pending[test_name]
+            suite['start'] = min(suite['start'], start)
+            suite['success'] = suite['success'] and success
+            suite['output'].append(output)
+            suite['durations'].update(durations)
+            suite['remaining'] -= 1
+
+            if suite['remaining'] == 0:
+                print_suite(test_name, "\n".join(suite['output']))
+                results[test_name] = {
+                    'success': suite['success'],
+                    'duration': time.time() - suite['start'],
+                    'tests': suite['durations']
+                }
+
+    # Nothing else is running now, so state-changing suites cannot race
+    for test_file, test_name in isolated:
+        start_time = time.time()
+        success, output, durations = run_shard([test_file])
+        print_suite(test_name, output)
+        results[test_name] = {
+            'success': success,
+            'duration': time.time() - start_time,
+            'tests': durations
+        }
+
+    # Keep the summary in the declared suite order
+    ordered = {name: results[name] for _, name in suites if name in results}
+    return ordered, time.time() - total_start
+
+class Lane:
+    """
+    A worker with a backend of its own, serving its own clone of the
+    template database, so its tests never see another worker's carts,
+    stock or orders
+    """
+
+    def __init__(self, template):
+        self.template = template
+        self.backend = None
+        # clean: fresh clone; used: shared tests ran; dirty: an isolated suite ran
+        self.state = None
+
+    def start(self):
+        self.backend = LocalBackend(database=self.template, template=True).start()
+        self.state = "clean"
+
+    def recycle(self):
+        """Fresh clone and server, for suites that need the seeded state"""
+        self.stop()
+        self.start()
+
+    def prepare(self, kind):
+        """
+        Get the lane ready for a shard of a `kind` suite (see suite_kind). An
+        isolated suite always starts on a fresh clone, and whatever runs after
+        one gets a fresh clone too, so nothing sees the state it left behind.
+        Self-hosted suites do not use the lane's backend.
+        """
+        if kind == "self-hosted":
+            return
+        if self.state == "dirty" or (kind == "isolated" and self.state != "clean"):
+            self.recycle()
+        self.state = "dirty" if kind == "isolated" else "used"
+
+    def stop(self):
+        if self.backend:
+            self.backend.stop()
+            self.backend = None
+
+    def env(self):
+        """Point the suites' conftest at this lane's backend"""
+        return {**os.environ, "BACKEND_URL": self.backend.backend_url,
+                "JWT_SECRET": self.backend.jwt_secret, "DB_STORAGE": self.backend.db_path,
+                "TEMPLATE_DATABASE": self.template}
+
+def run_local(workers, suites=TEST_SUITES):
+    """
+    Run every suite on per-worker local backends. A seeded template database
+    is built once; each worker clones it and starts a server on the clone.
+    Shared suites are split into batches of TESTS_PER_SHARD tests across the
+    workers; state-changing suites run whole on a fresh clone, on any worker,
+    and the lane is back on a fresh clone before its next shard.
+    """
+    total_start = time.time()
+    workdir = tempfile.mkdtemp(prefix="test-template-")
+    template = os.path.join(workdir, "template.sqlite")
+    build_template(template)
+    print(f"Template database built in {time.time() - total_start:.1f}s", flush=True)
+
+    shared = [f for f, _ in suites if suite_kind(f) == "shared"]
+    node_ids = {}
+    if workers > 1:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            node_ids = dict(zip(shared, pool.map(collect_tests, shared)))
+
+    # Whole suites first: they are the longest shards
+    shards = queue.Queue()
+    pending = {}
+    for test_file, test_name in sorted(suites, key=lambda suite: suite_kind(suite[0]) == "shared"):
+        kind = suite_kind(test_file)
+        groups = batches(node_ids.get(test_file, [])) if kind == "shared" else []
+        groups = groups or [[test_file]]
+        pending[test_name] = {
+            'remaining': len(groups),
+            'success': True,
+            'output': [],
+            'durations': {},
+            # Set when the first shard starts running
+            'start': None
+        }
+        for group in groups:
+            shards.put((test_name, group, kind))
+
+    results = {}
+    lock = threading.Lock()
+
+    def work():
+        lane = Lane(template)
+        try:
+            lane.start()
+            while True:
+                try:
+                    test_name, group, kind = shards.get_nowait()
+                except queue.Empty:
+                    return
+                lane.prepare(kind)
+                with lock:
+                    if pending[test_name]['start'] is None:
+                        pending[test_name]['start'] = time.time()
+                success, output, durations = run_shard(group, lane.env())
+                with lock:
+                    suite = pending[test_name]
+                    suite['success'] = suite['success'] and success
+                    suite['output'].append(output)
+                    suite['durations'].update(durations)
+                    suite['remaining'] -= 1
+                    if suite['remaining'] == 0:
+                        print_suite(test_name, "\n".join(suite['output']))
+                        results[test_name] = {
+                            'success': suite['success'],
+                            'duration': time.time() - suite['start'],
+                            'tests': suite['durations']
+                        }
+        finally:
+            lane.stop()
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for future in [pool.submit(work) for _ in range(workers)]:
+                future.result()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    ordered = {name: results[name] for _, name in suites if name in results}
+    return ordered, time.time() - total_start
+
+def print_suite(test_name, output):
+    """Print the collected output of a finished suite"""
+    print(f"\n{'='*60}")
+    print(f"Finished {test_name}")
+    print('='*60)
+    print(output, flush=True)
+
+def run_sequential(suites=TEST_SUITES):
+    """Run every suite one after another"""
+    results = {}
+    total_start = time.time()
+
+    for test_file, test_name in suites:
         start_time = time.time()
         success = run_test_suite(test_file, test_name)
         end_time = time.time()
-        
+
         results[test_name] = {
             'success': success,
             'duration': end_time - start_time
         }
-    
-    total_end = time.time()
-    
-    # Print summary
+
+    return results, time.time() - total_start
+
+def print_summary(results, total_duration):
+    """Print the summary report and return the number of failed suites"""
     print(f"\n{'='*60}")
     print("TEST SUMMARY REPORT")
     print('='*60)
-    
+
     passed = 0
     failed = 0
-    
+
     for test_name, result in results.items():
         status = "✅ PASSED" if result['success'] else "❌ FAILED"
         duration = f"{result['duration']:.2f}s"
         print(f"{test_name:<30} {status:<10} ({duration})")
-        
+
+        for node_id, test_duration in sorted(result.get('tests', {}).items(),
+                                             key=lambda item: -item[1]):
+            print(f"    {node_id:<60} {test_duration:.3f}s")
+
         if result['success']:
             passed += 1
         else:
             failed += 1
-    
-    print(f"\nTotal Tests Suites: {len(test_suites)}")
+
+    print(f"\nTotal Tests Suites: {len(results)}")
     print(f"Passed: {passed}")
     print(f"Failed: {failed}")
-    print(f"Total Duration: {total_end - total_start:.2f}s")
-    
+    print(f"Total Duration: {total_duration:.2f}s")
+
     if failed == 0:
         print("\n🎉 ALL TESTS PASSED! Your application is working perfectly!")
     else:
         print(f"\n⚠️  {failed} test suite(s) failed. Check the output above.")
-    
-    return failed == 0
+
+    return failed
+
+def main(argv=None):
+    """Run all test suites"""
+    parser = argparse.ArgumentParser(description="Run all Amazon Replica test suites")
+    parser.add_argument("--parallel", action="store_true",
+                        help="shard tests across a pool of pytest processes")
+    parser.add_argument("-j", "--workers", type=int,
+                        default=int(os.environ.get("TEST_WORKERS", os.cpu_count() or 4)),
+                        help="number of parallel workers (default: CPU count)")
+    parser.add_argument("--local", action="store_true",
+                        help="give each worker its own backend on a clone of a freshly seeded "
+                             "database instead of using BACKEND_URL (needs node)")
+    parser.add_argument("--slow", action="store_true",
+                        help="also run the long-running suites in SLOW_SUITES")
+    args = parser.parse_args(argv)
+    suites = TEST_SUITES + (SLOW_SUITES if args.slow else [])
+
+    print("Amazon Replica - Comprehensive Test Suite")
+    print("="*60)
+
+    if args.local:
+        workers = max(1, args.workers) if args.parallel else 1
+        print(f"Local mode: {workers} workers, one backend each")
+        results, total_duration = run_local(workers, suites)
+    elif args.parallel:
+        print(f"Parallel mode: {max(1, args.workers)} workers")
+        results, total_duration = run_parallel(max(1, args.workers), suites)
+    else:
+        results, total_duration = run_sequential(suites)
+
+    return print_summary(results, total_duration) == 0
 
 if __name__ == "__main__":
     success = main()
-    sys.exit(0 if success else 1)
\ No newline at end of file
+    sys.exit(0 if success else 1)
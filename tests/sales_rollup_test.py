@@ -0,0 +1,105 @@
+import json
+import sqlite3
+
+import pytest
+
+from api_support import user_headers
+from local_backend import run_script
+
+CART_USER_ID = "900400"
+
+class TestSalesRollup:
+    """
+    Sales rollups: updated at checkout, filled by the upgrade migration, rebuilt by the backfill command
+    """
+
+    def _reports(self, http, api_url, auth_headers):
+        analytics = http.get(f"{api_url}/admin/analytics", headers=auth_headers)
+        sales = http.get(f"{api_url}/admin/sales", params={"period": "week"}, headers=auth_headers)
+        assert analytics.status_code == 200 and sales.status_code == 200
+        return analytics.json(), sales.json()
+
+    def test_checkout_updates_rollups(self, http, api_url, auth_headers):
+        """Test a checkout shows up in today's revenue, product sales and customer spend"""
+        headers = user_headers(CART_USER_ID)
+        product = next(p for p in http.get(f"{api_url}/products").json() if p["countInStock"] > 2)
+        analytics_before, sales_before = self._reports(http, api_url, auth_headers)
+
+        http.post(f"{api_url}/cart/add", json={"productId": product["id"], "quantity": 2}, headers=headers)
+        line = http.get(f"{api_url}/cart", headers=headers).json()["items"][0]
+        assert http.post(f"{api_url}/cart/purchase", headers=headers).status_code == 200
+        amount = line["price"] * 2
+
+        analytics, sales = self._reports(http, api_url, auth_headers)
+        assert analytics["totalOrders"] == analytics_before["totalOrders"] + 1
+        assert analytics["totalRevenue"] == pytest.approx(analytics_before["totalRevenue"] + amount)
+        assert analytics["dailyRevenue"][-1]["orders"] == analytics_before["dailyRevenue"][-1]["orders"] + 1
+
+        def sold(report):
+            return next((p["totalQuantity"] for p in report["productSales"] if p["productId"] == product["id"]), 0)
+        assert sold(sales) == sold(sales_before) + 2
+        assert sales["totalOrders"] == sales_before["totalOrders"] + 1
+        print(f"✓ Checkout of {amount} rolled up")
+
+    def test_backfill_matches_history(self, legacy_database):
+        """Test the backfill command rebuilds rollups that agree with the order history"""
+        run_script("migrateBatched.js", legacy_database, "order-items")
+        run_script("backfillRollups.js", legacy_database)
+
+        conn = sqlite3.connect(legacy_database)
+        orders, revenue = conn.execute("SELECT COUNT(*), SUM(totalAmount) FROM Orders").fetchone()
+        quantity = conn.execute("SELECT SUM(quantity) FROM OrderItems").fetchone()[0]
+        assert conn.execute("SELECT SUM(orders), SUM(revenue) FROM DailySales").fetchone() == \
+            pytest.approx((orders, revenue))
+        assert conn.execute("SELECT SUM(orderCount), SUM(totalSpent) FROM CustomerSales").fetchone() == \
+            pytest.approx((orders, revenue))
+        assert conn.execute("SELECT SUM(quantity) FROM ProductDailySales").fetchone()[0] == quantity
+        conn.close()
+        print(f"✓ Backfill of {orders} orders matches history")
+
+    def test_backfill_checkpoints_and_reads_blobs(self, legacy_database):
+        """Test the backfill runs as a checkpointed batched migration and counts blob-only orders"""
+        run_script("backfillRollups.js", legacy_database)
+
+        conn = sqlite3.connect(legacy_database)
+        conn.row_factory = sqlite3.Row
+        checkpoint = conn.execute("SELECT * FROM MigrationCheckpoints WHERE name = 'sales-rollups'").fetchone()
+        last_order, orders = conn.execute("SELECT MAX(id), COUNT(*) FROM Orders").fetchone()
+        assert checkpoint["completedAt"] is not None
+        assert checkpoint["stopKey"] == last_order and checkpoint["rowsDone"] == orders
+
+        # Orders the order-items migration has not reached count through their JSON blob
+        quantity = conn.execute("SELECT COALESCE(SUM(quantity), 0) FROM OrderItems").fetchone()[0]
+        for (items,) in conn.execute("""
+                SELECT items FROM Orders o WHERE NOT EXISTS (SELECT 1 FROM OrderItems i WHERE i.orderId = o.id)"""):
+            quantity += sum(item.get("quantity") or 1 for item in json.loads(items or "[]"))
+        assert conn.execute("SELECT SUM(quantity) FROM ProductDailySales").fetchone()[0] == quantity
+        assert conn.execute("SELECT SUM(orders) FROM DailySales").fetchone()[0] == orders
+        conn.close()
+        print(f"✓ Backfill of {orders} orders checkpointed at order {last_order}")
+
+    def test_upgrade_migration_backfills(self, legacy_database):
+        """Test the schema migrations fill empty rollups from existing orders without a manual backfill"""
+        conn = sqlite3.connect(legacy_database)
+        with conn:
+            # As before the upgrade: orders on file, no rollups and no backfill yet
+            conn.execute("DELETE FROM SchemaVersions WHERE version >= 5")
+            conn.execute("DELETE FROM MigrationCheckpoints WHERE name = 'sales-rollups'")
+            for table in ("DailySales", "ProductDailySales", "CustomerSales"):
+                conn.execute(f"DELETE FROM {table}")
+        conn.close()
+
+        run_script("migrate.js", legacy_database)
+
+        conn = sqlite3.connect(legacy_database)
+        orders, revenue = conn.execute("SELECT COUNT(*), SUM(totalAmount) FROM Orders").fetchone()
+        assert conn.execute("SELECT SUM(orders), SUM(revenue) FROM DailySales").fetchone() == \
+            pytest.approx((orders, revenue))
+        assert conn.execute("SELECT SUM(orderCount), SUM(totalSpent) FROM CustomerSales").fetchone() == \
+            pytest.approx((orders, revenue))
+        assert conn.execute("SELECT COUNT(*) FROM SchemaVersions WHERE version = 5").fetchone()[0] == 1
+        conn.close()
+        print(f"✓ Upgrade migration rolled up {orders} orders")
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Product Search Benchmark for Amazon Replica
+Measure /api/products/search latency against a large synthetic catalog
+
+Usage:
+    python search_benchmark.py                  # 100k products
+    python search_benchmark.py --products 500000 --samples 500
+
+Builds a throwaway SQLite database with N synthetic products, starts the
+backend on it (which builds the FTS5 index on boot) and times a set of
+single-word, multi-word and type-ahead prefix queries.
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+import requests
+
+from benchmark import robust_stats
+from local_backend import LocalBackend
+
+CATEGORIES = {
+    "Electronics": ["wireless", "bluetooth", "smart", "portable", "noise", "cancelling",
+                    "headphones", "speaker", "charger", "laptop", "monitor", "camera"],
+    "Apparel": ["cotton", "denim", "slim", "casual", "jacket", "shirt", "sneakers",
+                "hoodie", "linen", "wool", "running", "formal"],
+    "Home & Kitchen": ["stainless", "steel", "nonstick", "cookware", "blender", "kettle",
+                       "ceramic", "knife", "storage", "coffee", "air", "fryer"],
+    "Books": ["novel", "history", "science", "fiction", "guide", "cookbook",
+              "biography", "mystery", "poetry", "fantasy", "programming", "atlas"],
+    "Sports & Outdoors": ["yoga", "mat", "tent", "camping", "hiking", "backpack",
+                          "dumbbell", "cycling", "helmet", "fitness", "trail", "bottle"],
+}
+BRANDS = ["Acme", "Zenith", "Nova", "Orbit", "Summit", "Vertex", "Lumen", "Atlas", "Pioneer", "Aurora"]
+
+QUERIES = [
+    ("single word", "headphones"),
+    ("two words", "wireless speaker"),
+    ("brand + word", "Zenith yoga"),
+    ("prefix 2 chars", "ca"),
+    ("prefix 4 chars", "blen"),
+    ("type-ahead", "stainless ste"),
+    ("rare term", "atlas poetry"),
+]
+
+def build_catalog(path, count, seed=42):
+    """Write `count` synthetic products into a Products table at `path`"""
+    rng = random.Random(seed)
+    conn = sqlite3.connect(path)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS Products (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name VARCHAR(255) NOT NULL,
+            image VARCHAR(255) NOT NULL,
+            description TEXT NOT NULL,
+            category VARCHAR(255) NOT NULL,
+            price DECIMAL(10,2) NOT NULL,
+            countInStock INTEGER NOT NULL DEFAULT 0,
+            rating DECIMAL(2,1) NOT NULL DEFAULT 0,
+            numReviews INTEGER NOT NULL DEFAULT 0,
+            createdAt DATETIME NOT NULL,
+            updatedAt DATETIME NOT NULL
+        )""")
+    now = time.strftime("%Y-%m-%d %H:%M:%S.000 +00:00", time.gmtime())
+    categories = list(CATEGORIES)
+
+    def rows():
+        for i in range(count):
+            category = rng.choice(categories)
+            words = CATEGORIES[category]
+            name = f"{rng.choice(BRANDS)} {' '.join(rng.sample(words, 3))} {i}"
+            description = " ".join(rng.choices(words + BRANDS, k=20))
+            yield (name, f"images/sku_{i}.jpg", description, category,
+                   round(rng.uniform(100, 100000), 2), rng.randint(0, 500),
+                   round(rng.uniform(1, 5), 1), rng.randint(0, 5000), now, now)
+
+    with conn:
+        conn.executemany("""
+            INSERT INTO Products (name, image, description, category, price, countInStock,
+                                  rating, numReviews, createdAt, updatedAt)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""", rows())
+    conn.close()
+
+def run(api_url, warmup, samples, limit):
+    http = requests.Session()
+    results = {}
+    for label, query in QUERIES:
+        params = {"q": query, "limit": limit}
+        for _ in range(warmup):
+            http.get(f"{api_url}/products/search", params=params).raise_for_status()
+        timings = []
+        hits = 0
+        for _ in range(samples):
+            start = time.perf_counter()
+            response = http.get(f"{api_url}/products/search", params=params)
+            timings.append(time.perf_counter() - start)
+            response.raise_for_status()
+            hits = len(response.json())
+        stats = robust_stats(timings)
+        results[label] = stats
+        print(f"{label:<16} {query!r:<18} {hits:>4} hits  median {stats['median_ms']:>7.2f}ms  "
+              f"p90 {stats['p90_ms']:>7.2f}ms  p99 {stats['p99_ms']:>7.2f}ms", flush=True)
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark product search on a synthetic catalog")
+    parser.add_argument("--products", type=int, default=100_000, help="catalog size (default 100000)")
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--samples", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=20, help="result limit per query")
+    parser.add_argument("--max-p99-ms", type=float, default=100.0,
+                        help="fail when any query's p99 exceeds this (default 100)")
+    args = parser.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix="search-bench-")
+    db_path = os.path.join(workdir, "catalog.sqlite")
+    start = time.perf_counter()
+    build_catalog(db_path, args.products)
+    print(f"Built {args.products} products in {time.perf_counter() - start:.1f}s")
+
+    try:
+        backend = LocalBackend(database=db_path, copy=False, startup_timeout=300)
+        start = time.perf_counter()
+        with backend:
+            print(f"Backend ready (FTS index built) in {time.perf_counter() - start:.1f}s")
+            print("="*100)
+            results = run(backend.api_url, args.warmup, args.samples, args.limit)
+    finally:
+        for name in os.listdir(workdir):
+            os.remove(os.path.join(workdir, name))
+        os.rmdir(workdir)
+
+    slow = [label for label, stats in results.items() if stats['p99_ms'] > args.max_p99_ms]
+    if slow:
+        print(f"\n⚠️  p99 above {args.max_p99_ms}ms for: {', '.join(slow)}")
+        return False
+    print(f"\n🎉 All queries under {args.max_p99_ms}ms p99 on {args.products} products")
+    return True
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
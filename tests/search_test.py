@@ -0,0 +1,66 @@
+import pytest
+
+class TestProductSearch:
+    """
+    Full-text search through GET /api/products/search
+    """
+
+    def test_search_by_name(self, http, api_url):
+        """Test a word from a product name finds that product first"""
+        products = http.get(f"{api_url}/products", params={"fields": "id,name"}).json()
+        target = products[0]
+        word = max(target["name"].split(), key=len)
+
+        response = http.get(f"{api_url}/products/search", params={"q": word})
+        assert response.status_code == 200
+        results = response.json()
+        assert any(r["id"] == target["id"] for r in results)
+        print(f"✓ Search for '{word}' found '{target['name']}'")
+
+    def test_prefix_type_ahead(self, http, api_url):
+        """Test the last word matches as a prefix while typing"""
+        response = http.get(f"{api_url}/products/search", params={"q": "Electro"})
+        assert response.status_code == 200
+        results = response.json()
+        assert len(results) > 0
+        assert any(r["category"] == "Electronics" for r in results)
+        print(f"✓ Prefix 'Electro' returned {len(results)} results")
+
+    def test_result_limit_and_category(self, http, api_url):
+        """Test limit and category narrow the result set"""
+        response = http.get(f"{api_url}/products/search",
+                            params={"q": "e", "limit": 3, "category": "Books"})
+        assert response.status_code == 200
+        results = response.json()
+        assert len(results) <= 3
+        assert all(r["category"] == "Books" for r in results)
+        print("✓ Search limit and category filter applied")
+
+    def test_missing_query(self, http, api_url):
+        """Test a search without q is rejected"""
+        response = http.get(f"{api_url}/products/search")
+        assert response.status_code == 400
+        print("✓ Empty search rejected")
+
+    def test_index_follows_admin_update(self, http, api_url, auth_headers):
+        """Test renaming a product through the admin API updates the index"""
+        product = http.get(f"{api_url}/products", params={"limit": 1}).json()[0]
+        marker = "Zyxwvut"
+        update = {"name": f"{marker} {product['name']}", "price": product["price"],
+                  "countInStock": product["countInStock"], "category": product["category"]}
+
+        response = http.put(f"{api_url}/admin/products/{product['id']}", json=update, headers=auth_headers)
+        assert response.status_code == 200
+        try:
+            results = http.get(f"{api_url}/products/search", params={"q": marker}).json()
+            assert [r["id"] for r in results] == [product["id"]]
+        finally:
+            restore = {**update, "name": product["name"]}
+            http.put(f"{api_url}/admin/products/{product['id']}", json=restore, headers=auth_headers)
+
+        results = http.get(f"{api_url}/products/search", params={"q": marker}).json()
+        assert results == []
+        print("✓ Search index stays in sync with admin product updates")
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -1,27 +1,26 @@
-import requests
 import time
 
 
 
-def test_login():
+def test_login(http, frontend_url):
     """Test login page loads"""
-    response = requests.get("http://localhost:5173/login")
+    response = http.get(f"{frontend_url}/login")
     assert response.status_code == 200
     print("✓ Login page loads")
 
-def test_admin_login():
+def test_admin_login(http, api_url):
     """Test admin login API"""
     login_data = {
         "email": "admin@lec.com",
         "password": "admin@1234"
     }
-    response = requests.post("http://localhost:5000/api/auth/login", json=login_data)
+    response = http.post(f"{api_url}/auth/login", json=login_data)
     assert response.status_code == 200
     print("✓ Admin login works")
 
-def test_products_api():
+def test_products_api(http, api_url):
     """Test products API"""
-    response = requests.get("http://localhost:5000/api/products")
+    response = http.get(f"{api_url}/products")
     assert response.status_code == 200
     data = response.json()
     assert len(data) > 0
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Local SMTP stand-in for the email tests and for development: accepts every
+message and keeps it in memory instead of delivering it. It can also be
+slow, defer some recipients with 451 or reject them with 550, to exercise
+the outbox dispatcher's retries.
+
+    python smtp_sink.py --port 2525    # print messages as they arrive
+
+Point the backend at it with SMTP_HOST=127.0.0.1 SMTP_PORT=2525 and an
+empty EMAIL_USER (the sink does not authenticate).
+"""
+
+import argparse
+import asyncio
+import email
+import threading
+import time
+from email import policy
+
+from aiosmtpd.controller import Controller
+
+from local_backend import free_port
+
+class _Handler:
+    def __init__(self, sink):
+        self.sink = sink
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        with self.sink.lock:
+            if address in self.sink.reject:
+                return "550 5.1.1 Mailbox unavailable"
+            if self.sink.defer.get(address, 0) > 0:
+                self.sink.defer[address] -= 1
+                return "451 4.3.0 Try again later"
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+    async def handle_DATA(self, server, session, envelope):
+        if self.sink.delay:
+            await asyncio.sleep(self.sink.delay)
+        message = email.message_from_bytes(envelope.content, policy=policy.default)
+        body = message.get_body(preferencelist=("html", "plain"))
+        with self.sink.changed:
+            for recipient in envelope.rcpt_tos:
+                self.sink.messages.append({
+                    "to": recipient,
+                    "from": envelope.mail_from,
+                    "subject": message["subject"],
+                    "body": body.get_content() if body else "",
+                    "received_at": time.time(),
+                })
+            self.sink.changed.notify_all()
+        if self.sink.verbose:
+            print(f"{time.strftime('%H:%M:%S')} {envelope.mail_from} -> {', '.join(envelope.rcpt_tos)}: "
+                  f"{message['subject']}", flush=True)
+        return "250 Message accepted for delivery"
+
+class SmtpSink:
+    """
+    Context manager running an in-memory SMTP server on 127.0.0.1.
+
+    `delay` seconds are spent on every message, `defer[address] = n` answers
+    the next n deliveries to address with 451, and addresses in `reject` get
+    550. Received messages are in `messages`.
+    """
+
+    def __init__(self, port=None, delay=0.0, verbose=False):
+        self.port = port or free_port()
+        self.delay = delay
+        self.verbose = verbose
+        self.defer = {}
+        self.reject = set()
+        self.messages = []
+        self.lock = threading.Lock()
+        self.changed = threading.Condition(self.lock)
+        self.controller = Controller(_Handler(self), hostname="127.0.0.1", port=self.port)
+
+    def start(self):
+        self.controller.start()
+        return self
+
+    def stop(self):
+        self.controller.stop()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def to(self, address):
+        with self.lock:
+            return [message for message in self.messages if message["to"] == address]
+
+    def wait_for(self, predicate, timeout=10.0):
+        """Wait until predicate(messages) is true; return it, or raise on timeout"""
+        deadline = time.time() + timeout
+        with self.changed:
+            while not predicate(self.messages):
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    raise TimeoutError(f"SMTP sink: condition not met after {timeout}s "
+                                       f"({len(self.messages)} messages received)")
+                self.changed.wait(remaining)
+            return self.messages
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Accept and print SMTP messages without delivering them")
+    parser.add_argument("--port", type=int, default=2525)
+    parser.add_argument("--delay", type=float, default=0.0, help="seconds spent on each message")
+    args = parser.parse_args(argv)
+
+    with SmtpSink(port=args.port, delay=args.delay, verbose=True):
+        print(f"SMTP sink listening on 127.0.0.1:{args.port} (Ctrl+C to stop)", flush=True)
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+SQLite profile test: the performance profile puts the database in WAL mode
+and mixed browse/checkout load runs without SQLITE_BUSY failures. Starts its
+own backends on copies of the dev database, so it needs node:
+
+    python -m pytest sqlite_profile_test.py -s
+
+For a before/after throughput comparison run the load harness:
+
+    python load_harness.py --users 20 --mix browse=70,checkout=30 \\
+        --compare SQLITE_PROFILE=default SQLITE_PROFILE=performance
+"""
+
+import asyncio
+import shutil
+import sqlite3
+
+import pytest
+
+from load_harness import print_report, run_load
+from local_backend import LocalBackend
+
+MIX = "browse=70,checkout=30"
+
+@pytest.fixture(scope="module", params=["default", "performance"])
+def profile_backend(request):
+    if shutil.which("node") is None:
+        pytest.skip("Needs node")
+    with LocalBackend(env={"SQLITE_PROFILE": request.param}) as backend:
+        yield request.param, backend
+
+def journal_mode(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute("PRAGMA journal_mode").fetchone()[0]
+    finally:
+        conn.close()
+
+def test_journal_mode(profile_backend):
+    """Test only the performance profile switches the database to WAL"""
+    profile, backend = profile_backend
+    expected = "wal" if profile == "performance" else "delete"
+    assert journal_mode(backend.db_path) == expected
+    print(f"✓ {profile}: journal_mode={expected}")
+
+def test_mixed_load_without_busy_errors(profile_backend):
+    """Test concurrent browsing and checkouts complete without errors"""
+    profile, backend = profile_backend
+    if profile == "default":
+        pytest.skip("The default profile has no busy timeout")
+    report = asyncio.run(run_load(mode="closed", users=20, duration=5, mix=MIX,
+                                  api_url=backend.api_url, jwt_secret=backend.jwt_secret))
+    print_report(report, show_histogram=False)
+    assert report['error_rate'] == 0
+    print(f"✓ {profile}: {report['throughput_rps']:.1f} req/s with no errors")
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
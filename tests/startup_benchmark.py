@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Startup Benchmark for Amazon Replica
+Measure time-to-first-200 on /api/products as the database grows
+
+Usage:
+    python startup_benchmark.py                          # seed, small, medium
+    python startup_benchmark.py --scales seed,small,large --runs 10
+
+For each scale, builds a template database (the seed data plus datagen.py's
+synthetic rows at that scale) and boots the backend on fresh clones of it
+`--runs` times in each mode:
+
+    migrations   the default: read SchemaVersions, apply nothing
+    sync         DB_SYNC_ON_BOOT=true: sequelize.sync() plus the search
+                 index check on every start, as before versioned migrations
+
+Time-to-first-200 is counted from spawning node until /api/products first
+answers 200, so it includes loading modules as well as preparing the schema.
+"""
+
+import argparse
+import os
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+from datagen import SCALES, generate
+from local_backend import LocalBackend, build_template
+
+MODES = {
+    "migrations": {},
+    "sync": {"DB_SYNC_ON_BOOT": "true"},
+}
+
+def build_scale(path, scale):
+    """Template database for `scale` ('seed' is the seed data alone)"""
+    build_template(path)
+    if scale != "seed":
+        # Rollup tables do not change what startup reads; skip rebuilding them
+        generate(path, *SCALES[scale], rollups=False)
+    conn = sqlite3.connect(path)
+    try:
+        conn.execute("PRAGMA journal_mode = DELETE")
+        counts = dict(conn.execute(
+            "SELECT type, COUNT(*) FROM sqlite_master WHERE type IN ('table', 'index') GROUP BY type"))
+        rows = sum(conn.execute(f'SELECT COUNT(*) FROM "{table}"').fetchone()[0]
+                   for table in ("Products", "Users", "Orders", "OrderItems", "Carts"))
+    finally:
+        conn.close()
+    return {"rows": rows, "tables": counts.get("table", 0), "indexes": counts.get("index", 0),
+            "size_mb": os.path.getsize(path) / 1e6}
+
+def time_boots(template, env, runs):
+    """Boot on a fresh clone `runs` times; return the seconds to first 200 of each"""
+    timings = []
+    for _ in range(runs):
+        with LocalBackend(database=template, template=True, env=env, startup_timeout=300) as backend:
+            timings.append(backend.ready_seconds)
+    return timings
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark backend startup time against database size")
+    parser.add_argument("--scales", default="seed,small,medium",
+                        help="comma-separated: seed and/or datagen scales (default seed,small,medium)")
+    parser.add_argument("--runs", type=int, default=5, help="boots per scale and mode (default 5)")
+    parser.add_argument("--modes", default=",".join(MODES),
+                        help=f"comma-separated subset of {', '.join(MODES)}")
+    parser.add_argument("--max-growth", type=float, default=2.0,
+                        help="fail when migrations-mode boot on the largest scale takes more than "
+                             "this many times the seed-only boot (default 2.0)")
+    args = parser.parse_args(argv)
+
+    scales = args.scales.split(",")
+    modes = args.modes.split(",")
+    unknown = [s for s in scales if s != "seed" and s not in SCALES] + [m for m in modes if m not in MODES]
+    if unknown:
+        parser.error(f"unknown scale or mode: {', '.join(unknown)}")
+
+    workdir = tempfile.mkdtemp(prefix="startup-bench-")
+    results = {}
+    try:
+        for scale in scales:
+            template = os.path.join(workdir, f"{scale}.sqlite")
+            start = time.perf_counter()
+            info = build_scale(template, scale)
+            print(f"{scale}: {info['rows']:,} rows, {info['tables']} tables, {info['indexes']} indexes, "
+                  f"{info['size_mb']:.0f} MB (built in {time.perf_counter() - start:.1f}s)")
+            for mode in modes:
+                timings = time_boots(template, MODES[mode], args.runs)
+                results[scale, mode] = timings
+                print(f"  {mode:<12} median {statistics.median(timings) * 1000:7.0f}ms   "
+                      f"min {min(timings) * 1000:7.0f}ms   max {max(timings) * 1000:7.0f}ms")
+            os.remove(template)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print("="*100)
+    print(f"{'scale':<10}" + "".join(f"{mode:>16}" for mode in modes))
+    for scale in scales:
+        print(f"{scale:<10}" + "".join(
+            f"{statistics.median(results[scale, mode]) * 1000:>14.0f}ms" for mode in modes))
+
+    if "migrations" not in modes or len(scales) < 2:
+        return True
+    smallest = statistics.median(results[scales[0], "migrations"])
+    largest = statistics.median(results[scales[-1], "migrations"])
+    growth = largest / smallest
+    if growth > args.max_growth:
+        print(f"\n⚠️  Startup grew {growth:.1f}x from {scales[0]} to {scales[-1]} (limit {args.max_growth}x)")
+        return False
+    print(f"\n🎉 Startup grew {growth:.1f}x from {scales[0]} to {scales[-1]} (limit {args.max_growth}x)")
+    return True
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,60 @@
+"""
+Template database test: clones of the seeded template are fast and
+independent, so every worker (or test) can have a backend of its own.
+Starts its own backends, so it needs node:
+
+    python -m pytest template_database_test.py -s
+"""
+
+import os
+import sqlite3
+import time
+
+import pytest
+import requests
+
+from api_support import user_headers
+from local_backend import clone_database
+
+CART_USER_ID = "900800"
+MAX_CLONE_MS = 500
+
+def test_clone_is_fast_and_complete(template_database, tmp_path):
+    """Test a clone takes milliseconds and holds the seeded data"""
+    target = str(tmp_path / "clone.sqlite")
+    start = time.perf_counter()
+    method = clone_database(template_database, target)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    assert elapsed_ms < MAX_CLONE_MS, f"clone took {elapsed_ms:.0f}ms"
+
+    with sqlite3.connect(target) as conn:
+        products = conn.execute("SELECT COUNT(*) FROM Products").fetchone()[0]
+        admins = conn.execute("SELECT COUNT(*) FROM Users WHERE isAdmin = 1").fetchone()[0]
+    assert products > 0 and admins == 1
+    print(f"✓ {os.path.getsize(target) // 1024}KB cloned by {method} in {elapsed_ms:.1f}ms")
+
+def _add_to_cart(backend):
+    product = requests.get(f"{backend.api_url}/products").json()[0]
+    response = requests.post(f"{backend.api_url}/cart/add", json={"productId": product["id"]},
+                             headers=user_headers(CART_USER_ID, backend.jwt_secret))
+    assert response.status_code == 201
+
+def _cart(backend):
+    response = requests.get(f"{backend.api_url}/cart",
+                            headers=user_headers(CART_USER_ID, backend.jwt_secret))
+    assert response.status_code == 200
+    return response.json()["items"]
+
+def test_backend_writes_its_own_clone(isolated_backend):
+    """Test state written through one isolated backend"""
+    _add_to_cart(isolated_backend)
+    assert len(_cart(isolated_backend)) == 1
+    print("✓ Cart written on a private clone")
+
+def test_next_backend_starts_from_the_template(isolated_backend):
+    """Test the previous test's cart did not leak into this clone"""
+    assert _cart(isolated_backend) == []
+    print("✓ Fresh clone starts from the seeded state")
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])